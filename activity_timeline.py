@@ -12,6 +12,8 @@ from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
+from services import search_index
+
 logger = logging.getLogger(__name__)
 
 # Activity action categories
@@ -587,6 +589,9 @@ def search_activity(
 ) -> List[Dict]:
     """Search activity log.
 
+    Uses the activity_fts full-text index when it exists (terms are
+    prefix-matched and ANDed), otherwise a LIKE scan.
+
     Args:
         conn: Database connection
         query: Search query
@@ -603,10 +608,15 @@ def search_activity(
         SELECT a.*, u.username
         FROM activity_log a
         LEFT JOIN users u ON a.user_id = u.id
-        WHERE (a.action LIKE ? OR a.entity_type LIKE ? OR a.details LIKE ?)
     """
-    search_term = f"%{query}%"
-    params = [search_term, search_term, search_term]
+    match = search_index.build_match_query(query)
+    if match and search_index.search_index_ready(conn, "activity"):
+        sql += " WHERE " + search_index.fts_filter("activity", "a.id")
+        params = [match]
+    else:
+        sql += " WHERE (a.action LIKE ? OR a.entity_type LIKE ? OR a.details LIKE ?)"
+        search_term = f"%{query}%"
+        params = [search_term, search_term, search_term]
 
     if start_date:
         sql += " AND a.created_at >= ?"
@@ -39,6 +39,7 @@ import sys
 import threading
 import time
 import uuid
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta
 from functools import wraps
 from pathlib import Path
@@ -58,75 +59,91 @@ from flask import (
 from flask_compress import Compress
 from flask_socketio import SocketIO, emit, join_room, leave_room
 
+# Feature modules are imported on first use (see lazy_routes.py)
+from lazy_routes import LazyBlueprintLoader, lazy_import
+
 # Import activity timeline module
-import activity_timeline
+activity_timeline = lazy_import("activity_timeline")
 
 # Import batch task creation module
-import batch_tasks
+batch_tasks = lazy_import("batch_tasks")
 
 # Import dashboard layout module
-import dashboard_layout
+dashboard_layout = lazy_import("dashboard_layout")
 
 # Import centralized database module
 import db as database
 
 # Import kudos (team recognition) module
-import kudos
+kudos = lazy_import("kudos")
 
 # Import notification rules module
-import notification_rules
+notification_rules = lazy_import("notification_rules")
 
 # Import portfolio module
-import portfolio
+portfolio = lazy_import("portfolio")
 
 # Import project cost tracking module
-import project_costs
+project_costs = lazy_import("project_costs")
 
 # Import project dependencies module
-import project_dependencies
+project_dependencies = lazy_import("project_dependencies")
 
 # Import project permissions utilities
-import project_permissions
+project_permissions = lazy_import("project_permissions")
 
 # Import custom reports module
-import reports as custom_reports
+custom_reports = lazy_import("reports")
 
 # Import resource allocation module
-import resource_allocation
+resource_allocation = lazy_import("resource_allocation")
 
 # Import retrospectives module
-import retrospectives
+retrospectives = lazy_import("retrospectives")
 
 # Import role management utilities
-import roles as user_roles
+user_roles = lazy_import("roles")
 
 # Import rollback manager module
-import rollback_manager
+rollback_manager = lazy_import("rollback_manager")
 
 # Import app-wide settings module
-import settings as app_settings
+app_settings = lazy_import("settings")
 
 # Import Slack integration utilities
-import slack_integration
+slack_integration = lazy_import("slack_integration")
 
 # Import sprint board management module
-import sprint_board
+sprint_board = lazy_import("sprint_board")
 
 # Import task conversion module
-import task_convert
+task_convert = lazy_import("task_convert")
 
 # Import task worklog module
-import task_worklog
+task_worklog = lazy_import("task_worklog")
 
 # Import webhook utilities for task events
-import webhooks as task_webhooks
-from db import get_pool_stats
+task_webhooks = lazy_import("webhooks")
+from db import format_pool_prometheus, get_pool_stats, set_pool_caller
 
 # Import rate limiting and resource monitoring services
 from services.rate_limiting import RateLimitService
 from services.resource_monitor import ResourceMonitor
 from services.background_tasks import get_background_task_manager
 from services.rate_limiting_routes import rate_limiting_bp
+from services.task_claim import TaskClaimEngine, ensure_claim_schema
+from services.dependency_graph import (
+    ensure_dependency_graph_schema,
+    get_task_dependency_graph,
+)
+from services import search_index
+from services import entity_counters
+from services.broadcast_hub import ensure_broadcast_schema, get_broadcast_hub
+from services.error_ingest import (
+    ensure_error_hash_schema,
+    error_hash,
+    get_error_aggregator,
+)
 
 # Import web dashboard modules
 try:
@@ -210,7 +227,23 @@ from csrf_protection import (
 )
 
 # Import dashboard cache management
-from dashboard_cache import get_cache_manager, get_component_info
+from dashboard_cache import (
+    ensure_dashboard_cache_schema,
+    get_cache_manager,
+    get_component_info,
+)
+
+# Import streaming export helpers
+from export_stream import (
+    XLSX_MIMETYPE,
+    csv_chunks,
+    drop_columns,
+    iter_batches,
+    iter_dicts,
+    json_document_chunks,
+    ndjson_chunks,
+    write_xlsx,
+)
 from milestone_summaries_api import register_milestone_summaries_routes
 
 # Import OpenAPI/Swagger documentation module
@@ -306,6 +339,12 @@ TASK_PRIORITY_MAX_AGE_BONUS = (
     10  # Maximum bonus from aging (caps at 100 minutes)
 )
 
+# Atomic claim engine for /api/tasks/claim and /api/tasks/claim-balanced
+task_claim_engine = TaskClaimEngine(
+    aging_factor=TASK_PRIORITY_AGING_FACTOR,
+    max_age_bonus=TASK_PRIORITY_MAX_AGE_BONUS,
+)
+
 # Dependency-based priority configuration
 # Tasks that block other tasks get priority boosts
 DEPENDENCY_BOOST_PER_BLOCKED = (
@@ -572,6 +611,20 @@ def init_rate_limiting_services():
         app.bg_task_manager = get_background_task_manager()
 
         # Register background tasks
+        app.bg_task_manager.register_task(
+            task_name="flush_rate_limit_buckets",
+            task_func=lambda: app.rate_limiter.flush_buckets(),
+            interval_seconds=1,  # Batch in-memory counts to rate_limit_buckets
+            start_immediately=False
+        )
+
+        app.bg_task_manager.register_task(
+            task_name="evict_rate_limit_state",
+            task_func=lambda: app.rate_limiter.evict_expired(),
+            interval_seconds=60,  # Drop GCRA state of idle clients
+            start_immediately=False
+        )
+
         app.bg_task_manager.register_task(
             task_name="cleanup_rate_limits",
             task_func=lambda: app.rate_limiter.cleanup_old_data(days=7),
@@ -760,28 +813,6 @@ try:
 except ImportError as e:
     print(f"Warning: Could not load system_overview blueprint: {e}")
 
-try:
-    from services.scheduler_routes import scheduler_bp
-
-    app.register_blueprint(scheduler_bp)
-    app.config["DB_PATH"] = DB_PATH  # Make DB_PATH available to blueprint
-except ImportError as e:
-    print(f"Warning: Could not load scheduler blueprint: {e}")
-
-try:
-    from services.task_alerts_routes import alerts_bp
-
-    app.register_blueprint(alerts_bp)
-except ImportError as e:
-    print(f"Warning: Could not load task alerts blueprint: {e}")
-
-try:
-    from services.api_keys_routes import api_keys_bp
-
-    app.register_blueprint(api_keys_bp)
-except ImportError as e:
-    print(f"Warning: Could not load API keys blueprint: {e}")
-
 try:
     from services.integrations_routes import integrations_bp
 
@@ -803,13 +834,6 @@ try:
 except ImportError as e:
     print(f"Warning: Could not load gantt blueprint: {e}")
 
-try:
-    from services.roadmap_routes import roadmap_bp
-
-    app.register_blueprint(roadmap_bp)
-except ImportError as e:
-    print(f"Warning: Could not load roadmap blueprint: {e}")
-
 try:
     from services.archive_routes import archive_bp
 
@@ -817,20 +841,6 @@ try:
 except ImportError as e:
     print(f"Warning: Could not load archive blueprint: {e}")
 
-try:
-    from services.watchers_routes import watchers_bp
-
-    app.register_blueprint(watchers_bp)
-except ImportError as e:
-    print(f"Warning: Could not load watchers blueprint: {e}")
-
-try:
-    from services.session_groups_routes import session_groups_bp
-
-    app.register_blueprint(session_groups_bp)
-except ImportError as e:
-    print(f"Warning: Could not load session_groups blueprint: {e}")
-
 try:
     from services.attachments_routes import attachments_bp
 
@@ -839,20 +849,6 @@ try:
 except ImportError as e:
     print(f"Warning: Could not load attachments blueprint: {e}")
 
-try:
-    from services.auto_assign_routes import auto_assign_bp
-
-    app.register_blueprint(auto_assign_bp)
-except ImportError as e:
-    print(f"Warning: Could not load auto_assign blueprint: {e}")
-
-try:
-    from services.status_history_routes import status_history_bp
-
-    app.register_blueprint(status_history_bp)
-except ImportError as e:
-    print(f"Warning: Could not load status_history blueprint: {e}")
-
 try:
     from services.task_suggestions_routes import suggestions_bp
 
@@ -860,13 +856,6 @@ try:
 except ImportError as e:
     print(f"Warning: Could not load suggestions blueprint: {e}")
 
-try:
-    from services.quick_create_routes import quick_create_bp
-
-    app.register_blueprint(quick_create_bp)
-except ImportError as e:
-    print(f"Warning: Could not load quick_create blueprint: {e}")
-
 # Rate limiting and resource monitoring routes
 try:
     app.register_blueprint(rate_limiting_bp)
@@ -874,13 +863,6 @@ try:
 except Exception as e:
     logger.error(f"Failed to load rate_limiting blueprint: {e}")
 
-try:
-    from services.llm_metrics_routes import llm_metrics_bp
-
-    app.register_blueprint(llm_metrics_bp)
-except ImportError as e:
-    print(f"Warning: Could not load LLM metrics blueprint: {e}")
-
 try:
     from services.go_wrapper_monitor_routes import go_monitor_bp
 
@@ -888,13 +870,6 @@ try:
 except ImportError as e:
     print(f"Warning: Could not load Go Wrapper monitor blueprint: {e}")
 
-try:
-    from services.session_pool_routes import session_pool_bp
-
-    app.register_blueprint(session_pool_bp)
-except ImportError as e:
-    print(f"Warning: Could not load Session Pool blueprint: {e}")
-
 try:
     from services.crawl_results_routes import crawl_results_bp
 
@@ -902,19 +877,25 @@ try:
 except ImportError as e:
     print(f"Warning: Could not load Crawl Results blueprint: {e}")
 
-try:
-    from routes.todos import todos_bp
-
-    app.register_blueprint(todos_bp)
-except ImportError as e:
-    print(f"Warning: Could not load todos blueprint: {e}")
-
-try:
-    from api.browser_automation import browser_api
-
-    app.register_blueprint(browser_api)
-except ImportError as e:
-    print(f"Warning: Could not load browser_automation API: {e}")
+# Route groups that own their URL prefix are imported on first request
+app.config["DB_PATH"] = DB_PATH  # Make DB_PATH available to blueprints
+lazy_blueprints = LazyBlueprintLoader(app)
+for _url_prefix, _module, _attr in [
+    ("/api/scheduled-tasks", "services.scheduler_routes", "scheduler_bp"),
+    ("/api/alerts", "services.task_alerts_routes", "alerts_bp"),
+    ("/api/keys", "services.api_keys_routes", "api_keys_bp"),
+    ("/api/roadmap", "services.roadmap_routes", "roadmap_bp"),
+    ("/api/watchers", "services.watchers_routes", "watchers_bp"),
+    ("/api/tmux/groups", "services.session_groups_routes", "session_groups_bp"),
+    ("/api/auto-assign", "services.auto_assign_routes", "auto_assign_bp"),
+    ("/api/status-history", "services.status_history_routes", "status_history_bp"),
+    ("/api/quick-create", "services.quick_create_routes", "quick_create_bp"),
+    ("/api/llm", "services.llm_metrics_routes", "llm_metrics_bp"),
+    ("/api/session-pool", "services.session_pool_routes", "session_pool_bp"),
+    ("/api/todos", "routes.todos", "todos_bp"),
+    ("/api/browser-tasks", "api.browser_automation", "browser_api"),
+]:
+    lazy_blueprints.add(_url_prefix, _module, _attr)
 
 try:
     from services.claude_templates import register_claude_template_routes
@@ -950,6 +931,22 @@ def correlation_id_before_request():
         before_request_correlation()
 
 
+# Tag connection pool acquisitions with the matched route. Only routes that go
+# through db.get_connection()/Database are counted; get_db_connection() opens
+# an unpooled connection and never shows up in the pool histograms.
+@app.before_request
+def db_pool_caller_before_request():
+    """Attribute pool wait/hold times to the route serving this request."""
+    rule = request.url_rule.rule if request.url_rule else "unmatched"
+    set_pool_caller(f"{request.method} {rule}")
+
+
+@app.teardown_request
+def db_pool_caller_teardown(exc=None):
+    """Clear the pool caller tag so the thread does not carry it over."""
+    set_pool_caller(None)
+
+
 # Register CORS handler for monitor API
 @app.after_request
 def add_cors_headers(response):
@@ -2634,6 +2631,78 @@ def init_database():
         except sqlite3.OperationalError:
             pass
 
+        # Ready-set and aging columns, indexes and triggers for the claim engine
+        try:
+            if ensure_claim_schema(conn, aging_factor=TASK_PRIORITY_AGING_FACTOR):
+                logger.info("Backfilled task_queue.blocked_count for claim engine")
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Could not set up task claim schema: {e}")
+
+        # Composite indexes for GET /api/tasks cursor pages: capped tasks are
+        # walked in (priority, created_epoch, id) order under the common
+        # filters; still-aging tasks are found by created_epoch range
+        for index_sql in [
+            "DROP INDEX IF EXISTS idx_task_queue_status_type_created",
+            "DROP INDEX IF EXISTS idx_task_queue_status_created",
+            "DROP INDEX IF EXISTS idx_task_queue_type_created",
+            "DROP INDEX IF EXISTS idx_task_queue_risk_status_created",
+            "CREATE INDEX IF NOT EXISTS idx_task_queue_created ON task_queue(created_at, id)",
+            """CREATE INDEX IF NOT EXISTS idx_task_queue_status_type_priority
+               ON task_queue(status, task_type, priority DESC, created_epoch, id)""",
+            """CREATE INDEX IF NOT EXISTS idx_task_queue_status_priority
+               ON task_queue(status, priority DESC, created_epoch, id)""",
+            """CREATE INDEX IF NOT EXISTS idx_task_queue_type_priority
+               ON task_queue(task_type, priority DESC, created_epoch, id)""",
+            """CREATE INDEX IF NOT EXISTS idx_task_queue_priority
+               ON task_queue(priority DESC, created_epoch, id)""",
+            """CREATE INDEX IF NOT EXISTS idx_task_queue_status_epoch
+               ON task_queue(status, created_epoch)""",
+            "CREATE INDEX IF NOT EXISTS idx_task_queue_epoch ON task_queue(created_epoch)",
+            # risk_level is added by migration 033 and may not exist yet
+            """CREATE INDEX IF NOT EXISTS idx_task_queue_risk_status_priority
+               ON task_queue(risk_level, status, priority DESC, created_epoch, id)""",
+        ]:
+            try:
+                conn.execute(index_sql)
+            except sqlite3.OperationalError:
+                pass
+
+        # Change log feeding the in-memory task dependency graph
+        try:
+            ensure_dependency_graph_schema(conn)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Could not set up dependency graph schema: {e}")
+
+        # Shared dashboard cache tables and version-bump triggers
+        try:
+            ensure_dashboard_cache_schema(conn)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Could not set up dashboard cache schema: {e}")
+
+        # Trigger-maintained per-status counts for the dashboard stats
+        try:
+            entity_counters.ensure_counter_schema(conn)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Could not set up entity counters: {e}")
+
+        # Event log shared by every worker's SSE / Socket.IO broadcast hub
+        try:
+            ensure_broadcast_schema(conn)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Could not set up broadcast event log: {e}")
+
+        # Unique error_hash over active errors for batched error ingestion
+        try:
+            ensure_error_hash_schema(conn)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Could not set up error hash index: {e}")
+
+        # FTS5 search indexes over activity, tasks, errors and comments
+        try:
+            search_index.ensure_search_schema(conn)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Could not set up search index: {e}")
+
         # Add soft delete columns to all core entities
         soft_delete_tables = [
             "projects",
@@ -3289,77 +3358,66 @@ def handle_get_entity_activity(data):
 # WEBSOCKET BROADCAST FUNCTIONS
 # ============================================================================
 
+# Room events travel through the broadcast hub on internal channels
+# ("_socketio.<room>") so every worker emits them to its own sockets
+SOCKETIO_CHANNEL_PREFIX = "_socketio."
 
-def broadcast_stats():
-    """Broadcast dashboard stats to all clients in the stats room."""
-    try:
-        with get_db_connection() as conn:
-            conn.row_factory = sqlite3.Row
+# Seconds over which rapid stats broadcasts collapse into the latest one
+STATS_COALESCE_INTERVAL = 1.0
 
-            # Get project count
-            projects = conn.execute(
-                "SELECT COUNT(*) as count FROM projects WHERE status = 'active'"
-            ).fetchone()["count"]
 
-            # Get feature counts by status
-            features = {}
-            feature_rows = conn.execute(
-                """
-                SELECT status, COUNT(*) as count FROM features GROUP BY status
-            """
-            ).fetchall()
-            for row in feature_rows:
-                features[row["status"]] = row["count"]
-            features["total"] = sum(features.values())
+def broadcast_hub():
+    """Get this process's broadcast hub with the Socket.IO bridge attached."""
+    hub = get_broadcast_hub(
+        database.get_db_path("main"),
+        coalesce={
+            "stats": STATS_COALESCE_INTERVAL,
+            f"{SOCKETIO_CHANNEL_PREFIX}stats": STATS_COALESCE_INTERVAL,
+        },
+    )
+    hub.add_listener(_emit_socketio_event)
+    return hub
 
-            # Get bug counts
-            bugs = {}
-            bug_rows = conn.execute(
-                """
-                SELECT status, COUNT(*) as count FROM bugs GROUP BY status
-            """
-            ).fetchall()
-            for row in bug_rows:
-                bugs[row["status"]] = row["count"]
-            bugs["total"] = sum(bugs.values())
 
-            # Get error counts
-            errors = {}
-            error_rows = conn.execute(
-                """
-                SELECT status, COUNT(*) as count, SUM(occurrence_count) as occurrences
-                FROM errors GROUP BY status
-            """
-            ).fetchall()
-            for row in error_rows:
-                errors[row["status"]] = {
-                    "count": row["count"],
-                    "occurrences": row["occurrences"] or 0,
-                }
+def _emit_socketio_event(event):
+    """Hub listener: emit a room event published by any worker."""
+    if not event.channel.startswith(SOCKETIO_CHANNEL_PREFIX):
+        return
+    message = json.loads(event.data)
+    socketio.emit(
+        message["event"],
+        message["data"],
+        room=event.channel[len(SOCKETIO_CHANNEL_PREFIX) :],
+    )
 
-            # Get node count
-            nodes = {
-                "online": conn.execute(
-                    "SELECT COUNT(*) FROM nodes WHERE status = 'online'"
-                ).fetchone()[0]
-            }
 
-            # Get tmux session count
-            tmux_sessions = conn.execute(
-                "SELECT COUNT(*) FROM tmux_sessions"
-            ).fetchone()[0]
+def socketio_broadcast(event: str, data, room: str):
+    """Emit a Socket.IO event to a room on every worker process."""
+    broadcast_hub().publish(f"{SOCKETIO_CHANNEL_PREFIX}{room}", {"event": event, "data": data})
 
-            stats = {
-                "projects": projects,
-                "features": features,
-                "bugs": bugs,
-                "errors": errors,
-                "nodes": nodes,
-                "tmux_sessions": tmux_sessions,
-                "timestamp": datetime.now().isoformat(),
-            }
 
-        socketio.emit("stats_update", stats, room="stats")
+def broadcast_stats():
+    """Broadcast dashboard stats to all clients in the stats room."""
+    try:
+        with get_db_connection() as conn:
+            counters = entity_counters.read_counters(conn)
+
+        features = entity_counters.status_counts(counters, "features")
+        features["total"] = sum(features.values())
+        bugs = entity_counters.status_counts(counters, "bugs")
+        bugs["total"] = sum(bugs.values())
+
+        stats = {
+            "projects": entity_counters.status_count(counters, "projects", "active"),
+            "features": features,
+            "bugs": bugs,
+            "errors": counters.get("errors", {}),
+            "nodes": {"online": entity_counters.status_count(counters, "nodes", "online")},
+            "tmux_sessions": entity_counters.total(counters, "tmux_sessions"),
+            "timestamp": datetime.now().isoformat(),
+        }
+
+        socketio_broadcast("stats_update", stats, room="stats")
     except Exception as e:
         logger.error(f"Error broadcasting stats: {e}")
 
@@ -3381,7 +3439,7 @@ def broadcast_errors():
             ).fetchall()
 
             error_list = [dict(e) for e in errors]
-        socketio.emit("errors_update", error_list, room="errors")
+        socketio_broadcast("errors_update", error_list, room="errors")
     except Exception as e:
         logger.error(f"Error broadcasting errors: {e}")
 
@@ -3402,7 +3460,7 @@ def broadcast_tmux():
             ).fetchall()
 
             session_list = [dict(s) for s in sessions]
-        socketio.emit("tmux_update", session_list, room="tmux")
+        socketio_broadcast("tmux_update", session_list, room="tmux")
     except Exception as e:
         logger.error(f"Error broadcasting tmux sessions: {e}")
 
@@ -3454,7 +3512,7 @@ def broadcast_queue():
                 "timestamp": datetime.now().isoformat(),
             }
 
-        socketio.emit("queue_update", queue_data, room="queue")
+        socketio_broadcast("queue_update", queue_data, room="queue")
     except Exception as e:
         logger.error(f"Error broadcasting queue: {e}")
 
@@ -3474,7 +3532,7 @@ def broadcast_nodes():
             ).fetchall()
 
             node_list = [dict(n) for n in nodes]
-        socketio.emit("nodes_update", node_list, room="nodes")
+        socketio_broadcast("nodes_update", node_list, room="nodes")
     except Exception as e:
         logger.error(f"Error broadcasting nodes: {e}")
 
@@ -3490,7 +3548,7 @@ def broadcast_activity(action, entity_type=None, entity_id=None, details=None):
             "username": session.get("username"),
             "timestamp": datetime.now().isoformat(),
         }
-        socketio.emit("activity_update", activity, room="activity")
+        socketio_broadcast("activity_update", activity, room="activity")
     except Exception as e:
         logger.error(f"Error broadcasting activity: {e}")
 
@@ -3499,80 +3557,13 @@ def broadcast_activity(action, entity_type=None, entity_id=None, details=None):
 # SERVER-SENT EVENTS (SSE) FOR REAL-TIME UPDATES
 # ============================================================================
 
-# Store for SSE client queues - each client gets their own queue
-_sse_clients: Dict[str, Dict] = {}
-_sse_lock = threading.Lock()
+# Channels a stream may subscribe to; "all" receives every one of them
+SSE_CHANNELS = {"stats", "errors", "tmux", "queue", "nodes", "activity", "all"}
 
 
 def sse_publish(channel: str, data: dict):
-    """Publish data to all SSE clients subscribed to a channel."""
-    event_data = json.dumps(data)
-    with _sse_lock:
-        for client_id, client_info in list(_sse_clients.items()):
-            if channel in client_info.get(
-                "channels", []
-            ) or "all" in client_info.get("channels", []):
-                try:
-                    client_info["queue"].put_nowait(
-                        {"event": channel, "data": event_data}
-                    )
-                except Exception:
-                    pass  # Queue full or client disconnected
-
-
-def sse_register_client(client_id: str, channels: list):
-    """Register a new SSE client."""
-    import queue
-
-    with _sse_lock:
-        _sse_clients[client_id] = {
-            "queue": queue.Queue(maxsize=100),
-            "channels": channels,
-            "connected_at": datetime.now().isoformat(),
-        }
-
-
-def sse_unregister_client(client_id: str):
-    """Unregister an SSE client."""
-    with _sse_lock:
-        _sse_clients.pop(client_id, None)
-
-
-def generate_sse_stream(client_id: str):
-    """Generator function for SSE stream."""
-    import queue
-
-    # Send initial connection event
-    yield f"event: connected\ndata: {json.dumps({'client_id': client_id, 'timestamp': datetime.now().isoformat()})}\n\n"
-
-    # Send heartbeat every 30 seconds to keep connection alive
-    last_heartbeat = time.time()
-
-    while True:
-        try:
-            client_info = _sse_clients.get(client_id)
-            if not client_info:
-                break
-
-            # Try to get an event from the queue
-            try:
-                event = client_info["queue"].get(timeout=1)
-                yield f"event: {event['event']}\ndata: {event['data']}\n\n"
-            except queue.Empty:
-                pass
-
-            # Send heartbeat if needed
-            if time.time() - last_heartbeat > 30:
-                yield f"event: heartbeat\ndata: {json.dumps({'timestamp': datetime.now().isoformat()})}\n\n"
-                last_heartbeat = time.time()
-
-        except GeneratorExit:
-            break
-        except Exception as e:
-            logger.error(f"SSE stream error for {client_id}: {e}")
-            break
-
-    sse_unregister_client(client_id)
+    """Publish data to SSE clients subscribed to a channel, in every worker."""
+    broadcast_hub().publish(channel, data)
 
 
 @app.route("/api/sse/stream", methods=["GET"])
@@ -3585,6 +3576,13 @@ def sse_stream():
         channels: Comma-separated list of channels to subscribe to
                   Options: stats, errors, tmux, queue, nodes, activity, all
                   Default: all
+        last_event_id: Resume after this event id (same as the
+                  Last-Event-ID header EventSource sends on reconnect)
+
+    Events come from the shared broadcast hub, so a client sees events
+    published by any worker process. Under eventlet an open stream waits as
+    a greenthread woken by the hub, so it does not block other clients; a
+    threaded server holds one request thread per open stream.
 
     Example:
         GET /api/sse/stream?channels=stats,errors
@@ -3596,24 +3594,15 @@ def sse_stream():
     """
     channels_param = request.args.get("channels", "all")
     channels = [c.strip() for c in channels_param.split(",")]
-
-    valid_channels = {
-        "stats",
-        "errors",
-        "tmux",
-        "queue",
-        "nodes",
-        "activity",
-        "all",
-    }
-    channels = [c for c in channels if c in valid_channels]
+    channels = [c for c in channels if c in SSE_CHANNELS]
     if not channels:
         channels = ["all"]
 
-    client_id = f"sse-{uuid.uuid4().hex[:12]}"
-    sse_register_client(client_id, channels)
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get(
+        "last_event_id"
+    )
 
-    response = make_response(generate_sse_stream(client_id))
+    response = make_response(broadcast_hub().iter_stream(channels, last_event_id))
     response.headers["Content-Type"] = "text/event-stream"
     response.headers["Cache-Control"] = "no-cache"
     response.headers["Connection"] = "keep-alive"
@@ -3624,19 +3613,10 @@ def sse_stream():
 @app.route("/api/sse/clients", methods=["GET"])
 @require_auth
 def get_sse_clients():
-    """Get list of connected SSE clients."""
-    with _sse_lock:
-        clients = []
-        for client_id, info in _sse_clients.items():
-            clients.append(
-                {
-                    "client_id": client_id,
-                    "channels": info["channels"],
-                    "connected_at": info["connected_at"],
-                    "queue_size": info["queue"].qsize(),
-                }
-            )
-    return jsonify({"clients": clients, "count": len(clients)})
+    """Get list of SSE clients connected to this worker."""
+    hub = broadcast_hub()
+    clients = hub.subscribers()
+    return jsonify({"clients": clients, "count": len(clients), "hub": hub.get_stats()})
 
 
 @app.route("/api/sse/publish", methods=["POST"])
@@ -3658,6 +3638,8 @@ def sse_publish_endpoint():
 
     if not channel:
         return api_error("Channel is required", 400)
+    if channel.startswith(SOCKETIO_CHANNEL_PREFIX):
+        return api_error("Channel is reserved", 400)
 
     sse_publish(channel, event_data)
     return jsonify({"success": True, "channel": channel})
@@ -3673,8 +3655,9 @@ def broadcast_stats_with_sse():
     # Also publish to SSE
     try:
         with get_db_connection() as conn:
-            conn.row_factory = sqlite3.Row
-            stats = {}
+            counters = entity_counters.read_counters(conn)
+        stats = {
+            table: entity_counters.total(counters, table)
             for table in [
                 "projects",
                 "milestones",
@@ -3683,15 +3666,9 @@ def broadcast_stats_with_sse():
                 "errors",
                 "nodes",
                 "tmux_sessions",
-            ]:
-                try:
-                    count = conn.execute(
-                        f"SELECT COUNT(*) as c FROM {table}"
-                    ).fetchone()["c"]
-                    stats[table] = count
-                except Exception:
-                    stats[table] = 0
-            sse_publish("stats", stats)
+            ]
+        }
+        sse_publish("stats", stats)
     except Exception as e:
         logger.debug(f"SSE stats publish error: {e}")
 
@@ -4284,6 +4261,129 @@ def paginate_query(query_result, page=1, per_page=50, max_per_page=100):
     }
 
 
+def encode_cursor(values):
+    """Encode keyset pagination values into an opaque URL-safe cursor.
+
+    Args:
+        values: Dict of the last row's sort-key values
+
+    Returns:
+        URL-safe base64 string
+    """
+    import base64
+
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, required_keys=()):
+    """Decode a cursor produced by encode_cursor().
+
+    Args:
+        cursor: Opaque cursor string from a previous response
+        required_keys: Keys that must be present in the decoded cursor
+
+    Returns:
+        Dict of sort-key values, or None if the cursor is malformed
+    """
+    import base64
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(values, dict) or any(k not in values for k in required_keys):
+        return None
+    return values
+
+
+# Oldest cursor accepted by GET /api/tasks; older traversals restart so the
+# still-aging range searched per page stays bounded
+TASK_CURSOR_MAX_AGE = 3600  # seconds
+
+
+def _valid_task_cursor(cursor, now_epoch):
+    """Check a decoded /api/tasks cursor before its values reach SQL."""
+
+    def is_int(value):
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    return (
+        isinstance(cursor["p"], (int, float))
+        and not isinstance(cursor["p"], bool)
+        and is_int(cursor["c"])
+        and is_int(cursor["i"])
+        and is_int(cursor["t"])
+        and now_epoch - TASK_CURSOR_MAX_AGE <= cursor["t"] <= now_epoch + 60
+    )
+
+
+def _task_cursor_where(where, params, cursor, now_epoch, limit):
+    """Restrict a task_queue filter to the next keyset page of candidates.
+
+    Effective priority is priority plus a capped aging bonus, so at a fixed
+    now_epoch tasks past the cap order by (priority, created_epoch, id),
+    which the priority indexes serve directly, and only tasks still gaining
+    their bonus (created within the last cap interval) need a computed sort.
+    Each branch resumes strictly after the cursor and stops after `limit`
+    rows, like the claim engine's candidate walks.
+
+    Args:
+        where: "WHERE ..." clause with the request's filters
+        params: Parameters for where
+        cursor: Decoded cursor of the previous page's last row, or None
+        now_epoch: Reference time pinned by the cursor
+        limit: Rows needed from each branch
+
+    Returns:
+        (where, params) selecting only the candidate ids
+    """
+    aging = TASK_PRIORITY_AGING_FACTOR > 0 and TASK_PRIORITY_MAX_AGE_BONUS > 0
+    bonus = TASK_PRIORITY_MAX_AGE_BONUS if aging else 0
+    due = now_epoch - bonus * 60.0 / TASK_PRIORITY_AGING_FACTOR if aging else None
+    order = "priority DESC, created_epoch ASC, id ASC"
+    capped = " AND created_epoch <= ?" if aging else ""
+    capped_params = [due] if aging else []
+
+    branches = []
+    if aging:
+        expr = "(priority + MIN(?, (? - created_epoch) / 60.0 * ?))"
+        expr_params = [TASK_PRIORITY_MAX_AGE_BONUS, now_epoch, TASK_PRIORITY_AGING_FACTOR]
+        condition, condition_params = " AND created_epoch > ?", [due]
+        if cursor:
+            condition += f""" AND ({expr} < ?
+                OR ({expr} = ? AND (created_epoch, id) > (?, ?)))"""
+            condition_params += expr_params + [cursor["p"]]
+            condition_params += expr_params + [cursor["p"], cursor["c"], cursor["i"]]
+        branches.append(
+            (condition, condition_params, f"{expr} DESC, created_epoch ASC, id ASC", expr_params)
+        )
+    if cursor:
+        # Same priority as the cursor row, then strictly lower priorities
+        priority = cursor["p"] - bonus
+        branches.append(
+            (
+                capped + " AND priority = ? AND (created_epoch, id) > (?, ?)",
+                capped_params + [priority, cursor["c"], cursor["i"]],
+                "created_epoch ASC, id ASC",
+                [],
+            )
+        )
+        branches.append((capped + " AND priority < ?", capped_params + [priority], order, []))
+    else:
+        branches.append((capped, capped_params, order, []))
+
+    selects, branch_params = [], []
+    for condition, condition_params, branch_order, order_params in branches:
+        selects.append(
+            f"""SELECT * FROM (SELECT id FROM task_queue {where}{condition}
+                ORDER BY {branch_order} LIMIT ?)"""
+        )
+        branch_params += params + condition_params + order_params + [limit]
+    return f"WHERE id IN ({' UNION ALL '.join(selects)})", branch_params
+
+
 def get_pagination_params():
     """Extract pagination parameters from request args.
 
@@ -4308,14 +4408,15 @@ def log_error_to_db(
     try:
         import json as json_module
 
+        digest = error_hash(error_type, message[:500], source or "backend")
         with get_db_connection() as conn:
-            # Check for existing error
+            # Check for existing active error
             existing = conn.execute(
                 """
                 SELECT id, occurrence_count, status FROM errors
-                WHERE error_type = ? AND message = ? AND source = ? AND status IN ('open', 'queued')
+                WHERE error_hash = ? AND status IN ('open', 'queued', 'in_progress')
             """,
-                (error_type, message[:500], source or "backend"),
+                (digest,),
             ).fetchone()
 
             error_id = None
@@ -4331,14 +4432,15 @@ def log_error_to_db(
             else:
                 cursor = conn.execute(
                     """
-                    INSERT INTO errors (error_type, message, source, stack_trace, status, occurrence_count)
-                    VALUES (?, ?, ?, ?, 'open', 1)
+                    INSERT INTO errors (error_type, message, source, stack_trace, status, occurrence_count, error_hash)
+                    VALUES (?, ?, ?, ?, 'open', 1, ?)
                 """,
                     (
                         error_type,
                         message[:500],
                         source or "backend",
                         stack_trace or "",
+                        digest,
                     ),
                 )
                 error_id = cursor.lastrowid
@@ -13150,8 +13252,15 @@ def get_errors():
         if error_type:
             query += " AND e.error_type = ?"
             params.append(error_type)
-        if search:
-            # Support both simple text search and SQL LIKE patterns
+        # Plain text uses the FTS5 index; explicit LIKE patterns (with %),
+        # punctuation-only text and databases without the index use LIKE
+        search_match = None
+        if search and "%" not in search and search_index.search_index_ready(conn, "errors"):
+            search_match = search_index.build_match_query(search)
+        if search_match:
+            query += " AND " + search_index.fts_filter("errors", "e.id")
+            params.append(search_match)
+        elif search:
             search_pattern = search if "%" in search else f"%{search}%"
             query += " AND (e.message LIKE ? OR e.source LIKE ? OR e.error_type LIKE ?)"
             params.extend([search_pattern, search_pattern, search_pattern])
@@ -13185,7 +13294,10 @@ def get_errors():
         if error_type:
             count_query += " AND e.error_type = ?"
             count_params.append(error_type)
-        if search:
+        if search_match:
+            count_query += " AND " + search_index.fts_filter("errors", "e.id")
+            count_params.append(search_match)
+        elif search:
             search_pattern = search if "%" in search else f"%{search}%"
             count_query += " AND (e.message LIKE ? OR e.source LIKE ? OR e.error_type LIKE ?)"
             count_params.extend(
@@ -13472,13 +13584,78 @@ def get_errors_summary():
         return jsonify(summary)
 
 
+# Seconds POST /api/errors waits for its report to be flushed
+ERROR_INGEST_WAIT = 5.0
+
+# Lines accepted in one POST /api/errors/batch body
+ERROR_BATCH_MAX_LINES = 10000
+
+
+def error_aggregator():
+    """Get this process's error ingest window for the main database."""
+    return get_error_aggregator(
+        database.get_db_path("main"),
+        on_new=_queue_error_fix_task,
+        on_flush=_broadcast_error_flush,
+    )
+
+
+def _queue_error_fix_task(conn, error_id, report, meta):
+    """Aggregator on_new hook: queue a Claude task for a newly seen error."""
+    dashboard_url = meta.get("dashboard_url", "")
+    message = f"""Fix this error and complete the full workflow:
+
+ERROR ID: {error_id}
+Type: {report.get('error_type', 'unknown')}
+Message: {report.get('message', 'N/A')}
+Source: {report.get('source', 'N/A')}
+Stack trace: {report.get('stack_trace') or 'N/A'}
+
+WORKFLOW - Complete ALL steps:
+1. Analyze and fix the error in the codebase
+2. Run tests to verify the fix
+3. Commit with a descriptive message
+4. Restart/deploy the server
+5. Mark error as resolved:
+   curl -X POST "{dashboard_url}/api/errors/{error_id}/resolve" -H "Cookie: $(cat /tmp/arch_cookies.txt | grep session | cut -f7)"
+
+Start by analyzing the error."""
+
+    task_data = json.dumps(
+        {
+            "entity_type": "error",
+            "entity_id": error_id,
+            "session": "arch_env3",
+            "message": message,
+            "dashboard_url": dashboard_url,
+        }
+    )
+    conn.execute(
+        """
+        INSERT INTO task_queue (task_type, task_data, priority, max_retries)
+        VALUES ('claude_task', ?, 2, 3)
+    """,
+        (task_data,),
+    )
+
+
+def _broadcast_error_flush(summary):
+    """Aggregator on_flush hook: one dashboard update per flushed window."""
+    broadcast_errors()
+    broadcast_stats()
+
+
 @app.route("/api/errors", methods=["POST"])
 @rate_limit(requests_per_minute=120)  # Higher limit for error logging
 def log_error():
     """Log an error from any node (no auth required).
 
     Creates or updates an aggregated error entry. Errors are deduplicated
-    by type+message+source combination. Updates occurrence count for duplicates.
+    by a hash of type+message+source against open, queued and in-progress
+    errors. Reports are merged in memory and written in batches; the
+    response is sent once this report's batch is flushed.
+
+    For high volumes, send NDJSON to POST /api/errors/batch instead.
 
     Request Body:
         error_type (str): Error type - error, warning, info
@@ -13492,10 +13669,14 @@ def log_error():
         url (str, optional): Request URL if applicable
         user_agent (str, optional): Client user agent
         http_status (int, optional): HTTP status code
-        context (str, optional): Additional context JSON
+        context (str or object, optional): Additional context (objects are
+            stored as JSON)
+        occurrences (int, optional): Times this error occurred (default 1)
 
     Returns:
         200: Error logged with ID, deduplicated flag indicates if merged
+        202: Accepted but not yet written (database busy)
+        400: Body is not a JSON object, or a field has an unsupported type
         429: Rate limit exceeded
 
     Example Request:
@@ -13513,7 +13694,8 @@ def log_error():
     Example Response (new error):
         {
             "id": 42,
-            "deduplicated": false
+            "deduplicated": false,
+            "queued": true
         }
 
     Example Response (duplicate merged):
@@ -13527,124 +13709,89 @@ def log_error():
              -H "Content-Type: application/json" \\
              -d '{"error_type": "error", "message": "Test error"}'
     """
-    data = request.get_json()
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return api_error("Request body must be a JSON object", 400)
 
-    # Generate error hash for deduplication
-    error_key = f"{
-        data.get(
-            'error_type',
-            '')}:{
-            data.get(
-                'message',
-                '')}:{
-                    data.get(
-                        'source',
-                        '')}"
-    error_hash = hashlib.md5(error_key.encode()).hexdigest()
+    try:
+        future = error_aggregator().submit(
+            data, meta={"dashboard_url": request.host_url.rstrip("/")}
+        )
+    except ValueError as e:
+        return api_error(str(e), 400)
+    if future is None:
+        return api_error("Error ingest is saturated, retry later", 503)
 
-    with get_db_connection() as conn:
-        conn.row_factory = sqlite3.Row
+    try:
+        result = future.result(timeout=ERROR_INGEST_WAIT)
+    except FutureTimeoutError:
+        return jsonify({"accepted": True, "deduplicated": None}), 202
 
-        # Check for existing error
-        existing = conn.execute(
-            """
-            SELECT id, occurrence_count FROM errors
-            WHERE error_type = ? AND message = ? AND source = ? AND status = 'open'
-            LIMIT 1
-        """,
-            (data.get("error_type"), data.get("message"), data.get("source")),
-        ).fetchone()
+    if result["deduplicated"]:
+        return jsonify(result)
+    return jsonify({**result, "queued": True})
 
-        if existing:
-            # Update existing error
-            conn.execute(
-                """
-                UPDATE errors SET
-                    occurrence_count = occurrence_count + 1,
-                    last_seen = CURRENT_TIMESTAMP,
-                    context = COALESCE(?, context)
-                WHERE id = ?
-            """,
-                (data.get("context"), existing["id"]),
-            )
-            # Broadcast updates via WebSocket
-            broadcast_errors()
-            broadcast_stats()
-            return jsonify({"id": existing["id"], "deduplicated": True})
-        else:
-            # Create new error with status 'queued'
-            cursor = conn.execute(
-                """
-                INSERT INTO errors (
-                    project_id, node_id, error_type, message, source,
-                    line, column_num, stack_trace, url, user_agent,
-                    http_status, context, status
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'queued')
-            """,
-                (
-                    data.get("project_id"),
-                    data.get("node_id"),
-                    data.get("error_type", "unknown"),
-                    data.get("message"),
-                    data.get("source"),
-                    data.get("line"),
-                    data.get("column"),
-                    data.get("stack_trace"),
-                    data.get("url"),
-                    data.get("user_agent"),
-                    data.get("http_status"),
-                    data.get("context"),
-                ),
-            )
-            error_id = cursor.lastrowid
 
-            # Auto-queue error for Claude processing
-            import json as json_module
+@app.route("/api/errors/batch", methods=["POST"])
+@rate_limit(requests_per_minute=120)
+def log_errors_batch():
+    """Log many errors at once as newline-delimited JSON (no auth required).
 
-            dashboard_url = request.host_url.rstrip("/")
-            message = """Fix this error and complete the full workflow:
-
-ERROR ID: {error_id}
-Type: {data.get('error_type', 'unknown')}
-Message: {data.get('message', 'N/A')}
-Source: {data.get('source', 'N/A')}
-Stack trace: {data.get('stack_trace') or 'N/A'}
+    Each line is one error object with the same fields as POST /api/errors,
+    including an optional occurrences count for clients that pre-aggregate.
+    Reports are folded into the ingest window and written asynchronously
+    with one upsert per distinct error.
 
-WORKFLOW - Complete ALL steps:
-1. Analyze and fix the error in the codebase
-2. Run tests to verify the fix
-3. Commit with a descriptive message
-4. Restart/deploy the server
-5. Mark error as resolved:
-   curl -X POST "{dashboard_url}/api/errors/{error_id}/resolve" -H "Cookie: $(cat /tmp/arch_cookies.txt | grep session | cut -f7)"
+    Returns:
+        202: {"accepted": n, "rejected": m, "invalid_lines": [...]}
+        413: More than ERROR_BATCH_MAX_LINES lines
 
-Start by analyzing the error."""
+    Example Request:
+        POST /api/errors/batch
+        Content-Type: application/x-ndjson
 
-            task_data = json_module.dumps(
-                {
-                    "entity_type": "error",
-                    "entity_id": error_id,
-                    "session": "arch_env3",
-                    "message": message,
-                    "dashboard_url": dashboard_url,
-                }
-            )
+        {"error_type": "error", "message": "Connection refused", "node_id": "n1"}
+        {"error_type": "error", "message": "Timeout", "occurrences": 12}
+    """
+    lines = request.get_data(as_text=True).splitlines()
+    if len(lines) > ERROR_BATCH_MAX_LINES:
+        return api_error(
+            f"Batch exceeds {ERROR_BATCH_MAX_LINES} lines", 413
+        )
 
-            conn.execute(
-                """
-                INSERT INTO task_queue (task_type, task_data, priority, max_retries)
-                VALUES ('claude_task', ?, 2, 3)
-            """,
-                (task_data,),
-            )
+    aggregator = error_aggregator()
+    meta = {"dashboard_url": request.host_url.rstrip("/")}
+    accepted = 0
+    invalid = []
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            report = json.loads(line)
+        except ValueError:
+            report = None
+        if not isinstance(report, dict):
+            invalid.append(number)
+            continue
+        try:
+            added = aggregator.add(report, meta=meta)
+        except ValueError:
+            added = False
+        if not added:
+            invalid.append(number)
+            continue
+        accepted += 1
 
-            # Broadcast updates via WebSocket
-            broadcast_errors()
-            broadcast_stats()
-            return jsonify(
-                {"id": error_id, "deduplicated": False, "queued": True}
-            )
+    return (
+        jsonify(
+            {
+                "accepted": accepted,
+                "rejected": len(invalid),
+                "invalid_lines": invalid[:100],
+            }
+        ),
+        202,
+    )
 
 
 @app.route("/api/errors/<int:error_id>/resolve", methods=["POST"])
@@ -13887,9 +14034,12 @@ def add_node():
     node_id = data.get("id") or str(uuid.uuid4())[:8]
 
     with get_db_connection() as conn:
+        # Delete and insert rather than INSERT OR REPLACE: REPLACE's implicit
+        # delete does not fire triggers, which would skew entity_counters
+        conn.execute("DELETE FROM nodes WHERE id = ?", (node_id,))
         conn.execute(
             """
-            INSERT OR REPLACE INTO nodes (id, hostname, ip_address, ssh_port, ssh_user, role, services)
+            INSERT INTO nodes (id, hostname, ip_address, ssh_port, ssh_user, role, services)
             VALUES (?, ?, ?, ?, ?, ?, ?)
         """,
             (
@@ -17830,14 +17980,20 @@ def get_tasks():
         completed_before (str): ISO date - tasks completed before
         risk_level (str): Filter by risk (low, medium, high, critical)
         min_risk_score (int): Minimum risk score filter
+        cursor (str): Keyset pagination cursor; pass an empty value for the
+            first page and the returned next_cursor for following pages
+            (cursors expire after TASK_CURSOR_MAX_AGE seconds)
+        limit (int): Page size for cursor and legacy limit/offset modes
 
     Returns:
-        200: List of tasks or paginated result
+        200: List of tasks, paginated result, or cursor page
+        400: Invalid or expired cursor
 
     Example Request:
         GET /api/tasks
         GET /api/tasks?status=pending&type=shell
         GET /api/tasks?hours=24&paginate=true
+        GET /api/tasks?status=pending&cursor=&limit=50
 
     Example Response:
         [
@@ -17878,78 +18034,123 @@ def get_tasks():
     risk_level = request.args.get("risk_level")
     min_risk_score = request.args.get("min_risk_score", type=int)
 
-    with get_db_connection() as conn:
-        conn.row_factory = sqlite3.Row
+    # Keyset pagination: the cursor pins "now" so effective_priority is
+    # computed identically on every page of the same traversal
+    cursor_mode = "cursor" in request.args
+    cursor = None
+    now_epoch = int(time.time())
+    if cursor_mode and request.args.get("cursor"):
+        cursor = decode_cursor(request.args["cursor"], ("p", "c", "i", "t"))
+        if cursor is None or not _valid_task_cursor(cursor, now_epoch):
+            return api_error("Invalid cursor", 400, "validation_error")
+        now_epoch = cursor["t"]
+
+    # effective_priority = priority + min(max_bonus, age_in_minutes * aging_factor);
+    # created_epoch is the trigger-maintained integer copy of created_at
+    priority_expr = "(priority + MIN(?, (? - created_epoch) / 60.0 * ?))"
+    priority_params = [
+        TASK_PRIORITY_MAX_AGE_BONUS,
+        now_epoch,
+        TASK_PRIORITY_AGING_FACTOR,
+    ]
 
-        # Include effective_priority calculation for task aging
-        # effective_priority = priority + min(max_bonus, age_in_minutes * aging_factor)
-        query = """SELECT *,
-            (priority + MIN({TASK_PRIORITY_MAX_AGE_BONUS},
-             (strftime('%s', 'now') - strftime('%s', created_at)) / 60.0 * {TASK_PRIORITY_AGING_FACTOR})) as effective_priority,
-            ROUND((strftime('%s', 'now') - strftime('%s', created_at)) / 60.0, 1) as age_minutes
-            FROM task_queue WHERE 1=1"""
-        params = []
+    where = "WHERE 1=1"
+    params = []
 
-        # Filter out soft-deleted records by default
-        if not include_deleted:
-            query += " AND deleted_at IS NULL"
+    # Filter out soft-deleted records by default
+    if not include_deleted:
+        where += " AND deleted_at IS NULL"
+
+    if status:
+        where += " AND status = ?"
+        params.append(status)
+    if task_type:
+        where += " AND task_type = ?"
+        params.append(task_type)
+
+    # Date range filtering
+    if hours:
+        where += " AND created_at > datetime('now', '-' || ? || ' hours')"
+        params.append(hours)
+    if created_after:
+        where += " AND created_at >= ?"
+        params.append(created_after)
+    if created_before:
+        where += " AND created_at <= ?"
+        params.append(created_before)
+    if started_after:
+        where += " AND started_at >= ?"
+        params.append(started_after)
+    if started_before:
+        where += " AND started_at <= ?"
+        params.append(started_before)
+    if completed_after:
+        where += " AND completed_at >= ?"
+        params.append(completed_after)
+    if completed_before:
+        where += " AND completed_at <= ?"
+        params.append(completed_before)
+
+    # Risk filtering
+    if risk_level:
+        where += " AND risk_level = ?"
+        params.append(risk_level)
+    if min_risk_score is not None:
+        where += " AND risk_score >= ?"
+        params.append(min_risk_score)
+
+    # Filter by blocked status (blocked_count is maintained by triggers)
+    if blocked_only:
+        where += " AND blocked_count > 0"
+    elif unblocked_only:
+        where += " AND blocked_count = 0"
+
+    filter_where, filter_params = where, list(params)
+
+    paginate = request.args.get("paginate", "").lower() == "true"
+    limit = request.args.get("limit", type=int)
+    offset = request.args.get("offset", 0, type=int)
+    page = per_page = total = None
+
+    if cursor_mode:
+        # Candidates come from index walks that resume after the cursor
+        limit = min(max(1, limit or 50), 100)
+        where, params = _task_cursor_where(where, params, cursor, now_epoch, limit + 1)
+
+    query = f"""SELECT *,
+        {priority_expr} as effective_priority,
+        ROUND((? - created_epoch) / 60.0, 1) as age_minutes
+        FROM task_queue {where}
+        ORDER BY effective_priority DESC, created_epoch ASC, id ASC"""
+    params = priority_params + [now_epoch] + params
+
+    if cursor_mode:
+        query += " LIMIT ?"
+        params.append(limit + 1)
+    elif paginate:
+        page, per_page = get_pagination_params()
+        page = max(1, page or 1)
+        per_page = min(max(1, per_page or 50), 100)
+        query += " LIMIT ? OFFSET ?"
+        params += [per_page, (page - 1) * per_page]
+    elif limit:
+        query += " LIMIT ? OFFSET ?"
+        params += [limit, max(0, offset)]
 
-        if status:
-            query += " AND status = ?"
-            params.append(status)
-        if task_type:
-            query += " AND task_type = ?"
-            params.append(task_type)
+    with get_db_connection() as conn:
+        conn.row_factory = sqlite3.Row
 
-        # Date range filtering
-        if hours:
-            query += " AND created_at > datetime('now', '-' || ? || ' hours')"
-            params.append(hours)
-        if created_after:
-            query += " AND created_at >= ?"
-            params.append(created_after)
-        if created_before:
-            query += " AND created_at <= ?"
-            params.append(created_before)
-        if started_after:
-            query += " AND started_at >= ?"
-            params.append(started_after)
-        if started_before:
-            query += " AND started_at <= ?"
-            params.append(started_before)
-        if completed_after:
-            query += " AND completed_at >= ?"
-            params.append(completed_after)
-        if completed_before:
-            query += " AND completed_at <= ?"
-            params.append(completed_before)
-
-        # Risk filtering
-        if risk_level:
-            query += " AND risk_level = ?"
-            params.append(risk_level)
-        if min_risk_score is not None:
-            query += " AND risk_score >= ?"
-            params.append(min_risk_score)
-
-        # Filter by blocked status
-        if blocked_only:
-            query += """ AND id IN (
-                SELECT td.task_id FROM task_dependencies td
-                JOIN task_queue tq ON td.depends_on_id = tq.id
-                WHERE tq.status NOT IN ('completed', 'failed')
-            )"""
-        elif unblocked_only:
-            query += """ AND id NOT IN (
-                SELECT td.task_id FROM task_dependencies td
-                JOIN task_queue tq ON td.depends_on_id = tq.id
-                WHERE tq.status NOT IN ('completed', 'failed')
-            )"""
+        task_list = [dict(t) for t in conn.execute(query, params).fetchall()]
 
-        query += " ORDER BY effective_priority DESC, created_at ASC"
+        if paginate and not cursor_mode:
+            total = conn.execute(
+                f"SELECT COUNT(*) FROM task_queue {filter_where}", filter_params
+            ).fetchone()[0]
 
-        tasks = conn.execute(query, params).fetchall()
-        task_list = [dict(t) for t in tasks]
+        has_more = False
+        if cursor_mode and len(task_list) > limit:
+            task_list = task_list[:limit]
+            has_more = True
 
         # Add dependency info if requested
         if include_deps and task_list:
@@ -17959,7 +18160,7 @@ def get_tasks():
             # Get blocked_by counts (tasks this depends on)
             blocked_by_counts = {}
             blocked_by_rows = conn.execute(
-                """
+                f"""
                 SELECT td.task_id, COUNT(*) as cnt,
                        SUM(CASE WHEN tq.status NOT IN ('completed', 'failed') THEN 1 ELSE 0 END) as incomplete
                 FROM task_dependencies td
@@ -17978,7 +18179,7 @@ def get_tasks():
             # Get blocks counts (tasks that depend on this)
             blocks_counts = {}
             blocks_rows = conn.execute(
-                """
+                f"""
                 SELECT td.depends_on_id as task_id, COUNT(*) as cnt
                 FROM task_dependencies td
                 WHERE td.depends_on_id IN ({placeholders})
@@ -18000,19 +18201,44 @@ def get_tasks():
                 t["is_blocked"] = dep_info["incomplete"] > 0
                 t["blocks_count"] = blocks_counts.get(tid, 0)
 
-        # Support pagination if requested
-        if request.args.get("paginate", "").lower() == "true":
-            page, per_page = get_pagination_params()
-            result = paginate_query(task_list, page, per_page)
-            return jsonify(result)
+    if cursor_mode:
+        next_cursor = None
+        if has_more:
+            last = task_list[-1]
+            next_cursor = encode_cursor(
+                {
+                    "p": last["effective_priority"],
+                    "c": last["created_epoch"],
+                    "i": last["id"],
+                    "t": now_epoch,
+                }
+            )
+        return jsonify(
+            {
+                "items": task_list,
+                "next_cursor": next_cursor,
+                "has_more": has_more,
+                "limit": limit,
+            }
+        )
 
-        # Legacy limit/offset support
-        limit = request.args.get("limit", type=int)
-        offset = request.args.get("offset", 0, type=int)
-        if limit:
-            return jsonify(task_list[offset: offset + limit])
+    if paginate:
+        total_pages = (total + per_page - 1) // per_page if total > 0 else 1
+        return jsonify(
+            {
+                "items": task_list,
+                "pagination": {
+                    "page": page,
+                    "per_page": per_page,
+                    "total": total,
+                    "total_pages": total_pages,
+                    "has_next": page < total_pages,
+                    "has_prev": page > 1,
+                },
+            }
+        )
 
-        return jsonify(task_list)
+    return jsonify(task_list)
 
 
 @app.route("/api/tasks", methods=["POST"])
@@ -18393,6 +18619,9 @@ Only return the JSON array, no additional text."""
 
                     conn.commit()
 
+                from workers.assigner_events import notify_assigner
+
+                notify_assigner()
                 result["tasks_queued"] = tasks_queued
                 result["queue_type"] = "assigner"
             else:
@@ -19430,75 +19659,55 @@ def search_archived_tasks():
 
 @app.route("/api/tasks/claim", methods=["POST"])
 def claim_task():
-    """Claim a pending task for a worker.
+    """Claim pending tasks for a worker.
 
     Only claims tasks that:
     - Are pending
     - Have not exceeded retry limit
-    - Are not blocked by incomplete dependencies
+    - Are not blocked by incomplete dependencies (blocked_count = 0)
 
     Tasks are ordered by effective priority which includes aging:
     effective_priority = priority + min(max_age_bonus, age_in_minutes * aging_factor)
     This prevents task starvation by gradually increasing priority of waiting tasks.
+
+    The claim is a single UPDATE guarded by status = 'pending', so concurrent
+    workers can never be handed the same task.
+
+    Request body:
+        - worker_id: Worker claiming the task
+        - task_types: Optional list of task types to claim
+        - max_tasks: Number of tasks to claim at once (default: 1, max: 50)
+
+    Returns:
+        - task: First claimed task (or null if none available)
+        - tasks: All claimed tasks
     """
-    data = request.get_json()
+    data = request.get_json() or {}
     worker_id = data.get("worker_id")
     task_types = data.get("task_types", [])
+    max_tasks = data.get("max_tasks", 1)
 
     with get_db_connection() as conn:
         conn.row_factory = sqlite3.Row
+        tasks = task_claim_engine.claim(
+            conn, worker_id, task_types=task_types, max_tasks=max_tasks
+        )
+        conn.commit()
 
-        # Find a pending task that is not blocked by incomplete dependencies
-        # Order by effective priority (base priority + aging bonus)
-        query = """
-            SELECT *,
-                (priority + MIN(?, (strftime('%s', 'now') - strftime('%s', created_at)) / 60.0 * ?)) as effective_priority
-            FROM task_queue
-            WHERE status = 'pending' AND retries < max_retries
-            AND id NOT IN (
-                SELECT td.task_id FROM task_dependencies td
-                JOIN task_queue tq ON td.depends_on_id = tq.id
-                WHERE tq.status NOT IN ('completed', 'failed')
-            )
-        """
-        # Start with aging parameters
-        params = [TASK_PRIORITY_MAX_AGE_BONUS, TASK_PRIORITY_AGING_FACTOR]
-
-        if task_types:
-            placeholders = ",".join("?" * len(task_types))
-            query += f" AND task_type IN ({placeholders})"
-            params.extend(task_types)
-
-        query += " ORDER BY effective_priority DESC, created_at ASC LIMIT 1"
-
-        task = conn.execute(query, params).fetchone()
-
-        if task:
-            # Claim the task
-            conn.execute(
-                """
-                UPDATE task_queue SET
-                    status = 'running',
-                    assigned_worker = ?,
-                    started_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """,
-                (worker_id, task["id"]),
-            )
-
-            # Trigger webhook notification for task claimed
-            trigger_task_webhook(
-                task_id=task["id"],
-                task_type=task["task_type"],
-                new_status="running",
-                old_status="pending",
-                worker_id=worker_id,
-                task_data=dict(task),
-            )
-
-            return jsonify({"task": dict(task), "success": True})
+    for task in tasks:
+        # Trigger webhook notification for task claimed
+        trigger_task_webhook(
+            task_id=task["id"],
+            task_type=task["task_type"],
+            new_status="running",
+            old_status="pending",
+            worker_id=worker_id,
+            task_data=task,
+        )
 
-        return jsonify({"task": None, "success": True})
+    return jsonify(
+        {"task": tasks[0] if tasks else None, "tasks": tasks, "success": True}
+    )
 
 
 @app.route("/api/tasks/claim-balanced", methods=["POST"])
@@ -19542,26 +19751,7 @@ def claim_task_balanced():
         conn.row_factory = sqlite3.Row
 
         # First find an available task
-        query = """
-            SELECT *,
-                (priority + MIN(?, (strftime('%s', 'now') - strftime('%s', created_at)) / 60.0 * ?)) as effective_priority
-            FROM task_queue
-            WHERE status = 'pending' AND retries < max_retries
-            AND id NOT IN (
-                SELECT td.task_id FROM task_dependencies td
-                JOIN task_queue tq ON td.depends_on_id = tq.id
-                WHERE tq.status NOT IN ('completed', 'failed')
-            )
-        """
-        params = [TASK_PRIORITY_MAX_AGE_BONUS, TASK_PRIORITY_AGING_FACTOR]
-
-        if task_types:
-            placeholders = ",".join("?" * len(task_types))
-            query += f" AND task_type IN ({placeholders})"
-            params.extend(task_types)
-
-        query += " ORDER BY effective_priority DESC, created_at ASC LIMIT 1"
-        task = conn.execute(query, params).fetchone()
+        task = task_claim_engine.peek(conn, task_types=task_types)
 
         if not task:
             return jsonify(
@@ -19586,7 +19776,7 @@ def claim_task_balanced():
                 return (
                     jsonify(
                         {
-                            "task": dict(task),
+                            "task": task,
                             "worker": None,
                             "success": False,
                             "error": "No workers available",
@@ -19609,31 +19799,39 @@ def claim_task_balanced():
                 500,
             )
 
-        # Claim the task with the selected worker
-        conn.execute(
-            """
-            UPDATE task_queue SET
-                status = 'running',
-                assigned_worker = ?,
-                started_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """,
-            (worker_id, task["id"]),
-        )
+        # Claim the task with the selected worker; another worker may have
+        # taken it since the peek, in which case nothing is claimed
+        claimed = task_claim_engine.claim_by_id(conn, task["id"], worker_id)
+        conn.commit()
+
+        if not claimed:
+            return (
+                jsonify(
+                    {
+                        "task": None,
+                        "worker": None,
+                        "success": False,
+                        "error": "Task was claimed by another worker, retry",
+                        "retry": True,
+                    }
+                ),
+                409,
+            )
+        lb.record_claim(worker_id)
 
         # Trigger webhook notification
         trigger_task_webhook(
-            task_id=task["id"],
-            task_type=task["task_type"],
+            task_id=claimed["id"],
+            task_type=claimed["task_type"],
             new_status="running",
             old_status="pending",
             worker_id=worker_id,
-            task_data=dict(task),
+            task_data=claimed,
         )
 
         return jsonify(
             {
-                "task": dict(task),
+                "task": claimed,
                 "worker": {
                     "worker_id": selection.worker_id,
                     "worker_type": selection.worker_type,
@@ -21583,13 +21781,13 @@ def get_task_effective_priority(task_id):
     with get_db_connection() as conn:
         conn.row_factory = sqlite3.Row
         task = conn.execute(
-            """
+            f"""
             SELECT id, priority, status, created_at,
-                ROUND((strftime('%s', 'now') - strftime('%s', created_at)) / 60.0, 2) as age_minutes,
+                ROUND((strftime('%s', 'now') - created_epoch) / 60.0, 2) as age_minutes,
                 ROUND(MIN({TASK_PRIORITY_MAX_AGE_BONUS},
-                    (strftime('%s', 'now') - strftime('%s', created_at)) / 60.0 * {TASK_PRIORITY_AGING_FACTOR}), 2) as aging_bonus,
+                    (strftime('%s', 'now') - created_epoch) / 60.0 * {TASK_PRIORITY_AGING_FACTOR}), 2) as aging_bonus,
                 ROUND(priority + MIN({TASK_PRIORITY_MAX_AGE_BONUS},
-                    (strftime('%s', 'now') - strftime('%s', created_at)) / 60.0 * {TASK_PRIORITY_AGING_FACTOR}), 2) as effective_priority
+                    (strftime('%s', 'now') - created_epoch) / 60.0 * {TASK_PRIORITY_AGING_FACTOR}), 2) as effective_priority
             FROM task_queue WHERE id = ?
         """,
             (task_id,),
@@ -21992,6 +22190,11 @@ def complete_task(task_id):
                     (parent_id,),
                 )
 
+    if worker_id:
+        from services.load_balancer import get_load_balancer
+
+        get_load_balancer(DB_PATH).record_completion(worker_id, success=True)
+
     # Broadcast queue update via WebSocket
     broadcast_queue()
     broadcast_stats()
@@ -22295,6 +22498,11 @@ def fail_task(task_id):
                 (worker_id,),
             )
 
+    if worker_id:
+        from services.load_balancer import get_load_balancer
+
+        get_load_balancer(DB_PATH).record_completion(worker_id, success=False)
+
     # Broadcast queue update via WebSocket
     broadcast_queue()
     broadcast_stats()
@@ -24128,6 +24336,13 @@ def get_recent_comments():
 # ============================================================================
 
 
+def dependency_graph(conn):
+    """Get the shared in-memory dependency graph, caught up with the database."""
+    graph = get_task_dependency_graph(DB_PATH)
+    graph.refresh(conn)
+    return graph
+
+
 @app.route("/api/tasks/<int:task_id>/dependencies", methods=["GET"])
 @require_auth
 def get_task_dependencies(task_id):
@@ -24225,16 +24440,9 @@ def add_task_dependency(task_id):
         if not dep_task:
             return jsonify({"error": "Dependency task not found"}), 404
 
-        # Check for circular dependency (simple check - dep cannot already
-        # depend on task)
-        circular = conn.execute(
-            """
-            SELECT id FROM task_dependencies
-            WHERE task_id = ? AND depends_on_id = ?
-        """,
-            (depends_on_id, task_id),
-        ).fetchone()
-        if circular:
+        # Check for circular dependency (dep cannot already depend on task,
+        # directly or transitively)
+        if dependency_graph(conn).would_create_cycle(task_id, depends_on_id):
             return jsonify({"error": "Circular dependency detected"}), 400
 
         # Check for existing dependency
@@ -24326,17 +24534,20 @@ def check_task_blocked(task_id):
     with get_db_connection() as conn:
         conn.row_factory = sqlite3.Row
 
-        # Get incomplete blocking tasks
-        blockers = conn.execute(
-            """
-            SELECT tq.id, tq.task_type, tq.status, tq.priority
-            FROM task_dependencies td
-            JOIN task_queue tq ON td.depends_on_id = tq.id
-            WHERE td.task_id = ? AND tq.status NOT IN ('completed', 'failed')
-            ORDER BY tq.priority DESC
-        """,
-            (task_id,),
-        ).fetchall()
+        # Incomplete blocking tasks come from the in-memory graph
+        blocker_ids = dependency_graph(conn).blockers(task_id)
+        blockers = []
+        if blocker_ids:
+            blockers = conn.execute(
+                """
+                SELECT id, task_type, status, priority FROM task_queue
+                WHERE id IN ({}) AND status NOT IN ('completed', 'failed')
+                ORDER BY priority DESC
+            """.format(
+                    ",".join("?" * len(blocker_ids))
+                ),
+                blocker_ids,
+            ).fetchall()
 
         return jsonify(
             {
@@ -24348,50 +24559,77 @@ def check_task_blocked(task_id):
         )
 
 
+@app.route("/api/tasks/<int:task_id>/dependencies/ancestors", methods=["GET"])
+@require_auth
+def get_task_dependency_ancestors(task_id):
+    """Get every task this task transitively depends on.
+
+    Query params:
+        max_depth: Stop after this many dependency hops (default: unlimited)
+    """
+    max_depth = request.args.get("max_depth", type=int)
+    with get_db_connection() as conn:
+        ancestors = dependency_graph(conn).ancestors(task_id, max_depth)
+
+    return jsonify(
+        {
+            "task_id": task_id,
+            "ancestors": [
+                {"id": tid, "distance": distance}
+                for tid, distance in sorted(ancestors.items(), key=lambda a: (a[1], a[0]))
+            ],
+            "count": len(ancestors),
+        }
+    )
+
+
+@app.route("/api/tasks/<int:task_id>/dependencies/descendants", methods=["GET"])
+@require_auth
+def get_task_dependency_descendants(task_id):
+    """Get every task that transitively depends on this task.
+
+    Query params:
+        max_depth: Stop after this many dependency hops (default: unlimited)
+    """
+    max_depth = request.args.get("max_depth", type=int)
+    with get_db_connection() as conn:
+        descendants = dependency_graph(conn).descendants(task_id, max_depth)
+
+    return jsonify(
+        {
+            "task_id": task_id,
+            "descendants": [
+                {"id": tid, "distance": distance}
+                for tid, distance in sorted(descendants.items(), key=lambda d: (d[1], d[0]))
+            ],
+            "count": len(descendants),
+        }
+    )
+
+
 # ============================================================================
 # AUTOMATIC TASK PRIORITIZATION
 # ============================================================================
 
 
-def calculate_dependency_priority(conn, task_id):
+def calculate_dependency_priority(conn, task_id, graph=None):
     """Calculate priority boost based on dependencies.
 
+    Args:
+        graph: Already refreshed dependency graph (saves a refresh per task)
+
     Returns:
         dependency_boost: Priority boost from blocking other tasks
-        is_on_critical_path: Whether task is on the critical path
+        direct_dependents: Tasks depending directly on this one
+        total_dependents: Tasks depending on this one directly or indirectly
         chain_depth: Depth in the dependency chain
     """
-    # Count how many tasks depend on this one (directly and indirectly)
-    # Direct dependents
-    direct_blocks = conn.execute(
-        """
-        SELECT COUNT(*) as cnt FROM task_dependencies
-        WHERE depends_on_id = ?
-    """,
-        (task_id,),
-    ).fetchone()["cnt"]
-
-    # Calculate transitive dependents using recursive CTE
-    transitive_result = conn.execute(
-        """
-        WITH RECURSIVE dependents(id, depth) AS (
-            -- Direct dependents
-            SELECT task_id, 1 FROM task_dependencies WHERE depends_on_id = ?
-            UNION ALL
-            -- Transitive dependents
-            SELECT td.task_id, d.depth + 1
-            FROM task_dependencies td
-            JOIN dependents d ON td.depends_on_id = d.id
-            WHERE d.depth < 10  -- Limit recursion depth
-        )
-        SELECT COUNT(DISTINCT id) as total_dependents, MAX(depth) as max_depth
-        FROM dependents
-    """,
-        (task_id,),
-    ).fetchone()
-
-    total_dependents = transitive_result["total_dependents"] or 0
-    max_depth = transitive_result["max_depth"] or 0
+    if graph is None:
+        graph = dependency_graph(conn)
+    metrics = graph.node_metrics(task_id)
+    direct_blocks = metrics["direct_dependents"]
+    total_dependents = metrics["total_dependents"]
+    max_depth = metrics["chain_depth"]
 
     # Calculate boost: more dependents = higher priority
     dependency_boost = min(
@@ -24408,69 +24646,15 @@ def calculate_dependency_priority(conn, task_id):
     }
 
 
-def find_critical_path(conn):
+def find_critical_path(conn, graph=None):
     """Find the critical path through pending tasks.
 
     Critical path = longest chain of dependent tasks.
     Returns list of task IDs in order from root to leaf.
     """
-    # Find all pending tasks with their dependencies
-    tasks = conn.execute(
-        """
-        SELECT id, task_type, priority, status FROM task_queue
-        WHERE status = 'pending'
-    """
-    ).fetchall()
-
-    if not tasks:
-        return []
-
-    task_ids = [t["id"] for t in tasks]
-
-    # Build dependency graph
-    deps = conn.execute(
-        """
-        SELECT task_id, depends_on_id
-        FROM task_dependencies
-        WHERE task_id IN ({}) AND depends_on_id IN ({})
-    """.format(
-            ",".join("?" * len(task_ids)), ",".join("?" * len(task_ids))
-        ),
-        task_ids + task_ids,
-    ).fetchall()
-
-    # Build adjacency list (depends_on -> tasks that depend on it)
-    graph = {t["id"]: [] for t in tasks}
-    in_degree = {t["id"]: 0 for t in tasks}
-
-    for dep in deps:
-        if dep["depends_on_id"] in graph:
-            graph[dep["depends_on_id"]].append(dep["task_id"])
-            in_degree[dep["task_id"]] = in_degree.get(dep["task_id"], 0) + 1
-
-    # Find root tasks (no dependencies within pending set)
-    roots = [tid for tid, deg in in_degree.items() if deg == 0]
-
-    # DFS to find longest path
-    def dfs(node, visited):
-        if node in visited:
-            return []
-        visited.add(node)
-        max_path = [node]
-        for neighbor in graph.get(node, []):
-            path = dfs(neighbor, visited.copy())
-            if len(path) + 1 > len(max_path):
-                max_path = [node] + path
-        return max_path
-
-    # Find longest path from any root
-    longest_path = []
-    for root in roots:
-        path = dfs(root, set())
-        if len(path) > len(longest_path):
-            longest_path = path
-
-    return longest_path
+    if graph is None:
+        graph = dependency_graph(conn)
+    return graph.critical_path()
 
 
 @app.route("/api/tasks/auto-prioritize", methods=["POST"])
@@ -24497,7 +24681,7 @@ def auto_prioritize_tasks():
         # Get tasks to process
         status_filter = "WHERE status = 'pending'" if pending_only else ""
         tasks = conn.execute(
-            """
+            f"""
             SELECT id, task_type, priority, status, created_at
             FROM task_queue {status_filter}
         """
@@ -24513,13 +24697,14 @@ def auto_prioritize_tasks():
             )
 
         # Find critical path
-        critical_path = find_critical_path(conn)
+        graph = dependency_graph(conn)
+        critical_path = find_critical_path(conn, graph)
         critical_path_set = set(critical_path)
 
         # Calculate new priorities
         updates = []
         for task in tasks:
-            dep_info = calculate_dependency_priority(conn, task["id"])
+            dep_info = calculate_dependency_priority(conn, task["id"], graph)
 
             # Calculate new priority
             base_priority = task["priority"]
@@ -24609,7 +24794,7 @@ def get_dependency_graph():
 
         # Get all tasks
         tasks = conn.execute(
-            """
+            f"""
             SELECT id, task_type, priority, status, story_points,
                    created_at, started_at, completed_at
             FROM task_queue {status_filter}
@@ -24628,22 +24813,15 @@ def get_dependency_graph():
                 }
             )
 
-        # Get all dependencies between these tasks
-        deps = conn.execute(
-            """
-            SELECT id, task_id, depends_on_id, dependency_type, created_at
-            FROM task_dependencies
-            WHERE task_id IN ({}) OR depends_on_id IN ({})
-        """.format(
-                ",".join("?" * len(task_ids)), ",".join("?" * len(task_ids))
-            ),
-            task_ids + task_ids,
-        ).fetchall()
+        # Dependencies touching these tasks and per-task metrics come from
+        # the in-memory graph
+        graph = dependency_graph(conn)
+        deps = graph.edges(task_ids)
 
         # Build nodes with dependency info
         nodes = []
         for task in tasks:
-            dep_info = calculate_dependency_priority(conn, task["id"])
+            dep_info = calculate_dependency_priority(conn, task["id"], graph)
             nodes.append(
                 {
                     "id": task["id"],
@@ -24673,7 +24851,7 @@ def get_dependency_graph():
             )
 
         # Find critical path
-        critical_path = find_critical_path(conn)
+        critical_path = find_critical_path(conn, graph)
 
         return jsonify(
             {
@@ -24770,7 +24948,7 @@ def get_task_priority_breakdown(task_id):
         task = conn.execute(
             """
             SELECT id, task_type, priority, status, created_at,
-                ROUND((strftime('%s', 'now') - strftime('%s', created_at)) / 60.0, 2) as age_minutes
+                ROUND((strftime('%s', 'now') - created_epoch) / 60.0, 2) as age_minutes
             FROM task_queue WHERE id = ?
         """,
             (task_id,),
@@ -24787,10 +24965,11 @@ def get_task_priority_breakdown(task_id):
         )
 
         # Calculate dependency boost
-        dep_info = calculate_dependency_priority(conn, task_id)
+        graph = dependency_graph(conn)
+        dep_info = calculate_dependency_priority(conn, task_id, graph)
 
         # Check if on critical path
-        critical_path = find_critical_path(conn)
+        critical_path = find_critical_path(conn, graph)
         on_critical_path = task_id in critical_path
         critical_boost = CRITICAL_PATH_BOOST if on_critical_path else 0
 
@@ -25228,20 +25407,23 @@ def complete_suggested_task(task_id):
 @app.route("/api/tasks/export", methods=["GET"])
 @require_auth
 def export_tasks():
-    """Export tasks to CSV or JSON format.
+    """Export tasks to CSV, JSON or NDJSON format.
+
+    The response is streamed in fetchmany() batches, so memory use does not
+    depend on the number of tasks exported.
 
     Query params:
-        format: 'csv' or 'json' (default: json)
+        format: 'csv', 'json' or 'ndjson' (default: json)
         status: filter by status (pending, running, completed, failed)
         type: filter by task_type
         from_date: filter tasks created after this date (ISO format)
         to_date: filter tasks created before this date (ISO format)
         include_data: include task_data field (default: true)
     """
-    import csv
-    import io
     from datetime import datetime
 
+    from flask import Response, stream_with_context
+
     export_format = request.args.get("format", "json").lower()
     status = request.args.get("status")
     task_type = request.args.get("type")
@@ -25249,101 +25431,78 @@ def export_tasks():
     to_date = request.args.get("to_date")
     include_data = request.args.get("include_data", "true").lower() == "true"
 
-    with get_db_connection() as conn:
-        conn.row_factory = sqlite3.Row
-
-        query = "SELECT * FROM task_queue WHERE 1=1"
-        params = []
-
-        if status:
-            query += " AND status = ?"
-            params.append(status)
-        if task_type:
-            query += " AND task_type = ?"
-            params.append(task_type)
-        if from_date:
-            query += " AND created_at >= ?"
-            params.append(from_date)
-        if to_date:
-            query += " AND created_at <= ?"
-            params.append(to_date)
-
-        query += " ORDER BY created_at DESC"
-
-        tasks = conn.execute(query, params).fetchall()
-        task_list = []
+    query = "SELECT * FROM task_queue WHERE 1=1"
+    params = []
 
-        for task in tasks:
-            task_dict = dict(task)
-            # Parse task_data JSON
-            if task_dict.get("task_data"):
-                try:
-                    task_dict["task_data"] = json.loads(task_dict["task_data"])
-                except json.JSONDecodeError:
-                    pass
-            if not include_data:
-                task_dict.pop("task_data", None)
-            task_list.append(task_dict)
+    if status:
+        query += " AND status = ?"
+        params.append(status)
+    if task_type:
+        query += " AND task_type = ?"
+        params.append(task_type)
+    if from_date:
+        query += " AND created_at >= ?"
+        params.append(from_date)
+    if to_date:
+        query += " AND created_at <= ?"
+        params.append(to_date)
+
+    query += " ORDER BY created_at DESC"
+
+    exported = {"count": 0}
+
+    def counted(batches):
+        for columns, rows in batches:
+            exported["count"] += len(rows)
+            yield columns, rows
+
+    batches = counted(iter_batches(get_db_connection, query, params))
+    if not include_data:
+        batches = drop_columns(batches, ["task_data"])
+
+    def parse_task_data(task):
+        # Parse task_data JSON
+        if task.get("task_data"):
+            try:
+                task["task_data"] = json.loads(task["task_data"])
+            except json.JSONDecodeError:
+                pass
+        return task
 
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     if export_format == "csv":
-        # Generate CSV
-        output = io.StringIO()
-        if task_list:
-            # Flatten task_data for CSV
-            flat_tasks = []
-            for task in task_list:
-                flat_task = {k: v for k, v in task.items() if k != "task_data"}
-                if include_data and task.get("task_data"):
-                    if isinstance(task["task_data"], dict):
-                        flat_task["task_data"] = json.dumps(task["task_data"])
-                    else:
-                        flat_task["task_data"] = str(task["task_data"])
-                flat_tasks.append(flat_task)
-
-            fieldnames = list(flat_tasks[0].keys()) if flat_tasks else []
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(flat_tasks)
-
-        response = make_response(output.getvalue())
-        response.headers["Content-Type"] = "text/csv; charset=utf-8"
-        response.headers["Content-Disposition"] = (
-            f'attachment; filename=tasks_export_{
-                datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-        )
-
-        log_activity(
-            "export", "tasks", None, f"CSV export: {len(task_list)} tasks"
-        )
-        return response
-
+        chunks, label = csv_chunks(batches), "CSV"
+        mimetype, extension = "text/csv", "csv"
+    elif export_format == "ndjson":
+        chunks, label = ndjson_chunks(iter_dicts(batches, parse_task_data)), "NDJSON"
+        mimetype, extension = "application/x-ndjson", "ndjson"
     else:
         # JSON format (default)
-        export_data = {
+        head = {
             "exported_at": datetime.now().isoformat(),
-            "total_count": len(task_list),
             "filters": {
                 "status": status,
                 "type": task_type,
                 "from_date": from_date,
                 "to_date": to_date,
             },
-            "tasks": task_list,
         }
+        chunks = json_document_chunks(head, "tasks", iter_dicts(batches, parse_task_data))
+        label, mimetype, extension = "JSON", "application/json", "json"
 
-        response = make_response(
-            json.dumps(export_data, indent=2, default=str)
-        )
-        response.headers["Content-Type"] = "application/json; charset=utf-8"
-        response.headers["Content-Disposition"] = (
-            f'attachment; filename=tasks_export_{
-                datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-        )
-
+    def generate():
+        yield from chunks
         log_activity(
-            "export", "tasks", None, f"JSON export: {len(task_list)} tasks"
+            "export", "tasks", None, f"{label} export: {exported['count']} tasks"
         )
-        return response
+
+    response = Response(
+        stream_with_context(generate()), content_type=f"{mimetype}; charset=utf-8"
+    )
+    response.headers["Content-Disposition"] = (
+        f"attachment; filename=tasks_export_{timestamp}.{extension}"
+    )
+    return response
 
 
 @app.route("/api/tasks/export/summary", methods=["GET"])
@@ -25421,51 +25580,27 @@ def export_tasks_summary():
 # ============================================================================
 
 
-def create_excel_workbook(data_dict):
-    """Create Excel workbook from dict of sheet_name->rows."""
-    try:
-        from openpyxl import Workbook
-        from openpyxl.styles import Border, Font, PatternFill, Side
-        from openpyxl.utils import get_column_letter
-    except ImportError:
-        return None
-    wb = Workbook()
-    wb.remove(wb.active)
-    hfont = Font(bold=True, color="FFFFFF")
-    hfill = PatternFill(
-        start_color="4472C4", end_color="4472C4", fill_type="solid"
-    )
-    border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin"),
+def _send_excel_workbook(sheets, prefix, error="openpyxl required. pip install openpyxl"):
+    """Write (title, batches) sheets to an XLSX attachment response.
+
+    The workbook is built in openpyxl's write-only mode in a temporary file
+    and sent from disk, so memory use does not grow with the export size.
+    """
+    import tempfile
+
+    from flask import send_file
+
+    tmp = tempfile.TemporaryFile()
+    if write_xlsx(sheets, tmp) is None:
+        tmp.close()
+        return jsonify({"error": error}), 500
+    tmp.seek(0)
+    return send_file(
+        tmp,
+        mimetype=XLSX_MIMETYPE,
+        as_attachment=True,
+        download_name=f'{prefix}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx',
     )
-    for name, rows in data_dict.items():
-        if not rows:
-            continue
-        ws = wb.create_sheet(title=name[:31])
-        headers = list(rows[0].keys())
-        for ci, h in enumerate(headers, 1):
-            c = ws.cell(row=1, column=ci, value=h.replace("_", " ").title())
-            c.font, c.fill, c.border = hfont, hfill, border
-        for ri, rd in enumerate(rows, 2):
-            for ci, h in enumerate(headers, 1):
-                v = rd.get(h, "")
-                if isinstance(v, (dict, list)):
-                    v = json.dumps(v, default=str)
-                ws.cell(row=ri, column=ci, value=v).border = border
-        for ci, h in enumerate(headers, 1):
-            ws.column_dimensions[get_column_letter(ci)].width = (
-                min(max(len(h), 10), 50) + 2
-            )
-        ws.freeze_panes = "A2"
-    if not wb.sheetnames:
-        wb.create_sheet("Empty").cell(1, 1, "No data")
-    out = io.BytesIO()
-    wb.save(out)
-    out.seek(0)
-    return out
 
 
 @app.route("/api/export/xlsx", methods=["GET"])
@@ -25481,114 +25616,64 @@ def export_to_excel():
     from_date, to_date = request.args.get("from_date"), request.args.get(
         "to_date"
     )
-    data = {}
-    with get_db_connection() as conn:
-        conn.row_factory = sqlite3.Row
-        df = ""
-        dp = []
-        if from_date:
-            df += " AND created_at >= ?"
-            dp.append(from_date)
-        if to_date:
-            df += " AND created_at <= ?"
-            dp.append(to_date)
-        if "projects" in entities:
-            data["Projects"] = [
-                dict(r)
-                for r in conn.execute(
-                    f"SELECT id, name, description, status, created_at FROM projects WHERE 1=1 {df}",
-                    dp,
-                ).fetchall()
-            ]
-        if "features" in entities:
-            data["Features"] = [
-                dict(r)
-                for r in conn.execute(
-                    f"SELECT f.id, p.name as project, f.name, f.status, f.priority, f.created_at FROM features f LEFT JOIN projects p ON f.project_id=p.id WHERE 1=1 {
-                        df.replace(
-                            'created_at',
-                            'f.created_at')}",
-                    dp,
-                ).fetchall()
-            ]
-        if "bugs" in entities:
-            data["Bugs"] = [
-                dict(r)
-                for r in conn.execute(
-                    f"SELECT b.id, p.name as project, b.title, b.status, b.severity, b.created_at FROM bugs b LEFT JOIN projects p ON b.project_id=p.id WHERE 1=1 {
-                        df.replace(
-                            'created_at',
-                            'b.created_at')}",
-                    dp,
-                ).fetchall()
-            ]
-        if "tasks" in entities:
-            data["Tasks"] = [
-                dict(r)
-                for r in conn.execute(
-                    f"SELECT id, task_type, status, priority, error_message, created_at, completed_at FROM task_queue WHERE 1=1 {df}",
-                    dp,
-                ).fetchall()
-            ]
-        if "errors" in entities:
-            data["Errors"] = [
-                dict(r)
-                for r in conn.execute(
-                    f"SELECT id, error_type, message, source, status, occurrence_count, last_seen FROM errors WHERE 1=1 {
-                        df.replace(
-                            'created_at',
-                            'first_seen')}",
-                    dp,
-                ).fetchall()
-            ]
-    xlsx = create_excel_workbook(data)
-    if not xlsx:
-        return (
-            jsonify({"error": "openpyxl required. pip install openpyxl"}),
-            500,
-        )
-    resp = make_response(xlsx.read())
-    resp.headers["Content-Type"] = (
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
-    resp.headers["Content-Disposition"] = (
-        f'attachment; filename=export_{
-            datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+    df = ""
+    dp = []
+    if from_date:
+        df += " AND created_at >= ?"
+        dp.append(from_date)
+    if to_date:
+        df += " AND created_at <= ?"
+        dp.append(to_date)
+    queries = {
+        "projects": (
+            "Projects",
+            f"SELECT id, name, description, status, created_at FROM projects WHERE 1=1 {df}",
+        ),
+        "features": (
+            "Features",
+            "SELECT f.id, p.name as project, f.name, f.status, f.priority, f.created_at "
+            "FROM features f LEFT JOIN projects p ON f.project_id=p.id WHERE 1=1 "
+            + df.replace("created_at", "f.created_at"),
+        ),
+        "bugs": (
+            "Bugs",
+            "SELECT b.id, p.name as project, b.title, b.status, b.severity, b.created_at "
+            "FROM bugs b LEFT JOIN projects p ON b.project_id=p.id WHERE 1=1 "
+            + df.replace("created_at", "b.created_at"),
+        ),
+        "tasks": (
+            "Tasks",
+            "SELECT id, task_type, status, priority, error_message, created_at, completed_at "
+            f"FROM task_queue WHERE 1=1 {df}",
+        ),
+        "errors": (
+            "Errors",
+            "SELECT id, error_type, message, source, status, occurrence_count, last_seen "
+            "FROM errors WHERE 1=1 " + df.replace("created_at", "first_seen"),
+        ),
+    }
+    # Sheets are generated one at a time while the workbook is written
+    sheets = (
+        (title, iter_batches(get_db_connection, query, dp))
+        for entity, (title, query) in queries.items()
+        if entity in entities
     )
-    return resp
+    return _send_excel_workbook(sheets, "export")
 
 
 @app.route("/api/export/xlsx/tasks", methods=["GET"])
 @require_auth
 def export_tasks_xlsx():
     """Export tasks to Excel."""
-    with get_db_connection() as conn:
-        conn.row_factory = sqlite3.Row
-        q, p = "SELECT * FROM task_queue WHERE 1=1", []
-        if request.args.get("status"):
-            q += " AND status=?"
-            p.append(request.args["status"])
-        if request.args.get("type"):
-            q += " AND task_type=?"
-            p.append(request.args["type"])
-        tasks = [
-            dict(r)
-            for r in conn.execute(
-                q + " ORDER BY created_at DESC", p
-            ).fetchall()
-        ]
-    xlsx = create_excel_workbook({"Tasks": tasks})
-    if not xlsx:
-        return jsonify({"error": "openpyxl required"}), 500
-    resp = make_response(xlsx.read())
-    resp.headers["Content-Type"] = (
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
-    resp.headers["Content-Disposition"] = (
-        f'attachment; filename=tasks_{
-            datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-    )
-    return resp
+    q, p = "SELECT * FROM task_queue WHERE 1=1", []
+    if request.args.get("status"):
+        q += " AND status=?"
+        p.append(request.args["status"])
+    if request.args.get("type"):
+        q += " AND task_type=?"
+        p.append(request.args["type"])
+    sheets = [("Tasks", iter_batches(get_db_connection, q + " ORDER BY created_at DESC", p))]
+    return _send_excel_workbook(sheets, "tasks", error="openpyxl required")
 
 
 # ============================================================================
@@ -28568,6 +28653,7 @@ def create_webhook():
                 timeout_seconds=data.get("timeout_seconds", 10),
             )
             log_activity("create_webhook", "webhook", webhook_id, data["name"])
+        task_webhooks.invalidate_subscriptions()
         return jsonify({"id": webhook_id, "success": True})
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
@@ -28598,6 +28684,7 @@ def update_webhook(webhook_id):
                     404,
                 )
             log_activity("update_webhook", "webhook", webhook_id)
+        task_webhooks.invalidate_subscriptions()
         return jsonify({"success": True})
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
@@ -28612,6 +28699,7 @@ def delete_webhook(webhook_id):
         if not deleted:
             return jsonify({"error": "Webhook not found"}), 404
         log_activity("delete_webhook", "webhook", webhook_id)
+    task_webhooks.invalidate_subscriptions()
     return jsonify({"success": True})
 
 
@@ -28643,6 +28731,7 @@ def toggle_webhook(webhook_id):
         log_activity(
             "toggle_webhook", "webhook", webhook_id, f"enabled={new_state}"
         )
+    task_webhooks.invalidate_subscriptions()
     return jsonify({"success": True, "enabled": bool(new_state)})
 
 
@@ -28714,6 +28803,7 @@ def get_webhook_stats():
                 ),
             },
             "by_event": [dict(r) for r in by_event],
+            "queue": task_webhooks.get_dispatcher(str(DB_PATH)).get_stats(),
         }
     )
 
@@ -35756,13 +35846,18 @@ def delete_custom_tour_step(step_id):
 def global_search():
     """Search across all entities in the system.
 
-    Searches projects, milestones, features, bugs, tasks, errors, and tmux sessions.
-    Results are grouped by entity type and ranked by relevance.
+    Searches projects, milestones, features, bugs, tasks, errors, activity,
+    task comments and tmux sessions. Results are grouped by entity type and
+    ranked by relevance. Tasks, errors, activity and comments use the FTS5
+    search index (services/search_index.py): terms are prefix-matched and
+    ANDed, results are BM25-ranked and carry "score" and "snippet"
+    (matched text with <mark> highlighting).
 
     Query params:
         q: Search query (required, min 2 chars)
         types: Comma-separated entity types to search (default: all)
-               Options: projects, milestones, features, bugs, tasks, errors, sessions
+               Options: projects, milestones, features, bugs, tasks, errors,
+               activity, comments, sessions
         limit: Max results per type (default 10, max 50)
         include_archived: Include archived items (default false)
     """
@@ -35791,6 +35886,8 @@ def global_search():
         "bugs",
         "tasks",
         "errors",
+        "activity",
+        "comments",
         "sessions",
     ]
     search_types = requested_types if requested_types else all_types
@@ -35860,26 +35957,60 @@ def global_search():
             results["bugs"] = [dict(r) for r in rows]
             total_count += len(results["bugs"])
 
+        # Indexed types: BM25-ranked FTS5 matches with a highlighted
+        # snippet, or LIKE on databases without the search index
         if "tasks" in search_types:
-            q = "SELECT id, task_type, task_data, status, priority, created_at, assigned_worker, 'task' as entity_type FROM task_queue WHERE (task_type LIKE ? OR task_data LIKE ?)"
-            q += " ORDER BY created_at DESC LIMIT ?"
-            rows = conn.execute(
-                q, [search_pattern, search_pattern, limit]
-            ).fetchall()
-            results["tasks"] = [dict(r) for r in rows]
+            if search_index.search_index_ready(conn, "tasks"):
+                rows = search_index.search_source(conn, "tasks", query, limit)
+            else:
+                q = "SELECT id, task_type, task_data, status, priority, created_at, assigned_worker FROM task_queue WHERE (task_type LIKE ? OR task_data LIKE ?)"
+                q += " ORDER BY created_at DESC LIMIT ?"
+                rows = conn.execute(
+                    q, [search_pattern, search_pattern, limit]
+                ).fetchall()
+            results["tasks"] = [dict(r, entity_type="task") for r in rows]
             total_count += len(results["tasks"])
 
         if "errors" in search_types:
-            q = "SELECT id, error_type, message, source, status, severity, occurrence_count, 'error' as entity_type FROM errors WHERE (error_type LIKE ? OR message LIKE ? OR source LIKE ?)"
-            if not include_archived:
-                q += " AND status != 'archived'"
-            q += " ORDER BY occurrence_count DESC LIMIT ?"
-            rows = conn.execute(
-                q, [search_pattern, search_pattern, search_pattern, limit]
-            ).fetchall()
-            results["errors"] = [dict(r) for r in rows]
+            status_filter = "" if include_archived else "s.status != 'archived'"
+            if search_index.search_index_ready(conn, "errors"):
+                rows = search_index.search_source(
+                    conn, "errors", query, limit, where=status_filter
+                )
+            else:
+                q = "SELECT s.id, s.error_type, s.message, s.source, s.status, s.occurrence_count, s.last_seen FROM errors s WHERE (s.error_type LIKE ? OR s.message LIKE ? OR s.source LIKE ?)"
+                if status_filter:
+                    q += f" AND {status_filter}"
+                q += " ORDER BY s.occurrence_count DESC LIMIT ?"
+                rows = conn.execute(
+                    q, [search_pattern, search_pattern, search_pattern, limit]
+                ).fetchall()
+            results["errors"] = [dict(r, entity_type="error") for r in rows]
             total_count += len(results["errors"])
 
+        if "activity" in search_types:
+            if search_index.search_index_ready(conn, "activity"):
+                rows = search_index.search_source(conn, "activity", query, limit)
+            else:
+                q = "SELECT id, user_id, action, entity_type, entity_id, created_at FROM activity_log WHERE (action LIKE ? OR entity_type LIKE ? OR details LIKE ?)"
+                q += " ORDER BY created_at DESC LIMIT ?"
+                rows = conn.execute(
+                    q, [search_pattern, search_pattern, search_pattern, limit]
+                ).fetchall()
+            # entity_type here is the logged entity, not "activity"
+            results["activity"] = [dict(r) for r in rows]
+            total_count += len(results["activity"])
+
+        if "comments" in search_types:
+            if search_index.search_index_ready(conn, "comments"):
+                rows = search_index.search_source(conn, "comments", query, limit)
+            else:
+                q = "SELECT id, task_id, content, author, comment_type, created_at FROM task_comments WHERE content LIKE ?"
+                q += " ORDER BY created_at DESC LIMIT ?"
+                rows = conn.execute(q, [search_pattern, limit]).fetchall()
+            results["comments"] = [dict(r, entity_type="comment") for r in rows]
+            total_count += len(results["comments"])
+
         if "sessions" in search_types:
             q = "SELECT ts.id, ts.session_name, ts.node_id, ts.status, ts.last_activity, 'session' as entity_type FROM tmux_sessions ts WHERE ts.session_name LIKE ? ORDER BY ts.last_activity DESC LIMIT ?"
             rows = conn.execute(q, [search_pattern, limit]).fetchall()
@@ -36590,6 +36721,7 @@ def get_stats():
 
     Returns:
         200: Statistics object with counts
+        304: Not modified (If-None-Match matched the current ETag)
 
     Example Request:
         GET /api/stats
@@ -36608,87 +36740,49 @@ def get_stats():
     cURL Example:
         curl -X GET "http://localhost:8080/api/stats" \\
              -H "Cookie: session=<session_cookie>"
+
+    Responses carry an ETag built from the cached stats entry and the
+    newest activity_log row; a matching If-None-Match gets 304 without
+    rebuilding the cache or reading recent activity.
     """
     try:
         with get_db_connection() as conn:
             conn.row_factory = sqlite3.Row
+            cache_mgr = get_cache_manager()
+
+            # New activity rows get higher rowids, so the max marks the feed
+            activity_marker = conn.execute("SELECT MAX(rowid) FROM activity_log").fetchone()[0]
+
+            cache_entry = cache_mgr.get_cache("stats")
+            if cache_entry is not None:
+                etag = f"{cache_entry['etag']}-{activity_marker or 0}"
+                if request.if_none_match.contains(etag):
+                    response = app.response_class(status=304)
+                    response.set_etag(etag)
+                    response.headers["Cache-Control"] = "private, no-cache"
+                    return response
 
-            stats = {}
-
-            # Project stats
-            stats["projects"] = conn.execute(
-                "SELECT COUNT(*) as count FROM projects WHERE status = 'active'"
-            ).fetchone()["count"]
-
-            # Feature stats
-            feature_stats = conn.execute(
-                """
-                SELECT status, COUNT(*) as count
-                FROM features
-                GROUP BY status
-            """
-            ).fetchall()
-            stats["features"] = {
-                row["status"]: row["count"] for row in feature_stats
-            }
-            stats["features"]["total"] = sum(stats["features"].values())
-
-            # Bug stats
-            bug_stats = conn.execute(
-                """
-                SELECT status, COUNT(*) as count
-                FROM bugs
-                GROUP BY status
-            """
-            ).fetchall()
-            stats["bugs"] = {row["status"]: row["count"] for row in bug_stats}
-            stats["bugs"]["total"] = sum(stats["bugs"].values())
-
-            # Error stats
-            error_stats = conn.execute(
-                """
-                SELECT status, COUNT(*) as count, SUM(occurrence_count) as occurrences
-                FROM errors
-                GROUP BY status
-            """
-            ).fetchall()
-            stats["errors"] = {
-                row["status"]: {
-                    "count": row["count"],
-                    "occurrences": row["occurrences"],
+            def compute_stats():
+                # Per-status counts are kept by triggers in entity_counters
+                counters = entity_counters.read_counters(conn)
+                stats = {
+                    "projects": entity_counters.status_count(counters, "projects", "active"),
+                    "features": entity_counters.status_counts(counters, "features"),
+                    "bugs": entity_counters.status_counts(counters, "bugs"),
+                    "errors": counters.get("errors", {}),
+                    "nodes": entity_counters.status_counts(counters, "nodes"),
+                    "tasks": entity_counters.status_counts(counters, "task_queue"),
+                    "tmux_sessions": entity_counters.total(counters, "tmux_sessions"),
                 }
-                for row in error_stats
-            }
-
-            # Node stats
-            node_stats = conn.execute(
-                """
-                SELECT status, COUNT(*) as count
-                FROM nodes
-                GROUP BY status
-            """
-            ).fetchall()
-            stats["nodes"] = {
-                row["status"]: row["count"] for row in node_stats
-            }
-
-            # Task queue stats
-            task_stats = conn.execute(
-                """
-                SELECT status, COUNT(*) as count
-                FROM task_queue
-                GROUP BY status
-            """
-            ).fetchall()
-            stats["tasks"] = {
-                row["status"]: row["count"] for row in task_stats
-            }
+                stats["features"]["total"] = sum(stats["features"].values())
+                stats["bugs"]["total"] = sum(stats["bugs"].values())
+                return stats
 
-            # tmux session count
-            tmux_count = conn.execute(
-                "SELECT COUNT(*) as count FROM tmux_sessions"
-            ).fetchone()["count"]
-            stats["tmux_sessions"] = tmux_count
+            # Counts are shared across workers and invalidated by writes to
+            # the underlying tables; recent activity is always read fresh
+            if cache_entry is None:
+                cache_entry = cache_mgr.get_or_compute("stats", compute_stats)
+            stats = dict(cache_entry["data"])
 
             # Recent activity
             recent = conn.execute(
@@ -36701,7 +36795,10 @@ def get_stats():
             ).fetchall()
             stats["recent_activity"] = [dict(r) for r in recent]
 
-            return jsonify(stats)
+            response = jsonify(stats)
+            response.set_etag(f"{cache_entry['etag']}-{activity_marker or 0}")
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
     except sqlite3.Error as e:
         logger.error(f"Database error fetching stats: {e}")
         return api_error("Failed to fetch statistics", 500, "database_error")
@@ -41135,6 +41232,28 @@ Start by analyzing what needs to be done."""
 # ============================================================================
 
 
+@app.route("/api/db/pool", methods=["GET"])
+@require_auth
+def get_db_pool_instrumentation():
+    """Get pool acquire-wait/hold percentiles by caller, leaks and sizing.
+
+    Query params:
+        db_type: pool name (default: all pools)
+        leak_threshold: report connections held longer than this (seconds)
+    """
+    try:
+        from db import get_pool_instrumentation
+
+        return jsonify(
+            get_pool_instrumentation(
+                request.args.get("db_type"),
+                leak_threshold=request.args.get("leak_threshold", type=float),
+            )
+        )
+    except Exception as e:
+        return api_error(str(e), 500)
+
+
 @app.route("/api/db/pool/stats", methods=["GET"])
 @require_auth
 def get_db_pool_stats():
@@ -41193,6 +41312,11 @@ def manage_db_pool_config():
             "recycle_time",
             "health_check_interval",
             "enabled",
+            "adaptive",
+            "adaptive_interval",
+            "adaptive_target_wait_ms",
+            "adaptive_max_connections",
+            "leak_threshold",
         }
         invalid_keys = set(data.keys()) - valid_keys
         if invalid_keys:
@@ -45635,6 +45759,12 @@ def get_metrics():
         except Exception:
             pass
 
+        # Connection pool latency histograms
+        try:
+            lines.extend(format_pool_prometheus())
+        except Exception as e:
+            logger.warning(f"Could not export pool metrics: {e}")
+
         # Build info metric
         lines.append("# HELP architect_build_info Build information")
         lines.append("# TYPE architect_build_info gauge")
@@ -48555,6 +48685,8 @@ def get_collaboration_stats():
 def _register_cache_callbacks():
     """Register broadcast functions as cache refresh callbacks."""
     cache_mgr = get_cache_manager()
+    # Share cached components and versions across worker processes
+    cache_mgr.use_shared_backend(database.get_db_path("main"))
     cache_mgr.register_refresh_callback("stats", broadcast_stats)
     cache_mgr.register_refresh_callback("errors", broadcast_errors)
     cache_mgr.register_refresh_callback("tmux", broadcast_tmux)
@@ -50078,9 +50210,20 @@ def main():
         action="store_true",
         help="Skip auto-migrations on startup",
     )
+    parser.add_argument(
+        "--import-profile",
+        action="store_true",
+        help="Report per-module import time, cold start and RSS (eager vs lazy routes) and exit",
+    )
 
     args = parser.parse_args()
 
+    if args.import_profile:
+        from import_profile import compare_lazy_routes, format_report
+
+        print(format_report(compare_lazy_routes("app")))
+        return
+
     # Environment safety: prevent debug mode in production
     if args.debug and APP_ENV == "prod":
         print("[SAFETY] Debug mode disabled in production environment")
@@ -50617,6 +50760,10 @@ curl -X POST "http://localhost:{args.port}/api/errors/{entity_id}/resolve" -H "C
 
                     # Check session health every 4 cycles (60 seconds)
                     if check_counter % 4 == 0:
+                        # Move tasks whose aging bonus hit the cap to the priority index
+                        task_claim_engine.materialize_aged_tasks(conn)
+                        conn.commit()
+
                         active_runs = conn.execute(
                             """
                             SELECT r.id, r.tmux_session, r.status, p.name as project_name
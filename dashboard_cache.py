@@ -3,13 +3,33 @@ Dashboard Cache Management Module
 
 Provides cache invalidation and refresh capabilities for dashboard components.
 Supports both in-memory caching and cache control for API responses.
+
+Cached entries and component versions live in a backend. The default
+MemoryCacheBackend is per-process; SQLiteCacheBackend stores them in the
+main database so every worker process shares one copy, and triggers on
+the source tables bump component versions so a write in any process
+invalidates exactly the affected components.
+
+Usage:
+    from dashboard_cache import ensure_dashboard_cache_schema, get_cache_manager
+
+    ensure_dashboard_cache_schema(conn)  # once, from init_database()
+
+    cache_mgr = get_cache_manager()
+    cache_mgr.use_shared_backend(db_path)
+    entry = cache_mgr.get_or_compute("stats", compute_stats)
 """
 
+import hashlib
+import json
 import logging
+import os
+import sqlite3
 import threading
 import time
+import uuid
 from collections import defaultdict
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
@@ -50,13 +70,282 @@ DASHBOARD_COMPONENTS = {
     "alerts": {"description": "User alerts and notifications", "ttl": 10, "priority": "high"},
 }
 
+# Version key bumped by invalidate_all()
+GLOBAL_VERSION_KEY = "_all"
+
+# Source tables whose writes bump component versions:
+# {table: (components, columns whose UPDATE counts, or None for any column)}
+VERSIONED_TABLES = {
+    "task_queue": (("queue", "stats"), ("status",)),
+    "bugs": (("bugs", "stats"), None),
+    "features": (("features", "stats"), None),
+    "projects": (("projects", "stats"), None),
+    "errors": (("errors", "stats"), ("status", "occurrence_count")),
+    "nodes": (("nodes", "stats"), ("status",)),
+    "tmux_sessions": (("tmux", "stats"), None),
+}
+
+_CACHE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS dashboard_cache (
+        component TEXT PRIMARY KEY,
+        data TEXT,
+        etag TEXT,
+        version INTEGER NOT NULL,
+        created_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS dashboard_cache_versions (
+        component TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 1
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS dashboard_cache_leases (
+        component TEXT PRIMARY KEY,
+        owner TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+]
+
+
+def _version_triggers() -> Dict[str, str]:
+    """Build the version-bump triggers for VERSIONED_TABLES."""
+    triggers = {}
+    for table, (components, update_columns) in VERSIONED_TABLES.items():
+        in_list = ", ".join(f"'{c}'" for c in components)
+        bump = (
+            "UPDATE dashboard_cache_versions SET version = version + 1 "
+            f"WHERE component IN ({in_list});"
+        )
+        update_event = f"UPDATE OF {', '.join(update_columns)}" if update_columns else "UPDATE"
+        for suffix, event in (("insert", "INSERT"), ("update", update_event), ("delete", "DELETE")):
+            name = f"trg_{table}_{suffix}_dashboard_cache"
+            triggers[
+                name
+            ] = f"""
+                CREATE TRIGGER IF NOT EXISTS {name}
+                AFTER {event} ON {table}
+                BEGIN
+                    {bump}
+                END
+            """
+    return triggers
+
+
+def ensure_dashboard_cache_schema(conn: sqlite3.Connection) -> int:
+    """Create the shared cache tables and version-bump triggers.
+
+    Safe to call on every startup. Triggers are skipped for source tables
+    that do not exist yet.
+
+    Args:
+        conn: Connection to the main database
+
+    Returns:
+        Number of version triggers in place
+    """
+    for table_sql in _CACHE_SCHEMA:
+        conn.execute(table_sql)
+    conn.executemany(
+        "INSERT OR IGNORE INTO dashboard_cache_versions (component) VALUES (?)",
+        [(c,) for c in list(DASHBOARD_COMPONENTS) + [GLOBAL_VERSION_KEY]],
+    )
+    created = 0
+    for trigger_sql in _version_triggers().values():
+        try:
+            conn.execute(trigger_sql)
+            created += 1
+        except sqlite3.OperationalError:
+            pass
+    return created
+
+
+class MemoryCacheBackend:
+    """Per-process cache storage (the original behaviour)."""
+
+    shared = False
+
+    def __init__(self):
+        self._entries: Dict[str, Dict] = {}
+        self._versions: Dict[str, int] = defaultdict(lambda: 1)
+        self._lock = threading.Lock()
+
+    def get(self, component: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(component)
+            if entry is None:
+                return None
+            return {**entry, "current_version": self._versions[component]}
+
+    def set(self, component: str, entry: Dict):
+        with self._lock:
+            self._entries[component] = entry
+
+    def delete(self, component: str) -> bool:
+        with self._lock:
+            return self._entries.pop(component, None) is not None
+
+    def clear(self) -> List[str]:
+        with self._lock:
+            cleared = list(self._entries)
+            self._entries.clear()
+            return cleared
+
+    def get_version(self, component: str) -> int:
+        with self._lock:
+            return self._versions[component]
+
+    def bump_versions(self, components: List[str]) -> Dict[str, int]:
+        with self._lock:
+            for component in components:
+                self._versions[component] += 1
+            return {c: self._versions[c] for c in components}
+
+    def try_acquire(self, component: str, owner: str, ttl: float) -> bool:
+        # Single-flight within the process is handled by the manager's locks
+        return True
+
+    def release(self, component: str, owner: str):
+        pass
+
+
+class SQLiteCacheBackend:
+    """Cache storage shared by every process using the same database file."""
+
+    shared = True
+
+    def __init__(self, db_path: str, timeout: float = 5.0):
+        self.db_path = str(db_path)
+        self.timeout = timeout
+        self._local = threading.local()
+        ensure_dashboard_cache_schema(self._conn())
+
+    def _conn(self) -> sqlite3.Connection:
+        """Per-thread autocommit connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path, timeout=self.timeout, isolation_level=None, check_same_thread=False
+            )
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def get(self, component: str) -> Optional[Dict]:
+        row = (
+            self._conn()
+            .execute(
+                """
+                SELECT c.data, c.etag, c.version, c.created_at,
+                    COALESCE(v.version, 1) as current_version
+                FROM dashboard_cache c
+                LEFT JOIN dashboard_cache_versions v ON v.component = c.component
+                WHERE c.component = ?
+            """,
+                (component,),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return {
+            "data": json.loads(row["data"]) if row["data"] is not None else None,
+            "etag": row["etag"],
+            "version": row["version"],
+            "timestamp": row["created_at"],
+            "current_version": row["current_version"],
+        }
+
+    def set(self, component: str, entry: Dict):
+        self._conn().execute(
+            """
+            INSERT OR REPLACE INTO dashboard_cache (component, data, etag, version, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        """,
+            (
+                component,
+                json.dumps(entry["data"], default=str),
+                entry["etag"],
+                entry["version"],
+                entry["timestamp"],
+            ),
+        )
+
+    def delete(self, component: str) -> bool:
+        cursor = self._conn().execute(
+            "DELETE FROM dashboard_cache WHERE component = ?", (component,)
+        )
+        return cursor.rowcount > 0
+
+    def clear(self) -> List[str]:
+        conn = self._conn()
+        cleared = [row[0] for row in conn.execute("SELECT component FROM dashboard_cache")]
+        conn.execute("DELETE FROM dashboard_cache")
+        return cleared
+
+    def get_version(self, component: str) -> int:
+        row = (
+            self._conn()
+            .execute(
+                "SELECT version FROM dashboard_cache_versions WHERE component = ?", (component,)
+            )
+            .fetchone()
+        )
+        return row[0] if row else 1
+
+    def bump_versions(self, components: List[str]) -> Dict[str, int]:
+        conn = self._conn()
+        conn.executemany(
+            """
+            INSERT INTO dashboard_cache_versions (component, version) VALUES (?, 2)
+            ON CONFLICT(component) DO UPDATE SET version = version + 1
+        """,
+            [(c,) for c in components],
+        )
+        placeholders = ",".join("?" * len(components))
+        rows = conn.execute(
+            "SELECT component, version FROM dashboard_cache_versions "
+            f"WHERE component IN ({placeholders})",
+            components,
+        ).fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def try_acquire(self, component: str, owner: str, ttl: float) -> bool:
+        """Take the rebuild lease for a component unless another owner holds it."""
+        now = time.time()
+        cursor = self._conn().execute(
+            """
+            INSERT INTO dashboard_cache_leases (component, owner, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT(component) DO UPDATE
+                SET owner = excluded.owner, expires_at = excluded.expires_at
+            WHERE dashboard_cache_leases.expires_at < ?
+                OR dashboard_cache_leases.owner = excluded.owner
+        """,
+            (component, owner, now + ttl, now),
+        )
+        return cursor.rowcount > 0
+
+    def release(self, component: str, owner: str):
+        self._conn().execute(
+            "DELETE FROM dashboard_cache_leases WHERE component = ? AND owner = ?",
+            (component, owner),
+        )
+
 
 class DashboardCacheManager:
     """Manages dashboard component caching and invalidation."""
 
-    def __init__(self):
-        # Cache storage: {component: {'data': ..., 'timestamp': ..., 'etag': ...}}
-        self._cache: Dict[str, Dict] = {}
+    # How long a rebuild lease is held before another caller may take over
+    LEASE_SECONDS = 10.0
+    # How often a caller waiting on another process's rebuild re-checks the cache
+    LEASE_POLL_INTERVAL = 0.05
+
+    def __init__(self, backend=None):
+        # Cache storage and component versions (per-process unless shared)
+        self._backend = backend or MemoryCacheBackend()
         # Cache metadata: {component: {'last_invalidated': ..., 'invalidation_count': ...}}
         self._metadata: Dict[str, Dict] = defaultdict(
             lambda: {
@@ -70,10 +359,36 @@ class DashboardCacheManager:
         self._refresh_callbacks: Dict[str, Callable] = {}
         # Lock for thread safety
         self._lock = threading.RLock()
-        # Global cache version (incremented on full invalidation)
-        self._version = 1
-        # Component-specific versions
-        self._component_versions: Dict[str, int] = defaultdict(lambda: 1)
+        # Per-component locks for single-flight rebuilds within this process
+        self._compute_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+        # Identifies this process/manager when holding rebuild leases
+        self._owner = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    @property
+    def _version(self) -> int:
+        """Global cache version (incremented on full invalidation)."""
+        return self._backend.get_version(GLOBAL_VERSION_KEY)
+
+    def use_shared_backend(self, db_path: str) -> bool:
+        """Switch to the SQLite backend shared by all worker processes.
+
+        Args:
+            db_path: Path to the main database
+
+        Returns:
+            True if the shared backend is active
+        """
+        with self._lock:
+            if isinstance(self._backend, SQLiteCacheBackend) and self._backend.db_path == str(
+                db_path
+            ):
+                return True
+            try:
+                self._backend = SQLiteCacheBackend(db_path)
+                return True
+            except sqlite3.Error as e:
+                logger.warning(f"Shared dashboard cache unavailable, using in-memory cache: {e}")
+                return False
 
     def register_refresh_callback(self, component: str, callback: Callable):
         """Register a callback function to refresh a component.
@@ -88,43 +403,100 @@ class DashboardCacheManager:
     def get_cache(self, component: str) -> Optional[Dict]:
         """Get cached data for a component if still valid.
 
+        An entry is valid while it is younger than the component TTL and no
+        write has bumped the component version since it was stored.
+
         Args:
             component: Component name
 
         Returns:
             Cached data dict or None if expired/missing
         """
-        with self._lock:
-            if component not in self._cache:
-                return None
+        cache_entry = self._backend.get(component)
+        if cache_entry is None:
+            return None
 
-            cache_entry = self._cache[component]
-            ttl = DASHBOARD_COMPONENTS.get(component, {}).get("ttl", 30)
+        ttl = DASHBOARD_COMPONENTS.get(component, {}).get("ttl", 30)
 
-            # Check if cache is still valid
-            if time.time() - cache_entry.get("timestamp", 0) > ttl:
-                return None
+        # Check if cache is still valid
+        if time.time() - cache_entry.get("timestamp", 0) > ttl:
+            return None
+        if cache_entry.get("version") != cache_entry.pop("current_version", None):
+            return None
 
-            return cache_entry
+        return cache_entry
 
-    def set_cache(self, component: str, data: Any, etag: str = None):
+    def set_cache(self, component: str, data: Any, etag: str = None, version: int = None) -> Dict:
         """Set cached data for a component.
 
         Args:
             component: Component name
             data: Data to cache
             etag: Optional ETag for the data
+            version: Component version the data was computed at (default: current)
+
+        Returns:
+            The stored cache entry
         """
+        if version is None:
+            version = self._backend.get_version(component)
+        cache_entry = {
+            "data": data,
+            "timestamp": time.time(),
+            "etag": etag or self._generate_etag(component, data, version),
+            "version": version,
+        }
+        self._backend.set(component, cache_entry)
+
         with self._lock:
-            now = time.time()
-            self._cache[component] = {
-                "data": data,
-                "timestamp": now,
-                "etag": etag or self._generate_etag(component, now),
-                "version": self._component_versions[component],
-            }
             self._metadata[component]["last_refresh"] = datetime.now().isoformat()
             self._metadata[component]["refresh_count"] += 1
+        return cache_entry
+
+    def get_or_compute(self, component: str, compute: Callable[[], Any]) -> Dict:
+        """Read-through cache access with single-flight recomputation.
+
+        Only one caller rebuilds an expired component: threads in this
+        process serialize on a per-component lock, and with the shared
+        backend other processes wait on a lease row until the rebuilt entry
+        appears (or the lease expires).
+
+        Args:
+            component: Component name
+            compute: Function returning fresh data for the component
+
+        Returns:
+            Cache entry dict with data, etag and version
+        """
+        cache_entry = self.get_cache(component)
+        if cache_entry is not None:
+            return cache_entry
+
+        with self._compute_locks[component]:
+            cache_entry = self.get_cache(component)
+            if cache_entry is not None:
+                return cache_entry
+
+            deadline = time.time() + self.LEASE_SECONDS
+            while not self._backend.try_acquire(component, self._owner, self.LEASE_SECONDS):
+                time.sleep(self.LEASE_POLL_INTERVAL)
+                cache_entry = self.get_cache(component)
+                if cache_entry is not None:
+                    return cache_entry
+                if time.time() >= deadline:
+                    logger.warning(f"Timed out waiting for {component} rebuild, computing locally")
+                    break
+
+            try:
+                # The previous lease holder may have published while we polled
+                cache_entry = self.get_cache(component)
+                if cache_entry is not None:
+                    return cache_entry
+                # Read the version first so writes during compute leave the entry stale
+                version = self._backend.get_version(component)
+                return self.set_cache(component, compute(), version=version)
+            finally:
+                self._backend.release(component, self._owner)
 
     def invalidate(self, component: str) -> Dict:
         """Invalidate cache for a specific component.
@@ -135,21 +507,18 @@ class DashboardCacheManager:
         Returns:
             Invalidation result
         """
-        with self._lock:
-            was_cached = component in self._cache
-
-            if was_cached:
-                del self._cache[component]
+        was_cached = self._backend.delete(component)
+        version = self._backend.bump_versions([component])[component]
 
-            self._component_versions[component] += 1
+        with self._lock:
             self._metadata[component]["last_invalidated"] = datetime.now().isoformat()
             self._metadata[component]["invalidation_count"] += 1
 
-            return {
-                "component": component,
-                "invalidated": was_cached,
-                "version": self._component_versions[component],
-            }
+        return {
+            "component": component,
+            "invalidated": was_cached,
+            "version": version,
+        }
 
     def invalidate_all(self) -> Dict:
         """Invalidate all cached data.
@@ -157,17 +526,19 @@ class DashboardCacheManager:
         Returns:
             Invalidation result
         """
-        with self._lock:
-            invalidated = list(self._cache.keys())
-            self._cache.clear()
-            self._version += 1
+        invalidated = self._backend.clear()
+        versions = self._backend.bump_versions(list(DASHBOARD_COMPONENTS) + [GLOBAL_VERSION_KEY])
 
+        with self._lock:
             for component in DASHBOARD_COMPONENTS:
-                self._component_versions[component] += 1
                 self._metadata[component]["last_invalidated"] = datetime.now().isoformat()
                 self._metadata[component]["invalidation_count"] += 1
 
-            return {"invalidated": invalidated, "count": len(invalidated), "version": self._version}
+        return {
+            "invalidated": invalidated,
+            "count": len(invalidated),
+            "version": versions[GLOBAL_VERSION_KEY],
+        }
 
     def refresh(self, component: str) -> Dict:
         """Refresh a specific component by calling its callback.
@@ -252,18 +623,22 @@ class DashboardCacheManager:
         """
         with self._lock:
             now = time.time()
-            status = {"version": self._version, "components": {}}
+            status = {
+                "version": self._version,
+                "shared": self._backend.shared,
+                "components": {},
+            }
 
             for component, config in DASHBOARD_COMPONENTS.items():
                 ttl = config.get("ttl", 30)
-                cache_entry = self._cache.get(component)
+                cache_entry = self.get_cache(component)
 
                 component_status = {
                     "description": config.get("description"),
                     "ttl_seconds": ttl,
                     "priority": config.get("priority"),
                     "cached": cache_entry is not None,
-                    "version": self._component_versions[component],
+                    "version": self._backend.get_version(component),
                     **self._metadata[component],
                 }
 
@@ -286,11 +661,10 @@ class DashboardCacheManager:
         Returns:
             ETag string or None
         """
-        with self._lock:
-            cache_entry = self._cache.get(component)
-            if cache_entry:
-                return cache_entry.get("etag")
-            return None
+        cache_entry = self.get_cache(component)
+        if cache_entry:
+            return cache_entry.get("etag")
+        return None
 
     def check_etag(self, component: str, etag: str) -> bool:
         """Check if an ETag matches the current cache.
@@ -305,12 +679,14 @@ class DashboardCacheManager:
         current_etag = self.get_etag(component)
         return current_etag is not None and current_etag == etag
 
-    def _generate_etag(self, component: str, timestamp: float) -> str:
-        """Generate an ETag for cached data."""
-        import hashlib
+    def _generate_etag(self, component: str, data: Any, version: int) -> str:
+        """Generate an ETag for cached data.
 
-        data = f"{component}:{self._component_versions[component]}:{timestamp}"
-        return hashlib.md5(data.encode()).hexdigest()[:16]
+        Derived from the content and version only, so every worker produces
+        the same ETag for the same data.
+        """
+        payload = json.dumps(data, sort_keys=True, default=str)
+        return hashlib.md5(f"{component}:{version}:{payload}".encode()).hexdigest()[:16]
 
     def get_cache_headers(self, component: str) -> Dict[str, str]:
         """Get HTTP cache headers for a component.
@@ -327,7 +703,7 @@ class DashboardCacheManager:
         headers = {
             "Cache-Control": f"private, max-age={ttl}",
             "X-Cache-Component": component,
-            "X-Cache-Version": str(self._component_versions.get(component, 1)),
+            "X-Cache-Version": str(self._backend.get_version(component)),
         }
 
         if etag:
@@ -10,6 +10,10 @@ Features:
     - Automatic connection health checks
     - Configurable pool sizes and timeouts
     - Connection statistics and monitoring
+    - Acquire-wait and hold-time histograms tagged by route or worker
+    - Adaptive pool sizing and leaked-connection reports
+    - Optional write queue: one writer thread per database with group commits,
+      reads served from a read-only (mode=ro) pool
 
 Usage:
     from db import get_connection, Database, get_pool_stats
@@ -30,20 +34,37 @@ Usage:
     # Get pool statistics
     stats = get_pool_stats()
     print(f"Active connections: {stats['active']}, Available: {stats['available']}")
+
+    # Tag this thread's acquisitions, then read p50/p95/p99 per caller
+    set_pool_caller("assigner_worker")
+    latency = get_pool_instrumentation("main")
+
+    # Write-queue mode (DB_WRITE_QUEUE=true): writes are group-committed by a
+    # single writer thread, reads use a read-only pool
+    task_id = get_write_queue("main").execute("INSERT INTO tasks (name) VALUES (?)", ("x",))
+    with get_read_connection() as conn:
+        conn.execute("SELECT * FROM tasks")
 """
 
 import atexit
+import bisect
 import logging
 import os
 import queue
 import sqlite3
+import sys
 import threading
 import time
+import traceback
+from collections import deque
+from concurrent.futures import Future
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from types import FrameType
+from typing import Any, Callable, Dict, List, Optional, Union
+from urllib.parse import quote
 
 logger = logging.getLogger(__name__)
 
@@ -70,8 +91,50 @@ POOL_CONFIG = {
     "recycle_time": 3600,  # Recycle connections after 1 hour
     "health_check_interval": 60,  # Seconds between health checks
     "enabled": True,  # Enable/disable pooling
+    "adaptive": os.environ.get("DB_POOL_ADAPTIVE", "false").lower() == "true",
+    "adaptive_interval": 30,  # Seconds between resize decisions
+    "adaptive_target_wait_ms": 10.0,  # Grow when p95 acquire wait exceeds this
+    "adaptive_max_connections": 50,  # Upper bound for adaptive growth
+    "leak_threshold": 60.0,  # Report connections held longer (seconds, 0 = off)
+}
+
+# Write queue configuration (single writer thread per database). Only
+# Database.execute/executemany and execute_with_retry() are routed through it;
+# writes on get_connection()/get_db_connection() connections still go direct.
+WRITE_QUEUE_CONFIG = {
+    "enabled": os.environ.get("DB_WRITE_QUEUE", "false").lower() == "true",
+    "max_batch": 256,  # Writes per group commit
+    "max_delay_ms": 0.0,  # Extra time to wait for a batch to fill (0 = drain only)
+    "max_pending": 10000,  # Queued writes before submit() blocks
+    "timeout": 30.0,  # Seconds a caller waits for its write
 }
 
+# Histogram bucket upper bounds in seconds (acquire wait and hold time)
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+# Distinct caller tags tracked per pool; the rest are counted as "other"
+MAX_POOL_CALLERS = 100
+
+# Frames kept from the acquiring stack for leak reports
+LEAK_STACK_DEPTH = 12
+
 # Base paths
 BASE_DIR = Path(__file__).parent
 APP_ENV = os.environ.get("APP_ENV", "prod")
@@ -89,6 +152,85 @@ DB_PATHS = {
 # Thread-local storage for connections
 _local = threading.local()
 
+# Caller tag for threads that never call set_pool_caller() (workers, scripts)
+_DEFAULT_CALLER = f"process:{Path(sys.argv[0]).name if sys.argv and sys.argv[0] else 'python'}"
+
+
+def set_pool_caller(caller: Optional[str]) -> None:
+    """
+    Tag pool acquisitions made by the current thread.
+
+    The app sets this to the matched route for each request, which only
+    matters for routes that acquire from the pool (get_connection/Database);
+    workers can set their own name. Pass None to fall back to the process name.
+    """
+    _local.pool_caller = caller
+
+
+def get_pool_caller() -> str:
+    """Get the caller tag for the current thread."""
+    return getattr(_local, "pool_caller", None) or _DEFAULT_CALLER
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram with interpolated percentiles.
+
+    Buckets match LATENCY_BUCKETS so histograms can be exported to Prometheus
+    as-is. Not thread-safe; ConnectionPool guards it with its metrics lock.
+    """
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        """Record one duration in seconds."""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile (0-1) in seconds."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                fraction = (rank - cumulative) / bucket_count
+                return min(lower + (upper - lower) * fraction, self.max)
+            cumulative += bucket_count
+        return self.max
+
+    def cumulative_counts(self) -> List[tuple]:
+        """(upper bound, cumulative count) pairs, ending with +Inf."""
+        result = []
+        running = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), self.counts):
+            running += bucket_count
+            result.append((bound, running))
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, mean and p50/p95/p99/max in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.50) * 1000, 3),
+            "p95_ms": round(self.quantile(0.95) * 1000, 3),
+            "p99_ms": round(self.quantile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
 # Global pool registry
 _pools: Dict[str, "ConnectionPool"] = {}
 _pools_lock = threading.Lock()
@@ -103,6 +245,13 @@ class PooledConnection:
     last_used: float = field(default_factory=time.time)
     use_count: int = 0
     is_valid: bool = True
+    # Set while checked out, for hold times and leak reports
+    acquired_at: Optional[float] = None
+    caller: Optional[str] = None
+    thread_name: Optional[str] = None
+    # Frame that acquired the connection; formatted only if a leak is reported
+    frame: Optional[FrameType] = None
+    leak_reported: bool = False
 
     def touch(self):
         """Update last used timestamp and increment use count."""
@@ -135,6 +284,9 @@ class ConnectionPool:
         - Health checking
         - Overflow handling for burst traffic
         - Statistics tracking
+        - Acquire-wait/hold histograms per caller (see set_pool_caller)
+        - Optional adaptive sizing from observed acquire waits
+        - Leak reports for connections held past leak_threshold
 
     Example:
         pool = ConnectionPool('/path/to/db.sqlite')
@@ -155,8 +307,10 @@ class ConnectionPool:
         pool_timeout: float = None,
         recycle_time: float = None,
         timeout: float = None,
+        read_only: bool = False,
     ):
         self.db_path = Path(db_path)
+        self.read_only = read_only
         self.min_connections = min_connections or POOL_CONFIG["min_connections"]
         self.max_connections = max_connections or POOL_CONFIG["max_connections"]
         self.max_overflow = max_overflow or POOL_CONFIG["max_overflow"]
@@ -181,8 +335,26 @@ class ConnectionPool:
             "timeout_errors": 0,
             "health_checks": 0,
             "health_failures": 0,
+            "resizes": 0,
         }
 
+        # Latency instrumentation, guarded by _metrics_lock
+        self._metrics_lock = threading.Lock()
+        self._wait_hist = LatencyHistogram()
+        self._hold_hist = LatencyHistogram()
+        # {caller: {"wait", "hold", "exhausted", "timeouts"}}
+        self._callers: Dict[str, Dict[str, Any]] = {}
+        self._checked_out: Dict[int, PooledConnection] = {}
+
+        # Adaptive sizing: waits seen since the last decision
+        self.adaptive = POOL_CONFIG["adaptive"]
+        self.base_max_connections = self.max_connections
+        self._window_wait = LatencyHistogram()
+        self._window_peak_active = 0
+        self._next_adapt = time.monotonic() + POOL_CONFIG["adaptive_interval"]
+        self._adapt_lock = threading.Lock()
+        self._resize_history: deque = deque(maxlen=20)
+
         # Ensure database directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -200,6 +372,8 @@ class ConnectionPool:
 
     def _create_connection(self) -> sqlite3.Connection:
         """Create a new raw database connection."""
+        if self.read_only:
+            return _create_connection(self.db_path, self.timeout, read_only=True)
         conn = sqlite3.connect(str(self.db_path), timeout=self.timeout)
         conn.row_factory = sqlite3.Row
         _apply_pragmas(conn)
@@ -251,7 +425,9 @@ class ConnectionPool:
         if self._closed:
             raise RuntimeError("Connection pool is closed")
 
+        start = time.perf_counter()
         deadline = time.time() + self.pool_timeout
+        exhausted = False
 
         while True:
             # Try to get from pool
@@ -261,7 +437,7 @@ class ConnectionPool:
                     self._active_count += 1
                 pooled.touch()
                 self._stats["reused"] += 1
-                return pooled
+                return self._checkout(pooled, start, exhausted)
 
             # Try to create new connection
             with self._lock:
@@ -274,26 +450,29 @@ class ConnectionPool:
                         pooled = self._create_pooled_connection()
                         self._active_count += 1
                         pooled.touch()
-                        return pooled
                     except sqlite3.Error as e:
                         self._stats["failed"] += 1
                         raise
 
-                if can_overflow:
+                elif can_overflow:
                     try:
                         pooled = self._create_pooled_connection()
                         self._overflow_count += 1
                         self._stats["overflow_used"] += 1
                         pooled.touch()
-                        return pooled
                     except sqlite3.Error as e:
                         self._stats["failed"] += 1
                         raise
 
+            if pooled:
+                return self._checkout(pooled, start, exhausted or can_overflow)
+
             # Wait for available connection
+            exhausted = True
             remaining = deadline - time.time()
             if remaining <= 0:
                 self._stats["timeout_errors"] += 1
+                self._record_timeout(time.perf_counter() - start)
                 raise TimeoutError(
                     f"Could not acquire connection within {self.pool_timeout}s. "
                     f"Pool stats: active={self._active_count}, "
@@ -303,6 +482,70 @@ class ConnectionPool:
             # Brief sleep before retry
             time.sleep(min(0.1, remaining))
 
+    def _caller_metrics(self, caller: str) -> Dict[str, Any]:
+        """Per-caller metrics; call with _metrics_lock held."""
+        metrics = self._callers.get(caller)
+        if metrics is None:
+            if len(self._callers) >= MAX_POOL_CALLERS:
+                caller = "other"
+                metrics = self._callers.get(caller)
+            if metrics is None:
+                metrics = {
+                    "wait": LatencyHistogram(),
+                    "hold": LatencyHistogram(),
+                    "exhausted": 0,
+                    "timeouts": 0,
+                }
+                self._callers[caller] = metrics
+        return metrics
+
+    def _checkout(
+        self, pooled: PooledConnection, start: float, exhausted: bool
+    ) -> PooledConnection:
+        """Record the acquire wait and remember who holds the connection."""
+        now = time.perf_counter()
+        wait = now - start
+        caller = get_pool_caller()
+        pooled.acquired_at = now
+        pooled.caller = caller
+        pooled.thread_name = threading.current_thread().name
+        pooled.leak_reported = False
+        # Skip this frame and acquire()
+        pooled.frame = sys._getframe(2) if POOL_CONFIG["leak_threshold"] else None
+
+        with self._metrics_lock:
+            self._wait_hist.observe(wait)
+            self._window_wait.observe(wait)
+            metrics = self._caller_metrics(caller)
+            metrics["wait"].observe(wait)
+            if exhausted:
+                metrics["exhausted"] += 1
+            self._checked_out[id(pooled)] = pooled
+            self._window_peak_active = max(self._window_peak_active, len(self._checked_out))
+        return pooled
+
+    def _record_timeout(self, wait: float):
+        """Record an acquire that gave up waiting."""
+        with self._metrics_lock:
+            self._wait_hist.observe(wait)
+            self._window_wait.observe(wait)
+            metrics = self._caller_metrics(get_pool_caller())
+            metrics["wait"].observe(wait)
+            metrics["exhausted"] += 1
+            metrics["timeouts"] += 1
+
+    def _checkin(self, pooled: PooledConnection):
+        """Record the hold time of a connection being released."""
+        if pooled.acquired_at is None:
+            return
+        hold = time.perf_counter() - pooled.acquired_at
+        with self._metrics_lock:
+            self._checked_out.pop(id(pooled), None)
+            self._hold_hist.observe(hold)
+            self._caller_metrics(pooled.caller)["hold"].observe(hold)
+        pooled.acquired_at = None
+        pooled.frame = None
+
     def release(self, pooled: PooledConnection, discard: bool = False):
         """
         Return a connection to the pool.
@@ -311,6 +554,8 @@ class ConnectionPool:
             pooled: The pooled connection to release
             discard: If True, close connection instead of returning to pool
         """
+        self._checkin(pooled)
+
         with self._lock:
             self._active_count = max(0, self._active_count - 1)
 
@@ -322,18 +567,18 @@ class ConnectionPool:
 
         if discard or not pooled.is_valid:
             self._close_pooled(pooled)
-            return
-
         # Return to pool if not expired
-        if pooled.is_expired(self.recycle_time):
+        elif pooled.is_expired(self.recycle_time):
             self._close_pooled(pooled)
             self._stats["recycled"] += 1
-            return
+        else:
+            try:
+                self._pool.put_nowait(pooled)
+            except queue.Full:
+                self._close_pooled(pooled)
 
-        try:
-            self._pool.put_nowait(pooled)
-        except queue.Full:
-            self._close_pooled(pooled)
+        if self.adaptive and time.monotonic() >= self._next_adapt:
+            self.adapt()
 
     @contextmanager
     def get_connection(self):
@@ -364,14 +609,184 @@ class ConnectionPool:
         """Get pool statistics."""
         return {
             "db_path": str(self.db_path),
+            "read_only": self.read_only,
             "active": self._active_count,
             "available": self._pool.qsize(),
             "overflow": self._overflow_count,
             "max_connections": self.max_connections,
             "max_overflow": self.max_overflow,
+            "adaptive": self.adaptive,
             **self._stats,
         }
 
+    def get_instrumentation(self, leak_threshold: float = None) -> Dict[str, Any]:
+        """
+        Get latency histograms, per-caller breakdown, leaks and sizing state.
+
+        Args:
+            leak_threshold: Seconds for the leak report (default: config)
+
+        Returns:
+            Dict with acquire_wait/hold summaries (p50/p95/p99 in ms), callers
+            sorted by total acquire wait, current leaks and resize history
+        """
+        with self._metrics_lock:
+            callers = {
+                caller: {
+                    "acquire_wait": m["wait"].summary(),
+                    "hold": m["hold"].summary(),
+                    "exhausted": m["exhausted"],
+                    "timeouts": m["timeouts"],
+                    "_wait_total": m["wait"].sum,
+                }
+                for caller, m in self._callers.items()
+            }
+            acquire_wait = self._wait_hist.summary()
+            hold = self._hold_hist.summary()
+
+        ordered = sorted(callers.items(), key=lambda item: item[1].pop("_wait_total"), reverse=True)
+        return {
+            "db_path": str(self.db_path),
+            "acquire_wait": acquire_wait,
+            "hold": hold,
+            "callers": dict(ordered),
+            "leaks": self.find_leaks(leak_threshold),
+            "adaptive": {
+                "enabled": self.adaptive,
+                "max_connections": self.max_connections,
+                "base_max_connections": self.base_max_connections,
+                "max_limit": POOL_CONFIG["adaptive_max_connections"],
+                "target_wait_ms": POOL_CONFIG["adaptive_target_wait_ms"],
+                "resizes": list(self._resize_history),
+            },
+        }
+
+    def get_histograms(self) -> Dict[str, Dict[str, LatencyHistogram]]:
+        """Copies of the per-caller histograms, for exporters."""
+        with self._metrics_lock:
+            result = {}
+            for caller, m in self._callers.items():
+                copies = {}
+                for kind in ("wait", "hold"):
+                    hist = LatencyHistogram(m[kind].buckets)
+                    hist.counts = list(m[kind].counts)
+                    hist.count, hist.sum, hist.max = m[kind].count, m[kind].sum, m[kind].max
+                    copies[kind] = hist
+                result[caller] = copies
+            return result
+
+    def find_leaks(self, threshold: float = None) -> List[Dict[str, Any]]:
+        """
+        List connections checked out for longer than the leak threshold.
+
+        Args:
+            threshold: Seconds (default: POOL_CONFIG["leak_threshold"])
+
+        Returns:
+            List of {caller, thread, held_seconds, stack}, longest held first
+        """
+        threshold = POOL_CONFIG["leak_threshold"] if threshold is None else threshold
+        if not threshold:
+            return []
+        now = time.perf_counter()
+        with self._metrics_lock:
+            held = list(self._checked_out.values())
+
+        leaks = []
+        for pooled in held:
+            acquired_at, frame = pooled.acquired_at, pooled.frame
+            if acquired_at is None or now - acquired_at < threshold:
+                continue
+            stack = []
+            if frame is not None:
+                stack = traceback.format_list(traceback.extract_stack(frame, LEAK_STACK_DEPTH))
+            leaks.append(
+                {
+                    "caller": pooled.caller,
+                    "thread": pooled.thread_name,
+                    "held_seconds": round(now - acquired_at, 1),
+                    "stack": stack,
+                    "_pooled": pooled,
+                }
+            )
+        leaks.sort(key=lambda leak: leak["held_seconds"], reverse=True)
+        for leak in leaks:
+            pooled = leak.pop("_pooled")
+            if not pooled.leak_reported:
+                pooled.leak_reported = True
+                logger.warning(
+                    f"Connection to {self.db_path.name} held {leak['held_seconds']}s by "
+                    f"{leak['caller']} ({leak['thread']}), acquired at:\n" + "".join(leak["stack"])
+                )
+        return leaks
+
+    def adapt(self) -> Optional[Dict[str, Any]]:
+        """
+        Grow or shrink max_connections from the acquire waits since the last call.
+
+        Grows by 25% (at least one) while p95 wait is above
+        adaptive_target_wait_ms, up to adaptive_max_connections. Shrinks by
+        one when waits stay under half the target and the peak number of
+        checked-out connections left at least two idle, down to the
+        configured max_connections.
+
+        Returns:
+            The resize record, or None if the size did not change
+        """
+        if not self._adapt_lock.acquire(blocking=False):
+            return None
+        try:
+            self._next_adapt = time.monotonic() + POOL_CONFIG["adaptive_interval"]
+            with self._metrics_lock:
+                window, self._window_wait = self._window_wait, LatencyHistogram()
+                peak = self._window_peak_active
+                self._window_peak_active = len(self._checked_out)
+            if not window.count:
+                return None
+
+            target = POOL_CONFIG["adaptive_target_wait_ms"]
+            p95_ms = window.quantile(0.95) * 1000
+            current = self.max_connections
+            if p95_ms > target:
+                new_size = min(
+                    POOL_CONFIG["adaptive_max_connections"], current + max(1, current // 4)
+                )
+            elif p95_ms <= target / 2 and peak + 2 <= current:
+                new_size = max(self.base_max_connections, current - 1)
+            else:
+                new_size = current
+            if new_size == current:
+                return None
+
+            self._resize(new_size)
+            record = {
+                "timestamp": datetime.now().isoformat(),
+                "from": current,
+                "to": new_size,
+                "p95_wait_ms": round(p95_ms, 3),
+                "peak_active": peak,
+            }
+            self._resize_history.append(record)
+            self._stats["resizes"] += 1
+            logger.info(
+                f"Resized pool {self.db_path.name}: {current} -> {new_size} "
+                f"(p95 wait {p95_ms:.1f}ms, peak active {peak})"
+            )
+            return record
+        finally:
+            self._adapt_lock.release()
+
+    def _resize(self, max_connections: int):
+        """Change max_connections, closing idle connections above the new size."""
+        with self._lock:
+            self.max_connections = max_connections
+            self._pool.maxsize = max_connections
+        while self._pool.qsize() > max_connections:
+            try:
+                self._close_pooled(self._pool.get_nowait())
+            except queue.Empty:
+                break
+
     def health_check(self) -> Dict[str, Any]:
         """
         Perform health check on all pooled connections.
@@ -413,6 +828,7 @@ class ConnectionPool:
             "healthy": healthy,
             "unhealthy": unhealthy,
             "recycled": recycled,
+            "leaks": len(self.find_leaks()),
             "timestamp": datetime.now().isoformat(),
         }
 
@@ -436,12 +852,13 @@ class ConnectionPool:
             pass
 
 
-def get_pool(db_type: str = "main") -> ConnectionPool:
+def get_pool(db_type: str = "main", read_only: bool = False) -> ConnectionPool:
     """
     Get or create a connection pool for the specified database.
 
     Args:
         db_type: Type of database ('main', 'delegator', etc.)
+        read_only: Get the read-only (mode=ro) pool, registered as "<db_type>:ro"
 
     Returns:
         ConnectionPool instance
@@ -449,11 +866,15 @@ def get_pool(db_type: str = "main") -> ConnectionPool:
     if not POOL_CONFIG["enabled"]:
         return None
 
+    name = f"{db_type}:ro" if read_only else db_type
     with _pools_lock:
-        if db_type not in _pools:
+        if name not in _pools:
             db_path = get_db_path(db_type)
-            _pools[db_type] = ConnectionPool(db_path)
-        return _pools[db_type]
+            if read_only and not db_path.exists():
+                # mode=ro cannot create the file
+                _create_connection(db_path).close()
+            _pools[name] = ConnectionPool(db_path, read_only=read_only)
+        return _pools[name]
 
 
 def close_all_pools():
@@ -488,7 +909,9 @@ def _apply_pragmas(conn: sqlite3.Connection) -> None:
             pass  # Some pragmas may not be supported
 
 
-def _create_connection(db_path: Path, timeout: float = None) -> sqlite3.Connection:
+def _create_connection(
+    db_path: Path, timeout: float = None, read_only: bool = False
+) -> sqlite3.Connection:
     """Create a new database connection with proper settings."""
     if timeout is None:
         timeout = DB_CONFIG["timeout"]
@@ -496,7 +919,11 @@ def _create_connection(db_path: Path, timeout: float = None) -> sqlite3.Connecti
     # Ensure directory exists
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
-    conn = sqlite3.connect(str(db_path), timeout=timeout)
+    if read_only:
+        # journal_mode cannot be changed read-only; _apply_pragmas skips it
+        conn = sqlite3.connect(f"file:{quote(str(db_path))}?mode=ro", timeout=timeout, uri=True)
+    else:
+        conn = sqlite3.connect(str(db_path), timeout=timeout)
     conn.row_factory = sqlite3.Row
     _apply_pragmas(conn)
 
@@ -548,10 +975,374 @@ def get_connection(db_type: str = "main", timeout: float = None, use_pool: bool
         conn.close()
 
 
+@contextmanager
+def get_read_connection(db_type: str = "main", timeout: float = None):
+    """
+    Get a read-only connection as a context manager.
+
+    Uses the "<db_type>:ro" pool of mode=ro connections, so readers never
+    take the write lock. Falls back to get_connection() when pooling is
+    disabled or db_type is a custom path.
+
+    Yields:
+        sqlite3.Connection with row_factory set to sqlite3.Row
+    """
+    pool = get_pool(db_type, read_only=True) if db_type in DB_PATHS else None
+    if not pool:
+        with get_connection(db_type, timeout) as conn:
+            yield conn
+        return
+
+    pooled = pool.acquire()
+    try:
+        yield pooled.connection
+        # End the read transaction so the WAL snapshot is not pinned
+        pooled.connection.rollback()
+    except Exception:
+        pooled.is_valid = False
+        raise
+    finally:
+        pool.release(pooled)
+
+
+class _QueuedConnection:
+    """
+    Connection handed to functions run by the WriteQueue.
+
+    Each function runs inside its own savepoint of the group commit.
+    commit() releases and reopens the savepoint, so a later rollback() only
+    undoes writes since the last commit(), as on a normal connection; the
+    data itself becomes durable when the writer commits the batch.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def commit(self):
+        self._conn.execute("RELEASE write_queue_item")
+        self._conn.execute("SAVEPOINT write_queue_item")
+
+    def rollback(self):
+        self._conn.execute("ROLLBACK TO write_queue_item")
+
+    def close(self):
+        pass
+
+
+class WriteQueue:
+    """
+    Serializes writes to one database through a single writer thread.
+
+    Callers submit functions (or statements); the writer drains whatever is
+    queued, runs each in its own savepoint inside one BEGIN IMMEDIATE
+    transaction and commits once. Request threads never contend for the
+    SQLite write lock with each other, and many small writes share one
+    fsync. A failing write only rolls back its own savepoint.
+
+    Example:
+        wq = get_write_queue("main")
+        row_id = wq.execute("INSERT INTO projects (name) VALUES (?)", ("x",))
+        wq.run(lambda conn: conn.execute("UPDATE projects SET status = 'done'"))
+    """
+
+    def __init__(self, db_path: Path, name: str = None, timeout: float = None):
+        self.db_path = Path(db_path)
+        self.name = name or self.db_path.stem
+        self.timeout = timeout or DB_CONFIG["timeout"]
+        self._queue: queue.Queue = queue.Queue(maxsize=WRITE_QUEUE_CONFIG["max_pending"])
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "writes": 0,
+            "batches": 0,
+            "errors": 0,
+            "commit_failures": 0,
+            "largest_batch": 0,
+        }
+        self._commit_hist = LatencyHistogram()
+        self._latency_hist = LatencyHistogram()
+        self._queued_conn: Optional[_QueuedConnection] = None
+        self._thread_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._start_thread()
+
+    def _start_thread(self):
+        """Start (or restart) the writer thread."""
+        self._thread = threading.Thread(
+            target=self._run_loop, name=f"WriteQueue-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, func: Callable[[sqlite3.Connection], Any]) -> Future:
+        """
+        Queue a write function without waiting for it.
+
+        Args:
+            func: Called with a connection on the writer thread; its return
+                  value becomes the future's result once committed
+
+        Returns:
+            concurrent.futures.Future
+        """
+        if self._closed:
+            raise RuntimeError("Write queue is closed")
+        if not self._thread.is_alive():
+            with self._thread_lock:
+                if not self._thread.is_alive() and not self._closed:
+                    logger.warning(f"Write queue {self.name}: restarting writer thread")
+                    self._start_thread()
+        future: Future = Future()
+        try:
+            self._queue.put(
+                (func, future, time.perf_counter()), timeout=WRITE_QUEUE_CONFIG["timeout"]
+            )
+        except queue.Full:
+            raise TimeoutError(
+                f"Write queue for {self.name} is full ({self._queue.maxsize} pending)"
+            )
+        return future
+
+    def run(self, func: Callable[[sqlite3.Connection], Any], timeout: float = None) -> Any:
+        """Run a write function on the writer thread and wait for the commit."""
+        if threading.current_thread() is self._thread:
+            # Nested write from a queued function: it is already in the batch
+            return func(self._queued_conn)
+        return self.submit(func).result(timeout or WRITE_QUEUE_CONFIG["timeout"])
+
+    def execute(self, sql: str, params: tuple = ()) -> int:
+        """Execute a statement and return lastrowid."""
+        return self.run(lambda conn: conn.execute(sql, params).lastrowid)
+
+    def executemany(self, sql: str, params_list: List[tuple]) -> int:
+        """Execute a statement with multiple parameter sets; returns rowcount."""
+        return self.run(lambda conn: conn.executemany(sql, params_list).rowcount)
+
+    def _next_batch(self) -> List[tuple]:
+        """Block for one write, then take whatever else is queued."""
+        batch = [self._queue.get()]
+        max_batch = WRITE_QUEUE_CONFIG["max_batch"]
+        deadline = time.perf_counter() + WRITE_QUEUE_CONFIG["max_delay_ms"] / 1000
+        while len(batch) < max_batch and batch[-1] is not None:
+            try:
+                remaining = deadline - time.perf_counter()
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(item)
+        return batch
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the writer connection."""
+        conn = _create_connection(self.db_path, self.timeout)
+        conn.isolation_level = None  # Transactions are managed explicitly
+        self._queued_conn = _QueuedConnection(conn)
+        return conn
+
+    def _reset(self, conn: sqlite3.Connection) -> sqlite3.Connection:
+        """Roll back what an aborted batch left open; reconnect if that fails."""
+        try:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            return conn
+        except sqlite3.Error:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+            return self._connect()
+
+    def _run_loop(self):
+        """Writer thread: group-commit batches until closed."""
+        conn = self._connect()
+        try:
+            while True:
+                batch = self._next_batch()
+                stop = batch[-1] is None
+                items = [item for item in batch if item is not None]
+                if items:
+                    try:
+                        self._commit_batch(conn, items)
+                    except Exception as e:
+                        # One bad batch must not take the writer thread down
+                        logger.exception(f"Write queue {self.name}: batch aborted")
+                        self._fail(items, e)
+                        conn = self._reset(conn)
+                if stop:
+                    break
+        finally:
+            conn.close()
+
+    def _commit_batch(self, conn: sqlite3.Connection, items: List[tuple]):
+        """Run a batch in one transaction, one savepoint per write."""
+        results = []
+        start = time.perf_counter()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error as e:
+            self._fail(items, e)
+            return
+
+        for func, future, _submitted in items:
+            if not future.set_running_or_notify_cancel():
+                results.append(None)
+                continue
+            try:
+                conn.execute("SAVEPOINT write_queue_item")
+                value = func(self._queued_conn)
+                conn.execute("RELEASE write_queue_item")
+                results.append((True, value))
+            except Exception as e:
+                try:
+                    conn.execute("ROLLBACK TO write_queue_item")
+                    conn.execute("RELEASE write_queue_item")
+                except sqlite3.Error:
+                    # The write ended the batch transaction itself (COMMIT,
+                    # ROLLBACK, executescript), so the batch cannot commit
+                    raise sqlite3.OperationalError(
+                        f"Write queue {self.name}: a write ended the batch transaction: {e}"
+                    ) from e
+                results.append((False, e))
+
+        try:
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            try:
+                conn.execute("ROLLBACK")
+            except sqlite3.Error:
+                pass
+            with self._stats_lock:
+                self._stats["commit_failures"] += 1
+            self._fail([item for item, result in zip(items, results) if result], e)
+            return
+
+        done = time.perf_counter()
+        errors = 0
+        with self._stats_lock:
+            self._commit_hist.observe(done - start)
+            for (_func, _future, submitted), result in zip(items, results):
+                if result:
+                    self._latency_hist.observe(done - submitted)
+            self._stats["batches"] += 1
+            self._stats["writes"] += len(items)
+            self._stats["largest_batch"] = max(self._stats["largest_batch"], len(items))
+
+        for (_func, future, _submitted), result in zip(items, results):
+            if result is None:
+                continue
+            ok, value = result
+            if ok:
+                future.set_result(value)
+            else:
+                errors += 1
+                future.set_exception(value)
+        if errors:
+            with self._stats_lock:
+                self._stats["errors"] += errors
+
+    def _fail(self, items: List[tuple], error: Exception):
+        """Fail every write of a batch that could not be committed."""
+        logger.warning(f"Write queue {self.name}: batch of {len(items)} failed: {error}")
+        with self._stats_lock:
+            self._stats["errors"] += len(items)
+        for _func, future, _submitted in items:
+            if future.done():
+                continue
+            if future.running() or future.set_running_or_notify_cancel():
+                future.set_exception(error)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, batch sizes and commit/latency percentiles."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+            stats["commit"] = self._commit_hist.summary()
+            stats["latency"] = self._latency_hist.summary()
+        stats["avg_batch"] = (
+            round(stats["writes"] / stats["batches"], 2) if stats["batches"] else 0.0
+        )
+        stats["pending"] = self._queue.qsize()
+        stats["db_path"] = str(self.db_path)
+        return stats
+
+    def close(self, timeout: float = 5.0):
+        """Finish queued writes and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+
+
+# Global write queue registry
+_write_queues: Dict[str, WriteQueue] = {}
+_write_queues_lock = threading.Lock()
+
+
+def get_write_queue(db_type: str = "main") -> WriteQueue:
+    """
+    Get or create the write queue (writer thread) for a database.
+
+    Args:
+        db_type: Type of database ('main', 'delegator', etc.) or a path
+
+    Returns:
+        WriteQueue instance
+    """
+    with _write_queues_lock:
+        if db_type not in _write_queues:
+            db_path = get_db_path(db_type)
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            _write_queues[db_type] = WriteQueue(db_path, name=db_type)
+        return _write_queues[db_type]
+
+
+def write_queue_enabled() -> bool:
+    """Whether writes are routed through the per-database writer threads."""
+    return WRITE_QUEUE_CONFIG["enabled"]
+
+
+def get_write_queue_stats() -> Dict[str, Any]:
+    """Stats for every write queue."""
+    with _write_queues_lock:
+        queues = dict(_write_queues)
+    return {
+        "enabled": WRITE_QUEUE_CONFIG["enabled"],
+        "queues": {name: wq.get_stats() for name, wq in queues.items()},
+    }
+
+
+def close_all_write_queues():
+    """Flush and stop all writer threads. Call at application shutdown."""
+    with _write_queues_lock:
+        for wq in _write_queues.values():
+            try:
+                wq.close()
+            except Exception as e:
+                logger.warning(f"Error closing write queue: {e}")
+        _write_queues.clear()
+
+
+atexit.register(close_all_write_queues)
+
+
 def execute_with_retry(func, max_retries: int = None, delay: float = None):
     """
     Execute a database function with retry logic for locked database.
 
+    In write-queue mode the function runs on the database's writer thread
+    instead, where lock contention between request threads cannot occur.
+
     Args:
         func: Function that takes a connection and performs database operations
         max_retries: Maximum number of retry attempts
@@ -560,6 +1351,9 @@ def execute_with_retry(func, max_retries: int = None, delay: float = None):
     Returns:
         Result of the function call
     """
+    if WRITE_QUEUE_CONFIG["enabled"]:
+        return get_write_queue("main").run(func)
+
     if max_retries is None:
         max_retries = DB_CONFIG["retry_count"]
     if delay is None:
@@ -608,24 +1402,34 @@ class Database:
         db_path = get_db_path(self.db_type)
         return _create_connection(db_path, self.timeout)
 
+    def _read_connection(self):
+        """Read-only pool in write-queue mode, otherwise a normal connection."""
+        if WRITE_QUEUE_CONFIG["enabled"]:
+            return get_read_connection(self.db_type, self.timeout)
+        return get_connection(self.db_type, self.timeout)
+
     def query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
         """Execute a query and return all results."""
-        with get_connection(self.db_type, self.timeout) as conn:
+        with self._read_connection() as conn:
             return conn.execute(sql, params).fetchall()
 
     def query_one(self, sql: str, params: tuple = ()) -> Optional[sqlite3.Row]:
         """Execute a query and return first result or None."""
-        with get_connection(self.db_type, self.timeout) as conn:
+        with self._read_connection() as conn:
             return conn.execute(sql, params).fetchone()
 
     def execute(self, sql: str, params: tuple = ()) -> int:
         """Execute a statement and return lastrowid."""
+        if WRITE_QUEUE_CONFIG["enabled"]:
+            return get_write_queue(self.db_type).execute(sql, params)
         with get_connection(self.db_type, self.timeout) as conn:
             cursor = conn.execute(sql, params)
             return cursor.lastrowid
 
     def executemany(self, sql: str, params_list: List[tuple]) -> int:
         """Execute a statement with multiple parameter sets."""
+        if WRITE_QUEUE_CONFIG["enabled"]:
+            return get_write_queue(self.db_type).executemany(sql, params_list)
         with get_connection(self.db_type, self.timeout) as conn:
             cursor = conn.executemany(sql, params_list)
             return cursor.rowcount
@@ -781,8 +1585,12 @@ def set_pool_config(config: Dict[str, Any]) -> None:
         })
 
     Note: Changes only affect new pools. Use reset_pools() to apply to existing.
+    The "adaptive" switch is also applied to existing pools.
     """
     POOL_CONFIG.update(config)
+    if "adaptive" in config:
+        for pool in _instrumented_pools().values():
+            pool.adaptive = bool(config["adaptive"])
 
 
 def reset_pools():
@@ -1185,6 +1993,104 @@ def get_pool_summary() -> Dict[str, Any]:
     return PoolMetrics.get_pool_summary()
 
 
+def _instrumented_pools() -> Dict[str, ConnectionPool]:
+    """Global and service pools by name."""
+    with _pools_lock:
+        pools = dict(_pools)
+    with ServiceConnectionPool._instances_lock:
+        for svc_pool in ServiceConnectionPool._instances.values():
+            if svc_pool._pool:
+                pools.setdefault(svc_pool.pool_name, svc_pool._pool)
+    return pools
+
+
+def get_pool_instrumentation(db_type: str = None, leak_threshold: float = None) -> Dict[str, Any]:
+    """
+    Get acquire-wait/hold percentiles, per-caller breakdown and leaks.
+
+    Args:
+        db_type: Specific pool name, or None for all pools
+        leak_threshold: Seconds for the leak report (default: config)
+
+    Returns:
+        Dict with pool stats and ConnectionPool.get_instrumentation() output
+    """
+    if not POOL_CONFIG["enabled"]:
+        return {"enabled": False}
+
+    pools = _instrumented_pools()
+    if db_type:
+        pool = pools.get(db_type)
+        if not pool:
+            return {"error": f"No pool for {db_type}"}
+        return {**pool.get_instrumentation(leak_threshold), "stats": pool.get_stats()}
+
+    return {
+        "enabled": True,
+        "timestamp": datetime.now().isoformat(),
+        "pools": {
+            name: {**pool.get_instrumentation(leak_threshold), "stats": pool.get_stats()}
+            for name, pool in pools.items()
+        },
+        "write_queues": get_write_queue_stats(),
+    }
+
+
+def format_pool_prometheus() -> List[str]:
+    """
+    Render pool histograms and gauges in Prometheus text format.
+
+    Exposes architect_db_pool_acquire_wait_seconds and
+    architect_db_pool_hold_seconds histograms labelled by pool and caller.
+    """
+    if not POOL_CONFIG["enabled"]:
+        return []
+
+    def labels(**values):
+        escaped = {
+            k: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            for k, v in values.items()
+        }
+        return ",".join(f'{k}="{v}"' for k, v in escaped.items())
+
+    pools = _instrumented_pools()
+    lines = []
+    for metric, kind, help_text in (
+        ("architect_db_pool_acquire_wait_seconds", "wait", "Time spent waiting in acquire()"),
+        ("architect_db_pool_hold_seconds", "hold", "Time a connection was held before release"),
+    ):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} histogram")
+        for name, pool in pools.items():
+            for caller, hists in pool.get_histograms().items():
+                hist = hists[kind]
+                for bound, count in hist.cumulative_counts():
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(
+                        f"{metric}_bucket{{{labels(pool=name, caller=caller, le=le)}}} {count}"
+                    )
+                lines.append(f"{metric}_sum{{{labels(pool=name, caller=caller)}}} {hist.sum}")
+                lines.append(f"{metric}_count{{{labels(pool=name, caller=caller)}}} {hist.count}")
+
+    gauges = (
+        ("architect_db_pool_active", "active", "Connections checked out"),
+        ("architect_db_pool_available", "available", "Idle connections in the pool"),
+        ("architect_db_pool_max_connections", "max_connections", "Current pool size limit"),
+    )
+    stats = {name: pool.get_stats() for name, pool in pools.items()}
+    for metric, key, help_text in gauges:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        for name, pool_stats in stats.items():
+            lines.append(f"{metric}{{{labels(pool=name)}}} {pool_stats[key]}")
+
+    lines.append("# HELP architect_db_pool_leaks Connections held past the leak threshold")
+    lines.append("# TYPE architect_db_pool_leaks gauge")
+    for name, pool in pools.items():
+        lines.append(f"architect_db_pool_leaks{{{labels(pool=name)}}} {len(pool.find_leaks())}")
+    return lines
+
+
 # =============================================================================
 # Connection Factory for Migration
 # =============================================================================
@@ -28,11 +28,13 @@ Usage:
 __version__ = "1.0.0"
 
 from .cluster_coordinator import (
+    AdaptiveTimeout,
     ClusterConfig,
     ClusterCoordinator,
     ClusterState,
     NodeInfo,
     NodeRole,
+    PhiAccrualDetector,
     get_coordinator,
     init_coordinator,
 )
@@ -90,6 +92,8 @@ __all__ = [
     "ClusterState",
     "NodeRole",
     "NodeInfo",
+    "PhiAccrualDetector",
+    "AdaptiveTimeout",
     "get_coordinator",
     "init_coordinator",
 ]
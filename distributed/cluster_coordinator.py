@@ -10,6 +10,17 @@ Architecture:
 - One FAILOVER node is ready to take over if primary fails
 - WORKER nodes run apps only, report metrics to primary
 
+Health checks:
+- All nodes are probed concurrently from a bounded thread pool, each pool
+  thread reusing a keep-alive requests.Session, so a round takes as long
+  as the slowest probe rather than the sum of all of them
+- Each node's probe timeout adapts to its observed round-trip time
+  (smoothed RTT + 4 x variance, as TCP computes its retransmit timeout)
+- Node health comes from a phi accrual failure detector fed by probe
+  replies and worker heartbeats instead of a fixed missed-heartbeat count
+- Probes run without holding the coordinator lock, and each round's node
+  updates are written in one transaction
+
 Usage:
     from distributed.cluster_coordinator import ClusterCoordinator, NodeRole
 
@@ -23,10 +34,13 @@ Usage:
 
 import json
 import logging
+import math
 import os
 import sqlite3
 import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from enum import Enum
@@ -96,7 +110,92 @@ class ClusterConfig:
     health_check_interval: int = 15  # Seconds between health checks
     failover_threshold: int = 30  # Seconds before failover
     recovery_threshold: int = 60  # Seconds before primary can reclaim
-    max_missed_heartbeats: int = 3  # Missed heartbeats before unhealthy
+    max_missed_heartbeats: int = 3  # Missed heartbeats before unhealthy (no history yet)
+    probe_timeout: float = 5.0  # Upper bound for one health probe
+    min_probe_timeout: float = 0.5  # Lower bound for adaptive probe timeouts
+    probe_workers: int = 16  # Concurrent health probes
+    phi_threshold: float = 8.0  # Suspicion level at which a node is unhealthy
+    phi_min_std: float = 2.5  # Floor for the arrival interval deviation (seconds)
+
+
+class PhiAccrualDetector:
+    """Phi accrual failure detector for one node.
+
+    Records heartbeat arrival times and reports phi, the suspicion that the
+    node is down: -log10 of the probability that the next heartbeat would
+    arrive later than now, given a normal distribution fitted to recent
+    arrival intervals. phi 1 means ~10% chance of a false positive, phi 8
+    about one in 10^8.
+    """
+
+    def __init__(self, expected_interval: float, min_std: float, window: int = 100):
+        self.expected_interval = expected_interval
+        self.min_std = min_std
+        self.intervals: deque = deque(maxlen=window)
+        self.last_arrival: Optional[float] = None
+
+    def heartbeat(self, now: float):
+        """Record a heartbeat arrival."""
+        if self.last_arrival is not None and now > self.last_arrival:
+            self.intervals.append(now - self.last_arrival)
+        self.last_arrival = now
+
+    def phi(self, now: float) -> float:
+        """Suspicion level at time now (inf before the first heartbeat)."""
+        if self.last_arrival is None:
+            return math.inf
+        if self.intervals:
+            mean = sum(self.intervals) / len(self.intervals)
+            variance = sum((i - mean) ** 2 for i in self.intervals) / len(self.intervals)
+            std = math.sqrt(variance)
+        else:
+            mean, std = self.expected_interval, self.expected_interval / 4
+        std = max(std, self.min_std)
+
+        elapsed = now - self.last_arrival
+        p_later = 0.5 * math.erfc((elapsed - mean) / (std * math.sqrt(2)))
+        if p_later <= 0:
+            return math.inf
+        return -math.log10(p_later)
+
+
+class AdaptiveTimeout:
+    """Probe timeout derived from a node's observed round-trip times.
+
+    Follows TCP's retransmit timeout (RFC 6298): smoothed RTT plus four
+    times its mean deviation, doubled after each timeout, clamped to
+    [minimum, maximum].
+    """
+
+    ALPHA = 0.125
+    BETA = 0.25
+
+    def __init__(self, minimum: float, maximum: float):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.srtt: Optional[float] = None
+        self.rttvar = 0.0
+        self._backoff = 1
+
+    def observe(self, rtt: float):
+        """Record a successful probe's round-trip time."""
+        if self.srtt is None:
+            self.srtt, self.rttvar = rtt, rtt / 2
+        else:
+            self.rttvar = (1 - self.BETA) * self.rttvar + self.BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - self.ALPHA) * self.srtt + self.ALPHA * rtt
+        self._backoff = 1
+
+    def timed_out(self):
+        """Back off after a probe timed out."""
+        self._backoff = min(self._backoff * 2, 64)
+
+    @property
+    def timeout(self) -> float:
+        if self.srtt is None:
+            return self.maximum
+        rto = max(self.minimum, self.srtt + 4 * self.rttvar)
+        return min(self.maximum, rto * self._backoff)
 
 
 class ClusterCoordinator:
@@ -135,6 +234,13 @@ class ClusterCoordinator:
         self._health_check_thread: Optional[threading.Thread] = None
         self._lock = threading.RLock()
 
+        # Health probing
+        self._probe_pool: Optional[ThreadPoolExecutor] = None
+        self._http_local = threading.local()
+        self._http_sessions: List[requests.Session] = []
+        self._detectors: Dict[str, PhiAccrualDetector] = {}
+        self._timeouts: Dict[str, AdaptiveTimeout] = {}
+
         # Callbacks
         self._on_role_change: Optional[Callable] = None
         self._on_failover: Optional[Callable] = None
@@ -223,10 +329,34 @@ class ClusterCoordinator:
         elif self.role == NodeRole.FAILOVER:
             self.failover_node_id = self.node_id
 
+    @staticmethod
+    def _node_row(node: NodeInfo) -> tuple:
+        """Snapshot of a node as a cluster_nodes row."""
+        return (
+            node.node_id,
+            node.role.value,
+            node.host,
+            node.port,
+            node.dashboard_url,
+            node.api_url,
+            node.last_heartbeat,
+            node.cpu_usage,
+            node.memory_usage,
+            node.disk_usage,
+            1 if node.is_healthy else 0,
+            json.dumps(node.services),
+        )
+
     def _save_node(self, node: NodeInfo):
         """Save node info to database."""
+        self._save_rows([self._node_row(node)])
+
+    def _save_rows(self, rows: List[tuple]):
+        """Write node rows in one transaction."""
+        if not rows:
+            return
         with self._get_db_connection() as conn:
-            conn.execute(
+            conn.executemany(
                 """
                 INSERT OR REPLACE INTO cluster_nodes
                 (node_id, role, host, port, dashboard_url, api_url,
@@ -234,20 +364,7 @@ class ClusterCoordinator:
                  is_healthy, services, updated_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
             """,
-                (
-                    node.node_id,
-                    node.role.value,
-                    node.host,
-                    node.port,
-                    node.dashboard_url,
-                    node.api_url,
-                    node.last_heartbeat,
-                    node.cpu_usage,
-                    node.memory_usage,
-                    node.disk_usage,
-                    1 if node.is_healthy else 0,
-                    json.dumps(node.services),
-                ),
+                rows,
             )
             conn.commit()
 
@@ -311,6 +428,8 @@ class ClusterCoordinator:
         with self._lock:
             if node_id in self.nodes:
                 del self.nodes[node_id]
+            self._detectors.pop(node_id, None)
+            self._timeouts.pop(node_id, None)
 
             with self._get_db_connection() as conn:
                 conn.execute("DELETE FROM cluster_nodes WHERE node_id = ?", (node_id,))
@@ -346,6 +465,12 @@ class ClusterCoordinator:
             self._heartbeat_thread.join(timeout=5)
         if self._health_check_thread:
             self._health_check_thread.join(timeout=5)
+        if self._probe_pool:
+            self._probe_pool.shutdown(wait=False, cancel_futures=True)
+            self._probe_pool = None
+        for session in self._http_sessions:
+            session.close()
+        self._http_sessions.clear()
 
         logger.info(f"Cluster coordinator stopped: {self.node_id}")
 
@@ -373,6 +498,7 @@ class ClusterCoordinator:
         }
 
         # Update self
+        row = None
         with self._lock:
             if self.node_id in self.nodes:
                 node = self.nodes[self.node_id]
@@ -381,7 +507,9 @@ class ClusterCoordinator:
                 node.memory_usage = metrics["memory_usage"]
                 node.disk_usage = metrics["disk_usage"]
                 node.is_healthy = True
-                self._save_node(node)
+                row = self._node_row(node)
+        if row:
+            self._save_rows([row])
 
         # If worker, send to primary
         if self.role == NodeRole.WORKER and self.primary_node_id:
@@ -404,39 +532,149 @@ class ClusterCoordinator:
 
             time.sleep(self.config.health_check_interval)
 
+    def _http(self) -> requests.Session:
+        """Keep-alive session for the calling probe thread."""
+        session = getattr(self._http_local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.verify = False
+            self._http_local.session = session
+            with self._lock:
+                self._http_sessions.append(session)
+        return session
+
+    def _detector(self, node_id: str) -> PhiAccrualDetector:
+        detector = self._detectors.get(node_id)
+        if detector is None:
+            detector = self._detectors[node_id] = PhiAccrualDetector(
+                expected_interval=min(
+                    self.config.heartbeat_interval, self.config.health_check_interval
+                ),
+                min_std=self.config.phi_min_std,
+            )
+        return detector
+
+    def _probe_timeout(self, node_id: str) -> AdaptiveTimeout:
+        timeout = self._timeouts.get(node_id)
+        if timeout is None:
+            timeout = self._timeouts[node_id] = AdaptiveTimeout(
+                self.config.min_probe_timeout, self.config.probe_timeout
+            )
+        return timeout
+
+    def _probe_node(self, url: str, timeout: float) -> Dict:
+        """GET a node's health endpoint; returns reachability, RTT and payload."""
+        started = time.monotonic()
+        try:
+            resp = self._http().get(url, timeout=timeout)
+            rtt = time.monotonic() - started
+            if resp.status_code != 200:
+                return {"reachable": False, "rtt": rtt, "timed_out": False}
+            try:
+                data = resp.json()
+            except ValueError:
+                data = {}
+            return {"reachable": True, "rtt": rtt, "data": data if isinstance(data, dict) else {}}
+        except requests.Timeout:
+            return {"reachable": False, "rtt": None, "timed_out": True}
+        except Exception:
+            return {"reachable": False, "rtt": None, "timed_out": False}
+
+    def _probe_all(self, targets: Dict[str, tuple]) -> Dict[str, Dict]:
+        """Probe nodes concurrently; targets maps node_id to (url, timeout)."""
+        if not targets:
+            return {}
+        if self._probe_pool is None:
+            self._probe_pool = ThreadPoolExecutor(
+                max_workers=self.config.probe_workers, thread_name_prefix=f"probe-{self.node_id}"
+            )
+        pool = self._probe_pool
+        futures = {
+            node_id: pool.submit(self._probe_node, url, timeout)
+            for node_id, (url, timeout) in targets.items()
+        }
+        return {node_id: future.result() for node_id, future in futures.items()}
+
     def _check_all_nodes(self):
-        """Check health of all registered nodes."""
+        """Check health of all registered nodes.
+
+        Probes run concurrently without holding the lock, so heartbeats
+        are handled while a slow node is being probed; the round's node
+        updates are then applied under the lock and saved together.
+        """
+        with self._lock:
+            targets = {
+                node_id: (f"{node.api_url}/health", self._probe_timeout(node_id).timeout)
+                for node_id, node in self.nodes.items()
+                if node_id != self.node_id
+            }
+
+        results = self._probe_all(targets)
+
         now = time.time()
+        rows = []
+        went_down = []
+        with self._lock:
+            for node_id, result in results.items():
+                node = self.nodes.get(node_id)
+                if node is None:
+                    continue  # removed while the probe was running
+                adaptive = self._probe_timeout(node_id)
+                detector = self._detector(node_id)
+
+                node.is_reachable = result["reachable"]
+                if result["reachable"]:
+                    adaptive.observe(result["rtt"])
+                    detector.heartbeat(now)
+                    data = result["data"]
+                    node.last_heartbeat = now
+                    node.cpu_usage = data.get("cpu_usage", 0)
+                    node.memory_usage = data.get("memory_usage", 0)
+                elif result["timed_out"]:
+                    adaptive.timed_out()
+
+                was_healthy = node.is_healthy
+                node.is_healthy = self._is_alive(node, now)
+                if was_healthy and not node.is_healthy:
+                    went_down.append(node_id)
+                rows.append(self._node_row(node))
+
+        self._save_rows(rows)
+
+        if self._on_node_down:
+            for node_id in went_down:
+                self._on_node_down(node_id)
+
+    def _is_alive(self, node: NodeInfo, now: float) -> bool:
+        """Whether a node's heartbeats are still arriving on schedule."""
+        detector = self._detectors.get(node.node_id)
+        if detector is None or detector.last_arrival is None:
+            # No heartbeat seen by this coordinator: use the fixed allowance
+            heartbeat_age = now - node.last_heartbeat
+            return (
+                heartbeat_age <= self.config.heartbeat_interval * self.config.max_missed_heartbeats
+            )
+        return detector.phi(now) < self.config.phi_threshold
 
+    def get_failure_detector_stats(self) -> Dict[str, Dict]:
+        """Per-node suspicion level, probe timeout and smoothed RTT."""
+        now = time.time()
         with self._lock:
-            for node_id, node in self.nodes.items():
+            stats = {}
+            for node_id in self.nodes:
                 if node_id == self.node_id:
                     continue
-
-                # Check if node is reachable
-                try:
-                    url = f"{node.api_url}/health"
-                    resp = requests.get(url, timeout=5, verify=False)
-                    node.is_reachable = resp.status_code == 200
-
-                    if node.is_reachable:
-                        data = resp.json()
-                        node.last_heartbeat = now
-                        node.cpu_usage = data.get("cpu_usage", 0)
-                        node.memory_usage = data.get("memory_usage", 0)
-                        node.is_healthy = True
-                except Exception:
-                    node.is_reachable = False
-
-                # Check heartbeat age
-                heartbeat_age = now - node.last_heartbeat
-                if (
-                    heartbeat_age
-                    > self.config.heartbeat_interval * self.config.max_missed_heartbeats
-                ):
-                    node.is_healthy = False
-
-                self._save_node(node)
+                detector = self._detectors.get(node_id)
+                adaptive = self._timeouts.get(node_id)
+                phi = detector.phi(now) if detector else math.inf
+                stats[node_id] = {
+                    "phi": round(phi, 2) if math.isfinite(phi) else None,
+                    "probe_timeout": round(adaptive.timeout, 3) if adaptive else None,
+                    "srtt_ms": (
+                        round(adaptive.srtt * 1000, 1) if adaptive and adaptive.srtt else None
+                    ),
+                }
+            return stats
 
     def _evaluate_cluster_state(self):
         """Evaluate cluster state and trigger failover if needed."""
@@ -506,15 +744,19 @@ class ClusterCoordinator:
             return
 
         with self._lock:
-            if node_id in self.nodes:
-                node = self.nodes[node_id]
-                node.last_heartbeat = data.get("timestamp", time.time())
-                node.cpu_usage = data.get("cpu_usage", 0)
-                node.memory_usage = data.get("memory_usage", 0)
-                node.disk_usage = data.get("disk_usage", 0)
-                node.is_healthy = True
-                node.is_reachable = True
-                self._save_node(node)
+            if node_id not in self.nodes:
+                return
+            node = self.nodes[node_id]
+            node.last_heartbeat = data.get("timestamp", time.time())
+            node.cpu_usage = data.get("cpu_usage", 0)
+            node.memory_usage = data.get("memory_usage", 0)
+            node.disk_usage = data.get("disk_usage", 0)
+            node.is_healthy = True
+            node.is_reachable = True
+            self._detector(node_id).heartbeat(time.time())
+            row = self._node_row(node)
+
+        self._save_rows([row])
 
     def get_cluster_status(self) -> Dict:
         """Get current cluster status."""
@@ -533,6 +775,7 @@ class ClusterCoordinator:
                 "total_nodes": len(self.nodes),
                 "healthy_nodes": sum(1 for n in self.nodes.values() if n.is_healthy),
                 "nodes": nodes_list,
+                "failure_detector": self.get_failure_detector_stats(),
             }
 
     def get_dashboard_url(self) -> str:
@@ -8,6 +8,13 @@ This module provides automated log file maintenance including:
 - Archive creation for historical logs
 - Configurable retention policies
 
+Large logs are handled in constant memory: trimming reads backwards from
+the end in fixed blocks to find where the last N lines start and moves
+that tail to the front of the file in place; archiving compresses in
+streaming mode. A maintenance pass processes files in parallel, with all
+file I/O sharing one byte-rate cap so it does not starve the agents
+running on the node.
+
 Usage:
     # Trim logs in a directory
     python3 -m distributed.log_maintenance trim /path/to/logs
@@ -25,7 +32,9 @@ Usage:
 import gzip
 import logging
 import os
-import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
@@ -34,6 +43,9 @@ from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Read/write block size for trimming and archiving
+BLOCK_SIZE = 64 * 1024
+
 
 class LogAction(Enum):
     """Actions that can be performed on log files."""
@@ -82,12 +94,75 @@ class MaintenancePolicy:
     archive_after_days: int = 7  # Archive files older than this
     delete_archives_after_days: int = 90  # Delete old archives
     exclude_patterns: List[str] = None  # Patterns to exclude
+    workers: int = 4  # Files processed in parallel
+    max_bytes_per_sec: Optional[float] = 32 * 1024 * 1024  # Shared I/O cap (None = unlimited)
 
     def __post_init__(self):
         if self.exclude_patterns is None:
             self.exclude_patterns = [".git", "__pycache__", "node_modules", ".gz"]
 
 
+class ByteRateLimiter:
+    """Token bucket capping the combined I/O rate of maintenance threads."""
+
+    def __init__(self, bytes_per_sec: Optional[float]):
+        self.rate = bytes_per_sec or 0
+        self._tokens = float(self.rate)  # allow a one-second burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, nbytes: int):
+        """Account for nbytes of I/O, sleeping if the cap is exceeded."""
+        if not self.rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= nbytes
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+
+def find_tail_offset(
+    f, size: int, keep_lines: int, limiter: Optional[ByteRateLimiter] = None
+) -> int:
+    """Byte offset at which the last keep_lines lines of a binary file start.
+
+    Reads backwards from the end in BLOCK_SIZE blocks, so only the tail
+    being kept is read. Returns 0 if the file has keep_lines lines or fewer.
+    """
+    if keep_lines <= 0:
+        return size
+    pos = size
+    if size:
+        # A trailing newline ends the last line rather than starting a new one
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            pos = size - 1
+
+    newlines = 0
+    while pos > 0:
+        start = max(0, pos - BLOCK_SIZE)
+        f.seek(start)
+        block = f.read(pos - start)
+        if limiter:
+            limiter.consume(len(block))
+        count = block.count(b"\n")
+        if newlines + count < keep_lines:
+            newlines += count
+            pos = start
+            continue
+        idx = len(block)
+        while True:
+            idx = block.rfind(b"\n", 0, idx)
+            newlines += 1
+            if newlines == keep_lines:
+                return start + idx + 1
+    return 0
+
+
 class LogMaintenance:
     """Worker for log file maintenance operations."""
 
@@ -110,6 +185,17 @@ class LogMaintenance:
             "bytes_freed": 0,
             "errors": [],
         }
+        self._stats_lock = threading.Lock()
+        self._limiter = ByteRateLimiter(self.policy.max_bytes_per_sec)
+
+    def _record(self, action: str, bytes_freed: int = 0):
+        with self._stats_lock:
+            self.stats[action] += 1
+            self.stats["bytes_freed"] += bytes_freed
+
+    def _record_error(self, error: Exception):
+        with self._stats_lock:
+            self.stats["errors"].append(str(error))
 
     def scan_logs(self) -> List[LogFileInfo]:
         """Scan directory for log files.
@@ -118,12 +204,17 @@ class LogMaintenance:
             List of LogFileInfo objects for found log files
         """
         logs = []
+        excluded = self.policy.exclude_patterns
 
-        for ext in self.LOG_EXTENSIONS:
-            for log_path in self.base_path.rglob(f"*{ext}"):
+        # One walk for all extensions; excluded directories are not descended
+        for root, dirs, files in os.walk(self.base_path):
+            dirs[:] = [d for d in dirs if not any(p in os.path.join(root, d) for p in excluded)]
+            for name in files:
+                if os.path.splitext(name)[1] not in self.LOG_EXTENSIONS:
+                    continue
+                log_path = Path(root) / name
                 # Skip excluded patterns
-                path_str = str(log_path)
-                if any(p in path_str for p in self.policy.exclude_patterns):
+                if any(p in str(log_path) for p in excluded):
                     continue
 
                 try:
@@ -164,6 +255,11 @@ class LogMaintenance:
     def trim_log(self, log_path: Path, keep_lines: Optional[int] = None) -> Tuple[bool, int]:
         """Trim a log file, keeping only the most recent lines.
 
+        The file is rewritten in place: a header followed by the kept tail,
+        copied forward block by block, then truncated. Memory use does not
+        depend on the file size, and processes appending to the log keep
+        writing to the same file.
+
         Args:
             log_path: Path to the log file
             keep_lines: Number of lines to keep (uses policy default if None)
@@ -175,46 +271,56 @@ class LogMaintenance:
         original_size = log_path.stat().st_size
 
         try:
-            # Read all lines
-            with open(log_path, "r", encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()
-
-            # Keep only the last N lines
-            if len(lines) > keep:
-                kept_lines = lines[-keep:]
+            with open(log_path, "r+b") as f:
+                offset = find_tail_offset(f, original_size, keep, self._limiter)
 
                 # Add header indicating trimming
                 header = f"# Log trimmed on {datetime.now().isoformat()}\n"
-                header += f"# Removed {len(lines) - keep} lines, kept last {keep}\n"
+                header += f"# Removed {offset} bytes, kept last {keep} lines\n"
                 header += "# ---\n"
+                header_bytes = header.encode("utf-8")
+
+                if offset <= len(header_bytes):
+                    logger.debug(f"Log {log_path.name} is within {keep} lines, no trimming needed")
+                    return True, 0
+
+                # Move the tail to the front; the write position never passes the read position
+                f.seek(0)
+                f.write(header_bytes)
+                read_pos, write_pos = offset, len(header_bytes)
+                while True:
+                    f.seek(read_pos)
+                    chunk = f.read(BLOCK_SIZE)
+                    if not chunk:
+                        break
+                    self._limiter.consume(len(chunk))
+                    f.seek(write_pos)
+                    f.write(chunk)
+                    read_pos += len(chunk)
+                    write_pos += len(chunk)
+                f.truncate(write_pos)
+
+            new_size = log_path.stat().st_size
+            bytes_freed = original_size - new_size
 
-                # Write back
-                with open(log_path, "w", encoding="utf-8") as f:
-                    f.write(header)
-                    f.writelines(kept_lines)
-
-                new_size = log_path.stat().st_size
-                bytes_freed = original_size - new_size
-
-                logger.info(
-                    f"Trimmed {log_path.name}: {original_size/1024:.1f}KB -> {new_size/1024:.1f}KB"
-                )
-                self.stats["trimmed"] += 1
-                self.stats["bytes_freed"] += bytes_freed
+            logger.info(
+                f"Trimmed {log_path.name}: {original_size/1024:.1f}KB -> {new_size/1024:.1f}KB"
+            )
+            self._record("trimmed", bytes_freed)
 
-                return True, bytes_freed
-            else:
-                logger.debug(f"Log {log_path.name} has {len(lines)} lines, no trimming needed")
-                return True, 0
+            return True, bytes_freed
 
         except Exception as e:
             logger.error(f"Error trimming {log_path}: {e}")
-            self.stats["errors"].append(str(e))
+            self._record_error(e)
             return False, 0
 
     def archive_log(self, log_path: Path) -> Tuple[bool, int]:
         """Archive a log file by compressing it.
 
+        Compresses in streaming mode to a temporary file that is renamed
+        into place, so an interrupted run never leaves a truncated archive.
+
         Args:
             log_path: Path to the log file
 
@@ -223,12 +329,19 @@ class LogMaintenance:
         """
         original_size = log_path.stat().st_size
         archive_path = log_path.with_suffix(log_path.suffix + ".gz")
+        partial_path = archive_path.with_name(archive_path.name + ".part")
 
         try:
             # Compress the file
             with open(log_path, "rb") as f_in:
-                with gzip.open(archive_path, "wb") as f_out:
-                    shutil.copyfileobj(f_in, f_out)
+                with gzip.open(partial_path, "wb", compresslevel=6) as f_out:
+                    while True:
+                        chunk = f_in.read(BLOCK_SIZE)
+                        if not chunk:
+                            break
+                        self._limiter.consume(len(chunk))
+                        f_out.write(chunk)
+            os.replace(partial_path, archive_path)
 
             # Remove original
             log_path.unlink()
@@ -239,14 +352,17 @@ class LogMaintenance:
             logger.info(
                 f"Archived {log_path.name} -> {archive_path.name} ({bytes_freed/1024:.1f}KB freed)"
             )
-            self.stats["archived"] += 1
-            self.stats["bytes_freed"] += bytes_freed
+            self._record("archived", bytes_freed)
 
             return True, bytes_freed
 
         except Exception as e:
             logger.error(f"Error archiving {log_path}: {e}")
-            self.stats["errors"].append(str(e))
+            self._record_error(e)
+            try:
+                partial_path.unlink()
+            except OSError:
+                pass
             return False, 0
 
     def delete_old_archives(self) -> int:
@@ -265,12 +381,11 @@ class LogMaintenance:
                     size = archive.stat().st_size
                     archive.unlink()
                     deleted += 1
-                    self.stats["deleted"] += 1
-                    self.stats["bytes_freed"] += size
+                    self._record("deleted", size)
                     logger.info(f"Deleted old archive: {archive.name}")
             except Exception as e:
                 logger.error(f"Error deleting {archive}: {e}")
-                self.stats["errors"].append(str(e))
+                self._record_error(e)
 
         return deleted
 
@@ -307,13 +422,11 @@ class LogMaintenance:
         }
 
         if not dry_run:
-            # Trim oversized logs
-            for log in categorized[LogAction.TRIM]:
-                self.trim_log(log.path)
-
-            # Archive old logs
-            for log in categorized[LogAction.ARCHIVE]:
-                self.archive_log(log.path)
+            # Trim oversized logs and archive old ones, several files at a time
+            jobs = [(self.trim_log, log.path) for log in categorized[LogAction.TRIM]]
+            jobs += [(self.archive_log, log.path) for log in categorized[LogAction.ARCHIVE]]
+            with ThreadPoolExecutor(max_workers=max(1, self.policy.workers)) as pool:
+                list(pool.map(lambda job: job[0](job[1]), jobs))
 
             # Delete old archives
             self.delete_old_archives()
@@ -391,6 +504,10 @@ def main():
     clean_parser = subparsers.add_parser("clean-project", help="Full maintenance cycle")
     clean_parser.add_argument("--path", default=".", help="Project path")
     clean_parser.add_argument("--max-size", type=float, default=10.0, help="Max size in MB")
+    clean_parser.add_argument("--workers", type=int, default=4, help="Files processed in parallel")
+    clean_parser.add_argument(
+        "--max-rate", type=float, default=32.0, help="I/O cap in MB/s (0 = unlimited)"
+    )
     clean_parser.add_argument("--dry-run", action="store_true", help="Only show what would be done")
 
     args = parser.parse_args()
@@ -469,7 +586,11 @@ def main():
 
     elif args.command == "clean-project":
         path = Path(args.path).resolve()
-        policy = MaintenancePolicy(max_size_mb=args.max_size)
+        policy = MaintenancePolicy(
+            max_size_mb=args.max_size,
+            workers=args.workers,
+            max_bytes_per_sec=args.max_rate * 1024 * 1024,
+        )
         maintenance = LogMaintenance(path, policy)
 
         results = maintenance.run_maintenance(dry_run=args.dry_run)
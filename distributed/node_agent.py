@@ -40,6 +40,9 @@ from graceful_shutdown import GracefulShutdown, ShutdownReason
 DEFAULT_DASHBOARD_URL = "http://100.112.58.92:8080"
 HEARTBEAT_INTERVAL = 30  # seconds
 METRICS_INTERVAL = 60  # seconds
+ERROR_FLUSH_INTERVAL = 2  # seconds between error batch uploads
+ERROR_BATCH_SIZE = 500  # distinct errors per /api/errors/batch request
+ERROR_BUFFER_LIMIT = 5000  # distinct errors held while the dashboard is unreachable
 PID_FILE = Path("/tmp/architect_node_agent.pid")
 STATE_FILE = Path("/tmp/architect_node_agent_state.json")
 LOG_FILE = Path("/tmp/architect_node_agent.log")
@@ -53,6 +56,106 @@ logging.basicConfig(
 logger = logging.getLogger("NodeAgent")
 
 
+class ErrorReportBuffer:
+    """
+    Client-side buffer behind NodeAgent.report_error().
+
+    Identical errors (same type, message and source) are coalesced into one
+    report with an occurrences count, and a daemon thread uploads the buffer
+    as NDJSON to /api/errors/batch every flush_interval seconds, or sooner
+    once batch_size distinct errors are waiting. Failed uploads stay
+    buffered for the next attempt; past limit, new distinct errors are
+    dropped and counted.
+    """
+
+    def __init__(
+        self,
+        send,
+        flush_interval: float = ERROR_FLUSH_INTERVAL,
+        batch_size: int = ERROR_BATCH_SIZE,
+        limit: int = ERROR_BUFFER_LIMIT,
+    ):
+        self._send = send  # callable(list of report dicts) -> bool
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.limit = limit
+        self._pending: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self.dropped = 0
+
+    def add(self, report: Dict[str, Any]) -> bool:
+        """Buffer a report; returns False if it was dropped."""
+        key = (report.get("error_type"), report.get("message"), report.get("source"))
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                pending["occurrences"] += 1
+                if "context" in report:
+                    pending["context"] = report["context"]
+            elif len(self._pending) >= self.limit:
+                self.dropped += 1
+                return False
+            else:
+                self._pending[key] = {**report, "occurrences": 1}
+            full = len(self._pending) >= self.batch_size
+            if self._thread is None and not self._stopped:
+                self._thread = threading.Thread(
+                    target=self._run, name="error-report-buffer", daemon=True
+                )
+                self._thread.start()
+        if full:
+            self._wake.set()
+        return True
+
+    def pending(self) -> int:
+        """Distinct errors waiting to be sent."""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> bool:
+        """Send everything buffered; returns False if an upload failed."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        items = list(batch.items())
+        for start in range(0, len(items), self.batch_size):
+            chunk = items[start : start + self.batch_size]
+            if not self._send([report for _, report in chunk]):
+                self._requeue(items[start:])
+                return False
+        return True
+
+    def close(self):
+        """Stop the upload thread and make a final flush."""
+        with self._lock:
+            self._stopped = True
+            thread, self._thread = self._thread, None
+        self._wake.set()
+        if thread is not None:
+            thread.join(10)
+        self.flush()
+
+    def _requeue(self, items):
+        with self._lock:
+            for key, report in items:
+                current = self._pending.get(key)
+                if current is not None:
+                    report["occurrences"] += current["occurrences"]
+                    if "context" in current:
+                        report["context"] = current["context"]
+                self._pending[key] = report
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._stopped:
+                break
+            self.flush()
+
+
 class NodeAgent:
     """
     Agent that runs on each cluster node.
@@ -90,6 +193,9 @@ class NodeAgent:
 
         self._lock = threading.Lock()
 
+        # Errors are coalesced and uploaded in batches
+        self._errors = ErrorReportBuffer(self._send_error_batch)
+
         # Graceful shutdown handler
         self._shutdown = GracefulShutdown(
             worker_id=self.node_id,
@@ -118,6 +224,12 @@ class NodeAgent:
         """Called during final cleanup phase."""
         logger.info(f"Cleaning up node agent {self.node_id}")
 
+        # Upload errors still buffered
+        try:
+            self._errors.close()
+        except Exception:
+            pass
+
         # Mark node as offline
         try:
             self._send_request(
@@ -386,14 +498,39 @@ class NodeAgent:
             return False
 
     def report_error(self, error_type: str, message: str, **kwargs) -> bool:
-        """Report an error to the dashboard."""
-        result = self._send_request(
-            "/errors",
-            "POST",
-            {"node_id": self.node_id, "error_type": error_type, "message": message, **kwargs},
+        """Report an error to the dashboard.
+
+        Reports are buffered and sent in batches; returns False only if the
+        buffer is full and the report was dropped. Object and list values
+        (e.g. a structured context) are sent as JSON text.
+        """
+        fields = {
+            key: json.dumps(value, default=str) if isinstance(value, (dict, list, tuple)) else value
+            for key, value in kwargs.items()
+        }
+        return self._errors.add(
+            {"node_id": self.node_id, "error_type": error_type, "message": message, **fields}
         )
 
-        return result is not None
+    def _send_error_batch(self, reports: List[Dict]) -> bool:
+        """Upload reports as NDJSON to /api/errors/batch."""
+        try:
+            import urllib.error
+            import urllib.request
+
+            body = "\n".join(json.dumps(report, default=str) for report in reports)
+            req = urllib.request.Request(
+                f"{self.dashboard_url}/api/errors/batch",
+                data=body.encode("utf-8"),
+                headers={"Content-Type": "application/x-ndjson"},
+                method="POST",
+            )
+            with urllib.request.urlopen(req, timeout=10) as response:
+                return 200 <= response.status < 300
+
+        except Exception as e:
+            logger.debug(f"Error batch upload failed: {e}")
+            return False
 
     def _save_state(self):
         """Save agent state to file."""
@@ -0,0 +1,205 @@
+"""
+Streaming Export Module
+
+Serialises query results in fixed-size batches so export endpoints use the
+same amount of memory for ten rows or a million. Rows are pulled from SQLite
+with fetchmany() and written out as they arrive; nothing holds the full
+result set.
+
+Features:
+- iter_batches(): fetchmany() generator that owns (and closes) its connection
+- csv_chunks() / ndjson_chunks(): text chunks for a streamed Flask response
+- json_document_chunks(): a single JSON document with the rows in an array
+- write_xlsx(): write-only (constant memory) openpyxl workbook
+
+Usage:
+    from export_stream import csv_chunks, iter_batches
+
+    batches = iter_batches(get_db_connection, "SELECT * FROM task_queue")
+    return Response(stream_with_context(csv_chunks(batches)), mimetype="text/csv")
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", "1000"))
+
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# (column names, rows) as produced by iter_batches()
+Batch = Tuple[List[str], List[Sequence]]
+
+
+def iter_batches(
+    connect: Callable, query: str, params: Sequence = (), batch_size: int = None
+) -> Iterator[Batch]:
+    """Run a query and yield its rows in fetchmany() batches.
+
+    The connection is opened lazily and closed when the generator finishes or
+    is closed, so it lives exactly as long as the streamed response.
+
+    Args:
+        connect: Callable returning a new sqlite3 connection
+        query: SQL query
+        params: Query parameters
+        batch_size: Rows per batch (default: EXPORT_BATCH_SIZE)
+
+    Yields:
+        (columns, rows) tuples; at least one, possibly with no rows, so callers
+        can always emit a header
+    """
+    batch_size = batch_size or EXPORT_BATCH_SIZE
+    conn = connect()
+    try:
+        # Plain tuples are cheaper than sqlite3.Row for serialisation
+        conn.row_factory = None
+        cursor = conn.execute(query, params)
+        columns = [d[0] for d in cursor.description]
+        rows = cursor.fetchmany(batch_size)
+        yield columns, rows
+        while rows:
+            rows = cursor.fetchmany(batch_size)
+            if rows:
+                yield columns, rows
+    finally:
+        conn.close()
+
+
+def drop_columns(batches: Iterable[Batch], names: Iterable[str]) -> Iterator[Batch]:
+    """Remove columns from every batch."""
+    names = set(names)
+    for columns, rows in batches:
+        keep = [i for i, c in enumerate(columns) if c not in names]
+        if len(keep) == len(columns):
+            yield columns, rows
+            continue
+        yield [columns[i] for i in keep], [[row[i] for i in keep] for row in rows]
+
+
+def iter_dicts(
+    batches: Iterable[Batch], transform: Callable[[Dict], Dict] = None
+) -> Iterator[List[Dict]]:
+    """Convert batches of tuples into batches of dicts."""
+    for columns, rows in batches:
+        items = [dict(zip(columns, row)) for row in rows]
+        if transform:
+            items = [transform(item) for item in items]
+        yield items
+
+
+def csv_chunks(batches: Iterable[Batch]) -> Iterator[str]:
+    """Yield CSV text: the header, then one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    header_written = False
+    for columns, rows in batches:
+        if not header_written:
+            writer.writerow(columns)
+            header_written = True
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def ndjson_chunks(dict_batches: Iterable[List[Dict]]) -> Iterator[str]:
+    """Yield newline-delimited JSON, one chunk per batch."""
+    for items in dict_batches:
+        if items:
+            yield "".join(json.dumps(item, default=str) + "\n" for item in items)
+
+
+def json_document_chunks(
+    head: Dict, key: str, dict_batches: Iterable[List[Dict]], count_key: str = "total_count"
+) -> Iterator[str]:
+    """Yield a single JSON object with the rows streamed into an array.
+
+    The fields in `head` come first, then `key` holding every row. The row
+    count is only known at the end, so `count_key` is written after the array.
+
+    Args:
+        head: Fields written before the array (e.g. exported_at, filters)
+        key: Name of the array field
+        dict_batches: Batches of dicts from iter_dicts()
+        count_key: Field that receives the number of rows (None to omit)
+    """
+    opening = json.dumps(head, default=str)[:-1]
+    yield f"{opening}{', ' if head else ''}{json.dumps(key)}: ["
+    count = 0
+    for items in dict_batches:
+        if not items:
+            continue
+        encoded = ",\n".join(json.dumps(item, default=str) for item in items)
+        yield ("\n" if count == 0 else ",\n") + encoded
+        count += len(items)
+    closing = f", {json.dumps(count_key)}: {count}" if count_key else ""
+    yield f"\n]{closing}}}"
+
+
+def _excel_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return value
+
+
+def write_xlsx(sheets: Iterable[Tuple[str, Iterable[Batch]]], fileobj) -> Optional[int]:
+    """Write sheets to an XLSX file using openpyxl's write-only mode.
+
+    Write-only worksheets stream rows to disk as they are appended, so memory
+    does not grow with the row count. Sheets without rows are skipped; a
+    workbook with no data gets a single "Empty" sheet.
+
+    Args:
+        sheets: (title, batches) pairs; batches as produced by iter_batches()
+        fileobj: Binary file object or path to save the workbook to
+
+    Returns:
+        Number of data rows written, or None if openpyxl is not installed
+    """
+    try:
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Border, Font, PatternFill, Side
+        from openpyxl.utils import get_column_letter
+    except ImportError:
+        return None
+
+    wb = Workbook(write_only=True)
+    hfont = Font(bold=True, color="FFFFFF")
+    hfill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    thin = Side(style="thin")
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+
+    total = 0
+    for title, batches in sheets:
+        ws = None
+        for columns, rows in batches:
+            if not rows:
+                continue
+            if ws is None:
+                ws = wb.create_sheet(title=title[:31])
+                # Widths and panes must be set before the first row is written
+                for ci, h in enumerate(columns, 1):
+                    ws.column_dimensions[get_column_letter(ci)].width = min(max(len(h), 10), 50) + 2
+                ws.freeze_panes = "A2"
+                header = []
+                for h in columns:
+                    cell = WriteOnlyCell(ws, value=h.replace("_", " ").title())
+                    cell.font, cell.fill, cell.border = hfont, hfill, border
+                    header.append(cell)
+                ws.append(header)
+            for row in rows:
+                ws.append([_excel_value(v) for v in row])
+            total += len(rows)
+
+    if not wb.sheetnames:
+        wb.create_sheet("Empty").append(["No data"])
+    wb.save(fileobj)
+    logger.debug(f"Wrote XLSX export with {total} rows")
+    return total
@@ -0,0 +1,180 @@
+"""
+Import Profiling Module
+
+Measures what a cold worker pays to import the app: wall time, peak RSS and
+per-module import time (from `python -X importtime`). Each measurement runs
+in a fresh interpreter so nothing is shared with the calling process.
+
+Usage:
+    python app.py --import-profile
+    python import_profile.py --target app --top 25
+
+    from import_profile import compare_lazy_routes
+    report = compare_lazy_routes("app")
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BASE_DIR = Path(__file__).parent
+
+# Runs in the child interpreter; prints wall time and peak RSS as JSON
+_CHILD_SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {target}
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+    rss_kb //= 1024
+print("IMPORT_PROFILE " + json.dumps({{"wall_ms": elapsed * 1000, "rss_kb": rss_kb}}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """Parse `-X importtime` output into per-module timings.
+
+    Returns:
+        List of {"module", "self_ms", "cumulative_ms", "depth"}
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue
+        raw_name = parts[2].rstrip()
+        stripped = raw_name.lstrip()
+        modules.append(
+            {
+                "module": stripped,
+                "self_ms": self_us / 1000,
+                "cumulative_ms": cumulative_us / 1000,
+                "depth": (len(raw_name) - len(stripped) - 1) // 2,
+            }
+        )
+    return modules
+
+
+def _run_child(target: str, child_env: Dict[str, str]):
+    """Run one cold import; returns (summary, importtime stderr)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD_SCRIPT.format(target=target)],
+        cwd=str(BASE_DIR),
+        env=child_env,
+        capture_output=True,
+        text=True,
+    )
+    summary = None
+    for line in result.stdout.splitlines():
+        if line.startswith("IMPORT_PROFILE "):
+            summary = json.loads(line[len("IMPORT_PROFILE ") :])
+    if summary is None:
+        raise RuntimeError(f"Importing {target} failed:\n{result.stderr[-2000:]}")
+    return summary, result.stderr
+
+
+def profile_import(
+    target: str = "app", env: Optional[Dict[str, str]] = None, runs: int = 1
+) -> Dict:
+    """Import a module in fresh interpreters and measure the cost.
+
+    Args:
+        target: Module to import
+        env: Extra environment variables for the child process
+        runs: Number of cold imports; wall time and RSS are the median
+
+    Returns:
+        {"target", "wall_ms", "rss_mb", "runs", "modules"} with modules (from
+        the last run) sorted by cumulative import time
+    """
+    child_env = {**os.environ, **(env or {})}
+    summaries = []
+    for _ in range(max(1, runs)):
+        summary, stderr = _run_child(target, child_env)
+        summaries.append(summary)
+
+    modules = parse_importtime(stderr)
+    modules.sort(key=lambda m: m["cumulative_ms"], reverse=True)
+    return {
+        "target": target,
+        "wall_ms": round(statistics.median(s["wall_ms"] for s in summaries), 1),
+        "rss_mb": round(statistics.median(s["rss_kb"] for s in summaries) / 1024, 1),
+        "runs": len(summaries),
+        "modules": modules,
+    }
+
+
+def compare_lazy_routes(target: str = "app", runs: int = 3) -> Dict:
+    """Profile the import with lazy routes disabled (before) and enabled (after)."""
+    before = profile_import(target, {"LAZY_ROUTES": "false"}, runs)
+    after = profile_import(target, {"LAZY_ROUTES": "true"}, runs)
+    return {
+        "before": before,
+        "after": after,
+        "wall_ms_saved": round(before["wall_ms"] - after["wall_ms"], 1),
+        "rss_mb_saved": round(before["rss_mb"] - after["rss_mb"], 1),
+    }
+
+
+def format_report(report: Dict, top: int = 20) -> str:
+    """Render a compare_lazy_routes() report as text."""
+    before, after = report["before"], report["after"]
+
+    def row(label, *values):
+        return f"{label:<22}" + "".join(f"{value:>12}" for value in values)
+
+    lines = [
+        f"Import profile for '{after['target']}' (median of {after['runs']} cold starts)",
+        "",
+        row("", "eager", "lazy", "saved"),
+        row("cold start (ms)", before["wall_ms"], after["wall_ms"], report["wall_ms_saved"]),
+        row("peak RSS (MB)", before["rss_mb"], after["rss_mb"], report["rss_mb_saved"]),
+        "",
+        f"Top {top} direct imports of '{after['target']}' (lazy, cumulative ms):",
+    ]
+    direct = [m for m in after["modules"] if m["depth"] == 1]
+    for module in direct[:top]:
+        lines.append(
+            f"  {module['cumulative_ms']:>9.1f}  {module['self_ms']:>9.1f}  {module['module']}"
+        )
+
+    deferred = {m["module"] for m in before["modules"]} - {m["module"] for m in after["modules"]}
+    if deferred:
+        lines.append("")
+        lines.append(f"Deferred until first use ({len(deferred)} modules):")
+        for name in sorted(n for n in deferred if "." not in n or n.count(".") == 1)[:top]:
+            lines.append(f"  {name}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Profile app import cost")
+    parser.add_argument("--target", default="app", help="Module to import")
+    parser.add_argument("--top", type=int, default=20, help="Modules to list")
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts per mode")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON")
+    args = parser.parse_args(argv)
+
+    report = compare_lazy_routes(args.target, args.runs)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_report(report, args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
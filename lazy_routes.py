@@ -0,0 +1,216 @@
+"""
+Lazy Route Loading Module
+
+Defers importing route groups and feature modules until they are first used,
+so gunicorn workers, test runs and CLIs that import app.py do not pay for
+modules they never touch.
+
+Features:
+- lazy_import(): module proxy that imports on first attribute access
+- LazyBlueprintLoader: registers a blueprint by URL prefix and imports its
+  module on the first request under that prefix
+- LAZY_ROUTES=false switches both back to eager imports (used by
+  `app.py --import-profile` for before/after comparisons)
+
+Usage:
+    from lazy_routes import LazyBlueprintLoader, lazy_import
+
+    portfolio = lazy_import("portfolio")
+
+    loader = LazyBlueprintLoader(app)
+    loader.add("/api/todos", "routes.todos", "todos_bp")
+"""
+
+import importlib
+import importlib.util
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+from flask import abort, current_app, request
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import Map
+
+logger = logging.getLogger(__name__)
+
+LAZY_ROUTES_ENABLED = os.environ.get("LAZY_ROUTES", "true").lower() == "true"
+
+# Methods accepted by the placeholder rule; the real rules decide what is allowed
+_PLACEHOLDER_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE"]
+
+
+def _import(name: str):
+    """Import a module through __import__ so `-X importtime` records it."""
+    __import__(name)
+    return sys.modules[name]
+
+
+def lazy_import(name: str):
+    """Import a module, deferring execution until an attribute is accessed.
+
+    Args:
+        name: Module name (e.g. "portfolio")
+
+    Returns:
+        The module (loaded lazily when LAZY_ROUTES is enabled)
+    """
+    if name in sys.modules or not LAZY_ROUTES_ENABLED:
+        return _import(name)
+
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        # Let the normal import raise the usual ImportError
+        return _import(name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class LazyBlueprintLoader:
+    """Registers blueprints by URL prefix and imports them on first request."""
+
+    def __init__(self, app, enabled: bool = None):
+        self.app = app
+        self.enabled = LAZY_ROUTES_ENABLED if enabled is None else enabled
+        # {name: {"prefix", "module", "attr", "loaded", "import_ms", "error"}}
+        self._groups: Dict[str, Dict] = {}
+        # Per-group url maps used by the placeholder after the group is loaded
+        self._group_maps: Dict[str, Map] = {}
+        self._lock = threading.RLock()
+
+    def add(self, url_prefix: str, module: str, attr: str) -> Optional[str]:
+        """Register a route group.
+
+        Args:
+            url_prefix: URL prefix served exclusively by the blueprint
+            module: Module that defines the blueprint
+            attr: Blueprint attribute name in the module
+
+        Returns:
+            Group name, or None if an eager import failed
+        """
+        name = attr
+        self._groups[name] = {
+            "prefix": url_prefix.rstrip("/"),
+            "module": module,
+            "attr": attr,
+            "loaded": False,
+            "import_ms": None,
+            "error": None,
+        }
+
+        if not self.enabled:
+            return name if self.load(name) else None
+
+        endpoint = self._placeholder_endpoint(name)
+        view = self._make_placeholder(name)
+        prefix = self._groups[name]["prefix"]
+        self.app.add_url_rule(prefix, endpoint, view, methods=_PLACEHOLDER_METHODS)
+        self.app.add_url_rule(
+            f"{prefix}/<path:_lazy_path>", endpoint, view, methods=_PLACEHOLDER_METHODS
+        )
+        return name
+
+    def load(self, name: str) -> bool:
+        """Import and register a group's blueprint if it is not loaded yet."""
+        group = self._groups[name]
+        if group["loaded"]:
+            return True
+
+        with self._lock:
+            if group["loaded"]:
+                return True
+
+            start = time.perf_counter()
+            try:
+                blueprint = getattr(_import(group["module"]), group["attr"])
+            except ImportError as e:
+                group["error"] = str(e)
+                print(f"Warning: Could not load {group['module']} blueprint: {e}")
+                return False
+            group["import_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+            # Flask rejects setup methods once it has served a request. Late
+            # registration is safe here: it only adds rules and view functions
+            # and is serialized by the loader lock.
+            got_first_request = self.app._got_first_request
+            self.app._got_first_request = False
+            try:
+                self.app.register_blueprint(blueprint)
+            finally:
+                self.app._got_first_request = got_first_request
+
+            if self.enabled:
+                self._group_maps[name] = self._build_group_map(blueprint.name)
+            group["loaded"] = True
+            logger.info(f"Loaded route group {name} ({group['prefix']}) in {group['import_ms']}ms")
+            return True
+
+    def load_all(self) -> List[str]:
+        """Load every registered group. Returns the names loaded successfully."""
+        return [name for name in list(self._groups) if self.load(name)]
+
+    def get_status(self) -> Dict[str, Dict]:
+        """Loaded state and import time for each group."""
+        return {name: dict(group) for name, group in self._groups.items()}
+
+    def _placeholder_endpoint(self, name: str) -> str:
+        return f"_lazy_routes_{name}"
+
+    def _build_group_map(self, blueprint_name: str) -> Map:
+        """Copy a blueprint's rules into a standalone map.
+
+        The placeholder rules stay in app.url_map (rebuilding a ~1000 rule
+        map on every lazy load costs more than the import saves). Concrete
+        blueprint rules always outrank the placeholder's <path:> rule, so the
+        placeholder is only reached for paths the group does not define, a
+        wrong method, or a missing trailing slash; matching against this map
+        turns those into the same 404/405/redirect eager registration gives.
+        """
+        old_map = self.app.url_map
+        group_map = Map(
+            strict_slashes=old_map.strict_slashes,
+            merge_slashes=old_map.merge_slashes,
+            redirect_defaults=old_map.redirect_defaults,
+            host_matching=old_map.host_matching,
+        )
+        group_map.converters = old_map.converters
+        for rule in old_map.iter_rules():
+            if rule.endpoint.startswith(f"{blueprint_name}."):
+                copy = rule.empty()
+                # Set by Flask after Rule creation, not carried over by empty()
+                copy.provide_automatic_options = getattr(rule, "provide_automatic_options", False)
+                group_map.add(copy)
+        return group_map
+
+    def _make_placeholder(self, name: str):
+        """View that loads the group and re-dispatches the current request."""
+
+        def placeholder(**_kwargs):
+            if not self.load(name):
+                abort(404)
+
+            adapter = self._group_maps[name].bind_to_environ(request.environ)
+            try:
+                rule, view_args = adapter.match(return_rule=True)
+            except HTTPException as e:
+                return e
+
+            request.url_rule = rule
+            request.view_args = view_args
+            for blueprint_name in request.blueprints:
+                for func in current_app.before_request_funcs.get(blueprint_name, ()):
+                    rv = current_app.ensure_sync(func)()
+                    if rv is not None:
+                        return rv
+            return current_app.dispatch_request()
+
+        placeholder.__name__ = f"lazy_{name}"
+        return placeholder
@@ -28,6 +28,8 @@ from mcp.types import TextContent, Tool
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from workers.assigner_events import notify_assigner  # noqa: E402
+
 app = Server("assigner-architect")
 
 # Database path
@@ -205,6 +207,7 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         prompt_id = cursor.lastrowid
         conn.commit()
         conn.close()
+        notify_assigner()
 
         return [
             TextContent(
@@ -318,6 +321,7 @@ Timeout: {prompt.get('timeout_minutes', 30)} minutes
             return [
                 TextContent(type="text", text=f"❌ Prompt {prompt_id} not found")
             ]
+        notify_assigner()
 
         return [
             TextContent(
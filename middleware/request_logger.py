@@ -3,15 +3,17 @@ Request Logging Middleware for Flask
 
 Provides comprehensive request/response logging for debugging with:
 - Configurable log levels (debug, info, minimal)
-- In-memory log buffer for API access
-- File logging for persistent debugging
-- Request timing and performance metrics
+- In-memory ring buffer for API access (deque appends, no trimming)
+- Batched, size-rotated file logging from a background writer thread
+- Per-route latency histograms (p50/p95/p99) and a top-K slow request heap
 - Automatic sensitive data masking
 
 Configuration via environment variables:
     REQUEST_LOG_ENABLED: Enable/disable logging (default: true)
     REQUEST_LOG_LEVEL: Log level - debug, info, minimal (default: info)
     REQUEST_LOG_FILE: Log file path (default: /tmp/architect_requests.log)
+    REQUEST_LOG_MAX_BYTES: Rotate the log file at this size (default: 10485760)
+    REQUEST_LOG_BACKUPS: Rotated files to keep (default: 3)
     REQUEST_LOG_MAX_BODY: Max body size to log (default: 1000)
     REQUEST_LOG_EXCLUDE: Comma-separated paths to exclude (default: /health,/socket.io)
 
@@ -25,12 +27,16 @@ Usage:
     logs = get_request_logs(limit=100)
 """
 
+import atexit
+import heapq
+import itertools
 import json
 import logging
 import os
 import threading
 import time
 import uuid
+from collections import deque
 from datetime import datetime
 from functools import wraps
 from pathlib import Path
@@ -38,6 +44,8 @@ from typing import Dict, List, Optional
 
 from flask import Flask, g, request
 
+from db import LatencyHistogram
+
 logger = logging.getLogger(__name__)
 
 # Configuration
@@ -45,26 +53,43 @@ REQUEST_LOG_ENABLED = os.environ.get("REQUEST_LOG_ENABLED", "true").lower() == "
 REQUEST_LOG_LEVEL = os.environ.get("REQUEST_LOG_LEVEL", "info").lower()
 REQUEST_LOG_FILE = Path(os.environ.get("REQUEST_LOG_FILE", "/tmp/architect_requests.log"))
 REQUEST_LOG_MAX_BODY = int(os.environ.get("REQUEST_LOG_MAX_BODY", 1000))
+REQUEST_LOG_MAX_BYTES = int(os.environ.get("REQUEST_LOG_MAX_BYTES", 10 * 1024 * 1024))
+REQUEST_LOG_BACKUPS = int(os.environ.get("REQUEST_LOG_BACKUPS", 3))
 REQUEST_LOG_EXCLUDE = set(
     filter(
         None, os.environ.get("REQUEST_LOG_EXCLUDE", "/health,/api/metrics,/socket.io").split(",")
     )
 )
 
-# In-memory circular buffer for recent logs
-_log_buffer: List[Dict] = []
+# In-memory ring buffer for recent logs; deque.append is atomic, so writers
+# never take a lock and the oldest entry falls off for free
 _log_buffer_size = 500
-_log_lock = threading.Lock()
+_log_buffer: deque = deque(maxlen=_log_buffer_size)
+
+# Slow request tracking: min-heap of the SLOW_TOP_K slowest requests over the threshold
+SLOW_REQUEST_MS = 100
+SLOW_TOP_K = 20
+
+# Routes tracked separately; the rest share one histogram
+MAX_ROUTES = 200
+OTHER_ROUTE = "<other>"
+
+
+def _new_stats() -> Dict:
+    return {
+        "total_requests": 0,
+        "total_errors": 0,
+        "status_counts": {},
+        "slowest": [],  # heap of (duration_ms, seq, entry)
+        "latency": LatencyHistogram(),
+        "routes": {},  # route -> LatencyHistogram
+    }
+
 
 # Statistics
-_stats = {
-    "total_requests": 0,
-    "total_errors": 0,
-    "avg_duration_ms": 0,
-    "status_counts": {},
-    "slowest_requests": [],
-}
+_stats = _new_stats()
 _stats_lock = threading.Lock()
+_slow_seq = itertools.count()
 
 
 def _should_log(path: str) -> bool:
@@ -86,15 +111,23 @@ def _mask_sensitive(headers: dict) -> dict:
 
 
 def _add_to_buffer(entry: dict):
-    """Add log entry to circular buffer."""
-    with _log_lock:
-        _log_buffer.append(entry)
-        while len(_log_buffer) > _log_buffer_size:
-            _log_buffer.pop(0)
+    """Add log entry to the ring buffer."""
+    _log_buffer.append(entry)
+
 
+def _snapshot_buffer() -> List[Dict]:
+    """Copy the ring buffer, retrying if an append lands mid-copy."""
+    while True:
+        try:
+            return list(_log_buffer)
+        except RuntimeError:  # deque mutated during iteration
+            continue
 
-def _update_stats(entry: dict):
+
+def _update_stats(entry: dict, route: str = None):
     """Update request statistics."""
+    duration_ms = entry["duration_ms"]
+    route = route or entry["path"]
     with _stats_lock:
         _stats["total_requests"] += 1
 
@@ -105,33 +138,175 @@ def _update_stats(entry: dict):
         status = str(entry["status"])
         _stats["status_counts"][status] = _stats["status_counts"].get(status, 0) + 1
 
-        # Update average duration (rolling average)
-        n = _stats["total_requests"]
-        old_avg = _stats["avg_duration_ms"]
-        _stats["avg_duration_ms"] = old_avg + (entry["duration_ms"] - old_avg) / n
-
-        # Track slowest requests
-        if entry["duration_ms"] > 100:  # Only track requests > 100ms
+        # Overall and per-route latency histograms
+        _stats["latency"].observe(duration_ms / 1000)
+        routes = _stats["routes"]
+        histogram = routes.get(route)
+        if histogram is None:
+            if len(routes) >= MAX_ROUTES:
+                route = OTHER_ROUTE
+            histogram = routes.setdefault(route, LatencyHistogram())
+        histogram.observe(duration_ms / 1000)
+
+        # Track slowest requests (fixed-size min-heap, O(log K) per slow hit)
+        slowest = _stats["slowest"]
+        if duration_ms > SLOW_REQUEST_MS and (
+            len(slowest) < SLOW_TOP_K or duration_ms > slowest[0][0]
+        ):
             slow_entry = {
                 "path": entry["path"],
                 "method": entry["method"],
-                "duration_ms": entry["duration_ms"],
+                "duration_ms": duration_ms,
                 "timestamp": entry["timestamp"],
             }
-            _stats["slowest_requests"].append(slow_entry)
-            _stats["slowest_requests"].sort(key=lambda x: x["duration_ms"], reverse=True)
-            _stats["slowest_requests"] = _stats["slowest_requests"][:20]
+            item = (duration_ms, next(_slow_seq), slow_entry)
+            if len(slowest) < SLOW_TOP_K:
+                heapq.heappush(slowest, item)
+            else:
+                heapq.heapreplace(slowest, item)
 
 
-def _write_to_file(entry: dict):
-    """Write log entry to file."""
+class RequestLogWriter:
+    """
+    Background writer that appends JSON lines to a size-rotated file.
+
+    Requests only enqueue their entry. A daemon thread drains the queue in
+    batches, writing each batch with a single write() to a file handle it
+    keeps open, and rotates the file (path.1 ... path.N) once it exceeds
+    max_bytes. If the writer falls behind, the oldest pending entries are
+    dropped and counted rather than growing memory.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = REQUEST_LOG_MAX_BYTES,
+        backups: int = REQUEST_LOG_BACKUPS,
+        flush_interval: float = 1.0,
+        max_pending: int = 10000,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self._pending: deque = deque(maxlen=max_pending)
+        self._wake = threading.Event()
+        self._done = threading.Condition()
+        self._started = 0  # write cycles begun
+        self._cycles = 0  # write cycles finished
+        self._stopped = False
+        self._file = None
+        self._size = 0
+        self.stats = {"written": 0, "batches": 0, "rotations": 0, "dropped": 0, "errors": 0}
+        self._thread = threading.Thread(target=self._run, name="request-log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, entry: dict):
+        """Queue an entry for the next batch."""
+        if len(self._pending) == self._pending.maxlen:
+            self.stats["dropped"] += 1
+        self._pending.append(entry)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Write everything queued so far; returns False on timeout."""
+        with self._done:
+            # A cycle already in progress may have drained the queue before our entries
+            target = self._started + 1
+            self._wake.set()
+            return self._done.wait_for(lambda: self._cycles >= target, timeout)
+
+    def close(self):
+        """Flush pending entries, stop the thread and close the file."""
+        self._stopped = True
+        self._wake.set()
+        self._thread.join(5.0)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            with self._done:
+                self._started += 1
+            self._write_pending()
+            with self._done:
+                self._cycles += 1
+                self._done.notify_all()
+            if self._stopped:
+                break
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _write_pending(self):
+        lines = []
+        while self._pending:
+            lines.append(json.dumps(self._pending.popleft(), default=str) + "\n")
+        if not lines:
+            return
+        try:
+            if self._file is None:
+                self._open()
+            data = "".join(lines)
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data.encode("utf-8"))
+            self.stats["written"] += len(lines)
+            self.stats["batches"] += 1
+            if self.max_bytes and self._size >= self.max_bytes:
+                self._rotate()
+        except OSError as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Failed to write request log: {e}")
+            if self._file is not None:
+                try:
+                    self._file.close()
+                except OSError:
+                    pass
+                self._file = None
+
+    def _open(self):
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        if self.backups > 0:
+            for i in range(self.backups - 1, 0, -1):
+                source = self.path.with_name(f"{self.path.name}.{i}")
+                if source.exists():
+                    source.replace(self.path.with_name(f"{self.path.name}.{i + 1}"))
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        self.stats["rotations"] += 1
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, "pending": len(self._pending), "file": str(self.path)}
+
+
+_writer: Optional[RequestLogWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_log_writer() -> Optional[RequestLogWriter]:
+    """The shared RequestLogWriter (None when file logging is disabled)."""
+    global _writer
     if not REQUEST_LOG_FILE:
-        return
-    try:
-        with open(REQUEST_LOG_FILE, "a") as f:
-            f.write(json.dumps(entry) + "\n")
-    except Exception as e:
-        logger.warning(f"Failed to write request log: {e}")
+        return None
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = RequestLogWriter(REQUEST_LOG_FILE)
+                atexit.register(_writer.close)
+    return _writer
+
+
+def _write_to_file(entry: dict):
+    """Queue a log entry for the background file writer."""
+    writer = get_log_writer()
+    if writer:
+        writer.write(entry)
 
 
 def init_request_logging(app: Flask):
@@ -207,9 +382,10 @@ def init_request_logging(app: Flask):
             log_msg += f" | Size: {response.content_length or 0}B"
         log_func(log_msg)
 
-        # Store in buffer and update stats
+        # Store in buffer and update stats (per route template, not raw path)
         _add_to_buffer(entry)
-        _update_stats(entry)
+        rule = request.url_rule.rule if request.url_rule else "<unmatched>"
+        _update_stats(entry, f"{request.method} {rule}")
 
         # Write to file
         if REQUEST_LOG_LEVEL in ["debug", "info"]:
@@ -294,8 +470,8 @@ def get_request_logs(
     Returns:
         List of log entries (newest first)
     """
-    with _log_lock:
-        logs = list(reversed(_log_buffer))
+    logs = _snapshot_buffer()
+    logs.reverse()
 
     # Apply filters
     if status is not None:
@@ -311,28 +487,35 @@ def get_request_logs(
 
 
 def get_request_stats() -> Dict:
-    """Get request statistics."""
+    """Get request statistics.
+
+    "latency" and "routes" hold count, mean and p50/p95/p99/max (ms) overall
+    and per route template ("GET /api/tasks/<int:task_id>").
+    """
     with _stats_lock:
-        return {
+        latency = _stats["latency"].summary()
+        slowest = sorted(_stats["slowest"], reverse=True)
+        stats = {
             "total_requests": _stats["total_requests"],
             "total_errors": _stats["total_errors"],
             "error_rate": round(_stats["total_errors"] / max(_stats["total_requests"], 1) * 100, 2),
-            "avg_duration_ms": round(_stats["avg_duration_ms"], 2),
+            "avg_duration_ms": round(latency["mean_ms"], 2),
             "status_counts": dict(_stats["status_counts"]),
-            "slowest_requests": list(_stats["slowest_requests"][:10]),
+            "slowest_requests": [item[2] for item in slowest[:10]],
+            "latency": latency,
+            "routes": {
+                route: histogram.summary() for route, histogram in sorted(_stats["routes"].items())
+            },
         }
+    writer = _writer
+    if writer:
+        stats["writer"] = writer.get_stats()
+    return stats
 
 
 def clear_request_logs():
     """Clear the request log buffer and reset stats."""
-    global _log_buffer, _stats
-    with _log_lock:
-        _log_buffer = []
+    global _stats
+    _log_buffer.clear()
     with _stats_lock:
-        _stats = {
-            "total_requests": 0,
-            "total_errors": 0,
-            "avg_duration_ms": 0,
-            "status_counts": {},
-            "slowest_requests": [],
-        }
+        _stats = _new_stats()
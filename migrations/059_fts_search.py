@@ -0,0 +1,50 @@
+"""
+Migration 059: Full-Text Search Index
+
+Adds SQLite FTS5 external-content indexes for search:
+- activity_fts over activity_log (action, entity_type, details)
+- task_fts over task_queue (task_type, task_data title and description)
+- error_fts over errors (error_type, message, source)
+- comment_fts over task_comments (content)
+- sync triggers for inserts, updates and deletes
+- backfill of all existing rows
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.search_index import (
+    SEARCH_SOURCES,
+    ensure_search_schema,
+    fts5_available,
+    rebuild_search_index,
+)
+
+DESCRIPTION = "Add FTS5 full-text search indexes with sync triggers"
+
+
+def upgrade(conn):
+    """Apply the migration."""
+    if not fts5_available(conn):
+        # Search keeps using LIKE on builds without FTS5
+        return
+
+    # Indexes that already existed are rebuilt too, so the backfill always
+    # reflects the current rows
+    built = ensure_search_schema(conn)
+    rebuild_search_index(conn, [name for name in SEARCH_SOURCES if name not in built])
+    conn.commit()
+
+
+def downgrade(conn):
+    """Rollback the migration."""
+    for source in SEARCH_SOURCES.values():
+        fts = source["fts"]
+        for event in ("insert", "delete", "update"):
+            conn.execute(f"DROP TRIGGER IF EXISTS trg_{fts}_{event}")
+        conn.execute(f"DROP TABLE IF EXISTS {fts}")
+    conn.execute("DROP VIEW IF EXISTS task_search_source")
+    conn.commit()
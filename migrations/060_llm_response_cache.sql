@@ -0,0 +1,17 @@
+-- Migration: LLM Response Cache Metrics
+-- Date: 2026-10-16
+-- Description: Daily hit/miss and savings totals for the LLM response cache.
+-- The cached responses themselves live in data/llm_cache.db (services/llm_cache.py).
+
+CREATE TABLE IF NOT EXISTS llm_cache_daily (
+    date TEXT PRIMARY KEY,  -- YYYY-MM-DD
+    memory_hits INTEGER DEFAULT 0,
+    disk_hits INTEGER DEFAULT 0,
+    coalesced INTEGER DEFAULT 0,  -- waited on an identical in-flight request
+    misses INTEGER DEFAULT 0,
+    evictions INTEGER DEFAULT 0,
+    tokens_saved INTEGER DEFAULT 0,
+    cost_saved_usd REAL DEFAULT 0.0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
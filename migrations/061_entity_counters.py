@@ -0,0 +1,37 @@
+"""
+Migration 061: Entity Counters
+
+Adds entity_counters, exact per-status row counts for the dashboard stats:
+- entity_counters table keyed by (entity, status)
+- insert, status-update and delete triggers on projects, milestones,
+  features, bugs, errors, nodes, task_queue and tmux_sessions
+- seeding from a full recount of every counted table
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.entity_counters import COUNTED_ENTITIES, ensure_counter_schema, rebuild_counters
+
+DESCRIPTION = "Add trigger-maintained entity_counters for dashboard stats"
+
+
+def upgrade(conn):
+    """Apply the migration."""
+    # Entities whose triggers already existed are recounted too, so the
+    # seed always reflects the current rows
+    seeded = ensure_counter_schema(conn)
+    rebuild_counters(conn, [entity for entity in COUNTED_ENTITIES if entity not in seeded])
+    conn.commit()
+
+
+def downgrade(conn):
+    """Rollback the migration."""
+    for entity in COUNTED_ENTITIES:
+        for event in ("insert", "update", "delete"):
+            conn.execute(f"DROP TRIGGER IF EXISTS trg_{entity}_{event}_counters")
+    conn.execute("DROP TABLE IF EXISTS entity_counters")
+    conn.commit()
@@ -0,0 +1,31 @@
+"""
+Migration 062: Error Hash
+
+Adds the deduplication key used by batched error ingestion:
+- errors.error_hash column (md5 of type:message:source)
+- backfill for open, queued and in-progress errors
+- unique partial index on error_hash over those active statuses
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.error_ingest import ERROR_HASH_INDEX, ensure_error_hash_schema
+
+DESCRIPTION = "Add errors.error_hash with a unique index over active errors"
+
+
+def upgrade(conn):
+    """Apply the migration."""
+    ensure_error_hash_schema(conn)
+    conn.commit()
+
+
+def downgrade(conn):
+    """Rollback the migration."""
+    conn.execute(f"DROP INDEX IF EXISTS {ERROR_HASH_INDEX}")
+    # SQLite cannot drop columns on older versions; error_hash is left in place
+    conn.commit()
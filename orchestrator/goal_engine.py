@@ -39,6 +39,7 @@ BASE_DIR = ORCHESTRATOR_DIR.parent
 sys.path.insert(0, str(BASE_DIR))
 
 from db import get_connection
+from workers.assigner_events import notify_assigner
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("GoalEngine")
@@ -966,6 +967,7 @@ class GoalEngine:
             task_id = cursor.lastrowid
             conn.commit()
             conn.close()
+            notify_assigner()
 
             logger.info(
                 f"✓ Queued task {task_id}: {task.content[:60]}... "
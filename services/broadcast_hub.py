@@ -0,0 +1,759 @@
+"""
+Broadcast Hub
+
+Shared fan-out for SSE streams and Socket.IO room events. An event is
+serialized once, appended to a log in the main database and picked up by
+one asyncio loop per worker process, so an event published in any worker
+reaches clients connected to every other worker.
+
+Features:
+- broadcast_events log as the cross-process backbone; publishes are written
+  in one transaction per loop tick and pruned to a fixed retention
+- One loop thread per process tails the log, encodes each SSE frame once
+  and hands the same bytes to every subscriber of the channel
+- Subscribers are asyncio queues on that loop, so an idle stream is a
+  suspended coroutine rather than a thread polling its own queue
+- iter_stream() serves a stream from WSGI: the stream runs as a task on
+  the hub loop and hands frames to the response iterator. Under eventlet
+  the iterator waits as a greenthread woken through the eventlet hub, so
+  idle clients cost no OS thread and never block the hub; under a
+  threaded server each open stream still holds its request thread
+- Last-Event-ID resume from an in-memory replay buffer, falling back to
+  the log; sequence numbers are shared by all processes
+- Per-channel coalescing: rapid publishes (e.g. "stats") collapse into the
+  latest payload, at most one per interval
+- Listeners (such as the Socket.IO bridge) see every event; channels that
+  start with "_" are internal and never reach "all" subscribers
+
+Usage:
+    from services.broadcast_hub import ensure_broadcast_schema, get_broadcast_hub
+
+    ensure_broadcast_schema(conn)  # once, from init_database()
+
+    hub = get_broadcast_hub(db_path, coalesce={"stats": 1.0})
+    hub.publish("stats", {"bugs": 4})
+
+    # WSGI response body of encoded SSE frames
+    return Response(hub.iter_stream(["stats", "errors"], last_event_id="1041"))
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Subscribing to this channel receives every non-internal channel
+ALL_CHANNELS = "all"
+
+# Channels with this prefix only reach listeners and explicit subscribers
+INTERNAL_PREFIX = "_"
+
+# Log rows kept for Last-Event-ID resume across processes
+EVENT_RETENTION = 5000
+
+# Recent events kept in memory per process for resume without a query
+REPLAY_BUFFER = 1000
+
+# Undelivered events a subscriber may hold before it is disconnected
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Seconds between heartbeat frames on an idle stream
+HEARTBEAT_INTERVAL = 30.0
+
+# Log rows read per loop tick
+READ_BATCH = 500
+
+_BROADCAST_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS broadcast_events (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        channel TEXT NOT NULL,
+        data TEXT NOT NULL,
+        created_at REAL NOT NULL
+    )
+"""
+
+
+def ensure_broadcast_schema(conn: sqlite3.Connection) -> None:
+    """Create the broadcast event log. Safe to call on every startup."""
+    conn.execute(_BROADCAST_SCHEMA)
+
+
+def sse_frame(event: str, data: str, event_id: Optional[int] = None) -> bytes:
+    """Encode one Server-Sent Events frame."""
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines.append(f"event: {event}")
+    lines.extend(f"data: {line}" for line in data.split("\n"))
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+class BroadcastEvent:
+    """A logged event with its SSE frame encoded once."""
+
+    __slots__ = ("seq", "channel", "data", "frame")
+
+    def __init__(self, seq: int, channel: str, data: str):
+        self.seq = seq
+        self.channel = channel
+        self.data = data
+        self.frame = sse_frame(channel, data, seq)
+
+
+class Subscription:
+    """One stream's channels and queue on the hub loop."""
+
+    def __init__(self, channels: Iterable[str], queue_size: int):
+        self.id = f"sse-{uuid.uuid4().hex[:12]}"
+        self.channels = frozenset(channels)
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.connected_at = datetime.now().isoformat()
+        self.last_seq = 0
+        self.inbox: Optional["_Inbox"] = None  # Set for streams read through iter_stream()
+
+    def wants(self, channel: str) -> bool:
+        if channel in self.channels:
+            return True
+        return ALL_CHANNELS in self.channels and not channel.startswith(INTERNAL_PREFIX)
+
+
+def _parse_event_id(value: Any) -> Optional[int]:
+    try:
+        return int(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+class _ThreadWaker:
+    """Wakes a WSGI reader blocked in a thread."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def clear(self) -> None:
+        self._event.clear()
+
+    def wait(self) -> None:
+        self._event.wait()
+
+    def wake(self) -> None:
+        self._event.set()
+
+
+class _GreenRelay:
+    """Runs callbacks in an eventlet hub's thread on behalf of other threads.
+
+    Eventlet primitives are not thread-safe and app.py does not monkey-patch,
+    so the hub loop never touches them directly: it queues a callback and
+    writes a byte to a pipe that one greenthread waits on through the
+    eventlet hub.
+    """
+
+    def __init__(self):
+        import eventlet
+
+        self._calls: deque = deque()
+        self._lock = threading.Lock()
+        self._signalled = False
+        self._read_fd, self._write_fd = os.pipe()
+        os.set_blocking(self._read_fd, False)
+        os.set_blocking(self._write_fd, False)
+        eventlet.spawn(self._run)
+
+    def call(self, callback: Callable[[], None]) -> None:
+        """Run callback soon in the eventlet hub's thread (any thread may call)."""
+        with self._lock:
+            self._calls.append(callback)
+            if self._signalled:
+                return
+            self._signalled = True
+        try:
+            os.write(self._write_fd, b"\0")
+        except BlockingIOError:
+            pass  # A wakeup is already pending
+
+    def _run(self) -> None:
+        from eventlet.hubs import trampoline
+
+        while True:
+            trampoline(self._read_fd, read=True)
+            try:
+                while os.read(self._read_fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+            with self._lock:
+                self._signalled = False
+                calls = list(self._calls)
+                self._calls.clear()
+            for callback in calls:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.debug(f"Broadcast relay callback error: {e}")
+
+
+class _GreenWaker:
+    """Wakes a WSGI reader waiting as an eventlet greenthread."""
+
+    def __init__(self, relay: _GreenRelay):
+        from eventlet.event import Event
+
+        self._relay = relay
+        self._event = Event()
+
+    def clear(self) -> None:
+        if self._event.ready():
+            self._event.reset()
+
+    def wait(self) -> None:
+        self._event.wait()
+
+    def wake(self) -> None:
+        self._relay.call(self._send)
+
+    def _send(self) -> None:
+        if not self._event.ready():
+            self._event.send()
+
+
+# One relay per OS thread running an eventlet hub
+_green_relays: Dict[int, _GreenRelay] = {}
+_green_relays_lock = threading.Lock()
+
+
+def _reader_waker():
+    """Waker for the calling WSGI request: green under eventlet, else a thread event."""
+    if "eventlet" in sys.modules:
+        import greenlet
+
+        # Eventlet greenthreads run under the hub greenlet; plain threads do not
+        if greenlet.getcurrent().parent is not None:
+            with _green_relays_lock:
+                relay = _green_relays.get(threading.get_ident())
+                if relay is None:
+                    relay = _green_relays[threading.get_ident()] = _GreenRelay()
+            return _GreenWaker(relay)
+    return _ThreadWaker()
+
+
+class _Inbox:
+    """Frames on their way from the hub loop to one iter_stream() reader.
+
+    The loop side waits while the inbox is full, so events for a reader
+    that stops back up in its subscription queue and it is dropped as
+    before.
+    """
+
+    def __init__(self, size: int, loop: asyncio.AbstractEventLoop, waker):
+        self.size = size
+        self._loop = loop
+        self._waker = waker
+        self._frames: deque = deque()
+        self._lock = threading.Lock()
+        self._space = asyncio.Event()
+        self._closed = False
+
+    async def put(self, frame: bytes) -> bool:
+        """Queue a frame, waiting for room (hub loop); False once closed."""
+        while True:
+            with self._lock:
+                if self._closed:
+                    return False
+                if len(self._frames) < self.size:
+                    self._frames.append(frame)
+                    break
+                self._space.clear()
+            await self._space.wait()
+        self._waker.wake()
+        return True
+
+    def end(self, discard: bool = False) -> None:
+        """Finish the stream after the queued frames, or drop them (hub loop)."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if discard:
+                self._frames.clear()
+            self._frames.append(None)
+        self._space.set()
+        self._waker.wake()
+
+    def get(self) -> Optional[bytes]:
+        """Next frame, or None at the end of the stream (reader side)."""
+        while True:
+            with self._lock:
+                if self._frames:
+                    was_full = len(self._frames) >= self.size
+                    frame = self._frames.popleft()
+                    break
+                self._waker.clear()
+            self._waker.wait()
+        if was_full:
+            try:
+                self._loop.call_soon_threadsafe(self._space.set)
+            except RuntimeError:
+                pass  # Hub closed; the end marker is already queued
+        return frame
+
+
+class BroadcastHub:
+    """Per-process fan-out over the shared broadcast event log."""
+
+    def __init__(
+        self,
+        db_path: str,
+        coalesce: Optional[Dict[str, float]] = None,
+        poll_interval: float = 0.25,
+        retention: int = EVENT_RETENTION,
+        replay_buffer: int = REPLAY_BUFFER,
+        queue_size: int = SUBSCRIBER_QUEUE_SIZE,
+    ):
+        self.db_path = str(db_path)
+        self.coalesce = dict(coalesce or {})
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.queue_size = queue_size
+
+        self._lock = threading.Lock()
+        self._outbox: List[tuple] = []
+        self._pending: Dict[str, str] = {}  # coalesced channel -> latest payload
+        self._last_flush: Dict[str, float] = {}
+        self._listeners: List[Callable[[BroadcastEvent], None]] = []
+
+        # Owned by the loop thread
+        self._replay: deque = deque(maxlen=replay_buffer)
+        self._subscribers: Dict[str, Subscription] = {}
+
+        # Owned by the database executor thread
+        self._conn: Optional[sqlite3.Connection] = None
+        self._last_seq = 0
+        self._writes_since_prune = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pid: Optional[int] = None
+        self._closing = False
+
+        self.stats = {
+            "published": 0,
+            "coalesced": 0,
+            "written": 0,
+            "delivered": 0,
+            "dropped_subscribers": 0,
+            "errors": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the loop thread (idempotent; restarts after a fork)."""
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            conn = self._open()
+            try:
+                # Only events logged from now on are live for this process
+                self._last_seq = conn.execute(
+                    "SELECT COALESCE(MAX(seq), 0) FROM broadcast_events"
+                ).fetchone()[0]
+            finally:
+                conn.close()
+            self._conn = None
+            self._replay.clear()
+            self._subscribers = {}
+            self._closing = False
+            self._pid = os.getpid()
+            self._loop = asyncio.new_event_loop()
+            self._wake = asyncio.Event()
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="broadcast-db")
+            self._thread = threading.Thread(target=self._run, name="broadcast-hub", daemon=True)
+            self._thread.start()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the loop thread, ending every open stream."""
+        with self._lock:
+            thread, loop = self._thread, self._loop
+            self._thread = None
+        if thread is None:
+            return
+        self._closing = True
+        loop.call_soon_threadsafe(self._wake.set)
+        thread.join(timeout)
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._pump())
+            # End open streams so their readers are not left waiting
+            for sub in list(self._subscribers.values()):
+                self._end(sub)
+            self._loop.run_until_complete(asyncio.sleep(0.05))
+        finally:
+            self._executor.submit(self._close_connection).result()
+            self._executor.shutdown()
+            self._loop.close()
+
+    # ------------------------------------------------------------------
+    # Publishing
+    # ------------------------------------------------------------------
+
+    def publish(self, channel: str, data: Any) -> None:
+        """Queue an event for every subscriber of channel, in every process.
+
+        Coalesced channels keep only the latest payload until their
+        interval has passed since the last write.
+        """
+        payload = json.dumps(data, default=str)
+        with self._lock:
+            self.stats["published"] += 1
+            if channel in self.coalesce:
+                if channel in self._pending:
+                    self.stats["coalesced"] += 1
+                self._pending[channel] = payload
+            else:
+                self._outbox.append((channel, payload))
+        self._notify()
+
+    def add_listener(self, listener: Callable[[BroadcastEvent], None]) -> None:
+        """Call listener on the hub loop for every event (added once)."""
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def _notify(self) -> None:
+        self.start()
+        try:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:
+            pass  # Loop closed
+
+    def _take_outbox(self, now: float) -> List[tuple]:
+        with self._lock:
+            rows, self._outbox = self._outbox, []
+            for channel, payload in list(self._pending.items()):
+                if now - self._last_flush.get(channel, 0.0) >= self.coalesce[channel]:
+                    rows.append((channel, payload))
+                    self._last_flush[channel] = now
+                    del self._pending[channel]
+        return rows
+
+    def _next_delay(self) -> float:
+        with self._lock:
+            due = [
+                self._last_flush.get(channel, 0.0) + self.coalesce[channel]
+                for channel in self._pending
+            ]
+        if not due:
+            return self.poll_interval
+        return max(0.0, min(self.poll_interval, min(due) - time.time()))
+
+    # ------------------------------------------------------------------
+    # Database (executor thread)
+    # ------------------------------------------------------------------
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        ensure_broadcast_schema(conn)
+        conn.commit()
+        return conn
+
+    def _close_connection(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _sync(self) -> List[BroadcastEvent]:
+        """Write queued publishes, then read log rows past our position."""
+        if self._conn is None:
+            self._conn = self._open()
+        conn = self._conn
+        now = time.time()
+
+        rows = self._take_outbox(now)
+        if rows:
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO broadcast_events (channel, data, created_at) VALUES (?, ?, ?)",
+                        [(channel, payload, now) for channel, payload in rows],
+                    )
+            except sqlite3.OperationalError:
+                with self._lock:
+                    self._outbox[:0] = rows  # Retry on the next tick
+                raise
+            self.stats["written"] += len(rows)
+            self._writes_since_prune += len(rows)
+
+        events = [
+            BroadcastEvent(*row)
+            for row in conn.execute(
+                """
+                SELECT seq, channel, data FROM broadcast_events
+                WHERE seq > ? ORDER BY seq LIMIT ?
+            """,
+                (self._last_seq, READ_BATCH),
+            )
+        ]
+        if events:
+            self._last_seq = events[-1].seq
+        # Prune after reading so our own writes are dispatched first
+        if self._writes_since_prune >= max(1, self.retention // 10):
+            self._prune(conn)
+        return events
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        with conn:
+            conn.execute(
+                """
+                DELETE FROM broadcast_events
+                WHERE seq <= (SELECT MAX(seq) FROM broadcast_events) - ?
+            """,
+                (self.retention,),
+            )
+        self._writes_since_prune = 0
+
+    def _read_since(self, seq: int) -> List[BroadcastEvent]:
+        if self._conn is None:
+            self._conn = self._open()
+        return [
+            BroadcastEvent(*row)
+            for row in self._conn.execute(
+                """
+                SELECT seq, channel, data FROM broadcast_events
+                WHERE seq > ? ORDER BY seq LIMIT ?
+            """,
+                (seq, self._replay.maxlen),
+            )
+        ]
+
+    # ------------------------------------------------------------------
+    # Fan-out (loop thread)
+    # ------------------------------------------------------------------
+
+    async def _pump(self) -> None:
+        loop = asyncio.get_running_loop()
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self._next_delay())
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if self._closing:
+                break
+            try:
+                events = await loop.run_in_executor(self._executor, self._sync)
+            except sqlite3.Error as e:
+                self.stats["errors"] += 1
+                logger.warning(f"Broadcast hub sync failed: {e}")
+                continue
+            for event in events:
+                self._dispatch(event)
+            if len(events) == READ_BATCH:
+                self._wake.set()
+
+    def _dispatch(self, event: BroadcastEvent) -> None:
+        self._replay.append(event)
+        for sub in list(self._subscribers.values()):
+            if not sub.wants(event.channel):
+                continue
+            try:
+                sub.queue.put_nowait(event)
+                self.stats["delivered"] += 1
+            except asyncio.QueueFull:
+                self._drop(sub)
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                logger.debug(f"Broadcast listener error on {event.channel}: {e}")
+
+    def _drop(self, sub: Subscription) -> None:
+        """Disconnect a subscriber that stopped reading.
+
+        The client reconnects with its Last-Event-ID and resumes from the
+        replay buffer or the log, so nothing is silently skipped.
+        """
+        self._end(sub)
+        self.stats["dropped_subscribers"] += 1
+        logger.info(f"Disconnected slow SSE subscriber {sub.id}")
+
+    def _end(self, sub: Subscription) -> None:
+        self._subscribers.pop(sub.id, None)
+        while not sub.queue.empty():
+            sub.queue.get_nowait()
+        sub.queue.put_nowait(None)
+        if sub.inbox is not None:
+            sub.inbox.end(discard=True)
+
+    async def _backlog(self, seq: int, sub: Subscription) -> List[BroadcastEvent]:
+        """Events after seq for a resuming subscriber."""
+        if self._replay and self._replay[0].seq <= seq + 1:
+            events = [e for e in self._replay if e.seq > seq]
+        else:
+            loop = asyncio.get_running_loop()
+            events = await loop.run_in_executor(self._executor, self._read_since, seq)
+        return [e for e in events if sub.wants(e.channel)]
+
+    def stream(
+        self,
+        channels: Iterable[str],
+        last_event_id: Any = None,
+        heartbeat: float = HEARTBEAT_INTERVAL,
+    ) -> AsyncIterator[bytes]:
+        """Encoded SSE frames for channels; must run on the hub loop.
+
+        Starts with a "connected" frame carrying the client id, replays
+        events after last_event_id, then follows live events with a
+        heartbeat frame whenever the stream is idle for heartbeat seconds.
+        """
+        return self._stream(Subscription(channels, self.queue_size), last_event_id, heartbeat)
+
+    async def _stream(
+        self, sub: Subscription, last_event_id: Any, heartbeat: float
+    ) -> AsyncIterator[bytes]:
+        self._subscribers[sub.id] = sub
+        try:
+            yield sse_frame(
+                "connected",
+                json.dumps({"client_id": sub.id, "timestamp": datetime.now().isoformat()}),
+            )
+            resume_from = _parse_event_id(last_event_id)
+            if resume_from is not None:
+                sub.last_seq = resume_from
+                for event in await self._backlog(resume_from, sub):
+                    if event.seq > sub.last_seq:
+                        sub.last_seq = event.seq
+                        yield event.frame
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield sse_frame(
+                        "heartbeat", json.dumps({"timestamp": datetime.now().isoformat()})
+                    )
+                    continue
+                if event is None:
+                    break
+                if event.seq <= sub.last_seq:
+                    continue  # Already sent from the backlog
+                sub.last_seq = event.seq
+                yield event.frame
+        finally:
+            self._subscribers.pop(sub.id, None)
+
+    async def _forward(
+        self, sub: Subscription, inbox: _Inbox, last_event_id: Any, heartbeat: float
+    ) -> None:
+        """Run one stream on the hub loop, handing its frames to an iter_stream() reader."""
+        sub.inbox = inbox
+        frames = self._stream(sub, last_event_id, heartbeat)
+        try:
+            async for frame in frames:
+                if not await inbox.put(frame):
+                    break
+        finally:
+            await frames.aclose()
+            inbox.end()
+
+    def iter_stream(
+        self,
+        channels: Iterable[str],
+        last_event_id: Any = None,
+        heartbeat: float = HEARTBEAT_INTERVAL,
+    ) -> Iterator[bytes]:
+        """Iterator over stream(), for WSGI response bodies.
+
+        The stream runs as a task on the hub loop and hands its frames to
+        this iterator. Under eventlet the reader waits as a greenthread that
+        the hub loop wakes through the eventlet hub, so an idle client holds
+        no OS thread and other greenthreads keep running; under a threaded
+        server each open stream holds its request thread. Closing the
+        iterator (client disconnect) cancels the task.
+        """
+        self.start()
+        loop = self._loop
+        inbox = _Inbox(self.queue_size, loop, _reader_waker())
+        forward = self._forward(
+            Subscription(channels, self.queue_size), inbox, last_event_id, heartbeat
+        )
+        try:
+            task = asyncio.run_coroutine_threadsafe(forward, loop)
+        except RuntimeError:  # Hub closed
+            forward.close()
+            return
+        try:
+            while True:
+                frame = inbox.get()
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            if not task.done():
+                task.cancel()
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def subscribers(self) -> List[Dict[str, Any]]:
+        """Open streams in this process."""
+        return [
+            {
+                "client_id": sub.id,
+                "channels": sorted(sub.channels),
+                "connected_at": sub.connected_at,
+                "queue_size": sub.queue.qsize(),
+            }
+            for sub in list(self._subscribers.values())
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hub counters for this process."""
+        by_channel: Dict[str, int] = {}
+        for sub in list(self._subscribers.values()):
+            for channel in sub.channels:
+                by_channel[channel] = by_channel.get(channel, 0) + 1
+        with self._lock:
+            pending = sorted(self._pending)
+        return {
+            **self.stats,
+            "subscribers": len(self._subscribers),
+            "subscribers_by_channel": by_channel,
+            "pending_coalesced": pending,
+            "last_seq": self._last_seq,
+            "replay_buffered": len(self._replay),
+            "running": self._thread is not None and self._thread.is_alive(),
+        }
+
+
+_hubs: Dict[str, BroadcastHub] = {}
+_hubs_lock = threading.Lock()
+
+
+def get_broadcast_hub(db_path: str = None, **kwargs) -> BroadcastHub:
+    """Get this process's hub for a database (kwargs apply on first call)."""
+    if db_path is None:
+        db_path = str(Path(__file__).parent.parent / "data" / "architect.db")
+    db_path = str(db_path)
+    with _hubs_lock:
+        hub = _hubs.get(db_path)
+        if hub is None:
+            hub = _hubs[db_path] = BroadcastHub(db_path, **kwargs)
+        return hub
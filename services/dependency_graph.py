@@ -2,9 +2,38 @@
 Task Dependencies Visualization Service
 
 Provides graph analysis and visualization data for task dependencies.
+
+Features:
+- Stateless helpers over task and dependency lists (graph building, cycle
+  detection, levels, critical path, D3 formatting)
+- TaskDependencyGraph: a process-wide, in-memory copy of task_dependencies.
+  Triggers append every edge change (and status changes of tasks that have
+  edges) to task_dependency_changes; each read applies the changes since the
+  last one instead of reloading. Transitive dependent counts, chain depth
+  and the critical path are recomputed in one pass only after a change.
+
+Usage:
+    from services.dependency_graph import (
+        ensure_dependency_graph_schema,
+        get_task_dependency_graph,
+    )
+
+    ensure_dependency_graph_schema(conn)  # once, from init_database()
+
+    graph = get_task_dependency_graph(db_path)
+    graph.refresh(conn)
+    graph.node_metrics(task_id)  # direct/total dependents, chain depth
+    graph.critical_path()
 """
 
-from typing import Dict, List, Optional, Set, Tuple
+import logging
+import sqlite3
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
 
 
 def build_dependency_graph(tasks: List[Dict], dependencies: List[Dict]) -> Dict:
@@ -82,7 +111,10 @@ def detect_cycles(nodes: List[Dict], edges: List[Dict]) -> List[List[int]]:
             adj[edge["task_id"]] = []
         adj[edge["task_id"]].append(edge["depends_on_id"])
 
-    def dfs(node_id: int, path: List[int]):
+    # path is the current DFS stack, shared by every level
+    path: List[int] = []
+
+    def dfs(node_id: int):
         visited.add(node_id)
         rec_stack.add(node_id)
         path.append(node_id)
@@ -93,13 +125,14 @@ def detect_cycles(nodes: List[Dict], edges: List[Dict]) -> List[List[int]]:
                 cycle_start = path.index(next_id)
                 cycles.append(path[cycle_start:] + [next_id])
             elif next_id not in visited:
-                dfs(next_id, path.copy())
+                dfs(next_id)
 
+        path.pop()
         rec_stack.discard(node_id)
 
     for node in nodes:
         if node["id"] not in visited:
-            dfs(node["id"], [])
+            dfs(node["id"])
 
     return cycles
 
@@ -128,9 +161,9 @@ def compute_levels(nodes: List[Dict], edges: List[Dict], root_nodes: List[int])
         adj[edge["depends_on_id"]].append(edge["task_id"])
 
     # BFS from root nodes
-    frontier = [(r, 0) for r in root_nodes]
+    frontier = deque((r, 0) for r in root_nodes)
     while frontier:
-        node_id, level = frontier.pop(0)
+        node_id, level = frontier.popleft()
         if node_id in levels:
             continue
         levels[node_id] = level
@@ -171,10 +204,10 @@ def find_critical_path(
     dist = {tid: (0, None) for tid in task_ids}
 
     # Start with nodes that have no dependencies
-    queue = [tid for tid in task_ids if in_degree[tid] == 0]
+    queue = deque(tid for tid in task_ids if in_degree[tid] == 0)
 
     while queue:
-        node = queue.pop(0)
+        node = queue.popleft()
 
         for next_node in adj[node]:
             if dist[node][0] + 1 > dist[next_node][0]:
@@ -291,3 +324,530 @@ def format_for_d3(nodes: List[Dict], edges: List[Dict]) -> Dict:
     ]
 
     return {"nodes": nodes, "links": links}
+
+
+# =============================================================================
+# Process-wide in-memory dependency graph
+# =============================================================================
+
+# Statuses that no longer block dependent tasks
+DONE_STATUSES = ("completed", "failed")
+
+# Change log rows kept; the prune trigger runs every 1000 changes
+CHANGE_LOG_RETENTION = 20000
+
+_CHANGE_LOG_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS task_dependency_changes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        op TEXT NOT NULL,
+        dependency_id INTEGER,
+        task_id INTEGER,
+        depends_on_id INTEGER,
+        dependency_type TEXT,
+        task_status TEXT,
+        depends_on_status TEXT
+    )
+"""
+
+# Task {id} is an endpoint of at least one dependency (both lookups are indexed)
+_HAS_EDGES_SQL = (
+    "(EXISTS (SELECT 1 FROM task_dependencies WHERE task_id = {id})"
+    " OR EXISTS (SELECT 1 FROM task_dependencies WHERE depends_on_id = {id}))"
+)
+
+# Endpoint statuses are recorded with the edge; NULL means the task does not exist
+_LOG_ADD_SQL = """
+    INSERT INTO task_dependency_changes (
+        op, dependency_id, task_id, depends_on_id, dependency_type,
+        task_status, depends_on_status
+    ) VALUES (
+        'add', NEW.id, NEW.task_id, NEW.depends_on_id, NEW.dependency_type,
+        (SELECT COALESCE(status, '') FROM task_queue WHERE id = NEW.task_id),
+        (SELECT COALESCE(status, '') FROM task_queue WHERE id = NEW.depends_on_id)
+    );
+"""
+
+_LOG_REMOVE_SQL = """
+    INSERT INTO task_dependency_changes (op, dependency_id, task_id, depends_on_id)
+    VALUES ('remove', OLD.id, OLD.task_id, OLD.depends_on_id);
+"""
+
+_GRAPH_TRIGGERS = {
+    "trg_task_deps_insert_graph": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_task_deps_insert_graph
+        AFTER INSERT ON task_dependencies
+        BEGIN
+            {_LOG_ADD_SQL}
+        END
+    """,
+    "trg_task_deps_delete_graph": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_task_deps_delete_graph
+        AFTER DELETE ON task_dependencies
+        BEGIN
+            {_LOG_REMOVE_SQL}
+        END
+    """,
+    "trg_task_deps_update_graph": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_task_deps_update_graph
+        AFTER UPDATE OF task_id, depends_on_id, dependency_type ON task_dependencies
+        BEGIN
+            {_LOG_REMOVE_SQL}
+            {_LOG_ADD_SQL}
+        END
+    """,
+    # Only tasks with dependencies matter to the graph
+    "trg_task_queue_status_graph": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_task_queue_status_graph
+        AFTER UPDATE OF status ON task_queue
+        WHEN OLD.status IS NOT NEW.status AND {_HAS_EDGES_SQL.format(id="NEW.id")}
+        BEGIN
+            INSERT INTO task_dependency_changes (op, task_id, task_status)
+            VALUES ('status', NEW.id, COALESCE(NEW.status, ''));
+        END
+    """,
+    # Covers deletes when foreign key cascades are not enabled
+    "trg_task_queue_delete_graph": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_task_queue_delete_graph
+        AFTER DELETE ON task_queue
+        WHEN {_HAS_EDGES_SQL.format(id="OLD.id")}
+        BEGIN
+            INSERT INTO task_dependency_changes (op, task_id) VALUES ('delete', OLD.id);
+        END
+    """,
+    "trg_task_dependency_changes_prune": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_task_dependency_changes_prune
+        AFTER INSERT ON task_dependency_changes
+        WHEN NEW.seq % 1000 = 0
+        BEGIN
+            DELETE FROM task_dependency_changes WHERE seq <= NEW.seq - {CHANGE_LOG_RETENTION};
+        END
+    """,
+}
+
+
+def ensure_dependency_graph_schema(conn: sqlite3.Connection) -> int:
+    """Create the dependency change log and the triggers that feed it.
+
+    Safe to call on every startup. Triggers are skipped for source tables
+    that do not exist yet.
+
+    Args:
+        conn: Connection to the main database
+
+    Returns:
+        Number of triggers in place
+    """
+    conn.execute(_CHANGE_LOG_SCHEMA)
+    created = 0
+    for trigger_sql in _GRAPH_TRIGGERS.values():
+        try:
+            conn.execute(trigger_sql)
+            created += 1
+        except sqlite3.OperationalError:
+            pass
+    return created
+
+
+class TaskDependencyGraph:
+    """
+    In-memory task dependency DAG for one database.
+
+    Edges point from a task to the tasks that depend on it ("downstream").
+    refresh() applies task_dependency_changes rows newer than the last one
+    seen; derived data is rebuilt lazily, once per batch of changes:
+
+    - Dependent metrics (direct and transitive dependents, chain depth):
+      one pass in reverse topological order, with transitive sets held as
+      integer bitsets and freed once every dependency has consumed them
+    - Critical path (longest chain of pending tasks): one topological pass,
+      rebuilt only when edges change or a task enters or leaves 'pending'
+
+    Edges whose endpoint task no longer exists are dropped, matching
+    ON DELETE CASCADE.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = str(db_path) if db_path else None
+        self._lock = threading.RLock()
+        self._seq: Optional[int] = None
+
+        # edge id -> (task_id, depends_on_id, dependency_type)
+        self._edges: Dict[int, Tuple[int, int, str]] = {}
+        # task_id -> {depends_on_id: edge id}
+        self._upstream: Dict[int, Dict[int, int]] = {}
+        # depends_on_id -> {task_id: edge id}
+        self._downstream: Dict[int, Dict[int, int]] = {}
+        # Status of every task with at least one edge
+        self._status: Dict[int, str] = {}
+
+        # task_id -> (direct dependents, total dependents, chain depth)
+        self._metrics: Optional[Dict[int, Tuple[int, int, int]]] = None
+        self._critical_path: Optional[List[int]] = None
+
+        self.stats = {"reloads": 0, "changes_applied": 0, "metric_builds": 0, "path_builds": 0}
+
+    # =========================================================================
+    # Loading and change application
+    # =========================================================================
+
+    def refresh(self, conn: Optional[sqlite3.Connection] = None) -> int:
+        """Apply dependency changes committed since the last refresh.
+
+        The first call (and any call after the change log was pruned past
+        this graph's position) loads the full graph instead.
+
+        Args:
+            conn: Connection to the main database (default: open db_path)
+
+        Returns:
+            Number of changes applied, or -1 after a full load
+        """
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                return self.refresh(conn)
+            finally:
+                conn.close()
+
+        with self._lock:
+            if self._seq is None:
+                self._load(conn)
+                return -1
+            try:
+                rows = conn.execute(
+                    """
+                    SELECT seq, op, dependency_id, task_id, depends_on_id, dependency_type,
+                           task_status, depends_on_status
+                    FROM task_dependency_changes WHERE seq > ? ORDER BY seq
+                """,
+                    (self._seq,),
+                ).fetchall()
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Dependency change log unavailable, reloading: {e}")
+                self._load(conn)
+                return -1
+
+            if rows and rows[0][0] > self._seq + 1:
+                oldest = conn.execute("SELECT MIN(seq) FROM task_dependency_changes").fetchone()[0]
+                if oldest > self._seq + 1:
+                    # Changes we never saw were pruned
+                    self._load(conn)
+                    return -1
+
+            for row in rows:
+                self._apply(row)
+            if rows:
+                self._seq = rows[-1][0]
+                self.stats["changes_applied"] += len(rows)
+            return len(rows)
+
+    def _load(self, conn: sqlite3.Connection):
+        """Replace the graph with the current contents of task_dependencies."""
+        try:
+            seq = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM task_dependency_changes"
+            ).fetchone()[0]
+        except sqlite3.OperationalError:
+            ensure_dependency_graph_schema(conn)
+            conn.commit()
+            seq = 0
+
+        # Read after the log position: replaying newer changes is idempotent
+        rows = conn.execute(
+            """
+            SELECT td.id, td.task_id, td.depends_on_id, td.dependency_type,
+                   COALESCE(t.status, ''), COALESCE(d.status, '')
+            FROM task_dependencies td
+            JOIN task_queue t ON t.id = td.task_id
+            JOIN task_queue d ON d.id = td.depends_on_id
+        """
+        ).fetchall()
+
+        self._edges = {}
+        self._upstream = {}
+        self._downstream = {}
+        self._status = {}
+        for (
+            edge_id,
+            task_id,
+            depends_on_id,
+            dependency_type,
+            task_status,
+            depends_on_status,
+        ) in rows:
+            self._add_edge(edge_id, task_id, depends_on_id, dependency_type)
+            self._status[task_id] = task_status
+            self._status[depends_on_id] = depends_on_status
+        self._seq = seq
+        self._invalidate()
+        self.stats["reloads"] += 1
+        logger.debug(f"Loaded dependency graph: {len(self._edges)} edges at change {seq}")
+
+    def _apply(self, row):
+        (
+            _,
+            op,
+            edge_id,
+            task_id,
+            depends_on_id,
+            dependency_type,
+            task_status,
+            depends_on_status,
+        ) = row
+        if op == "add":
+            if task_status is None or depends_on_status is None:
+                return  # an endpoint task does not exist
+            self._add_edge(edge_id, task_id, depends_on_id, dependency_type)
+            self._status[task_id] = task_status
+            self._status[depends_on_id] = depends_on_status
+        elif op == "remove":
+            self._remove_edge(edge_id)
+        elif op == "status":
+            old = self._status.get(task_id)
+            if old is None:
+                return
+            self._status[task_id] = task_status
+            if (old == "pending") != (task_status == "pending"):
+                self._critical_path = None
+        elif op == "delete":
+            incident = list(self._upstream.get(task_id, {}).values())
+            incident += self._downstream.get(task_id, {}).values()
+            for incident_id in incident:
+                self._remove_edge(incident_id)
+
+    def _add_edge(self, edge_id: int, task_id: int, depends_on_id: int, dependency_type: str):
+        existing = self._edges.get(edge_id)
+        if existing is not None and existing[:2] != (task_id, depends_on_id):
+            self._remove_edge(edge_id)
+        self._edges[edge_id] = (task_id, depends_on_id, dependency_type or "blocks")
+        self._upstream.setdefault(task_id, {})[depends_on_id] = edge_id
+        self._downstream.setdefault(depends_on_id, {})[task_id] = edge_id
+        self._invalidate()
+
+    def _remove_edge(self, edge_id: int):
+        edge = self._edges.pop(edge_id, None)
+        if edge is None:
+            return
+        task_id, depends_on_id, _ = edge
+        for index, node, other in (
+            (self._upstream, task_id, depends_on_id),
+            (self._downstream, depends_on_id, task_id),
+        ):
+            neighbours = index.get(node)
+            if neighbours is not None and neighbours.get(other) == edge_id:
+                del neighbours[other]
+                if not neighbours:
+                    del index[node]
+        for node in (task_id, depends_on_id):
+            if node not in self._upstream and node not in self._downstream:
+                self._status.pop(node, None)
+        self._invalidate()
+
+    def _invalidate(self):
+        self._metrics = None
+        self._critical_path = None
+
+    # =========================================================================
+    # Derived data
+    # =========================================================================
+
+    def _get_metrics(self) -> Dict[int, Tuple[int, int, int]]:
+        if self._metrics is None:
+            self._metrics = self._build_metrics()
+            self.stats["metric_builds"] += 1
+        return self._metrics
+
+    def _build_metrics(self) -> Dict[int, Tuple[int, int, int]]:
+        """Dependent counts and chain depth for every node in O(V + E) passes."""
+        upstream, downstream = self._upstream, self._downstream
+        nodes = set(upstream) | set(downstream)
+        bit = {node: 1 << i for i, node in enumerate(nodes)}
+        # Dependents not yet processed, and dependencies still to read a node's bitset
+        remaining = {node: len(downstream.get(node, ())) for node in nodes}
+        readers = {node: len(upstream.get(node, ())) for node in nodes}
+
+        metrics: Dict[int, Tuple[int, int, int]] = {}
+        reach: Dict[int, int] = {}
+        depth: Dict[int, int] = {}
+        queue = deque(node for node, count in remaining.items() if count == 0)
+        while queue:
+            node = queue.popleft()
+            children = downstream.get(node, ())
+            mask = 0
+            node_depth = 0
+            for child in children:
+                mask |= bit[child] | reach[child]
+                node_depth = max(node_depth, depth[child] + 1)
+                readers[child] -= 1
+                if not readers[child]:
+                    del reach[child]
+            metrics[node] = (len(children), bin(mask).count("1"), node_depth)
+            depth[node] = node_depth
+            if readers[node]:
+                reach[node] = mask
+            for parent in upstream.get(node, ()):
+                remaining[parent] -= 1
+                if not remaining[parent]:
+                    queue.append(parent)
+
+        # Nodes on or above a cycle never reach zero; fall back to a walk each
+        cyclic = nodes - metrics.keys()
+        if cyclic:
+            logger.warning(f"Task dependency cycle: {len(cyclic)} tasks on or above a cycle")
+            for node in cyclic:
+                reached = self._walk(node, downstream)
+                reached.pop(node, None)
+                metrics[node] = (
+                    len(downstream.get(node, ())),
+                    len(reached),
+                    max(reached.values(), default=0),
+                )
+        return metrics
+
+    def _build_critical_path(self) -> List[int]:
+        """Longest chain of pending tasks, from root to leaf."""
+        pending = {node for node, status in self._status.items() if status == "pending"}
+        children: Dict[int, List[int]] = {}
+        in_degree: Dict[int, int] = {}
+        for node in pending:
+            for child in self._downstream.get(node, ()):
+                if child in pending:
+                    children.setdefault(node, []).append(child)
+                    in_degree[child] = in_degree.get(child, 0) + 1
+        if not children:
+            return []
+
+        nodes = set(children) | set(in_degree)
+        queue = deque(sorted(node for node in nodes if node not in in_degree))
+        length = {node: 1 for node in nodes}
+        previous: Dict[int, int] = {}
+        best = None
+        while queue:
+            node = queue.popleft()
+            if best is None or length[node] > length[best]:
+                best = node
+            for child in children.get(node, ()):
+                if length[node] + 1 > length[child]:
+                    length[child] = length[node] + 1
+                    previous[child] = node
+                in_degree[child] -= 1
+                if not in_degree[child]:
+                    queue.append(child)
+
+        path = []
+        while best is not None:
+            path.append(best)
+            best = previous.get(best)
+        path.reverse()
+        return path
+
+    @staticmethod
+    def _walk(
+        start: int, index: Dict[int, Dict[int, int]], max_depth: Optional[int] = None
+    ) -> Dict[int, int]:
+        """Breadth-first walk: {task_id: distance} for everything reachable from start."""
+        distance = {start: 0}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            level = distance[node] + 1
+            if max_depth is not None and level > max_depth:
+                continue
+            for neighbour in index.get(node, ()):
+                if neighbour not in distance:
+                    distance[neighbour] = level
+                    queue.append(neighbour)
+        return distance
+
+    # =========================================================================
+    # Queries (call refresh() first for up-to-date answers)
+    # =========================================================================
+
+    def node_metrics(self, task_id: int) -> Dict[str, int]:
+        """Direct dependents, transitive dependents and chain depth of a task."""
+        with self._lock:
+            direct, total, depth = self._get_metrics().get(task_id, (0, 0, 0))
+        return {"direct_dependents": direct, "total_dependents": total, "chain_depth": depth}
+
+    def critical_path(self) -> List[int]:
+        """Task IDs of the longest chain of pending tasks, root first."""
+        with self._lock:
+            if self._critical_path is None:
+                self._critical_path = self._build_critical_path()
+                self.stats["path_builds"] += 1
+            return list(self._critical_path)
+
+    def edges(self, task_ids: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """Dependencies touching any of task_ids (all dependencies if None)."""
+        wanted = None if task_ids is None else set(task_ids)
+        with self._lock:
+            return [
+                {
+                    "id": edge_id,
+                    "task_id": task_id,
+                    "depends_on_id": depends_on_id,
+                    "dependency_type": dependency_type,
+                }
+                for edge_id, (task_id, depends_on_id, dependency_type) in sorted(
+                    self._edges.items()
+                )
+                if wanted is None or task_id in wanted or depends_on_id in wanted
+            ]
+
+    def blockers(self, task_id: int) -> List[int]:
+        """Direct dependencies of a task that are not completed or failed."""
+        with self._lock:
+            return [
+                dep
+                for dep in self._upstream.get(task_id, ())
+                if self._status.get(dep) not in DONE_STATUSES
+            ]
+
+    def ancestors(self, task_id: int, max_depth: Optional[int] = None) -> Dict[int, int]:
+        """Tasks this task transitively depends on: {task_id: distance}."""
+        with self._lock:
+            reached = self._walk(task_id, self._upstream, max_depth)
+        reached.pop(task_id, None)
+        return reached
+
+    def descendants(self, task_id: int, max_depth: Optional[int] = None) -> Dict[int, int]:
+        """Tasks that transitively depend on this task: {task_id: distance}."""
+        with self._lock:
+            reached = self._walk(task_id, self._downstream, max_depth)
+        reached.pop(task_id, None)
+        return reached
+
+    def would_create_cycle(self, task_id: int, depends_on_id: int) -> bool:
+        """Whether making task_id depend on depends_on_id would close a cycle."""
+        return task_id == depends_on_id or depends_on_id in self.descendants(task_id)
+
+    def status_of(self, task_id: int) -> Optional[str]:
+        """Status of a task with dependencies, or None."""
+        with self._lock:
+            return self._status.get(task_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Graph size, change log position and rebuild counters."""
+        with self._lock:
+            return {
+                "nodes": len(set(self._upstream) | set(self._downstream)),
+                "edges": len(self._edges),
+                "change_seq": self._seq,
+                **self.stats,
+            }
+
+
+_graphs: Dict[str, TaskDependencyGraph] = {}
+_graphs_lock = threading.Lock()
+
+
+def get_task_dependency_graph(db_path: str = None) -> TaskDependencyGraph:
+    """Get the shared dependency graph for a database."""
+    if db_path is None:
+        db_path = str(Path(__file__).parent.parent / "data" / "architect.db")
+    db_path = str(db_path)
+    with _graphs_lock:
+        graph = _graphs.get(db_path)
+        if graph is None:
+            graph = _graphs[db_path] = TaskDependencyGraph(db_path)
+        return graph
@@ -0,0 +1,313 @@
+"""
+Entity Counters
+
+Exact per-status row counts for the tables behind the dashboard stats, so
+/api/stats and the stats broadcasts read a few dozen rows instead of
+scanning and grouping seven tables.
+
+Features:
+- entity_counters holds (entity, status) -> count, plus the summed
+  occurrence_count for errors
+- Kept exact by AFTER INSERT / UPDATE OF / DELETE triggers; updates only
+  touch the counters when the status (or occurrence count) changes
+- Self-healing: an entity whose triggers are missing gets them recreated
+  and is recounted from its table
+- Consistency checker that compares counters against a full recount and
+  optionally repairs them, usable as a command
+
+Usage:
+    from services.entity_counters import ensure_counter_schema, read_counters
+
+    ensure_counter_schema(conn)  # once, from init_database()
+
+    counters = read_counters(conn)
+    counters["bugs"]       # {"open": {"count": 5, "occurrences": 0}, ...}
+    status_counts(counters, "bugs")  # {"open": 5, "resolved": 13}
+    total(counters, "tmux_sessions")
+
+    python -m services.entity_counters --db data/architect.db [--repair]
+"""
+
+import argparse
+import logging
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Counted tables: {entity: (status column or None, summed column or None)}
+COUNTED_ENTITIES = {
+    "projects": ("status", None),
+    "milestones": ("status", None),
+    "features": ("status", None),
+    "bugs": ("status", None),
+    "errors": ("status", "occurrence_count"),
+    "nodes": ("status", None),
+    "task_queue": ("status", None),
+    "tmux_sessions": (None, None),
+}
+
+# Counter key for rows whose status is NULL (and for tables without a status)
+NO_STATUS = ""
+
+_COUNTER_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS entity_counters (
+        entity TEXT NOT NULL,
+        status TEXT NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        occurrences INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (entity, status)
+    ) WITHOUT ROWID
+"""
+
+
+def _status_sql(entity: str, row: str) -> str:
+    column = COUNTED_ENTITIES[entity][0]
+    return f"COALESCE({row}.{column}, '')" if column else "''"
+
+
+def _sum_sql(entity: str, row: str) -> str:
+    column = COUNTED_ENTITIES[entity][1]
+    return f"COALESCE({row}.{column}, 0)" if column else "0"
+
+
+def _adjust_sql(entity: str, row: str, sign: str) -> str:
+    """Statements adding (+) or removing (-) row {row} from its counter."""
+    status = _status_sql(entity, row)
+    ensure_row = (
+        f"INSERT OR IGNORE INTO entity_counters (entity, status) VALUES ('{entity}', {status});"
+        if sign == "+"
+        else ""
+    )
+    return f"""
+        {ensure_row}
+        UPDATE entity_counters
+        SET count = count {sign} 1, occurrences = occurrences {sign} {_sum_sql(entity, row)}
+        WHERE entity = '{entity}' AND status = {status};
+    """
+
+
+def _trigger_sql(entity: str) -> Dict[str, str]:
+    status_column, sum_column = COUNTED_ENTITIES[entity]
+    triggers = {
+        f"trg_{entity}_insert_counters": f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{entity}_insert_counters
+            AFTER INSERT ON {entity}
+            BEGIN
+                {_adjust_sql(entity, "NEW", "+")}
+            END
+        """,
+        f"trg_{entity}_delete_counters": f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{entity}_delete_counters
+            AFTER DELETE ON {entity}
+            BEGIN
+                {_adjust_sql(entity, "OLD", "-")}
+            END
+        """,
+    }
+    columns = [c for c in (status_column, sum_column) if c]
+    if columns:
+        changed = " OR ".join(f"OLD.{c} IS NOT NEW.{c}" for c in columns)
+        triggers[
+            f"trg_{entity}_update_counters"
+        ] = f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{entity}_update_counters
+            AFTER UPDATE OF {", ".join(columns)} ON {entity}
+            WHEN {changed}
+            BEGIN
+                {_adjust_sql(entity, "OLD", "-")}
+                {_adjust_sql(entity, "NEW", "+")}
+            END
+        """
+    return triggers
+
+
+def _existing(conn: sqlite3.Connection, kind: str) -> set:
+    return {
+        row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = ?", (kind,))
+    }
+
+
+def ensure_counter_schema(conn: sqlite3.Connection) -> List[str]:
+    """Create the counters table and triggers, seeding entities that need it.
+
+    Safe to call on every startup. An entity is recounted only when one of
+    its triggers was missing, since rows written while the triggers were
+    absent are not in its counters. Tables that do not exist yet are skipped.
+
+    Args:
+        conn: Connection to the main database
+
+    Returns:
+        Entities that were (re)seeded
+    """
+    tables = _existing(conn, "table")
+    conn.execute(_COUNTER_SCHEMA)
+    triggers = _existing(conn, "trigger")
+
+    seeded = []
+    for entity in COUNTED_ENTITIES:
+        if entity not in tables:
+            continue
+        trigger_sql = _trigger_sql(entity)
+        if "entity_counters" in tables and set(trigger_sql) <= triggers:
+            continue
+        for name in trigger_sql:
+            conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        for sql in trigger_sql.values():
+            conn.execute(sql)
+        seeded.append(entity)
+
+    if seeded:
+        rebuild_counters(conn, seeded)
+        logger.info(f"Seeded entity counters for: {', '.join(seeded)}")
+    return seeded
+
+
+def _recount(conn: sqlite3.Connection, entity: str) -> Dict[str, Dict[str, int]]:
+    rows = conn.execute(
+        f"""
+        SELECT {_status_sql(entity, "t")}, COUNT(*), SUM({_sum_sql(entity, "t")})
+        FROM {entity} t GROUP BY 1
+    """
+    ).fetchall()
+    return {row[0]: {"count": row[1], "occurrences": row[2] or 0} for row in rows}
+
+
+def count_entities(
+    conn: sqlite3.Connection, entities: Optional[Sequence[str]] = None
+) -> Dict[str, Dict[str, Dict[str, int]]]:
+    """Full recount from the source tables (same shape as read_counters)."""
+    tables = _existing(conn, "table")
+    return {
+        entity: _recount(conn, entity)
+        for entity in (COUNTED_ENTITIES if entities is None else entities)
+        if entity in tables
+    }
+
+
+def rebuild_counters(conn: sqlite3.Connection, entities: Optional[Sequence[str]] = None) -> int:
+    """Replace the counters of entities with a full recount.
+
+    Args:
+        conn: Database connection
+        entities: Entity names (default: all that exist)
+
+    Returns:
+        Number of entities rebuilt
+    """
+    recounted = count_entities(conn, entities)
+    for entity, statuses in recounted.items():
+        conn.execute("DELETE FROM entity_counters WHERE entity = ?", (entity,))
+        conn.executemany(
+            "INSERT INTO entity_counters (entity, status, count, occurrences) VALUES (?, ?, ?, ?)",
+            [(entity, s, c["count"], c["occurrences"]) for s, c in statuses.items()],
+        )
+    return len(recounted)
+
+
+def read_counters(conn: sqlite3.Connection) -> Dict[str, Dict[str, Dict[str, int]]]:
+    """Current counters: {entity: {status: {"count", "occurrences"}}}.
+
+    Falls back to a full recount when the counters table does not exist.
+    """
+    try:
+        rows = conn.execute(
+            "SELECT entity, status, count, occurrences FROM entity_counters WHERE count != 0"
+        ).fetchall()
+    except sqlite3.OperationalError as e:
+        logger.warning(f"Entity counters unavailable, recounting: {e}")
+        return count_entities(conn)
+
+    counters: Dict[str, Dict[str, Dict[str, int]]] = {entity: {} for entity in COUNTED_ENTITIES}
+    for entity, status, count, occurrences in rows:
+        counters.setdefault(entity, {})[status] = {"count": count, "occurrences": occurrences}
+    return counters
+
+
+def status_counts(counters: Dict[str, Any], entity: str) -> Dict[str, int]:
+    """{status: count} for one entity."""
+    return {s: c["count"] for s, c in counters.get(entity, {}).items()}
+
+
+def status_count(counters: Dict[str, Any], entity: str, status: str) -> int:
+    """Rows of an entity with one status."""
+    return counters.get(entity, {}).get(status, {}).get("count", 0)
+
+
+def total(counters: Dict[str, Any], entity: str) -> int:
+    """All rows of an entity."""
+    return sum(c["count"] for c in counters.get(entity, {}).values())
+
+
+def check_counters(conn: sqlite3.Connection, repair: bool = False) -> List[Dict[str, Any]]:
+    """Compare the counters against a full recount.
+
+    Args:
+        conn: Database connection
+        repair: Rebuild the counters of every entity that differs
+
+    Returns:
+        One dict per differing (entity, status): expected vs stored values
+    """
+    stored = read_counters(conn)
+    actual = count_entities(conn)
+    zero = {"count": 0, "occurrences": 0}
+
+    mismatches = []
+    for entity, statuses in actual.items():
+        for status in set(statuses) | set(stored.get(entity, {})):
+            expected = statuses.get(status, zero)
+            found = stored.get(entity, {}).get(status, zero)
+            if expected != found:
+                mismatches.append(
+                    {
+                        "entity": entity,
+                        "status": status,
+                        "expected": expected,
+                        "stored": found,
+                    }
+                )
+
+    if mismatches and repair:
+        entities = sorted({m["entity"] for m in mismatches})
+        rebuild_counters(conn, entities)
+        conn.commit()
+        logger.warning(f"Repaired entity counters for: {', '.join(entities)}")
+    return mismatches
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Check entity counters against a full recount."""
+    parser = argparse.ArgumentParser(description="Verify entity_counters against a full recount")
+    parser.add_argument(
+        "--db",
+        default=str(Path(__file__).parent.parent / "data" / "architect.db"),
+        help="Database path (default: data/architect.db)",
+    )
+    parser.add_argument("--repair", action="store_true", help="Rebuild counters that differ")
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db, timeout=30)
+    try:
+        mismatches = check_counters(conn, repair=args.repair)
+    finally:
+        conn.close()
+
+    if not mismatches:
+        print("Entity counters match a full recount")
+        return 0
+    for m in mismatches:
+        print(
+            f"{m['entity']}[{m['status']}]: "
+            f"expected {m['expected']['count']} ({m['expected']['occurrences']} occurrences), "
+            f"stored {m['stored']['count']} ({m['stored']['occurrences']} occurrences)"
+        )
+    print(f"{len(mismatches)} mismatches" + (" repaired" if args.repair else ""))
+    return 0 if args.repair else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
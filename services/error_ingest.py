@@ -0,0 +1,466 @@
+"""
+Error Ingest
+
+Batched ingestion for reported errors. Reports are folded into an
+in-memory window keyed by error hash, and a background thread flushes the
+window with one UPSERT per distinct error, so a crash loop on one node
+costs a dictionary update per report instead of a write transaction.
+
+Features:
+- errors.error_hash (md5 of type:message:source) with a unique index over
+  active errors (open, queued, in_progress); resolved errors keep their
+  hash but no longer block a fresh row
+- One transaction per flush: INSERT ... ON CONFLICT DO UPDATE adds the
+  window's occurrence count to the active row
+- New rows are handed to an on_new callback inside the same transaction
+  (e.g. to queue a fix task); on_flush runs once per flush afterwards
+- Callers that need the row id wait on a future resolved by the flush
+  (submit() instead of add())
+- Reports are checked when added: object and list fields are stored as
+  JSON, other unbindable values raise ValueError
+- A failed flush (database locked) is merged back into the window and
+  retried on the next tick; any other write error fails the batch
+
+Usage:
+    from services.error_ingest import ensure_error_hash_schema, get_error_aggregator
+
+    ensure_error_hash_schema(conn)  # once, from init_database()
+
+    aggregator = get_error_aggregator(db_path, on_new=queue_fix, on_flush=broadcast)
+    aggregator.add({"error_type": "error", "message": "Connection refused"})
+
+    future = aggregator.submit(report)
+    future.result(timeout=5)  # {"id": 42, "deduplicated": False}
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Statuses covered by the unique error_hash index; a report for an error in
+# one of these states is merged into it instead of creating a new row
+ACTIVE_STATUSES = ("open", "queued", "in_progress")
+
+ERROR_HASH_INDEX = "idx_errors_active_hash"
+
+# Distinct errors held in one window before new ones are dropped
+MAX_PENDING_ERRORS = 50000
+
+# Hashes per IN (...) lookup, below SQLite's bound parameter limit
+_LOOKUP_CHUNK = 500
+
+_ACTIVE_SQL = "status IN ({})".format(", ".join(f"'{s}'" for s in ACTIVE_STATUSES))
+
+# Report fields stored on a new row, in column order
+_COLUMNS = (
+    "project_id",
+    "node_id",
+    "error_type",
+    "message",
+    "source",
+    "line",
+    "column_num",
+    "stack_trace",
+    "url",
+    "user_agent",
+    "http_status",
+    "context",
+)
+
+_UPSERT_SQL = f"""
+    INSERT INTO errors ({", ".join(_COLUMNS)}, status, occurrence_count, error_hash)
+    VALUES ({", ".join("?" for _ in _COLUMNS)}, ?, ?, ?)
+    ON CONFLICT(error_hash) WHERE {_ACTIVE_SQL} DO UPDATE SET
+        occurrence_count = occurrence_count + excluded.occurrence_count,
+        last_seen = CURRENT_TIMESTAMP,
+        context = COALESCE(excluded.context, errors.context)
+"""
+
+
+def normalize_report(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a report whose stored fields SQLite can bind.
+
+    Objects and lists (typically a structured "context") are stored as
+    JSON text; other non-scalar values are rejected.
+
+    Raises:
+        ValueError: If the report is not a dict or a field cannot be stored
+    """
+    if not isinstance(report, dict):
+        raise ValueError("Error report must be an object")
+    normalized = dict(report)
+    for field in (*_COLUMNS, "column"):
+        value = normalized.get(field)
+        if value is None or isinstance(value, (str, float, bytes)):
+            continue
+        if isinstance(value, int):
+            if not -(2**63) <= value < 2**63:
+                raise ValueError(f"Invalid {field}: integer out of range")
+        elif isinstance(value, (dict, list, tuple)):
+            try:
+                normalized[field] = json.dumps(value, default=str)
+            except ValueError as e:
+                raise ValueError(f"Invalid {field}: {e}")
+        else:
+            raise ValueError(f"Invalid {field}: unsupported type {type(value).__name__}")
+    return normalized
+
+
+def error_hash(error_type: Any, message: Any, source: Any) -> str:
+    """Deduplication key for an error report."""
+    key = f"{error_type or ''}:{message or ''}:{source or ''}"
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def ensure_error_hash_schema(conn: sqlite3.Connection) -> int:
+    """Add errors.error_hash and its unique index. Safe to call on every startup.
+
+    Active rows without a hash are backfilled. Where several active rows
+    share a hash (left by the old text-matching dedup), only the newest
+    gets it; the older ones stay unhashed and are never merged into.
+
+    Returns:
+        Number of rows backfilled (0 if the errors table does not exist)
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(errors)")}
+    if not columns:
+        return 0
+    if "error_hash" not in columns:
+        conn.execute("ALTER TABLE errors ADD COLUMN error_hash TEXT")
+
+    hashed = {
+        row[0]
+        for row in conn.execute(
+            f"SELECT error_hash FROM errors WHERE error_hash IS NOT NULL AND {_ACTIVE_SQL}"
+        )
+    }
+    updates = []
+    for row_id, error_type, message, source in conn.execute(
+        f"""
+        SELECT id, error_type, message, source FROM errors
+        WHERE error_hash IS NULL AND {_ACTIVE_SQL}
+        ORDER BY id DESC
+    """
+    ):
+        digest = error_hash(error_type, message, source)
+        if digest not in hashed:
+            hashed.add(digest)
+            updates.append((digest, row_id))
+    if updates:
+        conn.executemany("UPDATE errors SET error_hash = ? WHERE id = ?", updates)
+
+    conn.execute(
+        f"""
+        CREATE UNIQUE INDEX IF NOT EXISTS {ERROR_HASH_INDEX}
+        ON errors(error_hash) WHERE {_ACTIVE_SQL}
+    """
+    )
+    conn.commit()
+    return len(updates)
+
+
+class _Pending:
+    """One distinct error in the current window."""
+
+    __slots__ = ("report", "meta", "count", "context", "waiters")
+
+    def __init__(self, report: Dict[str, Any], meta: Optional[Dict[str, Any]]):
+        self.report = report
+        self.meta = meta or {}
+        self.count = 0
+        self.context = None
+        self.waiters: List[Future] = []
+
+    def merge(self, other: "_Pending") -> None:
+        self.count += other.count
+        if other.context is not None:
+            self.context = other.context
+        self.waiters.extend(other.waiters)
+
+
+def _occurrences(report: Dict[str, Any]) -> int:
+    """Occurrences a report stands for (clients may pre-aggregate)."""
+    try:
+        return max(1, int(report.get("occurrences") or 1))
+    except (TypeError, ValueError):
+        return 1
+
+
+class ErrorAggregator:
+    """
+    Per-process aggregation window flushed to the errors table.
+
+    add() only touches an in-memory dict under a short lock. A daemon
+    thread swaps the window out every flush_interval seconds and writes it
+    in a single transaction on its own connection.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        flush_interval: float = 0.25,
+        new_status: str = "queued",
+        on_new: Optional[Callable[[sqlite3.Connection, int, Dict, Dict], None]] = None,
+        on_flush: Optional[Callable[[Dict[str, Any]], None]] = None,
+        max_pending: int = MAX_PENDING_ERRORS,
+    ):
+        self.db_path = str(db_path)
+        self.flush_interval = flush_interval
+        self.new_status = new_status
+        self.on_new = on_new
+        self.on_flush = on_flush
+        self.max_pending = max_pending
+
+        self._lock = threading.Lock()
+        self._window: Dict[str, _Pending] = {}
+        self._wake = threading.Event()
+        self._done = threading.Condition()
+        self._started = 0  # flush cycles begun
+        self._cycles = 0  # flush cycles finished
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self.stats = {
+            "received": 0,
+            "flushes": 0,
+            "rows_written": 0,
+            "new_errors": 0,
+            "dropped": 0,
+            "errors": 0,
+        }
+
+    def start(self) -> None:
+        """Start the flush thread (idempotent; restarts after a fork)."""
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._conn = None
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name="error-ingest", daemon=True)
+            self._thread.start()
+
+    def add(self, report: Dict[str, Any], meta: Optional[Dict[str, Any]] = None) -> bool:
+        """Fold a report into the window.
+
+        Args:
+            report: Error fields (error_type, message, source, ...); an
+                optional "occurrences" count is added in one go
+            meta: Extra data passed to on_new if this creates a row
+
+        Returns:
+            False if the window is full and the report was dropped
+
+        Raises:
+            ValueError: If a field cannot be stored (see normalize_report)
+        """
+        return self._add(report, meta, None)
+
+    def submit(
+        self, report: Dict[str, Any], meta: Optional[Dict[str, Any]] = None
+    ) -> Optional[Future]:
+        """Like add(), returning a future resolved with {"id", "deduplicated"}
+        once the report is written, or None if it was dropped. The future
+        fails if the batch holding the report cannot be written."""
+        future: Future = Future()
+        return future if self._add(report, meta, future) else None
+
+    def _add(
+        self, report: Dict[str, Any], meta: Optional[Dict[str, Any]], future: Optional[Future]
+    ) -> bool:
+        # Checked here so a bad report fails its caller, not the whole flush
+        report = normalize_report(report)
+        if self._thread is None or self._pid != os.getpid():
+            self.start()
+        digest = error_hash(report.get("error_type"), report.get("message"), report.get("source"))
+        with self._lock:
+            pending = self._window.get(digest)
+            if pending is None:
+                if len(self._window) >= self.max_pending:
+                    self.stats["dropped"] += 1
+                    return False
+                pending = self._window[digest] = _Pending(report, meta)
+            pending.count += _occurrences(report)
+            if report.get("context") is not None:
+                pending.context = report["context"]
+            if future is not None:
+                pending.waiters.append(future)
+            self.stats["received"] += 1
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Write everything added so far; returns False on timeout."""
+        self.start()
+        with self._done:
+            # A cycle already in progress may have swapped the window before our reports
+            target = self._started + 1
+            self._wake.set()
+            return self._done.wait_for(lambda: self._cycles >= target, timeout)
+
+    def close(self) -> None:
+        """Flush the window and stop the thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stopped = True
+        self._wake.set()
+        thread.join(5.0)
+
+    def pending(self) -> int:
+        """Distinct errors waiting for the next flush."""
+        with self._lock:
+            return len(self._window)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters for this process."""
+        return {**self.stats, "pending": self.pending(), "flush_interval": self.flush_interval}
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            with self._done:
+                self._started += 1
+            self._flush_window()
+            with self._done:
+                self._cycles += 1
+                self._done.notify_all()
+            if self._stopped:
+                break
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _flush_window(self) -> None:
+        with self._lock:
+            batch, self._window = self._window, {}
+        if not batch:
+            return
+        try:
+            results = self._write(batch)
+        except sqlite3.OperationalError as e:
+            # Locked or busy: worth retrying
+            self.stats["errors"] += 1
+            logger.warning(f"Error ingest flush failed, retrying next tick: {e}")
+            self._requeue(batch)
+            return
+        except Exception as e:
+            # Retrying would fail the same way; drop the batch
+            self.stats["errors"] += 1
+            self.stats["dropped"] += len(batch)
+            logger.error(f"Error ingest flush failed, dropping {len(batch)} errors: {e}")
+            for pending in batch.values():
+                for future in pending.waiters:
+                    future.set_exception(e)
+            return
+
+        for digest, pending in batch.items():
+            for future in pending.waiters:
+                future.set_result(results[digest])
+        summary = {
+            "errors": len(batch),
+            "occurrences": sum(p.count for p in batch.values()),
+            "new": sum(1 for r in results.values() if not r["deduplicated"]),
+        }
+        if self.on_flush:
+            try:
+                self.on_flush(summary)
+            except Exception as e:
+                logger.debug(f"Error ingest on_flush failed: {e}")
+
+    def _requeue(self, batch: Dict[str, _Pending]) -> None:
+        with self._lock:
+            for digest, pending in batch.items():
+                current = self._window.get(digest)
+                if current is not None:
+                    pending.merge(current)
+                self._window[digest] = pending
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, timeout=5)
+        return self._conn
+
+    def _write(self, batch: Dict[str, _Pending]) -> Dict[str, Dict[str, Any]]:
+        """Upsert the batch in one transaction; returns {hash: {id, deduplicated}}."""
+        conn = self._connection()
+        digests = list(batch)
+        with conn:
+            existing = self._lookup(conn, digests)
+            conn.executemany(
+                _UPSERT_SQL,
+                [
+                    (
+                        *(self._column(pending, column) for column in _COLUMNS),
+                        self.new_status,
+                        pending.count,
+                        digest,
+                    )
+                    for digest, pending in batch.items()
+                ],
+            )
+            created = self._lookup(conn, [d for d in digests if d not in existing])
+            if self.on_new:
+                for digest, error_id in created.items():
+                    pending = batch[digest]
+                    self.on_new(conn, error_id, pending.report, pending.meta)
+
+        self.stats["flushes"] += 1
+        self.stats["rows_written"] += len(batch)
+        self.stats["new_errors"] += len(created)
+        results = {d: {"id": i, "deduplicated": True} for d, i in existing.items()}
+        results.update({d: {"id": i, "deduplicated": False} for d, i in created.items()})
+        return results
+
+    @staticmethod
+    def _column(pending: _Pending, column: str) -> Any:
+        if column == "context":
+            return pending.context
+        if column == "column_num":
+            return pending.report.get("column_num", pending.report.get("column"))
+        if column == "error_type":
+            return pending.report.get("error_type") or "unknown"
+        return pending.report.get(column)
+
+    @staticmethod
+    def _lookup(conn: sqlite3.Connection, digests: List[str]) -> Dict[str, int]:
+        found: Dict[str, int] = {}
+        for i in range(0, len(digests), _LOOKUP_CHUNK):
+            chunk = digests[i : i + _LOOKUP_CHUNK]
+            found.update(
+                conn.execute(
+                    f"""
+                    SELECT error_hash, id FROM errors
+                    WHERE error_hash IN ({", ".join("?" for _ in chunk)}) AND {_ACTIVE_SQL}
+                """,
+                    chunk,
+                ).fetchall()
+            )
+        return found
+
+
+_aggregators: Dict[str, ErrorAggregator] = {}
+_aggregators_lock = threading.Lock()
+
+
+def get_error_aggregator(db_path: str = None, **kwargs) -> ErrorAggregator:
+    """Get this process's aggregator for a database (kwargs apply on first call)."""
+    if db_path is None:
+        db_path = str(Path(__file__).parent.parent / "data" / "architect.db")
+    db_path = str(db_path)
+    with _aggregators_lock:
+        aggregator = _aggregators.get(db_path)
+        if aggregator is None:
+            aggregator = _aggregators[db_path] = ErrorAggregator(db_path, **kwargs)
+        return aggregator
@@ -0,0 +1,576 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache
+
+Opt-in cache for UnifiedLLMClient completions. Workers such as auto-confirm,
+task suggestion and the crawler send the same classification prompts over
+and over; a cache hit returns the stored completion without a provider call.
+
+Features:
+    - Keys are exact request fingerprints of (model, messages, temperature,
+      max_tokens, system, other provider arguments)
+    - In-memory LRU tier in front of a persistent SQLite tier
+    - TTL expiry plus entry-count and byte-size eviction on disk
+    - Single-flight coalescing: concurrent identical requests share one
+      provider call
+    - Hit/miss/coalesced counters and cost saved, flushed periodically to
+      LLMMetricsService
+
+Usage:
+    from services.llm_cache import get_response_cache
+    from services.llm_provider import UnifiedLLMClient
+
+    client = UnifiedLLMClient(cache=get_response_cache())
+    response = client.messages.create(
+        model="claude-sonnet-4-5",
+        max_tokens=64,
+        messages=[{"role": "user", "content": "Classify: ..."}],
+    )
+    client.messages.create(..., cache=False)  # bypass for one call
+
+Environment Variables:
+    LLM_CACHE_ENABLED - Attach the shared cache to every UnifiedLLMClient (default: false)
+    LLM_CACHE_DB - SQLite file for the persistent tier (default: data/llm_cache.db)
+    LLM_CACHE_TTL - Entry lifetime in seconds (default: 3600)
+"""
+
+import asyncio
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from services.prompt_fingerprint import request_fingerprint
+
+logger = logging.getLogger("LLMCache")
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "llm_cache.db"
+
+# Arguments with a dedicated slot in the fingerprint
+_KEY_ARGS = ("model", "temperature", "max_tokens", "system")
+
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT,
+    provider TEXT,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    cost REAL DEFAULT 0.0,
+    tokens INTEGER DEFAULT 0,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_used_at REAL NOT NULL,
+    hits INTEGER DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_expires ON llm_response_cache(expires_at);
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_used ON llm_response_cache(last_used_at);
+"""
+
+
+class _Flight:
+    """A provider call in progress that identical requests wait on."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.entry: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+class LLMResponseCache:
+    """Two-tier response cache with single-flight coalescing."""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        ttl: Optional[float] = None,
+        memory_entries: int = 512,
+        max_entries: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        prune_every: int = 64,
+        metrics_flush_interval: float = 60.0,
+        metrics_recorder: Optional[Callable[..., bool]] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: SQLite file for the persistent tier (None: LLM_CACHE_DB or
+                data/llm_cache.db; ":memory:" keeps everything in process)
+            ttl: Entry lifetime in seconds (default: LLM_CACHE_TTL or 3600)
+            memory_entries: Size of the in-memory LRU tier
+            max_entries: Entries kept on disk before the least recently used go
+            max_bytes: Serialized response bytes kept on disk
+            prune_every: Run disk eviction after this many stores
+            metrics_flush_interval: Seconds between metric flushes
+            metrics_recorder: Called with the counter deltas on flush
+                (default: LLMMetricsService.record_cache_stats)
+        """
+        self.db_path = str(db_path or os.getenv("LLM_CACHE_DB") or DEFAULT_DB_PATH)
+        self.ttl = float(ttl if ttl is not None else os.getenv("LLM_CACHE_TTL", 3600))
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.prune_every = prune_every
+        self.metrics_flush_interval = metrics_flush_interval
+        self._metrics_recorder = metrics_recorder
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._inflight: Dict[str, _Flight] = {}
+        self._async_inflight: Dict[str, "asyncio.Future"] = {}
+
+        self._db_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stores_since_prune = 0
+
+        self.stats = self._zero_stats()
+        self._unflushed = self._zero_stats()
+        self._last_flush = time.monotonic()
+
+    @staticmethod
+    def _zero_stats() -> Dict[str, float]:
+        return {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "stores": 0,
+            "evictions": 0,
+            "tokens_saved": 0,
+            "cost_saved": 0.0,
+        }
+
+    # =========================================================================
+    # Keys and serialization
+    # =========================================================================
+
+    @staticmethod
+    def make_key(messages: List[Dict[str, Any]], **kwargs) -> str:
+        """Fingerprint a create() call."""
+        extra = {k: v for k, v in kwargs.items() if k not in _KEY_ARGS}
+        return request_fingerprint(
+            kwargs.get("model"),
+            messages,
+            temperature=kwargs.get("temperature"),
+            max_tokens=kwargs.get("max_tokens"),
+            system=kwargs.get("system"),
+            extra=extra,
+        )
+
+    @staticmethod
+    def _to_response(entry: Dict[str, Any]):
+        """Rebuild a fresh LLMResponse for a caller from a stored entry."""
+        from services.llm_provider import LLMResponse, Usage
+
+        data = dict(entry["response"])
+        data["usage"] = Usage(**data.get("usage", {}))
+        data["content"] = [dict(block) for block in data.get("content", [])]
+        data["cost"] = 0.0
+        data["latency"] = 0.0
+        data["cached"] = True
+        return LLMResponse(**data)
+
+    def _entry(self, response, now: float) -> Dict[str, Any]:
+        data = response.to_dict()
+        data.pop("cached", None)
+        return {
+            "response": data,
+            "cost": response.cost,
+            "tokens": response.usage.total_tokens,
+            "expires_at": now + self.ttl,
+        }
+
+    # =========================================================================
+    # Persistent tier
+    # =========================================================================
+
+    def _db(self) -> sqlite3.Connection:
+        """Open the SQLite tier on first use (caller holds _db_lock)."""
+        if self._conn is None:
+            if self.db_path != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(CACHE_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _disk_get(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        try:
+            with self._db_lock:
+                conn = self._db()
+                row = conn.execute(
+                    "SELECT response, cost, tokens, expires_at FROM llm_response_cache "
+                    "WHERE key = ? AND expires_at > ?",
+                    (key, now),
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute(
+                    "UPDATE llm_response_cache SET hits = hits + 1, last_used_at = ? WHERE key = ?",
+                    (now, key),
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+        return {
+            "response": json.loads(row[0]),
+            "cost": row[1] or 0.0,
+            "tokens": row[2] or 0,
+            "expires_at": row[3],
+        }
+
+    def _disk_put(self, key: str, entry: Dict[str, Any], now: float):
+        payload = json.dumps(entry["response"], separators=(",", ":"))
+        try:
+            with self._db_lock:
+                conn = self._db()
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO llm_response_cache (
+                        key, model, provider, response, size, cost, tokens,
+                        created_at, expires_at, last_used_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        key,
+                        entry["response"].get("model"),
+                        entry["response"].get("provider"),
+                        payload,
+                        len(payload),
+                        entry["cost"],
+                        entry["tokens"],
+                        now,
+                        entry["expires_at"],
+                        now,
+                    ),
+                )
+                conn.commit()
+                self._stores_since_prune += 1
+                due = self._stores_since_prune >= self.prune_every
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache write failed: {e}")
+            return
+        if due:
+            self.prune()
+
+    def prune(self) -> int:
+        """Drop expired entries, then the least recently used beyond the size limits."""
+        now = time.time()
+        try:
+            with self._db_lock:
+                conn = self._db()
+                removed = conn.execute(
+                    "DELETE FROM llm_response_cache WHERE expires_at <= ?", (now,)
+                ).rowcount
+                removed += conn.execute(
+                    """
+                    DELETE FROM llm_response_cache WHERE key IN (
+                        SELECT key FROM llm_response_cache
+                        ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+                    )
+                """,
+                    (self.max_entries,),
+                ).rowcount
+                removed += conn.execute(
+                    """
+                    DELETE FROM llm_response_cache WHERE key IN (
+                        SELECT key FROM (
+                            SELECT key, SUM(size) OVER (
+                                ORDER BY last_used_at DESC, key
+                            ) AS running_bytes
+                            FROM llm_response_cache
+                        ) WHERE running_bytes > ?
+                    )
+                """,
+                    (self.max_bytes,),
+                ).rowcount
+                conn.commit()
+                self._stores_since_prune = 0
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache prune failed: {e}")
+            return 0
+        if removed:
+            self._count("evictions", removed)
+        return removed
+
+    # =========================================================================
+    # Lookup and store
+    # =========================================================================
+
+    def _memory_get(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            if entry["expires_at"] <= now:
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return entry
+
+    def _memory_put(self, key: str, entry: Dict[str, Any]):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        entry = self._memory_get(key, now)
+        if entry is not None:
+            self._record_hit("memory_hits", entry)
+            return entry
+        entry = self._disk_get(key, now)
+        if entry is not None:
+            self._memory_put(key, entry)
+            self._record_hit("disk_hits", entry)
+        return entry
+
+    def get(self, key: str):
+        """Cached LLMResponse for a key, or None."""
+        try:
+            entry = self._lookup(key)
+            return self._to_response(entry) if entry is not None else None
+        finally:
+            self._maybe_flush_metrics()
+
+    def put(self, key: str, response):
+        """Store a successful response in both tiers."""
+        now = time.time()
+        entry = self._entry(response, now)
+        self._memory_put(key, entry)
+        self._disk_put(key, entry, now)
+        self._count("stores")
+        return entry
+
+    def get_or_create(self, key: str, create: Callable[[], Any]):
+        """
+        Return the cached response for key, or call create() once.
+
+        Concurrent callers with the same key wait for the first caller's
+        provider call instead of making their own. Failures are not cached;
+        every waiter sees the leader's exception.
+        """
+        try:
+            return self._get_or_create(key, create)
+        finally:
+            # Hits and coalesced waiters count too, not just the leader
+            self._maybe_flush_metrics()
+
+    def _get_or_create(self, key: str, create: Callable[[], Any]):
+        entry = self._lookup(key)
+        if entry is not None:
+            return self._to_response(entry)
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            self._record_hit("coalesced", flight.entry)
+            return self._to_response(flight.entry)
+
+        try:
+            # A flight that finished between the lookup and taking the lead
+            entry = self._memory_get(key, time.time())
+            if entry is not None:
+                flight.entry = entry
+                self._record_hit("memory_hits", entry)
+                return self._to_response(entry)
+
+            self._count("misses")
+            response = create()
+            flight.entry = self.put(key, response)
+            return response
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    async def aget_or_create(self, key: str, create: Callable[[], Awaitable[Any]]):
+        """
+        Async get_or_create() for AsyncUnifiedLLMClient.
+
+        The memory tier is checked inline; the SQLite tier, stores and metric
+        flushes run in a worker thread so the event loop never blocks on
+        disk. Concurrent identical calls on one event loop await the first
+        caller's create() instead of making their own.
+        """
+        try:
+            return await self._aget_or_create(key, create)
+        finally:
+            if time.monotonic() - self._last_flush >= self.metrics_flush_interval:
+                await asyncio.to_thread(self.flush_metrics)
+
+    async def _aget_or_create(self, key: str, create: Callable[[], Awaitable[Any]]):
+        now = time.time()
+        entry = self._memory_get(key, now)
+        if entry is not None:
+            self._record_hit("memory_hits", entry)
+            return self._to_response(entry)
+
+        # Take the lead before the first await so identical calls see the flight
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            flight = self._async_inflight.get(key)
+            leader = flight is None or flight.get_loop() is not loop
+            if leader:
+                flight = loop.create_future()
+                # Futures cannot be shared across loops: a flight running on
+                # another loop keeps the slot and this call runs alone
+                self._async_inflight.setdefault(key, flight)
+
+        if not leader:
+            try:
+                entry = await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    raise
+                # The leader was cancelled, not this call: try again
+                return await self._aget_or_create(key, create)
+            self._record_hit("coalesced", entry)
+            return self._to_response(entry)
+
+        try:
+            entry = await asyncio.to_thread(self._disk_get, key, now)
+            if entry is not None:
+                self._memory_put(key, entry)
+                self._record_hit("disk_hits", entry)
+                response = self._to_response(entry)
+            else:
+                self._count("misses")
+                response = await create()
+                entry = await asyncio.to_thread(self.put, key, response)
+            flight.set_result(entry)
+            return response
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as e:
+            flight.set_exception(e)
+            flight.exception()  # Mark retrieved in case nobody was waiting
+            raise
+        finally:
+            with self._lock:
+                if self._async_inflight.get(key) is flight:
+                    del self._async_inflight[key]
+
+    def clear(self):
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        try:
+            with self._db_lock:
+                self._db().execute("DELETE FROM llm_response_cache")
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache clear failed: {e}")
+
+    def close(self):
+        """Flush metrics and close the SQLite tier."""
+        self.flush_metrics()
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # =========================================================================
+    # Metrics
+    # =========================================================================
+
+    def _count(self, name: str, amount: float = 1):
+        with self._lock:
+            self.stats[name] += amount
+            self._unflushed[name] += amount
+
+    def _record_hit(self, name: str, entry: Dict[str, Any]):
+        with self._lock:
+            for stats in (self.stats, self._unflushed):
+                stats[name] += 1
+                stats["tokens_saved"] += entry["tokens"]
+                stats["cost_saved"] += entry["cost"]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Cache counters since this process started."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_entries"] = len(self._memory)
+            stats["inflight"] = len(self._inflight) + len(self._async_inflight)
+        hits = stats["memory_hits"] + stats["disk_hits"] + stats["coalesced"]
+        lookups = hits + stats["misses"]
+        stats["hits"] = hits
+        stats["hit_rate"] = hits / lookups if lookups else 0.0
+        stats["cost_saved"] = round(stats["cost_saved"], 6)
+        return stats
+
+    def _maybe_flush_metrics(self):
+        if time.monotonic() - self._last_flush >= self.metrics_flush_interval:
+            self.flush_metrics()
+
+    def flush_metrics(self) -> bool:
+        """Send counters accumulated since the last flush to the metrics store."""
+        with self._lock:
+            pending, self._unflushed = self._unflushed, self._zero_stats()
+            self._last_flush = time.monotonic()
+        if not any(pending[k] for k in ("memory_hits", "disk_hits", "misses", "coalesced")):
+            return True
+
+        recorder = self._metrics_recorder
+        if recorder is None:
+            try:
+                from services.llm_metrics import LLMMetricsService
+
+                recorder = LLMMetricsService.record_cache_stats
+            except Exception as e:
+                logger.debug(f"LLM metrics unavailable: {e}")
+                return False
+        try:
+            return bool(
+                recorder(
+                    memory_hits=pending["memory_hits"],
+                    disk_hits=pending["disk_hits"],
+                    misses=pending["misses"],
+                    coalesced=pending["coalesced"],
+                    evictions=pending["evictions"],
+                    tokens_saved=pending["tokens_saved"],
+                    cost_saved_usd=pending["cost_saved"],
+                )
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record LLM cache metrics: {e}")
+            return False
+
+
+_shared_cache: Optional[LLMResponseCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_response_cache() -> LLMResponseCache:
+    """Get the process-wide response cache."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = LLMResponseCache()
+            # Send the counters of the last interval before the process exits
+            atexit.register(_shared_cache.close)
+        return _shared_cache
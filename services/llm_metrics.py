@@ -527,6 +527,93 @@ class LLMMetricsService:
                 ),
             )
 
+    @staticmethod
+    def record_cache_stats(
+        memory_hits: int = 0,
+        disk_hits: int = 0,
+        misses: int = 0,
+        coalesced: int = 0,
+        evictions: int = 0,
+        tokens_saved: int = 0,
+        cost_saved_usd: float = 0.0,
+    ) -> bool:
+        """
+        Add response cache counters to today's totals.
+
+        Called by LLMResponseCache with the deltas since its last flush.
+
+        Returns:
+            True if recorded successfully
+        """
+        try:
+            with get_connection("main") as conn:
+                conn.execute(
+                    """
+                    INSERT INTO llm_cache_daily (
+                        date, memory_hits, disk_hits, misses, coalesced,
+                        evictions, tokens_saved, cost_saved_usd
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(date) DO UPDATE SET
+                        memory_hits = memory_hits + excluded.memory_hits,
+                        disk_hits = disk_hits + excluded.disk_hits,
+                        misses = misses + excluded.misses,
+                        coalesced = coalesced + excluded.coalesced,
+                        evictions = evictions + excluded.evictions,
+                        tokens_saved = tokens_saved + excluded.tokens_saved,
+                        cost_saved_usd = cost_saved_usd + excluded.cost_saved_usd,
+                        updated_at = CURRENT_TIMESTAMP
+                """,
+                    (
+                        date.today().isoformat(),
+                        memory_hits,
+                        disk_hits,
+                        misses,
+                        coalesced,
+                        evictions,
+                        tokens_saved,
+                        cost_saved_usd,
+                    ),
+                )
+                conn.commit()
+                return True
+        except Exception as e:
+            print(f"Error recording cache stats: {e}")
+            return False
+
+    @staticmethod
+    def get_cache_summary(days: int = 30) -> Dict:
+        """Get response cache hit rate and savings over the last N days."""
+        try:
+            with get_connection("main") as conn:
+                conn.row_factory = sqlite3.Row
+                row = conn.execute(
+                    """
+                    SELECT
+                        COALESCE(SUM(memory_hits), 0) as memory_hits,
+                        COALESCE(SUM(disk_hits), 0) as disk_hits,
+                        COALESCE(SUM(coalesced), 0) as coalesced,
+                        COALESCE(SUM(misses), 0) as misses,
+                        COALESCE(SUM(evictions), 0) as evictions,
+                        COALESCE(SUM(tokens_saved), 0) as tokens_saved,
+                        COALESCE(SUM(cost_saved_usd), 0.0) as cost_saved_usd
+                    FROM llm_cache_daily
+                    WHERE date >= date('now', ?)
+                """,
+                    (f"-{int(days)} days",),
+                ).fetchone()
+
+                summary = dict(row)
+                hits = summary["memory_hits"] + summary["disk_hits"] + summary["coalesced"]
+                lookups = hits + summary["misses"]
+                summary["hits"] = hits
+                summary["hit_rate"] = round(hits / lookups * 100, 2) if lookups else 0.0
+                summary["cost_saved_usd"] = round(summary["cost_saved_usd"], 4)
+                summary["days"] = days
+                return summary
+        except Exception as e:
+            print(f"Error getting cache summary: {e}")
+            return {"hits": 0, "misses": 0, "hit_rate": 0.0, "cost_saved_usd": 0.0, "days": days}
+
     @staticmethod
     def get_daily_trends(days: int = 30) -> List[Dict]:
         """Get daily cost and usage trends."""
@@ -248,6 +248,45 @@ def get_llm_trends():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@llm_metrics_bp.route("/api/llm/cache", methods=["GET"])
+@require_auth_decorator
+def get_llm_cache_stats():
+    """
+    Get response cache hit rate and savings.
+
+    Query Parameters:
+        days: Number of days to look back (default: 30)
+
+    Returns:
+        200: Cache summary
+            {
+                "success": true,
+                "cache": {
+                    "hits": 420,
+                    "memory_hits": 380,
+                    "disk_hits": 25,
+                    "coalesced": 15,
+                    "misses": 180,
+                    "hit_rate": 70.0,
+                    "tokens_saved": 126000,
+                    "cost_saved_usd": 1.89,
+                    "days": 30
+                }
+            }
+
+    Example:
+        GET /api/llm/cache?days=7
+    """
+    try:
+        days = request.args.get("days", 30, type=int)
+        cache = LLMMetricsService.get_cache_summary(days=days)
+
+        return jsonify({"success": True, "cache": cache})
+
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @llm_metrics_bp.route("/api/llm/record", methods=["POST"])
 @require_auth_decorator
 def record_llm_request():
@@ -11,9 +11,11 @@ Features:
     - Metrics collection
     - Thread-safe operation
     - Drop-in replacement for anthropic.messages.create()
+    - Optional response cache with request coalescing (services/llm_cache.py)
+    - Async client with pooled connections, batch completion and hedged requests
 
 Usage:
-    from services.llm_provider import UnifiedLLMClient
+    from services.llm_provider import AsyncUnifiedLLMClient, UnifiedLLMClient
 
     # Initialize client (automatically detects environment)
     client = UnifiedLLMClient()
@@ -25,21 +27,32 @@ Usage:
         messages=[{"role": "user", "content": "Hello!"}]
     )
 
+    # Async, with the next provider raced in after 2s of silence
+    client = AsyncUnifiedLLMClient(hedge_after=2.0)
+    response = await client.messages.create(model=..., messages=[...])
+
 Environment Variables:
     LLM_FAILOVER_ENABLED - Enable/disable failover (default: true)
     LLM_DEFAULT_PROVIDER - Primary provider (claude, ollama, openai)
     ANTHROPIC_API_KEY - Claude API key
     OPENAI_API_KEY - OpenAI API key
     OLLAMA_ENDPOINT - Ollama endpoint (default: http://localhost:11434)
+    LLM_CACHE_ENABLED - Cache identical requests (default: false)
+    LLM_HEDGE_AFTER - Seconds before AsyncUnifiedLLMClient hedges to the next provider
 """
 
+import asyncio
+import functools
 import logging
 import os
+import threading
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from services.circuit_breaker import CircuitBreaker, CircuitConfig, CircuitOpenError
 
@@ -118,6 +131,7 @@ class LLMResponse:
     provider: str = ""
     cost: float = 0.0
     latency: float = 0.0
+    cached: bool = False  # served from LLMResponseCache, no provider call
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -134,6 +148,7 @@ class ProviderConfig:
     endpoint: Optional[str] = None
     timeout: float = 120.0
     max_retries: int = 3
+    max_concurrency: int = 8  # threads / aiohttp connections for calls from async code
 
     # Cost tracking (per 1K tokens)
     cost_per_1k_prompt: float = 0.0
@@ -162,50 +177,162 @@ class BaseProvider:
         self.total_requests = 0
         self.successful_requests = 0
         self.failed_requests = 0
+        self.cancelled_requests = 0
         self.total_cost = 0.0
         self.total_tokens = 0
 
-    def create_completion(self, messages: List[Dict[str, str]], **kwargs) -> LLMResponse:
-        """Create completion with circuit breaker protection."""
+        # Pooled connections: one requests.Session per thread, one aiohttp
+        # session / async SDK client per event loop
+        self._local = threading.local()
+        self._loop_resources: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def _begin_request(self) -> float:
+        """Circuit breaker check before a call; returns the start time."""
         if not self.circuit.allow_request():
             raise CircuitOpenError(f"llm-{self.provider_type.value}")
-
         self.total_requests += 1
-        start_time = time.time()
+        return time.time()
+
+    def _record_success(self, response: LLMResponse, start_time: float) -> LLMResponse:
+        latency = time.time() - start_time
+        response.latency = latency
+        response.provider = self.provider_type.value
+
+        # Calculate cost
+        response.cost = self.calculate_cost(response.usage)
+
+        # Update metrics
+        self.successful_requests += 1
+        self.total_cost += response.cost
+        self.total_tokens += response.usage.total_tokens
+
+        self.circuit.record_success()
+        logger.info(
+            f"{self.provider_type.value} completion successful: "
+            f"{response.usage.total_tokens} tokens, "
+            f"${response.cost:.4f}, {latency:.2f}s"
+        )
+        return response
 
+    def _record_failure(self, error: Exception):
+        self.failed_requests += 1
+        self.circuit.record_failure(error)
+        logger.error(f"{self.provider_type.value} completion failed: {error}")
+
+    def create_completion(self, messages: List[Dict[str, str]], **kwargs) -> LLMResponse:
+        """Create completion with circuit breaker protection."""
+        start_time = self._begin_request()
         try:
             response = self._create_completion_impl(messages, **kwargs)
-            latency = time.time() - start_time
-            response.latency = latency
-            response.provider = self.provider_type.value
-
-            # Calculate cost
-            response.cost = self.calculate_cost(response.usage)
-
-            # Update metrics
-            self.successful_requests += 1
-            self.total_cost += response.cost
-            self.total_tokens += response.usage.total_tokens
-
-            self.circuit.record_success()
-            logger.info(
-                f"{self.provider_type.value} completion successful: "
-                f"{response.usage.total_tokens} tokens, "
-                f"${response.cost:.4f}, {latency:.2f}s"
-            )
+        except Exception as e:
+            self._record_failure(e)
+            raise
+        return self._record_success(response, start_time)
 
-            return response
+    async def acreate_completion(self, messages: List[Dict[str, str]], **kwargs) -> LLMResponse:
+        """
+        Async create_completion with the same circuit breaker protection.
 
+        A cancelled call (e.g. the losing side of a hedged request) counts as
+        neither a success nor a failure.
+        """
+        start_time = self._begin_request()
+        try:
+            response = await self._acreate_completion_impl(messages, **kwargs)
+        except asyncio.CancelledError:
+            self.cancelled_requests += 1
+            raise
         except Exception as e:
-            self.failed_requests += 1
-            self.circuit.record_failure(e)
-            logger.error(f"{self.provider_type.value} completion failed: {e}")
+            self._record_failure(e)
             raise
+        return self._record_success(response, start_time)
 
     def _create_completion_impl(self, messages: List[Dict[str, str]], **kwargs) -> LLMResponse:
         """Provider-specific implementation."""
         raise NotImplementedError
 
+    async def _acreate_completion_impl(
+        self, messages: List[Dict[str, str]], **kwargs
+    ) -> LLMResponse:
+        """
+        Provider-specific async implementation.
+
+        Defaults to running the blocking implementation on this provider's
+        bounded thread pool. Cancelling it stops the wait, not the thread.
+        """
+        return await self._run_blocking(self._create_completion_impl, messages, **kwargs)
+
+    async def _run_blocking(self, func: Callable, *args, **kwargs):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.config.max_concurrency,
+                    thread_name_prefix=f"llm-{self.provider_type.value}",
+                )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    # -------------------------------------------------------------------------
+    # Pooled HTTP
+    # -------------------------------------------------------------------------
+
+    def _http_session(self):
+        """Keep-alive requests.Session for the calling thread."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import requests
+
+            session = self._local.session = requests.Session()
+        return session
+
+    def _post_json(
+        self, url: str, payload: Dict, headers: Dict = None, pooled: bool = False
+    ) -> Dict:
+        import requests
+
+        http = self._http_session() if pooled else requests
+        response = http.post(url, json=payload, headers=headers, timeout=self.config.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def _loop_resource(self, name: str, factory: Callable):
+        """One shared object (session, async SDK client) per running event loop."""
+        loop = asyncio.get_running_loop()
+        resources = self._loop_resources.setdefault(loop, {})
+        if name not in resources:
+            resources[name] = factory()
+        return resources[name]
+
+    async def _apost_json(self, url: str, payload: Dict, headers: Dict = None) -> Dict:
+        """POST JSON from async code over a pooled aiohttp session if available."""
+        try:
+            import aiohttp
+        except ImportError:
+            return await self._run_blocking(self._post_json, url, payload, headers, pooled=True)
+
+        session = self._loop_resource(
+            "aiohttp",
+            lambda: aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.config.max_concurrency),
+                timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+            ),
+        )
+        async with session.post(url, json=payload, headers=headers) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def aclose(self):
+        """Close pooled async resources for the running loop."""
+        resources = self._loop_resources.pop(asyncio.get_running_loop(), {})
+        for resource in resources.values():
+            close = getattr(resource, "close", None)
+            if close is not None:
+                result = close()
+                if asyncio.iscoroutine(result):
+                    await result
+
     def calculate_cost(self, usage: Usage) -> float:
         """Calculate cost based on usage."""
         prompt_cost = (usage.prompt_tokens / 1000.0) * self.config.cost_per_1k_prompt
@@ -256,17 +383,44 @@ class ClaudeProvider(BaseProvider):
         if not self.config.api_key:
             raise ValueError("ANTHROPIC_API_KEY not set")
 
-        client = anthropic.Anthropic(api_key=self.config.api_key)
+        # The SDK client pools connections; share it across calls
+        client = getattr(self, "_client", None)
+        if client is None:
+            client = self._client = anthropic.Anthropic(api_key=self.config.api_key)
 
         # Call Claude API
-        response = client.messages.create(
-            model=kwargs.get("model", self.config.model),
-            max_tokens=kwargs.get("max_tokens", 1024),
-            messages=messages,
-            **{k: v for k, v in kwargs.items() if k not in ["model", "max_tokens"]},
+        response = client.messages.create(**self._request_args(messages, kwargs))
+        return self._normalize(response)
+
+    async def _acreate_completion_impl(
+        self, messages: List[Dict[str, str]], **kwargs
+    ) -> LLMResponse:
+        """Create Claude completion with the async SDK client."""
+        try:
+            import anthropic
+        except ImportError:
+            raise RuntimeError("anthropic package not installed. Run: pip install anthropic")
+
+        if not self.config.api_key:
+            raise ValueError("ANTHROPIC_API_KEY not set")
+
+        client = self._loop_resource(
+            "anthropic", lambda: anthropic.AsyncAnthropic(api_key=self.config.api_key)
         )
+        response = await client.messages.create(**self._request_args(messages, kwargs))
+        return self._normalize(response)
+
+    def _request_args(self, messages: List[Dict[str, str]], kwargs: Dict) -> Dict:
+        return {
+            "model": kwargs.get("model", self.config.model),
+            "max_tokens": kwargs.get("max_tokens", 1024),
+            "messages": messages,
+            **{k: v for k, v in kwargs.items() if k not in ["model", "max_tokens"]},
+        }
 
-        # Normalize response
+    @staticmethod
+    def _normalize(response) -> LLMResponse:
+        """Normalize an Anthropic SDK response."""
         return LLMResponse(
             id=response.id,
             content=response.content,
@@ -296,21 +450,26 @@ class OllamaProvider(BaseProvider):
 
     def _create_completion_impl(self, messages: List[Dict[str, str]], **kwargs) -> LLMResponse:
         """Create Ollama completion."""
-        import requests
+        data = self._post_json(*self._request(messages, kwargs))
+        return self._parse(data, messages)
 
-        url = f"{self.config.endpoint}/api/chat"
+    async def _acreate_completion_impl(
+        self, messages: List[Dict[str, str]], **kwargs
+    ) -> LLMResponse:
+        """Create Ollama completion without blocking the event loop."""
+        data = await self._apost_json(*self._request(messages, kwargs))
+        return self._parse(data, messages)
 
+    def _request(self, messages: List[Dict[str, str]], kwargs: Dict):
+        url = f"{self.config.endpoint}/api/chat"
         payload = {
             "model": kwargs.get("model", self.config.model),
             "messages": messages,
             "stream": False,
         }
+        return url, payload
 
-        response = requests.post(url, json=payload, timeout=self.config.timeout)
-        response.raise_for_status()
-
-        data = response.json()
-
+    def _parse(self, data: Dict, messages: List[Dict[str, str]]) -> LLMResponse:
         # Extract content
         content = data.get("message", {}).get("content", "")
 
@@ -355,16 +514,43 @@ class OpenAIProvider(BaseProvider):
         if not self.config.api_key:
             raise ValueError("OPENAI_API_KEY not set")
 
-        client = openai.OpenAI(api_key=self.config.api_key)
+        # The SDK client pools connections; share it across calls
+        client = getattr(self, "_client", None)
+        if client is None:
+            client = self._client = openai.OpenAI(api_key=self.config.api_key)
 
-        response = client.chat.completions.create(
-            model=kwargs.get("model", self.config.model),
-            messages=messages,
-            max_tokens=kwargs.get("max_tokens"),
-            **{k: v for k, v in kwargs.items() if k not in ["model", "max_tokens"]},
+        response = client.chat.completions.create(**self._request_args(messages, kwargs))
+        return self._normalize(response)
+
+    async def _acreate_completion_impl(
+        self, messages: List[Dict[str, str]], **kwargs
+    ) -> LLMResponse:
+        """Create OpenAI completion with the async SDK client."""
+        try:
+            import openai
+        except ImportError:
+            raise RuntimeError("openai package not installed. Run: pip install openai")
+
+        if not self.config.api_key:
+            raise ValueError("OPENAI_API_KEY not set")
+
+        client = self._loop_resource(
+            "openai", lambda: openai.AsyncOpenAI(api_key=self.config.api_key)
         )
+        response = await client.chat.completions.create(**self._request_args(messages, kwargs))
+        return self._normalize(response)
 
-        # Normalize response
+    def _request_args(self, messages: List[Dict[str, str]], kwargs: Dict) -> Dict:
+        return {
+            "model": kwargs.get("model", self.config.model),
+            "messages": messages,
+            "max_tokens": kwargs.get("max_tokens"),
+            **{k: v for k, v in kwargs.items() if k not in ["model", "max_tokens"]},
+        }
+
+    @staticmethod
+    def _normalize(response) -> LLMResponse:
+        """Normalize an OpenAI SDK response."""
         choice = response.choices[0]
 
         return LLMResponse(
@@ -462,8 +648,17 @@ class AnythingLLMProvider(BaseProvider):
 
     def _create_completion_impl(self, messages: List[Dict[str, str]], **kwargs) -> LLMResponse:
         """Create AnythingLLM completion."""
-        import requests
+        data = self._post_json(*self._request(messages))
+        return self._parse(data, messages)
 
+    async def _acreate_completion_impl(
+        self, messages: List[Dict[str, str]], **kwargs
+    ) -> LLMResponse:
+        """Create AnythingLLM completion without blocking the event loop."""
+        data = await self._apost_json(*self._request(messages))
+        return self._parse(data, messages)
+
+    def _request(self, messages: List[Dict[str, str]]):
         url = f"{self.config.endpoint}/api/v1/workspace/chat"
 
         # AnythingLLM format
@@ -475,12 +670,9 @@ class AnythingLLMProvider(BaseProvider):
         headers = {}
         if self.config.api_key:
             headers["Authorization"] = f"Bearer {self.config.api_key}"
+        return url, payload, headers
 
-        response = requests.post(url, json=payload, headers=headers, timeout=self.config.timeout)
-        response.raise_for_status()
-
-        data = response.json()
-
+    def _parse(self, data: Dict, messages: List[Dict[str, str]]) -> LLMResponse:
         # Extract content
         content = data.get("textResponse", "")
 
@@ -587,18 +779,26 @@ class UnifiedLLMClient:
         )
     """
 
-    def __init__(self, failover_enabled: bool = None):
+    def __init__(self, failover_enabled: bool = None, cache=None):
         """
         Initialize unified LLM client.
 
         Args:
             failover_enabled: Enable automatic failover (default: from env LLM_FAILOVER_ENABLED)
+            cache: LLMResponseCache for identical requests (default: the shared
+                cache if LLM_CACHE_ENABLED is true, otherwise no caching)
         """
         if failover_enabled is None:
             failover_enabled = os.getenv("LLM_FAILOVER_ENABLED", "true").lower() == "true"
 
         self.failover_enabled = failover_enabled
 
+        if cache is None and os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true":
+            from services.llm_cache import get_response_cache
+
+            cache = get_response_cache()
+        self.cache = cache
+
         # Initialize providers
         self.providers: Dict[str, BaseProvider] = {
             "claude": ClaudeProvider(),
@@ -640,7 +840,8 @@ class UnifiedLLMClient:
 
         Args:
             messages: List of message dictionaries
-            **kwargs: Additional arguments (model, max_tokens, etc.)
+            **kwargs: Additional arguments (model, max_tokens, etc.); pass
+                cache=False to skip the response cache for this call
 
         Returns:
             LLMResponse with normalized response
@@ -648,6 +849,15 @@ class UnifiedLLMClient:
         Raises:
             RuntimeError: If all providers fail
         """
+        use_cache = kwargs.pop("cache", True)
+        if self.cache is None or not use_cache:
+            return self._create_uncached(messages, **kwargs)
+
+        key = self.cache.make_key(messages, **kwargs)
+        return self.cache.get_or_create(key, lambda: self._create_uncached(messages, **kwargs))
+
+    def _create_uncached(self, messages: List[Dict[str, str]], **kwargs) -> LLMResponse:
+        """Call providers in failover order."""
         self.total_requests += 1
 
         # Import rate limit handler
@@ -782,6 +992,7 @@ class UnifiedLLMClient:
             "total_cost": sum(p.total_cost for p in self.providers.values()),
             "total_tokens": sum(p.total_tokens for p in self.providers.values()),
             "providers": provider_metrics,
+            "cache": self.cache.get_metrics() if self.cache is not None else None,
         }
 
     def get_circuit_status(self) -> Dict[str, Dict]:
@@ -795,6 +1006,298 @@ class UnifiedLLMClient:
         logger.info("All circuit breakers reset")
 
 
+# =============================================================================
+# Async Client
+# =============================================================================
+
+# Default for per-call overrides where None is a meaningful value
+_UNSET = object()
+
+
+class AsyncUnifiedLLMClient:
+    """
+    Async counterpart of UnifiedLLMClient.
+
+    Shares providers, circuit breakers and failover order with a
+    UnifiedLLMClient, but calls providers without blocking a thread per
+    request: Claude and OpenAI through their async SDK clients, HTTP
+    providers through a pooled aiohttp session (or a bounded thread pool
+    when aiohttp is not installed).
+
+    With hedging enabled, if the current provider has not answered after
+    hedge_after seconds the next provider is started as well; the first
+    successful response wins and the other call is cancelled.
+
+    Example:
+        client = AsyncUnifiedLLMClient(hedge_after=2.0)
+        response = await client.messages.create(
+            model="claude-sonnet-4-5",
+            max_tokens=1024,
+            messages=[{"role": "user", "content": "Hello!"}]
+        )
+        responses = await client.create_many([
+            {"messages": [{"role": "user", "content": "One"}]},
+            {"messages": [{"role": "user", "content": "Two"}]},
+        ])
+        await client.aclose()
+    """
+
+    def __init__(
+        self,
+        failover_enabled: bool = None,
+        hedge_after: Optional[float] = None,
+        client: UnifiedLLMClient = None,
+    ):
+        """
+        Initialize async LLM client.
+
+        Args:
+            failover_enabled: Enable automatic failover (default: from env LLM_FAILOVER_ENABLED)
+            hedge_after: Seconds before starting the next provider alongside a
+                slow one (default: from env LLM_HEDGE_AFTER, unset = no hedging)
+            client: UnifiedLLMClient whose providers to share (default: a new one)
+        """
+        self.client = client or UnifiedLLMClient(failover_enabled=failover_enabled)
+        self.providers = self.client.providers
+        self.failover_order = self.client.failover_order
+        self.failover_enabled = self.client.failover_enabled
+
+        if hedge_after is None and os.getenv("LLM_HEDGE_AFTER"):
+            hedge_after = float(os.getenv("LLM_HEDGE_AFTER"))
+        self.hedge_after = hedge_after
+
+        # Metrics
+        self.total_requests = 0
+        self.successful_requests = 0
+        self.failed_requests = 0
+        self.failover_count = 0
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+
+        # Messages API compatibility: await client.messages.create(...)
+        self.messages = self
+
+    def _rate_limit_hooks(self):
+        """rate_limit_handler functions, or None if unavailable."""
+        try:
+            from services.rate_limit_handler import (
+                get_rate_limiter,
+                record_rate_limit,
+                record_success,
+            )
+        except ImportError:
+            return None
+        return get_rate_limiter(), record_rate_limit, record_success
+
+    def _candidates(self, hooks) -> List[str]:
+        """Providers to try, in order, skipping open circuits and rate limits."""
+        if not self.failover_enabled:
+            return [self.failover_order[0]]
+
+        candidates = []
+        for provider_name in self.failover_order:
+            provider = self.providers.get(provider_name)
+            if not provider:
+                continue
+            if provider.circuit.is_open:
+                logger.warning(f"Skipping {provider_name}: circuit breaker open")
+                continue
+            if hooks and hooks[0].is_rate_limited(provider_name):
+                remaining = hooks[0].get_cooldown_remaining(provider_name)
+                logger.info(f"Skipping {provider_name}: rate limited ({remaining}s remaining)")
+                continue
+            candidates.append(provider_name)
+        return candidates
+
+    async def create(
+        self, messages: List[Dict[str, str]], hedge_after: Optional[float] = _UNSET, **kwargs
+    ) -> LLMResponse:
+        """
+        Create completion with automatic failover and optional hedging.
+
+        Uses the shared client's response cache, like UnifiedLLMClient.create();
+        concurrent identical calls share one provider call.
+
+        Args:
+            messages: List of message dictionaries
+            hedge_after: Override the client's hedging threshold for this call
+                (None disables hedging)
+            **kwargs: Additional arguments (model, max_tokens, etc.); pass
+                cache=False to skip the response cache for this call
+
+        Returns:
+            LLMResponse with normalized response
+
+        Raises:
+            RuntimeError: If all providers fail
+        """
+        use_cache = kwargs.pop("cache", True)
+        cache = self.client.cache
+        if cache is None or not use_cache:
+            return await self._create_uncached(messages, hedge_after, **kwargs)
+
+        key = cache.make_key(messages, **kwargs)
+        return await cache.aget_or_create(
+            key, lambda: self._create_uncached(messages, hedge_after, **kwargs)
+        )
+
+    async def _create_uncached(
+        self, messages: List[Dict[str, str]], hedge_after: Optional[float] = _UNSET, **kwargs
+    ) -> LLMResponse:
+        """Call providers in failover order, hedging if configured."""
+        if hedge_after is _UNSET:
+            hedge_after = self.hedge_after
+        self.total_requests += 1
+        hooks = self._rate_limit_hooks()
+
+        if not self.failover_enabled:
+            provider_name = self.failover_order[0]
+            try:
+                response = await self.providers[provider_name].acreate_completion(
+                    messages, **kwargs
+                )
+            except Exception as e:
+                self.failed_requests += 1
+                if hooks and self.client._is_rate_limit_error(e):
+                    await asyncio.to_thread(hooks[1], provider_name)
+                raise
+            self.successful_requests += 1
+            if hooks:
+                await asyncio.to_thread(hooks[2], provider_name)
+            return response
+
+        candidates = iter(self._candidates(hooks))
+        pending: Dict[asyncio.Task, str] = {}
+        errors = []
+        hedged = False
+
+        def start_next() -> bool:
+            provider_name = next(candidates, None)
+            if provider_name is None:
+                return False
+            task = asyncio.ensure_future(
+                self.providers[provider_name].acreate_completion(messages, **kwargs)
+            )
+            pending[task] = provider_name
+            return True
+
+        start_next()
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=hedge_after,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    # Slow provider: race the next one against it
+                    if start_next():
+                        if not hedged:
+                            self.hedged_requests += 1
+                            hedged = True
+                        logger.info(
+                            f"Hedging: {', '.join(pending.values())} in flight after {hedge_after}s"
+                        )
+                    continue
+
+                for task in done:
+                    provider_name = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        return await self._won(task.result(), provider_name, hedged, hooks)
+
+                    if hooks and self.client._is_rate_limit_error(error):
+                        await asyncio.to_thread(hooks[1], provider_name)
+                        logger.warning(f"{provider_name} rate limited, switching to fallback")
+                    elif isinstance(error, CircuitOpenError):
+                        logger.warning(
+                            f"{provider_name} circuit breaker open, trying next provider"
+                        )
+                    else:
+                        logger.error(f"{provider_name} failed: {error}")
+                    errors.append((provider_name, str(error)))
+                    # Fail over immediately rather than waiting for the hedge timer
+                    start_next()
+        finally:
+            # Cancel whatever lost the race (or everything, if we were cancelled)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        # All providers failed
+        self.failed_requests += 1
+        error_summary = "; ".join([f"{p}: {e}" for p, e in errors]) or "no provider available"
+        raise RuntimeError(f"All providers failed: {error_summary}")
+
+    async def _won(self, response: LLMResponse, provider_name: str, hedged: bool, hooks):
+        if hooks:
+            await asyncio.to_thread(hooks[2], provider_name)
+        if provider_name != self.failover_order[0]:
+            self.failover_count += 1
+            if hedged:
+                self.hedge_wins += 1
+            logger.warning(f"Failover to {provider_name} successful")
+        self.successful_requests += 1
+        return response
+
+    async def create_completion(self, messages: List[Dict[str, str]], **kwargs) -> LLMResponse:
+        """Alias for create() for consistency."""
+        return await self.create(messages, **kwargs)
+
+    async def create_many(
+        self,
+        requests: List[Dict[str, Any]],
+        max_concurrency: int = 8,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Run several completions concurrently, gather-style.
+
+        Args:
+            requests: create() keyword arguments per request (each with "messages")
+            max_concurrency: Most requests in flight at once
+            return_exceptions: Put exceptions in the result list instead of raising
+
+        Returns:
+            Responses (or exceptions) in request order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(request: Dict[str, Any]):
+            async with semaphore:
+                return await self.create(**request)
+
+        return await asyncio.gather(
+            *(run(request) for request in requests), return_exceptions=return_exceptions
+        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get async client metrics plus the shared provider metrics."""
+        metrics = self.client.get_metrics()
+        metrics.update(
+            {
+                "total_requests": self.total_requests,
+                "successful_requests": self.successful_requests,
+                "failed_requests": self.failed_requests,
+                "success_rate": (
+                    self.successful_requests / self.total_requests
+                    if self.total_requests > 0
+                    else 0.0
+                ),
+                "failover_count": self.failover_count,
+                "hedged_requests": self.hedged_requests,
+                "hedge_wins": self.hedge_wins,
+            }
+        )
+        return metrics
+
+    async def aclose(self):
+        """Close pooled sessions and async SDK clients for the running loop."""
+        for provider in self.providers.values():
+            await provider.aclose()
+
+
 # =============================================================================
 # Backwards Compatibility (Note: CircuitBreaker imported from circuit_breaker.py)
 # =============================================================================
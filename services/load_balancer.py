@@ -5,7 +5,8 @@ Distributes tasks across workers based on current load, capacity, and capabiliti
 
 Features:
 - Multiple load balancing strategies (least-loaded, round-robin, weighted, skill-based)
-- Real-time worker load tracking
+- Real-time worker load tracking from one aggregated query, cached as a
+  short-TTL snapshot and adjusted in memory on claim/complete
 - Configurable worker capacity limits
 - Health-aware routing (avoids unhealthy workers)
 - Task affinity support (prefer workers with relevant experience)
@@ -20,10 +21,15 @@ Usage:
     # Find best worker for a task
     worker = lb.select_worker(task_type='shell', strategy=LoadBalancingStrategy.LEAST_LOADED)
 
+    # Keep the cached snapshot current between refreshes
+    lb.record_claim(worker.worker_id)
+    lb.record_completion(worker.worker_id, success=True)
+
     # Get load distribution
     distribution = lb.get_load_distribution()
 """
 
+import heapq
 import logging
 import sqlite3
 import threading
@@ -142,8 +148,12 @@ class LoadBalancer:
         "load_weight": 0.5,  # weight of current load in adaptive strategy
         "success_weight": 0.2,  # weight of success rate in adaptive strategy
         "round_robin_index": 0,
+        "snapshot_ttl": 2.0,  # seconds between full load refreshes
     }
 
+    # Worker statuses eligible for new tasks
+    ACTIVE_STATUSES = ("idle", "busy", "active")
+
     def __init__(self, db_path: str, config: Dict = None):
         self.db_path = db_path
         self.config = {**self.DEFAULT_CONFIG, **(config or {})}
@@ -151,7 +161,8 @@ class LoadBalancer:
         self._lock = threading.Lock()
         self._worker_cache: Dict[str, WorkerLoad] = {}
         self._cache_time: float = 0
-        self._cache_ttl: float = 5.0  # Cache TTL in seconds
+        self._cache_ttl: float = self.config["snapshot_ttl"]
+        self.stats = {"refreshes": 0}
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get database connection."""
@@ -163,6 +174,107 @@ class LoadBalancer:
     # Worker Load Tracking
     # =========================================================================
 
+    # One pass over task_queue per snapshot: every per-worker counter the
+    # balancer needs comes out of a single GROUP BY assigned_worker, and
+    # worker_config is pivoted into capacity/weight columns alongside it.
+    _LOAD_QUERY = """
+        WITH task_stats AS (
+            SELECT
+                assigned_worker AS worker_id,
+                SUM(status = 'running') AS running,
+                SUM(status = 'pending') AS pending,
+                SUM(status = 'completed' AND completed_at >= date('now')) AS completed_today,
+                SUM(status = 'failed' AND completed_at >= date('now')) AS failed_today,
+                AVG(CASE WHEN status IN ('completed', 'failed')
+                          AND completed_at >= datetime('now', '-7 days')
+                    THEN CAST(
+                        (julianday(completed_at) - julianday(started_at)) * 86400000 AS INTEGER
+                    )
+                END) AS avg_duration_ms,
+                SUM(status = 'completed' AND completed_at >= datetime('now', '-7 days')) AS ok_7d,
+                SUM(status IN ('completed', 'failed')
+                    AND completed_at >= datetime('now', '-7 days')) AS done_7d
+            FROM task_queue
+            WHERE assigned_worker IS NOT NULL {task_filter}
+            GROUP BY assigned_worker
+        ),
+        config AS (
+            SELECT
+                worker_id,
+                MAX(CASE WHEN key = 'capacity' THEN value END) AS capacity,
+                MAX(CASE WHEN key = 'weight' THEN value END) AS weight
+            FROM worker_config
+            WHERE key IN ('capacity', 'weight') {config_filter}
+            GROUP BY worker_id
+        )
+        SELECT
+            w.id, w.worker_type, w.node_id, w.status, w.last_heartbeat,
+            t.running, t.pending, t.completed_today, t.failed_today,
+            t.avg_duration_ms, t.ok_7d, t.done_7d,
+            c.capacity, c.weight
+        FROM workers w
+        LEFT JOIN task_stats t ON t.worker_id = w.id
+        LEFT JOIN config c ON c.worker_id = w.id
+        {worker_filter}
+    """
+
+    def _query_loads(self, conn, worker_id: str = None) -> Dict[str, WorkerLoad]:
+        """Build WorkerLoad objects for one or all workers in a single query."""
+        if worker_id is None:
+            query = self._LOAD_QUERY.format(task_filter="", config_filter="", worker_filter="")
+            params: Tuple = ()
+        else:
+            query = self._LOAD_QUERY.format(
+                task_filter="AND assigned_worker = ?",
+                config_filter="AND worker_id = ?",
+                worker_filter="WHERE w.id = ?",
+            )
+            params = (worker_id, worker_id, worker_id)
+
+        now = datetime.now()
+        return {row["id"]: self._row_to_load(row, now) for row in conn.execute(query, params)}
+
+    def _row_to_load(self, row: sqlite3.Row, now: datetime) -> WorkerLoad:
+        """Apply health rules to one aggregated worker row."""
+        last_heartbeat = row["last_heartbeat"]
+        is_healthy = True
+        is_draining = row["status"] in ("draining", "shutting_down")
+
+        if last_heartbeat:
+            try:
+                hb_time = datetime.fromisoformat(last_heartbeat.replace("Z", "+00:00"))
+                age = (now - hb_time.replace(tzinfo=None)).total_seconds()
+                if age > self.config["heartbeat_timeout"]:
+                    is_healthy = False
+            except (AttributeError, TypeError, ValueError):
+                pass
+
+        success_rate = row["ok_7d"] * 100.0 / row["done_7d"] if row["done_7d"] else 100.0
+        if success_rate < self.config["min_success_rate"]:
+            is_healthy = False
+
+        return WorkerLoad(
+            worker_id=row["id"],
+            worker_type=row["worker_type"],
+            node_id=row["node_id"],
+            status=row["status"],
+            current_tasks=row["running"] or 0,
+            pending_tasks=row["pending"] or 0,
+            completed_today=row["completed_today"] or 0,
+            failed_today=row["failed_today"] or 0,
+            capacity=(
+                int(row["capacity"])
+                if row["capacity"] is not None
+                else self.config["default_capacity"]
+            ),
+            weight=float(row["weight"]) if row["weight"] is not None else 1.0,
+            last_heartbeat=last_heartbeat,
+            avg_task_duration_ms=row["avg_duration_ms"] or 0.0,
+            success_rate=success_rate,
+            is_healthy=is_healthy,
+            is_draining=is_draining,
+        )
+
     def get_worker_load(self, worker_id: str, conn=None) -> Optional[WorkerLoad]:
         """Get current load information for a specific worker."""
         close_conn = conn is None
@@ -170,145 +282,70 @@ class LoadBalancer:
             conn = self._get_connection()
 
         try:
-            # Get worker info
-            worker = conn.execute(
-                """
-                SELECT id, worker_type, node_id, status, last_heartbeat
-                FROM workers
-                WHERE id = ?
-            """,
-                (worker_id,),
-            ).fetchone()
-
-            if not worker:
-                return None
-
-            # Get current task counts
-            task_counts = conn.execute(
-                """
-                SELECT
-                    COUNT(CASE WHEN status = 'running' THEN 1 END) as running,
-                    COUNT(CASE WHEN status = 'pending' AND assigned_worker = ? THEN 1 END) as pending
-                FROM task_queue
-                WHERE assigned_worker = ?
-            """,
-                (worker_id, worker_id),
-            ).fetchone()
-
-            # Get today's stats
-            today_stats = conn.execute(
-                """
-                SELECT
-                    COUNT(CASE WHEN status = 'completed' THEN 1 END) as completed,
-                    COUNT(CASE WHEN status = 'failed' THEN 1 END) as failed
-                FROM task_queue
-                WHERE assigned_worker = ?
-                  AND completed_at >= date('now')
-            """,
-                (worker_id,),
-            ).fetchone()
-
-            # Get average task duration and success rate
-            perf_stats = conn.execute(
-                """
-                SELECT
-                    AVG(CAST((julianday(completed_at) - julianday(started_at)) * 86400000 AS INTEGER)) as avg_duration_ms,
-                    CAST(SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) AS FLOAT) /
-                        NULLIF(COUNT(*), 0) * 100 as success_rate
-                FROM task_queue
-                WHERE assigned_worker = ?
-                  AND status IN ('completed', 'failed')
-                  AND completed_at >= datetime('now', '-7 days')
-            """,
-                (worker_id,),
-            ).fetchone()
-
-            # Get worker capacity from config (or use default)
-            capacity = conn.execute(
-                """
-                SELECT value FROM worker_config
-                WHERE worker_id = ? AND key = 'capacity'
-            """,
-                (worker_id,),
-            ).fetchone()
-
-            # Get worker weight
-            weight = conn.execute(
-                """
-                SELECT value FROM worker_config
-                WHERE worker_id = ? AND key = 'weight'
-            """,
-                (worker_id,),
-            ).fetchone()
-
-            # Determine health status
-            last_heartbeat = worker["last_heartbeat"]
-            is_healthy = True
-            is_draining = worker["status"] in ("draining", "shutting_down")
-
-            if last_heartbeat:
-                try:
-                    hb_time = datetime.fromisoformat(last_heartbeat.replace("Z", "+00:00"))
-                    age = (datetime.now() - hb_time.replace(tzinfo=None)).total_seconds()
-                    if age > self.config["heartbeat_timeout"]:
-                        is_healthy = False
-                except:
-                    pass
-
-            success_rate = perf_stats["success_rate"] if perf_stats["success_rate"] else 100.0
-            if success_rate < self.config["min_success_rate"]:
-                is_healthy = False
-
-            return WorkerLoad(
-                worker_id=worker["id"],
-                worker_type=worker["worker_type"],
-                node_id=worker["node_id"],
-                status=worker["status"],
-                current_tasks=task_counts["running"] or 0,
-                pending_tasks=task_counts["pending"] or 0,
-                completed_today=today_stats["completed"] or 0,
-                failed_today=today_stats["failed"] or 0,
-                capacity=int(capacity["value"]) if capacity else self.config["default_capacity"],
-                weight=float(weight["value"]) if weight else 1.0,
-                last_heartbeat=last_heartbeat,
-                avg_task_duration_ms=perf_stats["avg_duration_ms"] or 0.0,
-                success_rate=success_rate,
-                is_healthy=is_healthy,
-                is_draining=is_draining,
-            )
-
+            return self._query_loads(conn, worker_id).get(worker_id)
         finally:
             if close_conn:
                 conn.close()
 
-    def get_all_worker_loads(
-        self, include_unhealthy: bool = False, worker_type: str = None
-    ) -> List[WorkerLoad]:
-        """Get load information for all workers."""
+    def _snapshot(self) -> Dict[str, WorkerLoad]:
+        """Loads for every worker, refreshed from the database at most once per TTL."""
+        with self._lock:
+            if self._cache_time and time.monotonic() - self._cache_time < self._cache_ttl:
+                return self._worker_cache
+
         conn = self._get_connection()
         try:
-            query = "SELECT id FROM workers WHERE 1=1"
-            params = []
-
-            if not include_unhealthy:
-                query += " AND status IN ('idle', 'busy', 'active')"
+            loads = self._query_loads(conn)
+        finally:
+            conn.close()
 
-            if worker_type:
-                query += " AND worker_type = ?"
-                params.append(worker_type)
+        with self._lock:
+            self._worker_cache = loads
+            self._cache_time = time.monotonic()
+            self.stats["refreshes"] += 1
+        return loads
 
-            workers = conn.execute(query, params).fetchall()
+    def invalidate(self):
+        """Drop the cached snapshot so the next read goes to the database."""
+        with self._lock:
+            self._worker_cache = {}
+            self._cache_time = 0
 
-            loads = []
-            for w in workers:
-                load = self.get_worker_load(w["id"], conn)
-                if load:
-                    if include_unhealthy or load.is_healthy:
-                        loads.append(load)
+    def record_claim(self, worker_id: str):
+        """Count a task claimed by a worker in the cached snapshot."""
+        with self._lock:
+            load = self._worker_cache.get(worker_id)
+            if load is None:
+                return
+            load.current_tasks += 1
+            load.last_task_assigned = datetime.now().isoformat()
+
+    def record_completion(self, worker_id: str, success: bool = True):
+        """Count a task finished by a worker in the cached snapshot."""
+        with self._lock:
+            load = self._worker_cache.get(worker_id)
+            if load is None:
+                return
+            load.current_tasks = max(0, load.current_tasks - 1)
+            if success:
+                load.completed_today += 1
+            else:
+                load.failed_today += 1
 
-            return loads
-        finally:
-            conn.close()
+    def get_all_worker_loads(
+        self, include_unhealthy: bool = False, worker_type: str = None
+    ) -> List[WorkerLoad]:
+        """Get load information for all workers."""
+        loads = []
+        for load in self._snapshot().values():
+            if worker_type and load.worker_type != worker_type:
+                continue
+            if not include_unhealthy and (
+                load.status not in self.ACTIVE_STATUSES or not load.is_healthy
+            ):
+                continue
+            loads.append(load)
+        return loads
 
     # =========================================================================
     # Load Balancing Strategies
@@ -442,7 +479,12 @@ class LoadBalancer:
         strategy = strategy or LoadBalancingStrategy(self.config["default_strategy"])
         exclude_workers = exclude_workers or []
 
-        conn = self._get_connection()
+        # Only skill matching needs the database; everything else runs on
+        # the in-memory snapshot
+        needs_conn = strategy == LoadBalancingStrategy.SKILL_BASED or (
+            strategy == LoadBalancingStrategy.ADAPTIVE and task_type
+        )
+        conn = self._get_connection() if needs_conn else None
         try:
             # Get all available workers
             all_workers = self.get_all_worker_loads(
@@ -486,18 +528,19 @@ class LoadBalancer:
                     strategy_used=strategy.value, reason="No suitable worker found"
                 )
 
-            # Build alternatives list
-            alternatives = []
-            for w in workers:
-                if w.worker_id != selected.worker_id:
-                    alternatives.append(
-                        {
-                            "worker_id": w.worker_id,
-                            "load_percentage": w.load_percentage,
-                            "available_capacity": w.available_capacity,
-                        }
-                    )
-            alternatives.sort(key=lambda x: x["load_percentage"])
+            # Build alternatives list (five least loaded)
+            alternatives = [
+                {
+                    "worker_id": w.worker_id,
+                    "load_percentage": w.load_percentage,
+                    "available_capacity": w.available_capacity,
+                }
+                for w in heapq.nsmallest(
+                    5,
+                    (w for w in workers if w.worker_id != selected.worker_id),
+                    key=lambda w: w.load_percentage,
+                )
+            ]
 
             return WorkerSelection(
                 worker_id=selected.worker_id,
@@ -506,13 +549,14 @@ class LoadBalancer:
                 strategy_used=strategy.value,
                 score=selected.effective_weight,
                 reason=f"Selected via {strategy.value}",
-                alternatives=alternatives[:5],
+                alternatives=alternatives,
                 load_before=selected.load_percentage,
                 estimated_load_after=((selected.current_tasks + 1) / selected.capacity) * 100,
             )
 
         finally:
-            conn.close()
+            if conn is not None:
+                conn.close()
 
     # =========================================================================
     # Load Distribution Analysis
@@ -649,6 +693,7 @@ class LoadBalancer:
                 (worker_id, str(capacity)),
             )
             conn.commit()
+            self.invalidate()
             return True
         except Exception as e:
             logger.error(f"Failed to set worker capacity: {e}")
@@ -668,6 +713,7 @@ class LoadBalancer:
                 (worker_id, str(weight)),
             )
             conn.commit()
+            self.invalidate()
             return True
         except Exception as e:
             logger.error(f"Failed to set worker weight: {e}")
@@ -687,6 +733,7 @@ class LoadBalancer:
                 (worker_id,),
             )
             conn.commit()
+            self.invalidate()
             return True
         except Exception as e:
             logger.error(f"Failed to drain worker: {e}")
@@ -706,6 +753,7 @@ class LoadBalancer:
                 (worker_id,),
             )
             conn.commit()
+            self.invalidate()
             return True
         except Exception as e:
             logger.error(f"Failed to undrain worker: {e}")
@@ -799,6 +847,7 @@ class LoadBalancer:
 
             if result.rowcount > 0:
                 conn.commit()
+                self.invalidate()
                 logger.info(f"Rebalanced task {task_id} to worker {to_worker}")
                 return True
 
@@ -845,11 +894,20 @@ def init_load_balancer_schema(db_path: str):
 # =============================================================================
 
 
+_instances: Dict[str, LoadBalancer] = {}
+_instances_lock = threading.Lock()
+
+
 def get_load_balancer(db_path: str = None) -> LoadBalancer:
-    """Get a load balancer instance."""
+    """Get the shared load balancer for a database, so its snapshot is reused."""
     if db_path is None:
         db_path = str(Path(__file__).parent.parent / "data" / "architect.db")
-    return LoadBalancer(db_path)
+    db_path = str(db_path)
+    with _instances_lock:
+        lb = _instances.get(db_path)
+        if lb is None:
+            lb = _instances[db_path] = LoadBalancer(db_path)
+        return lb
 
 
 def select_worker_for_task(
@@ -12,7 +12,48 @@ import hashlib
 import json
 import re
 import subprocess
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Union
+
+
+def request_fingerprint(
+    model: Optional[str],
+    messages: List[Dict[str, Any]],
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    system: Optional[Union[str, List[Dict[str, Any]]]] = None,
+    extra: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Generate an exact fingerprint for an LLM request.
+
+    Unlike generate_fingerprint() nothing is normalized away: two requests
+    share a fingerprint only if every input that can change the completion
+    is equal. The request is serialized as canonical JSON (sorted keys, no
+    insignificant whitespace) so dict ordering does not matter.
+
+    Args:
+        model: Model name
+        messages: Chat messages
+        temperature: Sampling temperature
+        max_tokens: Completion token limit
+        system: System prompt
+        extra: Any other provider arguments (stop sequences, tools, ...)
+
+    Returns:
+        64-character hex SHA-256 fingerprint
+    """
+    components = {
+        "model": model,
+        "messages": messages,
+        "temperature": float(temperature) if temperature is not None else None,
+        "max_tokens": int(max_tokens) if max_tokens is not None else None,
+        "system": system,
+        "extra": extra or {},
+    }
+    combined = json.dumps(
+        components, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(combined.encode("utf-8")).hexdigest()
 
 
 class PromptFingerprint:
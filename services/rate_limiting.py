@@ -1,4 +1,12 @@
-"""Database-backed rate limiting service with persistence and analytics."""
+"""Database-backed rate limiting service with persistence and analytics.
+
+Request/hour and request/minute limits are enforced in process with a sharded
+GCRA (generic cell rate algorithm) limiter, so a check costs a few dict
+lookups instead of several SQLite round trips. Limit configs are cached and
+re-read only when their version stamp changes. Per-minute request counts are
+accumulated in memory and written to rate_limit_buckets in batches by
+flush_buckets(). Daily/monthly quotas still go to the database.
+"""
 import time
 import logging
 import threading
@@ -8,6 +16,12 @@ from collections import defaultdict
 
 logger = logging.getLogger(__name__)
 
+# Sliding-window limit types enforced in memory, with their window in seconds
+WINDOW_LIMIT_TYPES = {
+    "requests_per_minute": 60,
+    "requests_per_hour": 3600,
+}
+
 
 class RateLimitService:
     """Enhanced rate limiting with database persistence and auto-throttling."""
@@ -16,6 +30,13 @@ class RateLimitService:
     HIGH_LOAD_THRESHOLD = 80  # CPU/memory %
     CRITICAL_LOAD_THRESHOLD = 95
 
+    # In-memory limiter tuning
+    SHARD_COUNT = 16
+    CONFIG_VERSION_CHECK_INTERVAL = 5.0  # seconds between config version checks
+    MAX_PENDING_BUCKETS = 5000  # flush inline if this many bucket keys are buffered
+    SWEEP_INTERVAL = 60.0  # seconds between evictions of expired GCRA state per shard
+    MAX_LIMITS_CACHE = 10000  # resolved limit lists kept before the cache is reset
+
     def __init__(self, db_connection_factory):
         """Initialize rate limiting service.
 
@@ -23,10 +44,21 @@ class RateLimitService:
             db_connection_factory: Callable that returns DB connection
         """
         self.get_db = db_connection_factory
-        self._local_cache: Dict[str, List[float]] = {}
+
+        # Cached limit configs, keyed by (scope, scope_value, resource_type)
         self._cache_lock = threading.Lock()
-        self._cache_ttl = 300  # 5 minutes - local cache time-to-live
-        self._cache_timestamps = {}
+        self._config_version = None
+        self._config_checked_at = 0.0
+        self._configs: List[Dict] = []
+        self._limits_cache: Dict[Tuple, List[Dict]] = {}
+
+        # GCRA state: theoretical arrival time per limit key, sharded by client
+        self._shards = [({}, threading.Lock()) for _ in range(self.SHARD_COUNT)]
+        self._next_sweep = [0.0] * self.SHARD_COUNT
+
+        # Request counts waiting to be written to rate_limit_buckets
+        self._pending_lock = threading.Lock()
+        self._pending_buckets: Dict[Tuple, int] = defaultdict(int)
 
     def check_limit(
         self,
@@ -57,51 +89,216 @@ class RateLimitService:
         if not limits:
             return True, None
 
-        # Check each limit type
-        for limit_config in limits:
-            allowed = self._check_single_limit(
-                scope, scope_value, resource_type, limit_config
+        allowed, info, _ = self._check_limits(
+            scope, scope_value, resource_type, limits, request_path, user_agent
+        )
+        return allowed, info
+
+    def _check_limits(
+        self,
+        scope: str,
+        scope_value: str,
+        resource_type: str,
+        limits: List[Dict],
+        request_path: str = "",
+        user_agent: str = "",
+        limit_values: Optional[List[int]] = None,
+    ) -> Tuple[bool, Optional[Dict], Optional[Dict]]:
+        """Check and consume all limits for one request.
+
+        The client's GCRA shard lock is held across all window limits, so the
+        request is only counted against them if every limit allows it.
+
+        Args:
+            limits: Limit configs from _get_limits()
+            limit_values: Optional per-limit overrides of limit_value
+
+        Returns:
+            Tuple of (allowed, info, denied limit config)
+        """
+        values = limit_values or [c["limit_value"] for c in limits]
+        denied = None
+
+        # Daily/monthly quotas - checked against the database
+        for limit_config, limit_value in zip(limits, values):
+            if limit_config["limit_type"] not in WINDOW_LIMIT_TYPES:
+                if not self._check_quota(scope, scope_value, resource_type, limit_value):
+                    denied = (limit_config, limit_value)
+                    break
+
+        if denied is None:
+            now = time.monotonic()
+            index = self._shard_index(scope, scope_value)
+            state, lock = self._shards[index]
+            with lock:
+                if now >= self._next_sweep[index]:
+                    self._evict_expired(state, now)
+                    self._next_sweep[index] = now + self.SWEEP_INTERVAL
+                updates = []
+                for limit_config, limit_value in zip(limits, values):
+                    window_seconds = WINDOW_LIMIT_TYPES.get(limit_config["limit_type"])
+                    if window_seconds is None:
+                        continue
+                    key = (scope, scope_value, resource_type, limit_config["id"])
+                    tat = self._gcra_next(state.get(key), now, limit_value, window_seconds)
+                    if tat is None:
+                        denied = (limit_config, limit_value)
+                        break
+                    updates.append((key, tat))
+                else:
+                    for key, tat in updates:
+                        state[key] = tat
+
+        if denied is not None:
+            limit_config, limit_value = denied
+            self._record_violation(
+                scope, scope_value, resource_type, limit_config,
+                request_path, user_agent
             )
-            if not allowed:
-                self._record_violation(
-                    scope, scope_value, resource_type, limit_config,
-                    request_path, user_agent
-                )
-                return False, {
-                    "limit": limit_config["limit_value"],
-                    "limit_type": limit_config["limit_type"],
-                    "resource": resource_type,
-                    "retry_after": 60
-                }
+            return False, {
+                "limit": limit_value,
+                "limit_type": limit_config["limit_type"],
+                "resource": resource_type,
+                "retry_after": 60
+            }, limit_config
 
         # Update buckets if all checks pass
         self._update_bucket(scope, scope_value, resource_type)
-        return True, None
+        return True, None, None
 
-    def _get_limits(self, scope: str, scope_value: str, resource_type: str) -> List[Dict]:
-        """Get applicable rate limit configurations from database.
+    def _shard_index(self, scope: str, scope_value: str) -> int:
+        return hash((scope, scope_value)) % self.SHARD_COUNT
+
+    def _shard_for(self, scope: str, scope_value: str):
+        """Return the (state, lock) shard holding a client's GCRA state."""
+        return self._shards[self._shard_index(scope, scope_value)]
 
-        Prioritizes specific rules over default rules.
+    @staticmethod
+    def _evict_expired(state: Dict, now: float) -> int:
+        """Drop GCRA entries whose theoretical arrival time has passed.
+
+        Such an entry allows a full burst again, exactly like a missing one,
+        so evicting it changes no decision. Caller holds the shard lock.
+
+        Returns:
+            Number of entries removed
         """
-        try:
-            conn = self.get_db()
-            cursor = conn.cursor()
+        expired = [key for key, tat in state.items() if tat <= now]
+        for key in expired:
+            del state[key]
+        return len(expired)
 
-            # Check specific + default limits, prioritize specific ones
-            cursor.execute("""
-                SELECT * FROM rate_limit_configs
-                WHERE enabled = 1
-                AND scope = ?
-                AND (scope_value = ? OR scope_value IS NULL)
-                AND (resource_type = ? OR resource_type IS NULL)
-                ORDER BY scope_value DESC, resource_type DESC
-            """, (scope, scope_value, resource_type))
-
-            results = cursor.fetchall()
-            return [dict(row) for row in results]
-        except Exception as e:
-            logger.error(f"Error getting rate limit configs: {e}")
-            return []
+    def evict_expired(self) -> int:
+        """Evict expired GCRA state from every shard.
+
+        Returns:
+            Number of entries removed
+        """
+        now = time.monotonic()
+        removed = 0
+        for index, (state, lock) in enumerate(self._shards):
+            with lock:
+                removed += self._evict_expired(state, now)
+                self._next_sweep[index] = now + self.SWEEP_INTERVAL
+        return removed
+
+    def _window_allows(
+        self,
+        scope: str,
+        scope_value: str,
+        resource_type: str,
+        limit_config: Dict,
+        limit_value: int,
+    ) -> bool:
+        """Check a request/minute or request/hour limit without consuming it."""
+        window_seconds = WINDOW_LIMIT_TYPES[limit_config["limit_type"]]
+        state, lock = self._shard_for(scope, scope_value)
+        with lock:
+            tat = state.get((scope, scope_value, resource_type, limit_config["id"]))
+        return self._gcra_next(tat, time.monotonic(), limit_value, window_seconds) is not None
+
+    @staticmethod
+    def _gcra_next(
+        tat: Optional[float], now: float, limit_value: int, window_seconds: int
+    ) -> Optional[float]:
+        """Apply GCRA for one request.
+
+        Allows a burst of limit_value requests, then one request every
+        window_seconds / limit_value seconds.
+
+        Returns:
+            New theoretical arrival time if allowed, None if the limit is hit
+        """
+        if limit_value <= 0:
+            return None
+        interval = window_seconds / limit_value
+        tat = now if tat is None or tat < now else tat
+        if tat - now > window_seconds - interval:
+            return None
+        return tat + interval
+
+    def _get_limits(self, scope: str, scope_value: str, resource_type: str) -> List[Dict]:
+        """Get applicable rate limit configurations.
+
+        Prioritizes specific rules over default rules. Served from memory;
+        the enabled configs are reloaded only when their version changes.
+        """
+        self._refresh_configs()
+        key = (scope, scope_value, resource_type)
+        limits = self._limits_cache.get(key)
+        if limits is None:
+            limits = [
+                c for c in self._configs
+                if c["scope"] == scope
+                and c["scope_value"] in (scope_value, None)
+                and c["resource_type"] in (resource_type, None)
+            ]
+            # Same order as ORDER BY scope_value DESC, resource_type DESC (NULLs last)
+            limits.sort(key=lambda c: c["resource_type"] is None)
+            limits.sort(key=lambda c: c["scope_value"] is None)
+            if len(self._limits_cache) >= self.MAX_LIMITS_CACHE:
+                self._limits_cache = {}
+            self._limits_cache[key] = limits
+        return limits
+
+    def _refresh_configs(self, force: bool = False):
+        """Reload enabled configs if the rate_limit_configs version changed.
+
+        The version check is a single aggregate query and runs at most once
+        per CONFIG_VERSION_CHECK_INTERVAL.
+        """
+        now = time.monotonic()
+        if not force and now - self._config_checked_at < self.CONFIG_VERSION_CHECK_INTERVAL:
+            return
+
+        with self._cache_lock:
+            if not force and now - self._config_checked_at < self.CONFIG_VERSION_CHECK_INTERVAL:
+                return
+            try:
+                conn = self.get_db()
+                version = tuple(conn.execute("""
+                    SELECT COUNT(*), MAX(id), SUM(enabled), MAX(updated_at)
+                    FROM rate_limit_configs
+                """).fetchone())
+                if force or version != self._config_version:
+                    cursor = conn.cursor()
+                    cursor.execute("""
+                        SELECT * FROM rate_limit_configs
+                        WHERE enabled = 1
+                        ORDER BY scope_value DESC, resource_type DESC
+                    """)
+                    self._configs = [dict(row) for row in cursor.fetchall()]
+                    self._limits_cache = {}
+                    self._config_version = version
+            except Exception as e:
+                logger.error(f"Error getting rate limit configs: {e}")
+            self._config_checked_at = now
+
+    def invalidate_config_cache(self):
+        """Force limit configs to be reloaded on the next check."""
+        with self._cache_lock:
+            self._config_checked_at = 0.0
+            self._config_version = None
 
     def _check_single_limit(
         self,
@@ -110,38 +307,15 @@ class RateLimitService:
         resource_type: str,
         limit_config: Dict
     ) -> bool:
-        """Check a single limit configuration against request history."""
+        """Check a single limit configuration without consuming capacity."""
         limit_type = limit_config["limit_type"]
         limit_value = limit_config["limit_value"]
 
-        if limit_type == "requests_per_minute":
-            window_seconds = 60
-        elif limit_type == "requests_per_hour":
-            window_seconds = 3600
-        else:
+        if limit_type not in WINDOW_LIMIT_TYPES:
             # Daily/monthly quota - different logic
             return self._check_quota(scope, scope_value, resource_type, limit_value)
 
-        # Sliding window check
-        try:
-            window_start = datetime.now() - timedelta(seconds=window_seconds)
-            conn = self.get_db()
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                SELECT SUM(request_count) as total FROM rate_limit_buckets
-                WHERE scope = ? AND scope_value = ?
-                AND (resource_type IS NULL OR resource_type = ?)
-                AND window_end > ?
-            """, (scope, scope_value, resource_type, window_start))
-
-            row = cursor.fetchone()
-            count = row[0] if row and row[0] else 0
-
-            return count < limit_value
-        except Exception as e:
-            logger.error(f"Error checking single limit: {e}")
-            return True  # Fail open - allow request if DB error
+        return self._window_allows(scope, scope_value, resource_type, limit_config, limit_value)
 
     def _check_quota(
         self,
@@ -174,41 +348,64 @@ class RateLimitService:
             return True  # Fail open
 
     def _update_bucket(self, scope: str, scope_value: str, resource_type: str):
-        """Update request count in current minute bucket."""
+        """Count a request in the current minute bucket.
+
+        Counts are buffered in memory and written by flush_buckets().
+        """
+        minute = int(time.time()) // 60 * 60
+        with self._pending_lock:
+            self._pending_buckets[(scope, scope_value, resource_type, minute)] += 1
+            backlog = len(self._pending_buckets)
+        if backlog >= self.MAX_PENDING_BUCKETS:
+            self.flush_buckets()
+
+    def flush_buckets(self) -> int:
+        """Write buffered request counts to rate_limit_buckets in one transaction.
+
+        Registered as a background task by the app; also called before stats
+        and cleanup so they see current counts.
+
+        Returns:
+            Number of bucket rows written
+        """
+        with self._pending_lock:
+            if not self._pending_buckets:
+                return 0
+            pending = self._pending_buckets
+            self._pending_buckets = defaultdict(int)
+
         try:
             conn = self.get_db()
             cursor = conn.cursor()
 
-            now = datetime.now()
-            window_start = now.replace(second=0, microsecond=0)
-            window_end = window_start + timedelta(minutes=1)
+            for (scope, scope_value, resource_type, minute), count in pending.items():
+                window_start = datetime.fromtimestamp(minute)
+                window_end = window_start + timedelta(minutes=1)
 
-            # Try to update existing bucket, insert if not exists
-            cursor.execute("""
-                SELECT id, request_count FROM rate_limit_buckets
-                WHERE scope = ? AND scope_value = ?
-                AND resource_type = ?
-                AND window_start = ?
-                LIMIT 1
-            """, (scope, scope_value, resource_type, window_start))
-
-            existing = cursor.fetchone()
-            if existing:
                 cursor.execute("""
                     UPDATE rate_limit_buckets
-                    SET request_count = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (existing[1] + 1, existing[0]))
-            else:
-                cursor.execute("""
-                    INSERT INTO rate_limit_buckets
-                    (scope, scope_value, resource_type, window_start, window_end, request_count)
-                    VALUES (?, ?, ?, ?, ?, 1)
-                """, (scope, scope_value, resource_type, window_start, window_end))
+                    SET request_count = request_count + ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE scope = ? AND scope_value = ?
+                    AND resource_type = ?
+                    AND window_start = ?
+                """, (count, scope, scope_value, resource_type, window_start))
+
+                if cursor.rowcount == 0:
+                    cursor.execute("""
+                        INSERT INTO rate_limit_buckets
+                        (scope, scope_value, resource_type, window_start, window_end, request_count)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    """, (scope, scope_value, resource_type, window_start, window_end, count))
 
             conn.commit()
+            return len(pending)
         except Exception as e:
-            logger.error(f"Error updating bucket: {e}")
+            logger.error(f"Error flushing rate limit buckets: {e}")
+            # Keep the counts for the next flush
+            with self._pending_lock:
+                for key, count in pending.items():
+                    self._pending_buckets[key] += count
+            return 0
 
     def _record_violation(
         self,
@@ -249,6 +446,7 @@ class RateLimitService:
         Returns:
             Number of records deleted
         """
+        self.flush_buckets()
         try:
             cutoff = datetime.now() - timedelta(days=days)
             conn = self.get_db()
@@ -285,6 +483,7 @@ class RateLimitService:
         Returns:
             Dictionary with statistics
         """
+        self.flush_buckets()
         try:
             cutoff = datetime.now() - timedelta(days=days)
             conn = self.get_db()
@@ -358,6 +557,7 @@ class RateLimitService:
             """, (rule_name, scope, limit_type, limit_value, scope_value, resource_type))
 
             conn.commit()
+            self.invalidate_config_cache()
             logger.info(f"Created rate limit config: {rule_name}")
             return True
         except Exception as e:
@@ -370,12 +570,14 @@ class RateLimitService:
             conn = self.get_db()
             cursor = conn.cursor()
 
-            cursor.execute(
-                "UPDATE rate_limit_configs SET enabled = 0 WHERE rule_name = ?",
-                (rule_name,)
-            )
+            cursor.execute("""
+                UPDATE rate_limit_configs
+                SET enabled = 0, updated_at = CURRENT_TIMESTAMP
+                WHERE rule_name = ?
+            """, (rule_name,))
 
             conn.commit()
+            self.invalidate_config_cache()
             logger.info(f"Disabled rate limit config: {rule_name}")
             return True
         except Exception as e:
@@ -13,7 +13,7 @@ Key Features:
 
 import logging
 from typing import Dict, Optional, Tuple
-from services.rate_limiting import RateLimitService
+from services.rate_limiting import WINDOW_LIMIT_TYPES, RateLimitService
 from services.reputation_system import get_reputation_system
 
 logger = logging.getLogger(__name__)
@@ -71,42 +71,30 @@ class EnhancedRateLimitService(RateLimitService):
         # Apply reputation multiplier to limits
         reputation_multiplier = self.reputation_system.get_limit_multiplier(user_id)
 
-        # Check each adjusted limit
-        for limit_config in limits:
-            # Adjust limit by reputation multiplier
-            adjusted_limit = int(limit_config["limit_value"] * reputation_multiplier)
-
-            # Check with adjusted limit
-            allowed = self._check_single_limit_with_adjusted_value(
-                scope,
-                scope_value,
-                resource_type,
-                limit_config,
-                adjusted_limit,
-            )
+        # Check and consume all adjusted limits in one pass
+        adjusted_limits = [
+            int(limit_config["limit_value"] * reputation_multiplier) for limit_config in limits
+        ]
+        allowed, info, denied_config = self._check_limits(
+            scope,
+            scope_value,
+            resource_type,
+            limits,
+            request_path,
+            user_agent,
+            limit_values=adjusted_limits,
+        )
+
+        if not allowed:
+            # Record as reputation event
+            self._record_reputation_violation(user_id, denied_config)
 
-            if not allowed:
-                # Record violation both in rate limit system and reputation system
-                self._record_violation(
-                    scope, scope_value, resource_type, limit_config,
-                    request_path, user_agent
-                )
-
-                # Record as reputation event
-                self._record_reputation_violation(user_id, limit_config)
-
-                return False, {
-                    "limit": adjusted_limit,
-                    "base_limit": limit_config["limit_value"],
-                    "limit_multiplier": reputation_multiplier,
-                    "limit_type": limit_config["limit_type"],
-                    "resource": resource_type,
-                    "retry_after": 60,
-                    "reputation_score": self.reputation_system.get_reputation(user_id),
-                }
-
-        # Update buckets if all checks pass
-        self._update_bucket(scope, scope_value, resource_type)
+            return False, {
+                **info,
+                "base_limit": denied_config["limit_value"],
+                "limit_multiplier": reputation_multiplier,
+                "reputation_score": self.reputation_system.get_reputation(user_id),
+            }
 
         # Record clean request as reputation event
         self._record_clean_request(user_id)
@@ -133,38 +121,13 @@ class EnhancedRateLimitService(RateLimitService):
         Returns:
             True if within adjusted limit, False otherwise
         """
-        limit_type = limit_config["limit_type"]
-
-        if limit_type == "requests_per_minute":
-            window_seconds = 60
-        elif limit_type == "requests_per_hour":
-            window_seconds = 3600
-        else:
+        if limit_config["limit_type"] not in WINDOW_LIMIT_TYPES:
             # Daily/monthly quota - use base method
             return self._check_quota(scope, scope_value, resource_type, adjusted_limit)
 
-        # Sliding window check with adjusted limit
-        try:
-            from datetime import datetime, timedelta
-            window_start = datetime.now() - timedelta(seconds=window_seconds)
-            conn = self.get_db()
-            cursor = conn.cursor()
-
-            cursor.execute(
-                """SELECT SUM(request_count) as total FROM rate_limit_buckets
-                   WHERE scope = ? AND scope_value = ?
-                   AND (resource_type IS NULL OR resource_type = ?)
-                   AND window_end > ?""",
-                (scope, scope_value, resource_type, window_start),
-            )
-
-            row = cursor.fetchone()
-            count = row[0] if row and row[0] else 0
-
-            return count < adjusted_limit
-        except Exception as e:
-            logger.error(f"Error checking single limit with adjusted value: {e}")
-            return True  # Fail open
+        return self._window_allows(
+            scope, scope_value, resource_type, limit_config, adjusted_limit
+        )
 
     def _record_reputation_violation(self, user_id: int, limit_config: Dict):
         """Record a violation as a reputation event.
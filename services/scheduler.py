@@ -50,6 +50,9 @@ Usage:
     )
 """
 
+import bisect
+import calendar
+import heapq
 import json
 import logging
 import re
@@ -110,9 +113,9 @@ class CronField:
     def next_value(self, current: int) -> Tuple[int, bool]:
         """Get next matching value. Returns (value, wrapped)."""
         sorted_vals = sorted(self.values)
-        for v in sorted_vals:
-            if v >= current:
-                return v, False
+        idx = bisect.bisect_left(sorted_vals, current)
+        if idx < len(sorted_vals):
+            return sorted_vals[idx], False
         # Wrap around to first value
         return sorted_vals[0], True
 
@@ -124,10 +127,17 @@ class CronExpression:
     Supports standard 5-field cron format and predefined schedules.
     """
 
+    # Upper bound for the next_run() search. Every satisfiable day/month/weekday
+    # combination recurs within one 28-year weekday cycle plus a skipped
+    # century leap day.
+    MAX_SEARCH_YEARS = 40
+
     def __init__(self, expression: str):
         self.original = expression.strip()
         self.expression = self._expand_predefined(self.original)
         self.fields = self._parse()
+        # Sorted value lists drive the field-wise search in next_run()
+        self._sorted = [sorted(f.values) for f in self.fields]
 
     def _expand_predefined(self, expr: str) -> str:
         """Expand predefined schedules like @daily."""
@@ -214,14 +224,20 @@ class CronExpression:
         )
 
     def next_run(
-        self, from_dt: Optional[datetime] = None, max_iterations: int = 525600
+        self, from_dt: Optional[datetime] = None, max_iterations: Optional[int] = None
     ) -> datetime:
         """
         Calculate next run time from given datetime.
 
+        Walks the sorted month/day/hour/minute value sets from the largest
+        field down, carrying into the next year when a field wraps, so the
+        cost depends on the number of field values rather than the number
+        of minutes until the next run.
+
         Args:
             from_dt: Starting datetime (default: now)
-            max_iterations: Max minutes to search (prevent infinite loop)
+            max_iterations: Optional search window in minutes; the next run
+                must fall within this many minutes of from_dt
 
         Returns:
             Next matching datetime
@@ -230,14 +246,59 @@ class CronExpression:
             from_dt = datetime.now()
 
         # Start from next minute
-        dt = from_dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
-
-        for _ in range(max_iterations):
-            if self.matches(dt):
-                return dt
-            dt += timedelta(minutes=1)
+        start = from_dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        result = self._search(start)
+
+        if result is None:
+            raise CronError(f"Could not find next run within {self.MAX_SEARCH_YEARS} years")
+        if max_iterations is not None and result - start >= timedelta(minutes=max_iterations):
+            raise CronError(f"Could not find next run within {max_iterations} minutes")
+        return result
+
+    def _search(self, start: datetime) -> Optional[datetime]:
+        """Find the first matching minute at or after start."""
+        minutes, hours, days, months, weekdays = self._sorted
+        any_weekday = len(weekdays) == 7
+        weekday_set = self.fields[4].values
+
+        # A day that no selected month can hold (e.g. "30 2") never fires
+        if days[0] > max(calendar.monthrange(2000, m)[1] for m in months):
+            return None
 
-        raise CronError(f"Could not find next run within {max_iterations} minutes")
+        for year in range(start.year, start.year + self.MAX_SEARCH_YEARS + 1):
+            in_start_year = year == start.year
+            month_idx = bisect.bisect_left(months, start.month) if in_start_year else 0
+
+            for month in months[month_idx:]:
+                in_start_month = in_start_year and month == start.month
+                days_in_month = calendar.monthrange(year, month)[1]
+                day_idx = bisect.bisect_left(days, start.day) if in_start_month else 0
+
+                for day in days[day_idx:]:
+                    if day > days_in_month:
+                        break
+                    # Python weekday (Mon=0) to cron weekday (Sun=0)
+                    if (
+                        not any_weekday
+                        and (calendar.weekday(year, month, day) + 1) % 7 not in weekday_set
+                    ):
+                        continue
+
+                    in_start_day = in_start_month and day == start.day
+                    hour_idx = bisect.bisect_left(hours, start.hour) if in_start_day else 0
+
+                    for hour in hours[hour_idx:]:
+                        if in_start_day and hour == start.hour:
+                            minute_idx = bisect.bisect_left(minutes, start.minute)
+                            if minute_idx == len(minutes):
+                                continue
+                        else:
+                            minute_idx = 0
+                        return start.replace(
+                            year=year, month=month, day=day, hour=hour, minute=minutes[minute_idx]
+                        )
+
+        return None
 
     def next_runs(self, count: int = 5, from_dt: Optional[datetime] = None) -> List[datetime]:
         """Get next N run times."""
@@ -288,6 +349,19 @@ class SchedulerService:
         self._pool = ServiceConnectionPool.get_or_create(
             db_path, min_connections=1, max_connections=3
         )
+        self._change_listeners: List = []
+
+    def add_change_listener(self, callback) -> None:
+        """Register a callback invoked after tasks are created, updated or deleted."""
+        self._change_listeners.append(callback)
+
+    def _notify_change(self) -> None:
+        """Tell listeners (e.g. the daemon) that the schedule changed."""
+        for callback in self._change_listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Scheduler change listener failed: {e}")
 
     def _get_connection(self):
         """Get database connection from pool."""
@@ -360,6 +434,7 @@ class SchedulerService:
 
                 task_id = cursor.lastrowid
                 logger.info(f"Created scheduled task '{name}' (id={task_id}), next run: {next_run}")
+                self._notify_change()
 
                 return self.get_scheduled_task(task_id)
 
@@ -451,6 +526,7 @@ class SchedulerService:
             conn.commit()
 
         logger.info(f"Updated scheduled task {task_id}: {list(updates.keys())}")
+        self._notify_change()
         return self.get_scheduled_task(task_id)
 
     def delete_scheduled_task(self, task_id: int) -> bool:
@@ -461,6 +537,7 @@ class SchedulerService:
 
             if result.rowcount > 0:
                 logger.info(f"Deleted scheduled task {task_id}")
+                self._notify_change()
                 return True
             return False
 
@@ -527,14 +604,16 @@ class SchedulerService:
             )
             conn.commit()
 
-    def update_task_after_run(self, task_id: int, status: str, duration_ms: int = None):
-        """Update scheduled task after a run."""
+    def update_task_after_run(
+        self, task_id: int, status: str, duration_ms: int = None
+    ) -> Optional[datetime]:
+        """Update scheduled task after a run. Returns the new next run time."""
         now = datetime.now()
 
         # Calculate next run
         task = self.get_scheduled_task(task_id)
         if not task:
-            return
+            return None
 
         cron = CronExpression(task["cron_expression"])
         next_run = cron.next_run(now)
@@ -577,6 +656,19 @@ class SchedulerService:
                 )
             conn.commit()
 
+        return next_run
+
+    def get_schedule(self) -> List[Tuple[int, str]]:
+        """Get (id, next_run_at) for every enabled task."""
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT id, next_run_at FROM scheduled_tasks
+                WHERE enabled = 1 AND next_run_at IS NOT NULL
+            """
+            ).fetchall()
+            return [(row["id"], row["next_run_at"]) for row in rows]
+
     def get_run_history(
         self, task_id: int = None, status: str = None, limit: int = 50
     ) -> List[Dict]:
@@ -661,19 +753,31 @@ class SchedulerDaemon:
     """
     Background daemon that executes scheduled tasks.
 
-    Polls for due tasks and creates queue entries for execution.
+    Keeps a min-heap of upcoming fire times and sleeps until the earliest
+    one is due. Changes made through the attached SchedulerService wake the
+    daemon immediately; poll_interval only bounds how long it waits before
+    re-reading the schedule for changes made by other processes.
     """
 
-    def __init__(self, db_path: str, poll_interval: int = 60):
+    # Seconds before due tasks are retried after failing to load
+    RETRY_DELAY = 5
+
+    def __init__(self, db_path: str, poll_interval: int = 60, service: SchedulerService = None):
         self.db_path = db_path
         self.poll_interval = poll_interval
-        self.service = SchedulerService(db_path)
+        self.service = service or SchedulerService(db_path)
         self._running = False
         self._thread = None
         # Use connection pooling
         self._pool = ServiceConnectionPool.get_or_create(
             db_path, min_connections=1, max_connections=3
         )
+        # (fire_time, task_id); entries that no longer match _fire_times are stale
+        self._heap: List[Tuple[datetime, int]] = []
+        self._fire_times: Dict[int, datetime] = {}
+        self._next_reload = 0.0
+        self._wake = threading.Event()
+        self.service.add_change_listener(self.wake)
 
     def start(self):
         """Start the scheduler daemon."""
@@ -682,6 +786,7 @@ class SchedulerDaemon:
             return
 
         self._running = True
+        self._wake.clear()
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
         self._thread.start()
         logger.info(f"Scheduler daemon started (poll_interval={self.poll_interval}s)")
@@ -689,27 +794,88 @@ class SchedulerDaemon:
     def stop(self):
         """Stop the scheduler daemon."""
         self._running = False
+        self._wake.set()
         if self._thread:
             self._thread.join(timeout=5)
         logger.info("Scheduler daemon stopped")
 
+    def wake(self):
+        """Reload the schedule and re-evaluate the next wakeup now."""
+        self._next_reload = 0.0
+        self._wake.set()
+
     def _run_loop(self):
-        """Main polling loop."""
+        """Main loop: sleep until the next task is due, then run it."""
         while self._running:
             try:
+                if time.monotonic() >= self._next_reload:
+                    self._load_schedule()
                 self._process_due_tasks()
             except Exception as e:
                 logger.error(f"Scheduler error: {e}")
 
-            # Sleep in small increments to allow quick shutdown
-            for _ in range(self.poll_interval):
-                if not self._running:
-                    break
-                time.sleep(1)
+            self._wake.wait(self._seconds_until_next())
+            self._wake.clear()
+
+    def _load_schedule(self):
+        """Rebuild the fire-time heap from the database."""
+        fire_times = {}
+        for task_id, next_run_at in self.service.get_schedule():
+            try:
+                fire_times[task_id] = datetime.fromisoformat(next_run_at)
+            except (TypeError, ValueError):
+                logger.warning(f"Scheduled task {task_id} has invalid next_run_at: {next_run_at}")
+
+        self._fire_times = fire_times
+        self._heap = [(when, task_id) for task_id, when in fire_times.items()]
+        heapq.heapify(self._heap)
+        self._next_reload = time.monotonic() + self.poll_interval
+
+    def _schedule(self, task_id: int, when: Optional[datetime]):
+        """Set (or clear) the next fire time for a task."""
+        if when is None:
+            self._fire_times.pop(task_id, None)
+            return
+        self._fire_times[task_id] = when
+        heapq.heappush(self._heap, (when, task_id))
+
+    def _seconds_until_next(self) -> float:
+        """Seconds to sleep before the next due task or schedule reload."""
+        timeout = max(0.0, self._next_reload - time.monotonic())
+        while self._heap and self._fire_times.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        if self._heap:
+            until_due = (self._heap[0][0] - datetime.now()).total_seconds()
+            timeout = min(timeout, max(0.0, until_due))
+        return timeout
+
+    def _pop_due(self) -> List[Tuple[datetime, int]]:
+        """Pop the (fire_time, task_id) of all tasks whose fire time has passed."""
+        now = datetime.now()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            when, task_id = heapq.heappop(self._heap)
+            if self._fire_times.get(task_id) == when:
+                del self._fire_times[task_id]
+                due.append((when, task_id))
+        return due
 
     def _process_due_tasks(self):
         """Process all due scheduled tasks."""
-        due_tasks = self.service.get_due_tasks()
+        due = self._pop_due()
+        due_tasks = []
+        try:
+            for _, task_id in due:
+                task = self.service.get_scheduled_task(task_id)
+                if task and task.get("enabled"):
+                    due_tasks.append(task)
+        except Exception:
+            # Nothing has run yet: keep every popped task, retrying shortly
+            retry_at = datetime.now() + timedelta(seconds=self.RETRY_DELAY)
+            for when, task_id in due:
+                self._schedule(task_id, max(when, retry_at))
+            raise
+        due_tasks.sort(key=lambda t: (-(t.get("priority") or 0), t.get("next_run_at") or ""))
 
         for task in due_tasks:
             try:
@@ -748,13 +914,13 @@ class SchedulerDaemon:
                 )
 
             # Update task for next run
-            self.service.update_task_after_run(task["id"], "queued")
+            self._schedule(task["id"], self.service.update_task_after_run(task["id"], "queued"))
 
             logger.info(f"Scheduled task {task['name']} added to queue (queue_id={queue_id})")
 
         except Exception as e:
             self.service.complete_run(run_id, "failed", error_message=str(e))
-            self.service.update_task_after_run(task["id"], "failed")
+            self._schedule(task["id"], self.service.update_task_after_run(task["id"], "failed"))
             raise
 
 
@@ -779,5 +945,7 @@ def get_scheduler_daemon(db_path: str = None, poll_interval: int = 60) -> Schedu
     if _scheduler_daemon is None:
         if db_path is None:
             raise ValueError("db_path required for first initialization")
-        _scheduler_daemon = SchedulerDaemon(db_path, poll_interval)
+        _scheduler_daemon = SchedulerDaemon(
+            db_path, poll_interval, service=get_scheduler_service(db_path)
+        )
     return _scheduler_daemon
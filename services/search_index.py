@@ -0,0 +1,368 @@
+"""
+Full-Text Search Index
+
+SQLite FTS5 index over activity, tasks, errors and task comments.
+
+Features:
+- External-content FTS5 tables, so indexed text is not stored twice:
+  activity_fts (activity_log), task_fts (task_queue), error_fts (errors)
+  and comment_fts (task_comments)
+- Task titles and descriptions are pulled out of task_queue.task_data
+  through the task_search_source view
+- Kept in sync by AFTER INSERT / UPDATE OF / DELETE triggers; updates only
+  re-index when an indexed column changes, so counters such as
+  errors.occurrence_count do not touch the index
+- Self-healing: an index whose table or triggers are missing is recreated
+  and rebuilt from its source table
+- BM25 ranking with per-column weights and <mark> snippet highlighting
+- User input is turned into a quoted, prefix-matching FTS5 query, so
+  punctuation and FTS5 operators in search boxes cannot raise syntax errors
+
+Usage:
+    from services.search_index import ensure_search_schema, search, fts_filter
+
+    ensure_search_schema(conn)  # once, from init_database()
+
+    results = search(conn, "timeout deploy", sources=["tasks", "errors"], limit=10)
+    # {"tasks": [{"id": 3, ..., "score": 4.21, "snippet": "... <mark>deploy</mark> ..."}]}
+
+    # Use the index as a filter inside an existing query
+    sql = f"SELECT * FROM errors e WHERE {fts_filter('errors', 'e.id')}"
+    conn.execute(sql, [build_match_query("timeout")])
+"""
+
+import html
+import logging
+import re
+import sqlite3
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+SNIPPET_OPEN = "<mark>"
+SNIPPET_CLOSE = "</mark>"
+SNIPPET_ELLIPSIS = "…"
+SNIPPET_TOKENS = 12
+# Placeholders snippet() puts around matches; swapped for the <mark> tags
+# once the row text has been HTML-escaped (private-use code points)
+_MATCH_OPEN = "\ue000"
+_MATCH_CLOSE = "\ue001"
+
+# Title and description of a task, from the task_data JSON of row {row}
+_TASK_DATA_SQL = "CASE WHEN json_valid({row}.task_data) THEN COALESCE({fields}) END"
+_TASK_TITLE_SQL = _TASK_DATA_SQL.format(
+    row="{row}",
+    fields="json_extract({row}.task_data, '$.title'), json_extract({row}.task_data, '$.name')",
+)
+_TASK_DESCRIPTION_SQL = _TASK_DATA_SQL.format(
+    row="{row}",
+    fields=(
+        "json_extract({row}.task_data, '$.description'), "
+        "json_extract({row}.task_data, '$.prompt'), "
+        "json_extract({row}.task_data, '$.message'), "
+        "json_extract({row}.task_data, '$.command')"
+    ),
+)
+
+# Indexed sources. "columns" are the FTS columns, in order; "values" the SQL
+# expression for each, relative to a source row named {row}; "weights" the
+# BM25 weight of each column; "watch" the source columns whose updates
+# re-index a row (default: "columns"); "select" the result columns (alias "s").
+SEARCH_SOURCES: Dict[str, Dict[str, Any]] = {
+    "activity": {
+        "fts": "activity_fts",
+        "table": "activity_log",
+        "content": "activity_log",
+        "columns": ("action", "entity_type", "details"),
+        "values": ("{row}.action", "{row}.entity_type", "{row}.details"),
+        "weights": (2.0, 1.0, 1.0),
+        "select": "s.id, s.user_id, s.action, s.entity_type, s.entity_id, s.created_at",
+    },
+    "tasks": {
+        "fts": "task_fts",
+        "table": "task_queue",
+        "content": "task_search_source",
+        "columns": ("task_type", "title", "description"),
+        "values": ("{row}.task_type", _TASK_TITLE_SQL, _TASK_DESCRIPTION_SQL),
+        "watch": ("task_type", "task_data"),
+        "weights": (1.0, 4.0, 2.0),
+        "select": (
+            "s.id, s.task_type, s.task_data, s.status, s.priority, "
+            "s.created_at, s.assigned_worker"
+        ),
+    },
+    "errors": {
+        "fts": "error_fts",
+        "table": "errors",
+        "content": "errors",
+        "columns": ("error_type", "message", "source"),
+        "values": ("{row}.error_type", "{row}.message", "{row}.source"),
+        "weights": (2.0, 1.0, 1.0),
+        "select": (
+            "s.id, s.error_type, s.message, s.source, s.status, s.occurrence_count, s.last_seen"
+        ),
+    },
+    "comments": {
+        "fts": "comment_fts",
+        "table": "task_comments",
+        "content": "task_comments",
+        "columns": ("content",),
+        "values": ("{row}.content",),
+        "weights": (1.0,),
+        "select": "s.id, s.task_id, s.content, s.author, s.comment_type, s.created_at",
+    },
+}
+
+_fts5_available: Optional[bool] = None
+
+
+def fts5_available(conn: sqlite3.Connection) -> bool:
+    """Whether this SQLite build has the FTS5 extension (checked once)."""
+    global _fts5_available
+    if _fts5_available is None:
+        try:
+            conn.execute("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)")
+            conn.execute("DROP TABLE temp._fts5_probe")
+            _fts5_available = True
+        except sqlite3.OperationalError:
+            _fts5_available = False
+            logger.warning("SQLite FTS5 is not available; search falls back to LIKE")
+    return _fts5_available
+
+
+def _values(source: Dict[str, Any], row: str) -> str:
+    return ", ".join(v.format(row=row) for v in source["values"])
+
+
+def _trigger_sql(source: Dict[str, Any]) -> Dict[str, str]:
+    """CREATE TRIGGER statements keeping one FTS table in sync."""
+    fts, table = source["fts"], source["table"]
+    columns = ", ".join(source["columns"])
+    watched = ", ".join(source.get("watch", source["columns"]))
+    delete = (
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) "
+        f"VALUES ('delete', OLD.id, {_values(source, 'OLD')});"
+    )
+    insert = f"INSERT INTO {fts}(rowid, {columns}) VALUES (NEW.id, {_values(source, 'NEW')});"
+    return {
+        f"trg_{fts}_insert": f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{fts}_insert
+            AFTER INSERT ON {table}
+            BEGIN
+                {insert}
+            END
+        """,
+        f"trg_{fts}_delete": f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{fts}_delete
+            AFTER DELETE ON {table}
+            BEGIN
+                {delete}
+            END
+        """,
+        f"trg_{fts}_update": f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{fts}_update
+            AFTER UPDATE OF {watched} ON {table}
+            BEGIN
+                {delete}
+                {insert}
+            END
+        """,
+    }
+
+
+def _existing(conn: sqlite3.Connection, kind: str) -> set:
+    return {
+        row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = ?", (kind,))
+    }
+
+
+def ensure_search_schema(conn: sqlite3.Connection) -> List[str]:
+    """Create the FTS tables, the task view and the sync triggers.
+
+    Safe to call on every startup. An index is rebuilt from its source table
+    only when it (or one of its triggers) was missing, since rows written
+    while the triggers were absent are not in the index.
+
+    Args:
+        conn: Connection to the main database
+
+    Returns:
+        Names of the sources that were (re)built
+    """
+    if not fts5_available(conn):
+        return []
+
+    tables = _existing(conn, "table")
+    if "task_queue" in tables:
+        conn.execute(
+            f"""
+            CREATE VIEW IF NOT EXISTS task_search_source AS
+            SELECT t.id, t.task_type,
+                   {_TASK_TITLE_SQL.format(row='t')} AS title,
+                   {_TASK_DESCRIPTION_SQL.format(row='t')} AS description
+            FROM task_queue t
+            """
+        )
+
+    triggers = _existing(conn, "trigger")
+    rebuilt = []
+    for name, source in SEARCH_SOURCES.items():
+        if source["table"] not in tables:
+            continue
+        fts = source["fts"]
+        trigger_sql = _trigger_sql(source)
+        if fts in tables and set(trigger_sql) <= triggers:
+            continue
+
+        # Drop and recreate so the index matches the current definition
+        for trigger in trigger_sql:
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        conn.execute(f"DROP TABLE IF EXISTS {fts}")
+        conn.execute(
+            f"""
+            CREATE VIRTUAL TABLE {fts} USING fts5(
+                {", ".join(source["columns"])},
+                content='{source["content"]}', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+            """
+        )
+        for sql in trigger_sql.values():
+            conn.execute(sql)
+        conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+        rebuilt.append(name)
+
+    if rebuilt:
+        logger.info(f"Built full-text search index for: {', '.join(rebuilt)}")
+    return rebuilt
+
+
+def rebuild_search_index(conn: sqlite3.Connection, sources: Optional[Sequence[str]] = None) -> int:
+    """Rebuild FTS tables from their source tables.
+
+    Args:
+        conn: Database connection
+        sources: Source names (default: all that exist)
+
+    Returns:
+        Number of indexes rebuilt
+    """
+    tables = _existing(conn, "table")
+    count = 0
+    for name in SEARCH_SOURCES if sources is None else sources:
+        fts = SEARCH_SOURCES[name]["fts"]
+        if fts in tables:
+            conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            count += 1
+    return count
+
+
+def search_index_ready(conn: sqlite3.Connection, source: str) -> bool:
+    """Whether the FTS table for a source exists on this database."""
+    fts = SEARCH_SOURCES[source]["fts"]
+    return (
+        conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+        ).fetchone()
+        is not None
+    )
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 MATCH expression.
+
+    Each whitespace-separated term becomes a quoted phrase with a prefix
+    wildcard ("dep" matches "deploy"); terms are ANDed. Quoting keeps
+    characters such as - : * ( ) " from being read as FTS5 syntax.
+
+    Returns:
+        The MATCH expression, or None if the query has no searchable terms
+    """
+    terms = [t for t in query.split() if re.search(r"\w", t)]
+    if not terms:
+        return None
+    return " ".join('"{}"*'.format(t.replace('"', '""')) for t in terms)
+
+
+def fts_filter(source: str, id_column: str) -> str:
+    """SQL condition restricting id_column to rows matching a MATCH parameter."""
+    fts = SEARCH_SOURCES[source]["fts"]
+    return f"{id_column} IN (SELECT rowid FROM {fts} WHERE {fts} MATCH ?)"
+
+
+def search_source(
+    conn: sqlite3.Connection,
+    source: str,
+    query: str,
+    limit: int = 10,
+    where: str = "",
+    params: Sequence[Any] = (),
+) -> List[Dict]:
+    """Search one source, best BM25 match first.
+
+    Args:
+        conn: Database connection
+        source: Key of SEARCH_SOURCES
+        query: Free-text query (see build_match_query)
+        limit: Maximum results
+        where: Extra SQL condition on the source row (alias "s")
+        params: Parameters for the extra condition
+
+    Returns:
+        Rows of the source's "select" columns plus "score" (higher is
+        better) and "snippet" (HTML-escaped matched text with <mark>
+        highlighting)
+    """
+    match = build_match_query(query)
+    if match is None:
+        return []
+    spec = SEARCH_SOURCES[source]
+    fts = spec["fts"]
+    weights = ", ".join(repr(w) for w in spec["weights"])
+    sql = f"""
+        SELECT {spec["select"]},
+               -bm25({fts}, {weights}) AS score,
+               snippet({fts}, -1, ?, ?, ?, {SNIPPET_TOKENS}) AS snippet
+        FROM {fts}
+        JOIN {spec["table"]} s ON s.id = {fts}.rowid
+        WHERE {fts} MATCH ?
+    """
+    if where:
+        sql += f" AND ({where})"
+    sql += f" ORDER BY bm25({fts}, {weights}) LIMIT ?"
+
+    cursor = conn.execute(
+        sql,
+        [_MATCH_OPEN, _MATCH_CLOSE, SNIPPET_ELLIPSIS, match, *params, limit],
+    )
+    names = [d[0] for d in cursor.description]
+    results = []
+    for row in cursor.fetchall():
+        item = dict(zip(names, row))
+        item["score"] = round(item["score"], 4)
+        item["snippet"] = highlight_snippet(item["snippet"])
+        results.append(item)
+    return results
+
+
+def highlight_snippet(snippet: Optional[str]) -> Optional[str]:
+    """HTML-escape a raw snippet() result, then add the <mark> tags."""
+    if snippet is None:
+        return None
+    return (
+        html.escape(snippet).replace(_MATCH_OPEN, SNIPPET_OPEN).replace(_MATCH_CLOSE, SNIPPET_CLOSE)
+    )
+
+
+def search(
+    conn: sqlite3.Connection,
+    query: str,
+    sources: Optional[Sequence[str]] = None,
+    limit: int = 10,
+) -> Dict[str, List[Dict]]:
+    """Search several sources; results are grouped by source name."""
+    return {
+        name: search_source(conn, name, query, limit)
+        for name in (sources or SEARCH_SOURCES)
+        if search_index_ready(conn, name)
+    }
@@ -0,0 +1,507 @@
+"""
+Task Claim Engine
+
+Atomic, index-backed claiming of pending tasks from task_queue.
+
+Features:
+- Single-statement claims (UPDATE ... WHERE status = 'pending' ... RETURNING)
+  so two workers can never claim the same task
+- Materialized ready set: task_queue.blocked_count holds the number of
+  incomplete dependencies and is kept exact by triggers on task_dependencies
+  and task_queue, so claims never run the dependency anti-join
+- Index-walk aging order: created_epoch (integer seconds) is kept in sync
+  with created_at by triggers, and the ready set is split into tasks still
+  gaining their aging bonus (indexed on priority * scale - created_epoch,
+  which orders exactly like effective priority) and tasks whose bonus has
+  reached the cap (indexed on priority); aging_capped is materialized by
+  materialize_aged_tasks(), which claim() runs at most once a minute
+- Batch claims (max_tasks=N) in the same statement
+
+Usage:
+    from services.task_claim import TaskClaimEngine, ensure_claim_schema
+
+    ensure_claim_schema(conn, aging_factor=0.1)  # once, from init_database()
+
+    engine = TaskClaimEngine(aging_factor=0.1, max_age_bonus=10)
+    tasks = engine.claim(conn, worker_id="worker-1", task_types=["shell"], max_tasks=5)
+"""
+
+import logging
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# UPDATE ... RETURNING needs SQLite 3.35+
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# created_at as integer epoch seconds (a missing created_at counts as "now")
+_EPOCH_SQL = "CAST(strftime('%s', COALESCE({created_at}, 'now')) AS INTEGER)"
+
+# Ready set restricted to tasks still gaining (0) or past (1) the aging cap
+_AGING_READY = "status = 'pending' AND blocked_count = 0 AND aging_capped = {capped}"
+
+# Number of incomplete dependencies for the task whose id is {task_id}
+_BLOCKED_COUNT_SQL = """(
+    SELECT COUNT(*) FROM task_dependencies td
+    JOIN task_queue tq ON tq.id = td.depends_on_id
+    WHERE td.task_id = {task_id} AND tq.status NOT IN ('completed', 'failed')
+)"""
+_ROW_BLOCKED_COUNT_SQL = _BLOCKED_COUNT_SQL.format(task_id="task_queue.id")
+
+_CLAIM_TRIGGERS = {
+    "trg_task_deps_insert_blocked": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_task_deps_insert_blocked
+        AFTER INSERT ON task_dependencies
+        BEGIN
+            UPDATE task_queue SET blocked_count = {_BLOCKED_COUNT_SQL.format(task_id="NEW.task_id")}
+            WHERE id = NEW.task_id;
+        END
+    """,
+    "trg_task_deps_delete_blocked": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_task_deps_delete_blocked
+        AFTER DELETE ON task_dependencies
+        BEGIN
+            UPDATE task_queue SET blocked_count = {_BLOCKED_COUNT_SQL.format(task_id="OLD.task_id")}
+            WHERE id = OLD.task_id;
+        END
+    """,
+    "trg_task_deps_update_blocked": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_task_deps_update_blocked
+        AFTER UPDATE OF task_id, depends_on_id ON task_dependencies
+        BEGIN
+            UPDATE task_queue SET blocked_count = {_ROW_BLOCKED_COUNT_SQL}
+            WHERE id IN (OLD.task_id, NEW.task_id);
+        END
+    """,
+    # Completing (or re-opening) a task changes the blocked count of its dependents
+    "trg_task_queue_status_blocked": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_task_queue_status_blocked
+        AFTER UPDATE OF status ON task_queue
+        WHEN (OLD.status IN ('completed', 'failed')) IS NOT (NEW.status IN ('completed', 'failed'))
+        BEGIN
+            UPDATE task_queue SET blocked_count = {_ROW_BLOCKED_COUNT_SQL}
+            WHERE id IN (SELECT task_id FROM task_dependencies WHERE depends_on_id = NEW.id);
+        END
+    """,
+    # Covers deletes/archiving when foreign key cascades are not enabled
+    "trg_task_queue_delete_blocked": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_task_queue_delete_blocked
+        AFTER DELETE ON task_queue
+        BEGIN
+            UPDATE task_queue SET blocked_count = {_ROW_BLOCKED_COUNT_SQL}
+            WHERE id IN (SELECT task_id FROM task_dependencies WHERE depends_on_id = OLD.id);
+        END
+    """,
+    # created_epoch mirrors created_at; a new created_at also restarts aging
+    "trg_task_queue_created_epoch_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_task_queue_created_epoch_insert
+        AFTER INSERT ON task_queue
+        WHEN NEW.created_epoch IS NOT {_EPOCH_SQL.format(created_at="NEW.created_at")}
+        BEGIN
+            UPDATE task_queue SET
+                created_epoch = {_EPOCH_SQL.format(created_at="NEW.created_at")},
+                aging_capped = 0
+            WHERE id = NEW.id;
+        END
+    """,
+    "trg_task_queue_created_epoch_update": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_task_queue_created_epoch_update
+        AFTER UPDATE OF created_at ON task_queue
+        WHEN NEW.created_epoch IS NOT {_EPOCH_SQL.format(created_at="NEW.created_at")}
+        BEGIN
+            UPDATE task_queue SET
+                created_epoch = {_EPOCH_SQL.format(created_at="NEW.created_at")},
+                aging_capped = 0
+            WHERE id = NEW.id;
+        END
+    """,
+}
+
+
+def aging_scale(aging_factor: float) -> float:
+    """Seconds of waiting worth one priority point (60 / aging_factor).
+
+    Rounded so the value, and the index expressions built from it, are stable.
+    """
+    return round(60.0 / aging_factor, 6)
+
+
+def _aging_key_sql(scale: float) -> str:
+    """Index expression that orders uncapped tasks by effective priority.
+
+    effective * scale = priority * scale + (now - created_epoch), so for a
+    fixed "now" this key sorts exactly like effective priority.
+    """
+    return f"(priority * {scale!r} - created_epoch)"
+
+
+def _aging_indexes(aging_factor: float) -> Dict[str, str]:
+    """CREATE INDEX statements for the aging-ordered ready set."""
+    indexes = {
+        "idx_task_queue_aged": f"""
+            CREATE INDEX IF NOT EXISTS idx_task_queue_aged
+            ON task_queue(priority DESC, created_epoch, id)
+            WHERE {_AGING_READY.format(capped=1)}
+        """,
+        "idx_task_queue_aged_type": f"""
+            CREATE INDEX IF NOT EXISTS idx_task_queue_aged_type
+            ON task_queue(task_type, priority DESC, created_epoch, id)
+            WHERE {_AGING_READY.format(capped=1)}
+        """,
+        # Uncapped pending tasks by age: finds tasks due for materialization
+        "idx_task_queue_aging_due": """
+            CREATE INDEX IF NOT EXISTS idx_task_queue_aging_due
+            ON task_queue(created_epoch)
+            WHERE status = 'pending' AND aging_capped = 0
+        """,
+    }
+    if aging_factor > 0:
+        key = _aging_key_sql(aging_scale(aging_factor))
+        indexes[
+            "idx_task_queue_aging"
+        ] = f"""
+            CREATE INDEX IF NOT EXISTS idx_task_queue_aging
+            ON task_queue({key} DESC, created_epoch, id)
+            WHERE {_AGING_READY.format(capped=0)}
+        """
+        indexes[
+            "idx_task_queue_aging_type"
+        ] = f"""
+            CREATE INDEX IF NOT EXISTS idx_task_queue_aging_type
+            ON task_queue(task_type, {key} DESC, created_epoch, id)
+            WHERE {_AGING_READY.format(capped=0)}
+        """
+    return indexes
+
+
+def ensure_claim_schema(conn: sqlite3.Connection, aging_factor: float = 0.1) -> bool:
+    """Create the ready-set and aging columns, their indexes and triggers.
+
+    Safe to call on every startup. The blocked_count and created_epoch
+    backfills only run when the columns are first added. The aging indexes
+    embed the aging factor, so they are rebuilt when it changes.
+
+    Args:
+        conn: Connection to the main database
+        aging_factor: Priority points gained per minute (as TaskClaimEngine)
+
+    Returns:
+        True if blocked_count was added and backfilled
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(task_queue)").fetchall()}
+    added = False
+    if "blocked_count" not in columns:
+        conn.execute("ALTER TABLE task_queue ADD COLUMN blocked_count INTEGER DEFAULT 0")
+        added = True
+    if "aging_capped" not in columns:
+        conn.execute("ALTER TABLE task_queue ADD COLUMN aging_capped INTEGER DEFAULT 0")
+    if "created_epoch" not in columns:
+        conn.execute("ALTER TABLE task_queue ADD COLUMN created_epoch INTEGER")
+        conn.execute(
+            f"UPDATE task_queue SET created_epoch = {_EPOCH_SQL.format(created_at='created_at')}"
+        )
+        logger.info("Backfilled task_queue.created_epoch for priority aging")
+
+    # Superseded by the aging indexes below
+    conn.execute("DROP INDEX IF EXISTS idx_task_queue_ready")
+    conn.execute("DROP INDEX IF EXISTS idx_task_queue_ready_type")
+
+    existing = {
+        row[0]: row[1]
+        for row in conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'task_queue'"
+        )
+    }
+    indexes = _aging_indexes(aging_factor)
+    key = _aging_key_sql(aging_scale(aging_factor)) if aging_factor > 0 else None
+    for name in ("idx_task_queue_aging", "idx_task_queue_aging_type"):
+        # Built for a different aging factor (or aging is now disabled)
+        if name in existing and (key is None or key not in (existing[name] or "")):
+            conn.execute(f"DROP INDEX {name}")
+    for index_sql in indexes.values():
+        conn.execute(index_sql)
+
+    for trigger_sql in _CLAIM_TRIGGERS.values():
+        conn.execute(trigger_sql)
+
+    if added:
+        rebuild_blocked_counts(conn)
+    return added
+
+
+def rebuild_blocked_counts(conn: sqlite3.Connection) -> int:
+    """Recompute blocked_count for every task from task_dependencies.
+
+    Args:
+        conn: Connection to the main database
+
+    Returns:
+        Number of tasks currently blocked
+    """
+    conn.execute("UPDATE task_queue SET blocked_count = 0 WHERE blocked_count != 0")
+    conn.execute(
+        f"""
+        UPDATE task_queue SET blocked_count = {_ROW_BLOCKED_COUNT_SQL}
+        WHERE id IN (SELECT DISTINCT task_id FROM task_dependencies)
+    """
+    )
+    return conn.execute("SELECT COUNT(*) FROM task_queue WHERE blocked_count > 0").fetchone()[0]
+
+
+class TaskClaimEngine:
+    """
+    Claims ready tasks for workers with a single atomic UPDATE per claim.
+
+    Candidates come from three index walks merged on exact effective priority:
+    uncapped tasks by aging key, capped tasks by priority, and the (few)
+    tasks that reached the cap since the last materialize_aged_tasks() run.
+    """
+
+    # Upper bound on tasks claimed in one call
+    MAX_BATCH = 50
+
+    # Seconds between materialize_aged_tasks() runs triggered by claims
+    MATERIALIZE_INTERVAL = 60
+
+    def __init__(self, aging_factor: float = 0.1, max_age_bonus: float = 10):
+        self.aging_factor = aging_factor
+        self.max_age_bonus = max_age_bonus
+        self.aging = aging_factor > 0 and max_age_bonus > 0
+        # Effective priority scaled by `scale` is integral, so ties compare exactly
+        self.scale = aging_scale(aging_factor) if self.aging else 1.0
+        self.cap_seconds = max_age_bonus * self.scale if self.aging else 0
+        self._next_materialize = 0.0
+
+    def _priority_expr(self, now: str = "strftime('%s', 'now')") -> str:
+        """SQL for effective priority (base priority plus capped aging bonus)."""
+        if not self.aging:
+            return "(priority + 0.0)"
+        return (
+            f"(priority + MIN({float(self.max_age_bonus)}, "
+            f"({now} - created_epoch) / 60.0 * {float(self.aging_factor)}))"
+        )
+
+    def _ready_filter(self, task_types: Optional[List[str]], type_column: str = "task_type"):
+        """WHERE clause selecting the ready set, optionally filtered by type."""
+        where = "status = 'pending' AND blocked_count = 0 AND retries < max_retries"
+        params: List[Any] = []
+        if task_types:
+            where += f" AND {type_column} IN ({','.join('?' * len(task_types))})"
+            params.extend(task_types)
+        return where, params
+
+    def _candidates_sql(
+        self, task_types: Optional[List[str]], limit: int, now: Optional[int] = None
+    ) -> Tuple[str, List[Any]]:
+        """SELECT of the ids of the top `limit` ready tasks, best first.
+
+        Each branch is an index walk that stops after `limit` rows, so the
+        cost does not depend on how many tasks are pending.
+        """
+        now = int(time.time()) if now is None else int(now)
+        where, type_params = self._ready_filter(task_types)
+        if not self.aging:
+            return (
+                f"""SELECT id FROM task_queue WHERE {where}
+                ORDER BY priority DESC, created_epoch ASC, id ASC LIMIT ?""",
+                type_params + [limit],
+            )
+
+        due = now - self.cap_seconds
+        capped_order = "priority DESC, created_epoch ASC, id ASC"
+        # "+task_type" keeps the last branch on idx_task_queue_aging_due, and
+        # "+created_epoch" keeps the first one off it (a range on it would
+        # need a sort of every still-aging task)
+        unindexed_where, _ = self._ready_filter(task_types, type_column="+task_type")
+        branches = [
+            # Still aging: key order is effective priority order
+            (
+                where,
+                "aging_capped = 0 AND +created_epoch > ?",
+                [due],
+                f"{_aging_key_sql(self.scale)} DESC, created_epoch ASC, id ASC",
+            ),
+            # Bonus capped and materialized: priority order
+            (where, "aging_capped = 1", [], capped_order),
+            # Reached the cap since the last materialization (sorted in full,
+            # but only holds tasks that aged out within MATERIALIZE_INTERVAL)
+            (
+                unindexed_where,
+                "aging_capped = 0 AND created_epoch <= ?",
+                [due],
+                capped_order,
+            ),
+        ]
+        selects, params = [], []
+        for branch_where, condition, condition_params, order in branches:
+            selects.append(
+                f"""SELECT * FROM (
+                    SELECT id, priority, created_epoch FROM task_queue
+                    WHERE {branch_where} AND {condition}
+                    ORDER BY {order} LIMIT ?)"""
+            )
+            params += type_params + condition_params + [limit]
+        sql = f"""
+            SELECT id FROM ({" UNION ALL ".join(selects)})
+            ORDER BY priority * {self.scale!r} + MIN(? - created_epoch, {self.cap_seconds!r}) DESC,
+                created_epoch ASC, id ASC
+            LIMIT ?"""
+        return sql, params + [now, limit]
+
+    def materialize_aged_tasks(self, conn: sqlite3.Connection, now: Optional[int] = None) -> int:
+        """Flag pending tasks whose aging bonus has reached the cap.
+
+        Flagged tasks move from the aging index to the priority index. Claims
+        are exact either way; this keeps the "reached the cap" branch small.
+
+        Args:
+            conn: Connection to the main database (caller commits)
+            now: Epoch seconds (default: current time)
+
+        Returns:
+            Number of tasks flagged
+        """
+        if not self.aging:
+            return 0
+        now = int(time.time()) if now is None else int(now)
+        cursor = conn.execute(
+            """
+            UPDATE task_queue SET aging_capped = 1
+            WHERE status = 'pending' AND aging_capped = 0 AND created_epoch <= ?
+        """,
+            (now - self.cap_seconds,),
+        )
+        if cursor.rowcount:
+            logger.debug(f"Materialized aging cap for {cursor.rowcount} tasks")
+        return cursor.rowcount
+
+    def _maybe_materialize(self, conn: sqlite3.Connection):
+        now = time.time()
+        if now < self._next_materialize:
+            return
+        self._next_materialize = now + self.MATERIALIZE_INTERVAL
+        self.materialize_aged_tasks(conn, now)
+
+    def peek(
+        self, conn: sqlite3.Connection, task_types: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Return the next ready task without claiming it."""
+        now = int(time.time())
+        candidates, params = self._candidates_sql(task_types, 1, now)
+        row = conn.execute(
+            f"""
+            SELECT *, {self._priority_expr("?")} as effective_priority
+            FROM task_queue
+            WHERE id IN ({candidates})
+        """,
+            [now] + params,
+        ).fetchone()
+        return dict(row) if row else None
+
+    def claim(
+        self,
+        conn: sqlite3.Connection,
+        worker_id: str,
+        task_types: Optional[List[str]] = None,
+        max_tasks: int = 1,
+    ) -> List[Dict[str, Any]]:
+        """Atomically claim up to max_tasks ready tasks for a worker.
+
+        Args:
+            conn: Connection with row_factory = sqlite3.Row (caller commits)
+            worker_id: Worker taking the tasks
+            task_types: Optional task type filter
+            max_tasks: Number of tasks to claim (capped at MAX_BATCH)
+
+        Returns:
+            Claimed tasks ordered by effective priority, highest first
+        """
+        max_tasks = min(max(1, int(max_tasks or 1)), self.MAX_BATCH)
+        self._maybe_materialize(conn)
+        now = int(time.time())
+        candidates, params = self._candidates_sql(task_types, max_tasks, now)
+
+        if not SUPPORTS_RETURNING:
+            ids = [row[0] for row in conn.execute(candidates, params).fetchall()]
+            return self._claim_without_returning(conn, worker_id, ids)
+
+        rows = conn.execute(
+            f"""
+            UPDATE task_queue SET
+                status = 'running',
+                assigned_worker = ?,
+                started_at = CURRENT_TIMESTAMP
+            WHERE id IN ({candidates}) AND status = 'pending'
+            RETURNING *, {self._priority_expr("?")} as effective_priority
+        """,
+            [worker_id] + params + [now],
+        ).fetchall()
+        tasks = [dict(row) for row in rows]
+        tasks.sort(key=lambda t: self._sort_key(t, now))
+        return tasks
+
+    def _sort_key(self, task: Dict[str, Any], now: int):
+        """Python equivalent of the candidate ORDER BY."""
+        created = task.get("created_epoch")
+        if created is None:
+            return (float("inf"), 0, task["id"])
+        scaled = (task["priority"] or 0) * self.scale
+        if self.aging:
+            scaled += min(now - created, self.cap_seconds)
+        return (-scaled, created, task["id"])
+
+    def claim_by_id(
+        self, conn: sqlite3.Connection, task_id: int, worker_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Claim a specific task if it is still ready.
+
+        Returns:
+            The claimed task, or None if another worker got it first
+        """
+        if not SUPPORTS_RETURNING:
+            claimed = self._claim_without_returning(conn, worker_id, [task_id])
+            return claimed[0] if claimed else None
+
+        row = conn.execute(
+            f"""
+            UPDATE task_queue SET
+                status = 'running',
+                assigned_worker = ?,
+                started_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND status = 'pending' AND blocked_count = 0
+            RETURNING *, {self._priority_expr()} as effective_priority
+        """,
+            (worker_id, task_id),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def _claim_without_returning(
+        self, conn: sqlite3.Connection, worker_id: str, ids: List[int]
+    ) -> List[Dict[str, Any]]:
+        """Claim path for SQLite builds without RETURNING support.
+
+        Each row is still guarded by status = 'pending', so a concurrent claim
+        shows up as rowcount 0 rather than a double assignment.
+        """
+        claimed = []
+        for task_id in ids:
+            cursor = conn.execute(
+                """
+                UPDATE task_queue SET
+                    status = 'running',
+                    assigned_worker = ?,
+                    started_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND status = 'pending' AND blocked_count = 0
+            """,
+                (worker_id, task_id),
+            )
+            if cursor.rowcount:
+                row = conn.execute(
+                    f"""SELECT *, {self._priority_expr()} as effective_priority
+                    FROM task_queue WHERE id = ?""",
+                    (task_id,),
+                ).fetchone()
+                claimed.append(dict(row))
+        return claimed
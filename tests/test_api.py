@@ -2,6 +2,7 @@
 API Endpoint Tests for Architect Dashboard
 """
 import json
+import uuid
 
 import pytest
 
@@ -519,6 +520,17 @@ class TestStatsAPI:
         data = response.get_json()
         assert "projects" in data or "features" in data
 
+    def test_get_stats_conditional(self, authenticated_client):
+        """Test a matching If-None-Match is answered with 304."""
+        authenticated_client.get("/api/stats")  # Warm the stats cache
+        response = authenticated_client.get("/api/stats")
+        etag = response.headers.get("ETag")
+        assert etag
+
+        response = authenticated_client.get("/api/stats", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers.get("ETag") == etag
+
 
 class TestTmuxAPI:
     """Tests for /api/tmux endpoints."""
@@ -541,6 +553,76 @@ class TestTasksAPI:
         data = response.get_json()
         assert isinstance(data, list)
 
+    def _seed_tasks(self, count):
+        import db
+
+        task_type = f"test_{uuid.uuid4().hex[:8]}"
+        with db.get_db_connection() as conn:
+            conn.executemany(
+                "INSERT INTO task_queue (task_type, task_data, priority, created_at) "
+                "VALUES (?, '{}', ?, datetime('now', ?))",
+                [(task_type, i % 3, f"-{i} minutes") for i in range(count)],
+            )
+        return task_type
+
+    def test_list_tasks_cursor_pagination(self, authenticated_client):
+        """Test keyset cursor pages cover every task exactly once, in order."""
+        task_type = self._seed_tasks(25)
+
+        seen = []
+        cursor = ""
+        while True:
+            response = authenticated_client.get(
+                f"/api/tasks?type={task_type}&limit=10&cursor={cursor}"
+            )
+            assert response.status_code == 200
+            data = response.get_json()
+            assert len(data["items"]) <= 10
+            seen.extend(data["items"])
+            if not data["has_more"]:
+                assert data["next_cursor"] is None
+                break
+            cursor = data["next_cursor"]
+
+        assert len(seen) == 25
+        assert len({t["id"] for t in seen}) == 25
+        keys = [(-t["effective_priority"], t["created_at"], t["id"]) for t in seen]
+        assert keys == sorted(keys)
+
+    def test_list_tasks_invalid_cursor(self, authenticated_client):
+        """Test a malformed cursor is rejected."""
+        response = authenticated_client.get("/api/tasks?cursor=not-a-cursor")
+        assert response.status_code == 400
+
+    def test_list_tasks_cursor_values_validated(self, authenticated_client):
+        """Test cursors with ill-typed or expired values are rejected."""
+        import time
+
+        from app import encode_cursor
+
+        now = int(time.time())
+        for values in (
+            {"p": 1, "c": now, "i": 1, "t": "now"},
+            {"p": "1", "c": now, "i": 1, "t": now},
+            {"p": 1, "c": now, "i": 1, "t": now - 86400},
+            {"p": 1, "c": now, "i": 1, "t": now + 86400},
+        ):
+            response = authenticated_client.get(f"/api/tasks?cursor={encode_cursor(values)}")
+            assert response.status_code == 400
+
+    def test_list_tasks_paginate_counts_in_sql(self, authenticated_client):
+        """Test page/per_page pagination reports totals for the filter."""
+        task_type = self._seed_tasks(7)
+        response = authenticated_client.get(
+            f"/api/tasks?type={task_type}&paginate=true&page=2&per_page=5"
+        )
+        assert response.status_code == 200
+        data = response.get_json()
+        assert len(data["items"]) == 2
+        assert data["pagination"]["total"] == 7
+        assert data["pagination"]["total_pages"] == 2
+        assert data["pagination"]["has_prev"] is True
+
 
 class TestSecretsAPI:
     """Tests for /api/secrets endpoints (Secure Vault)."""
@@ -0,0 +1,205 @@
+"""
+Tests for the Event-Driven Assigner Loop
+
+Tests:
+- Wake-up socket round trip, coalescing and stale socket files
+- Prompt-to-dispatch latency when producers notify the worker
+- data_version fallback for producers that do not notify
+- State file written only on change; stop() wakes the loop
+"""
+
+import sqlite3
+import statistics
+
+# Add parent directory to path for imports
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from workers import assigner_events, assigner_worker  # noqa: E402
+from workers.assigner_events import AssignerWakeup, notify_assigner  # noqa: E402
+from workers.assigner_worker import (  # noqa: E402
+    AssignerDatabase,
+    AssignerWorker,
+    SessionDetector,
+    SessionStatus,
+)
+
+SESSIONS = [f"worker{i}" for i in range(25)]
+
+
+class _FakeDetector:
+    """Detector that reports fixed idle sessions without tmux."""
+
+    control = None
+
+    def list_sessions(self):
+        return list(SESSIONS)
+
+    def scan_all_sessions(self):
+        return [
+            SessionDetector._session_info(name, SessionStatus.IDLE, "claude", None)
+            for name in SESSIONS
+        ]
+
+    def detect_session_status(self, session):
+        return SessionStatus.BUSY, "claude", ""
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def wake_socket(tmp_path, monkeypatch):
+    path = tmp_path / "wake.sock"
+    monkeypatch.setattr(assigner_events, "WAKE_SOCKET", path)
+    return path
+
+
+@pytest.fixture
+def worker(tmp_path, wake_socket, monkeypatch):
+    """Worker on a temp database whose tmux sends are recorded."""
+    monkeypatch.setattr(assigner_worker, "STATE_FILE", tmp_path / "state.json")
+    inst = AssignerWorker(
+        poll_interval=3600,
+        session_scan_interval=3600,
+        timeout_check_interval=3600,
+        db_check_interval=3600,
+    )
+    inst.db = AssignerDatabase(db_path=tmp_path / "assigner.db")
+    inst.detector = _FakeDetector()
+
+    inst.sent = []
+    inst.dispatched = threading.Condition()
+
+    def send(session, content):
+        with inst.dispatched:
+            inst.sent.append((time.perf_counter(), session, content))
+            inst.dispatched.notify_all()
+
+    inst._send_to_session = send
+    yield inst
+    inst.stop()
+
+
+def _run(worker):
+    thread = threading.Thread(target=worker.start, daemon=True)
+    thread.start()
+    deadline = time.time() + 5
+    while worker.wakeup._sock is None and time.time() < deadline:
+        time.sleep(0.01)
+    return thread
+
+
+def _wait_sent(worker, count, timeout=5):
+    with worker.dispatched:
+        assert worker.dispatched.wait_for(lambda: len(worker.sent) >= count, timeout)
+    return worker.sent[count - 1][0]
+
+
+class TestWakeup:
+    """Test the wake-up socket."""
+
+    def test_round_trip_and_coalescing(self, wake_socket):
+        wakeup = AssignerWakeup()
+        assert wakeup.open()
+        try:
+            for _ in range(5):
+                assert notify_assigner()
+            assert notify_assigner("tmux")
+            assert wakeup.wait(1) == {"prompt", "tmux"}
+            assert wakeup.wait(0.05) == set()
+            assert wakeup.stats == {"wakeups": 1, "messages": 6}
+
+            # A full queue drops notifications instead of blocking producers
+            for _ in range(1000):
+                notify_assigner()
+            assert wakeup.wait(1) == {"prompt"}
+        finally:
+            wakeup.close()
+        assert not wake_socket.exists()
+        assert notify_assigner() is False
+
+    def test_stale_socket_is_replaced(self, wake_socket):
+        stale = AssignerWakeup()
+        assert stale.open()
+        stale._sock.close()  # crashed worker: file left behind
+        stale._sock = None
+
+        wakeup = AssignerWakeup()
+        assert wakeup.open()
+        try:
+            notify_assigner()
+            assert wakeup.wait(1) == {"prompt"}
+        finally:
+            wakeup.close()
+
+
+class TestEventDrivenWorker:
+    """Test the worker loop driven by wake-ups."""
+
+    def test_prompt_to_dispatch_latency(self, worker):
+        thread = _run(worker)
+        latencies = []
+        for i in range(20):
+            start = time.perf_counter()
+            worker.db.add_prompt(f"Task {i}")
+            latencies.append(_wait_sent(worker, i + 1) - start)
+
+        assert statistics.median(latencies) < 0.1
+        assert len({session for _, session, _ in worker.sent}) == 20
+        # Every wake-up came from a producer, none from a timeout
+        assert worker.loop_stats["timeouts"] == 0
+
+        worker.stop()
+        thread.join(2)
+        assert not thread.is_alive()
+
+    def test_backlog_drains_past_batch_size(self, worker):
+        for i in range(12):
+            worker.db.add_prompt(f"Queued {i}")
+        thread = _run(worker)
+        _wait_sent(worker, 12)
+        worker.stop()
+        thread.join(2)
+
+    def test_data_version_catches_silent_writers(self, worker, tmp_path):
+        worker.db_check_interval = 0.1
+        thread = _run(worker)
+        with sqlite3.connect(tmp_path / "assigner.db") as conn:
+            conn.execute("INSERT INTO prompts (content) VALUES ('queued without notify')")
+        _wait_sent(worker, 1, timeout=2)
+        assert worker.loop_stats["db_changes"] >= 1
+        worker.stop()
+        thread.join(2)
+
+    def test_stop_wakes_idle_loop(self, worker):
+        thread = _run(worker)
+        time.sleep(0.1)
+        start = time.perf_counter()
+        worker.stop()
+        thread.join(2)
+        assert not thread.is_alive()
+        assert time.perf_counter() - start < 0.5
+
+
+class TestStatePersistence:
+    """Test that the state file is rewritten only on change."""
+
+    def test_writes_only_on_change(self, worker):
+        state_file = assigner_worker.STATE_FILE
+        worker._save_state()
+        worker._save_state()
+        assert worker.loop_stats["state_writes"] == 1
+        first = state_file.read_text()
+
+        worker.db.add_prompt("Pending work")
+        worker._save_state()
+        worker._save_state()
+        assert worker.loop_stats["state_writes"] == 2
+        assert state_file.read_text() != first
@@ -0,0 +1,296 @@
+"""
+Tests for the Broadcast Hub
+
+Tests:
+- Fan-out of one encoded frame to every subscriber of a channel
+- Delivery across hubs sharing one database (worker processes)
+- Last-Event-ID resume from the replay buffer and from the log
+- Coalescing of rapid publishes, internal channels and listeners
+- Slow subscribers disconnected, log pruning, many idle subscribers
+- WSGI streams under eventlet wait as greenthreads without blocking the hub
+"""
+
+import asyncio
+import json
+import sqlite3
+
+# Add parent directory to path for imports
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.broadcast_hub import BroadcastHub, ensure_broadcast_schema, sse_frame  # noqa: E402
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "main.db"
+    conn = sqlite3.connect(path)
+    ensure_broadcast_schema(conn)
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def make_hub(db_path):
+    hubs = []
+
+    def make(**kwargs):
+        kwargs.setdefault("poll_interval", 0.02)
+        hub = BroadcastHub(db_path, **kwargs)
+        hubs.append(hub)
+        return hub
+
+    yield make
+    for hub in hubs:
+        hub.close()
+
+
+def _parse(frame):
+    fields = dict(line.split(": ", 1) for line in frame.decode().strip().split("\n"))
+    return fields.get("id"), fields["event"], json.loads(fields["data"])
+
+
+def _open(hub, channels, **kwargs):
+    """Stream with its "connected" frame consumed (subscribed from here on)."""
+    kwargs.setdefault("heartbeat", 0.2)
+    stream = hub.iter_stream(channels, **kwargs)
+    assert _parse(next(stream))[1] == "connected"
+    return stream
+
+
+def _events(stream, count):
+    """Next count non-heartbeat frames."""
+    frames = []
+    while len(frames) < count:
+        frame = next(stream)
+        if _parse(frame)[1] != "heartbeat":
+            frames.append(frame)
+    return frames
+
+
+def _until_idle(stream):
+    """Frames received before the stream goes quiet for one heartbeat."""
+    frames = []
+    for frame in stream:
+        if _parse(frame)[1] == "heartbeat":
+            return frames
+        frames.append(frame)
+    return frames
+
+
+class TestFanOut:
+    """Test local and cross-process delivery."""
+
+    def test_frame_encoded_once(self, make_hub):
+        hub = make_hub()
+        first = _open(hub, ["stats"])
+        second = _open(hub, ["all"])
+        other = _open(hub, ["errors"])
+
+        hub.publish("stats", {"bugs": 3})
+        (a,), (b,) = _events(first, 1), _events(second, 1)
+        assert a is b
+        seq, event, data = _parse(a)
+        assert (event, data) == ("stats", {"bugs": 3})
+        assert int(seq) > 0
+        assert _until_idle(other) == []
+
+    def test_delivered_across_processes(self, make_hub):
+        publisher, receiver = make_hub(), make_hub()
+        stream = _open(receiver, ["errors"])
+        publisher.publish("errors", {"count": 1})
+        publisher.publish("errors", {"count": 2})
+
+        frames = _events(stream, 2)
+        assert [_parse(f)[2]["count"] for f in frames] == [1, 2]
+
+    def test_internal_channels_reach_listeners_only(self, make_hub):
+        hub = make_hub()
+        seen = []
+        hub.add_listener(lambda event: seen.append((event.channel, json.loads(event.data))))
+        everything = _open(hub, ["all"])
+        explicit = _open(hub, ["_socketio.stats"])
+
+        hub.publish("_socketio.stats", {"event": "stats_update", "data": {}})
+        assert _parse(_events(explicit, 1)[0])[1] == "_socketio.stats"
+        assert _until_idle(everything) == []
+        assert seen == [("_socketio.stats", {"event": "stats_update", "data": {}})]
+
+
+class TestResume:
+    """Test Last-Event-ID resume."""
+
+    def test_resume_from_buffer_and_log(self, make_hub):
+        hub = make_hub()
+        stream = _open(hub, ["queue"])
+        for i in range(5):
+            hub.publish("queue", {"n": i})
+        ids = [_parse(f)[0] for f in _events(stream, 5)]
+
+        resumed = _open(hub, ["queue"], last_event_id=ids[1])
+        assert [_parse(f)[2]["n"] for f in _events(resumed, 3)] == [2, 3, 4]
+
+        # A fresh process has nothing buffered and reads the log
+        fresh = make_hub()
+        resumed = _open(fresh, ["queue"], last_event_id=ids[2])
+        assert [_parse(f)[2]["n"] for f in _events(resumed, 2)] == [3, 4]
+        assert _until_idle(resumed) == []
+
+    def test_resume_then_live_without_duplicates(self, make_hub):
+        hub = make_hub()
+        stream = _open(hub, ["nodes"])
+        hub.publish("nodes", {"n": 0})
+        (first,) = _events(stream, 1)
+
+        resumed = _open(hub, ["nodes"], last_event_id=_parse(first)[0])
+        hub.publish("nodes", {"n": 1})
+        assert [_parse(f)[2]["n"] for f in _until_idle(resumed)] == [1]
+
+
+class TestCoalescing:
+    """Test per-channel coalescing."""
+
+    def test_rapid_stats_collapse_to_latest(self, make_hub):
+        hub = make_hub(coalesce={"stats": 0.3})
+        stream = _open(hub, ["stats"], heartbeat=0.6)
+        hub.publish("stats", {"n": 0})
+        assert _parse(_events(stream, 1)[0])[2] == {"n": 0}
+        for i in range(1, 50):
+            hub.publish("stats", {"n": i})
+
+        frames = _until_idle(stream)
+        assert [_parse(f)[2]["n"] for f in frames] == [49]
+        assert hub.get_stats()["coalesced"] == 48
+        assert hub.get_stats()["written"] == 2
+
+    def test_other_channels_not_coalesced(self, make_hub):
+        hub = make_hub(coalesce={"stats": 5.0})
+        stream = _open(hub, ["errors"])
+        for i in range(3):
+            hub.publish("errors", {"n": i})
+        assert len(_events(stream, 3)) == 3
+
+
+class TestLimits:
+    """Test slow subscribers, pruning and idle subscriber counts."""
+
+    def test_slow_subscriber_disconnected(self, make_hub):
+        hub = make_hub(queue_size=2)
+        stream = _open(hub, ["activity"])
+        for i in range(10):
+            hub.publish("activity", {"n": i})
+
+        deadline = time.time() + 2
+        while hub.get_stats()["dropped_subscribers"] == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        assert hub.get_stats()["dropped_subscribers"] == 1
+        assert list(stream) == []
+        assert hub.subscribers() == []
+
+    def test_log_pruned_to_retention(self, make_hub, db_path):
+        hub = make_hub(retention=10)
+        stream = _open(hub, ["tmux"])
+        for i in range(40):
+            hub.publish("tmux", {"n": i})
+        _events(stream, 40)
+
+        conn = sqlite3.connect(db_path)
+        remaining = conn.execute("SELECT COUNT(*) FROM broadcast_events").fetchone()[0]
+        conn.close()
+        assert remaining <= 20
+
+    def test_close_ends_streams(self, make_hub):
+        hub = make_hub()
+        stream = _open(hub, ["stats"], heartbeat=5)
+        hub.close()
+        assert list(stream) == []
+
+    @pytest.mark.performance
+    def test_many_idle_subscribers(self, make_hub):
+        hub = make_hub()
+        hub.start()
+        received = []
+
+        async def subscriber():
+            async for frame in hub.stream(["stats"], heartbeat=60):
+                if _parse(frame)[1] == "stats":
+                    received.append(frame)
+                    return
+
+        for _ in range(2000):
+            asyncio.run_coroutine_threadsafe(subscriber(), hub._loop)
+        deadline = time.time() + 5
+        while len(hub.subscribers()) < 2000 and time.time() < deadline:
+            time.sleep(0.01)
+
+        started = time.perf_counter()
+        hub.publish("stats", {"bugs": 1})
+        while len(received) < 2000 and time.time() < deadline:
+            time.sleep(0.005)
+        elapsed = time.perf_counter() - started
+
+        assert len(received) == 2000
+        assert len({id(frame) for frame in received}) == 1
+        assert elapsed < 1.0
+
+
+class TestWSGIStreams:
+    """Test iter_stream() readers and their cleanup."""
+
+    def test_disconnect_ends_subscription(self, make_hub):
+        hub = make_hub()
+        stream = _open(hub, ["stats"], heartbeat=5)
+        assert len(hub.subscribers()) == 1
+        stream.close()
+
+        deadline = time.time() + 2
+        while hub.subscribers() and time.time() < deadline:
+            time.sleep(0.01)
+        assert hub.subscribers() == []
+
+    def test_eventlet_readers_do_not_block_the_hub(self, make_hub):
+        eventlet = pytest.importorskip("eventlet")
+        hub = make_hub()
+        hub.publish("errors", {})  # Start the loop and its database thread
+        deadline = time.time() + 2
+        while hub.get_stats()["written"] == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        threads = threading.active_count()
+        received = []
+
+        def reader():
+            stream = hub.iter_stream(["stats"], heartbeat=60)
+            for frame in stream:
+                if _parse(frame)[1] == "stats":
+                    received.append(frame)
+                    stream.close()
+                    return
+
+        with eventlet.Timeout(5):
+            readers = [eventlet.spawn(reader) for _ in range(50)]
+            while len(hub.subscribers()) < 50:
+                eventlet.sleep(0.01)
+
+            # Other greenthreads run while every reader waits for a frame
+            ticks = eventlet.spawn(lambda: [eventlet.sleep(0.01) for _ in range(10)])
+            ticks.wait()
+
+            hub.publish("stats", {"bugs": 1})
+            for greenthread in readers:
+                greenthread.wait()
+            while hub.subscribers():
+                eventlet.sleep(0.01)
+
+        assert len(received) == 50
+        assert len({id(frame) for frame in received}) == 1
+        assert threading.active_count() == threads
+
+
+def test_sse_frame_multiline():
+    assert sse_frame("note", "a\nb", 7) == b"id: 7\nevent: note\ndata: a\ndata: b\n\n"
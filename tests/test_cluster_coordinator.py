@@ -0,0 +1,225 @@
+"""
+Tests for the Cluster Coordinator Health Checks
+
+Tests:
+- Concurrent probing: a round takes as long as the slowest node
+- Heartbeats are not blocked while probes are in flight
+- Adaptive probe timeouts and keep-alive connection reuse
+- Phi accrual failure detection and node-down callbacks
+- One database transaction per health round
+"""
+
+import json
+
+# Add parent directory to path for imports
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from distributed.cluster_coordinator import (  # noqa: E402
+    AdaptiveTimeout,
+    ClusterConfig,
+    ClusterCoordinator,
+    NodeRole,
+    PhiAccrualDetector,
+)
+
+
+class _HealthServer:
+    """Local /health endpoint with a configurable delay."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.connections = set()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.connections.add(self.client_address)
+                time.sleep(server.delay)
+                body = json.dumps({"cpu_usage": 12.5, "memory_usage": 40.0}).encode()
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except OSError:
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    @property
+    def api_url(self):
+        return f"http://127.0.0.1:{self.port}/architecture/api"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def servers():
+    started = []
+
+    def start(delay=0.0):
+        server = _HealthServer(delay)
+        started.append(server)
+        return server
+
+    yield start
+    for server in started:
+        server.close()
+
+
+@pytest.fixture
+def coordinator(tmp_path):
+    coord = ClusterCoordinator(
+        node_id="primary",
+        role=NodeRole.PRIMARY,
+        db_path=tmp_path / "cluster.db",
+        config=ClusterConfig(min_probe_timeout=0.2, probe_timeout=2.0),
+    )
+    yield coord
+    coord.stop()
+
+
+def _add(coordinator, node_id, api_url):
+    node = coordinator.add_node(node_id, NodeRole.WORKER, "127.0.0.1", 0)
+    node.api_url = api_url
+    return node
+
+
+class TestConcurrentProbing:
+    """Test health rounds against local HTTP servers."""
+
+    def test_round_takes_slowest_probe(self, coordinator, servers):
+        for i in range(4):
+            _add(coordinator, f"node{i}", servers(delay=0.4).api_url)
+
+        started = time.monotonic()
+        coordinator._check_all_nodes()
+        assert time.monotonic() - started < 1.2
+
+        for i in range(4):
+            node = coordinator.nodes[f"node{i}"]
+            assert node.is_reachable and node.is_healthy
+            assert node.cpu_usage == 12.5
+
+    def test_heartbeats_not_blocked_by_probes(self, coordinator, servers):
+        _add(coordinator, "slow", servers(delay=1.0).api_url)
+        _add(coordinator, "worker", servers().api_url)
+        probe = threading.Thread(target=coordinator._check_all_nodes)
+        probe.start()
+        time.sleep(0.2)
+
+        started = time.monotonic()
+        coordinator.receive_heartbeat({"node_id": "worker", "cpu_usage": 3.0})
+        assert time.monotonic() - started < 0.3
+        probe.join()
+        assert coordinator.nodes["slow"].is_reachable
+
+    def test_timeout_adapts_to_rtt(self, coordinator, servers):
+        server = servers()
+        _add(coordinator, "node", server.api_url)
+        for _ in range(3):
+            coordinator._check_all_nodes()
+        assert coordinator._timeouts["node"].timeout == pytest.approx(0.2)
+        # Keep-alive: every round reused one connection
+        assert len(server.connections) == 1
+
+        server.delay = 1.5
+        started = time.monotonic()
+        coordinator._check_all_nodes()
+        assert time.monotonic() - started < 0.8
+        assert not coordinator.nodes["node"].is_reachable
+        assert coordinator._timeouts["node"].timeout == pytest.approx(0.4)
+
+    def test_unreachable_node_goes_down(self, coordinator, servers):
+        server = servers()
+        _add(coordinator, "node", server.api_url)
+        down = []
+        coordinator.on_node_down(down.append)
+        coordinator._check_all_nodes()
+        assert coordinator.nodes["node"].is_healthy
+
+        # Point the node at a port nobody listens on
+        dead = _HealthServer()
+        dead.close()
+        coordinator.nodes["node"].api_url = dead.api_url
+        # Last heartbeat long enough ago that phi crosses the threshold
+        detector = coordinator._detectors["node"]
+        detector.last_arrival -= 60
+        coordinator._check_all_nodes()
+        assert not coordinator.nodes["node"].is_reachable
+        assert not coordinator.nodes["node"].is_healthy
+        assert down == ["node"]
+        assert coordinator.get_failure_detector_stats()["node"]["phi"] > 8
+
+    def test_one_transaction_per_round(self, coordinator, servers, monkeypatch):
+        for i in range(5):
+            _add(coordinator, f"node{i}", servers().api_url)
+        calls = []
+        original = coordinator._get_db_connection
+        monkeypatch.setattr(
+            coordinator, "_get_db_connection", lambda: calls.append(1) or original()
+        )
+        coordinator._check_all_nodes()
+        assert len(calls) == 1
+
+        coordinator._load_nodes()
+        assert all(coordinator.nodes[f"node{i}"].is_healthy for i in range(5))
+
+
+class TestFailureDetection:
+    """Test the phi accrual detector and adaptive timeouts."""
+
+    def test_phi_grows_with_silence(self):
+        detector = PhiAccrualDetector(expected_interval=1.0, min_std=0.1)
+        assert detector.phi(0) == float("inf")
+        for t in range(20):
+            detector.heartbeat(float(t))
+
+        assert detector.phi(19.5) < 1
+        assert detector.phi(20.5) < detector.phi(21.5)
+        assert detector.phi(25) > 8
+
+    def test_irregular_heartbeats_tolerate_longer_gaps(self):
+        steady = PhiAccrualDetector(expected_interval=1.0, min_std=0.1)
+        jittery = PhiAccrualDetector(expected_interval=1.0, min_std=0.1)
+        t_steady = t_jittery = 0.0
+        for i in range(40):
+            t_steady += 1.0
+            t_jittery += 0.4 if i % 2 else 1.6
+            steady.heartbeat(t_steady)
+            jittery.heartbeat(t_jittery)
+        assert jittery.phi(t_jittery + 2.0) < steady.phi(t_steady + 2.0)
+
+    def test_adaptive_timeout(self):
+        timeout = AdaptiveTimeout(minimum=0.1, maximum=5.0)
+        assert timeout.timeout == 5.0
+        for _ in range(10):
+            timeout.observe(0.2)
+        assert 0.2 < timeout.timeout < 0.5
+        base = timeout.timeout
+        timeout.timed_out()
+        assert timeout.timeout == pytest.approx(base * 2)
+        for _ in range(10):
+            timeout.timed_out()
+        assert timeout.timeout == 5.0
+        timeout.observe(0.2)
+        assert timeout.timeout < 0.5
@@ -7,6 +7,7 @@ Verifies:
 - ServiceConnectionPool helper
 - Background health checker
 - Pool metrics and monitoring
+- Acquire-wait/hold histograms, leak reports and adaptive sizing
 - Thread safety
 """
 
@@ -26,12 +27,14 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from db import (
     POOL_CONFIG,
     ConnectionPool,
+    LatencyHistogram,
     PooledConnection,
     PoolHealthChecker,
     PoolMetrics,
     ServiceConnectionPool,
     close_pooled_connection,
     create_pooled_connection,
+    format_pool_prometheus,
     get_connection,
     get_health_check_results,
     get_pool,
@@ -39,6 +42,7 @@ from db import (
     get_pool_stats,
     get_pool_summary,
     initialize_pools,
+    set_pool_caller,
     start_health_checker,
     stop_health_checker,
     warmup_pools,
@@ -429,6 +433,147 @@ class TestCreatePooledConnection(unittest.TestCase):
         # Should work without errors
 
 
+class TestLatencyHistogram(unittest.TestCase):
+    """Test LatencyHistogram percentiles."""
+
+    def test_percentiles(self):
+        """Percentiles are interpolated within the matching bucket."""
+        hist = LatencyHistogram()
+        for _ in range(90):
+            hist.observe(0.002)
+        for _ in range(10):
+            hist.observe(0.4)
+
+        summary = hist.summary()
+        self.assertEqual(summary["count"], 100)
+        self.assertTrue(1.0 <= summary["p50_ms"] <= 2.5)
+        self.assertTrue(250 <= summary["p95_ms"] <= 400)
+        self.assertLessEqual(summary["p99_ms"], summary["max_ms"])
+        self.assertEqual(hist.cumulative_counts()[-1], (float("inf"), 100))
+
+    def test_empty(self):
+        """An empty histogram reports zeros."""
+        self.assertEqual(LatencyHistogram().summary()["p99_ms"], 0.0)
+
+
+class TestPoolInstrumentation(unittest.TestCase):
+    """Test acquire-wait/hold tracking, leaks and adaptive sizing."""
+
+    def setUp(self):
+        """Set up test database."""
+        self.temp_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        self.db_path = Path(self.temp_file.name)
+        self.temp_file.close()
+        self.saved_config = POOL_CONFIG.copy()
+
+    def tearDown(self):
+        """Clean up."""
+        POOL_CONFIG.update(self.saved_config)
+        set_pool_caller(None)
+        try:
+            os.unlink(self.db_path)
+        except OSError:
+            pass
+
+    def test_hold_time_tagged_by_caller(self):
+        """Wait and hold histograms are kept per caller tag."""
+        pool = ConnectionPool(self.db_path, min_connections=1, max_connections=3)
+        try:
+            set_pool_caller("GET /api/projects")
+            with pool.get_connection():
+                time.sleep(0.05)
+            set_pool_caller("assigner_worker")
+            with pool.get_connection():
+                pass
+
+            info = pool.get_instrumentation()
+            projects = info["callers"]["GET /api/projects"]
+            self.assertEqual(projects["hold"]["count"], 1)
+            self.assertGreaterEqual(projects["hold"]["p50_ms"], 25)
+            self.assertEqual(info["callers"]["assigner_worker"]["acquire_wait"]["count"], 1)
+            self.assertEqual(info["hold"]["count"], 2)
+        finally:
+            pool.close()
+
+    def test_exhaustion_and_timeouts_attributed(self):
+        """Callers that had to wait or timed out are counted."""
+        pool = ConnectionPool(
+            self.db_path, min_connections=1, max_connections=1, max_overflow=1, pool_timeout=0.2
+        )
+        try:
+            set_pool_caller("holder")
+            first = pool.acquire()
+            set_pool_caller("GET /api/report")
+            overflow = pool.acquire()
+            with self.assertRaises(TimeoutError):
+                pool.acquire()
+            pool.release(overflow)
+            pool.release(first)
+
+            report = pool.get_instrumentation()["callers"]["GET /api/report"]
+            self.assertEqual(report["exhausted"], 2)
+            self.assertEqual(report["timeouts"], 1)
+            self.assertGreaterEqual(report["acquire_wait"]["max_ms"], 150)
+        finally:
+            pool.close()
+
+    def test_leak_report_includes_stack(self):
+        """Connections held past the threshold are reported with their stack."""
+        pool = ConnectionPool(self.db_path, min_connections=1, max_connections=2)
+        try:
+            set_pool_caller("leaky_worker")
+            pooled = pool.acquire()
+            time.sleep(0.05)
+
+            self.assertEqual(pool.find_leaks(threshold=10), [])
+            leaks = pool.find_leaks(threshold=0.01)
+            self.assertEqual(len(leaks), 1)
+            self.assertEqual(leaks[0]["caller"], "leaky_worker")
+            self.assertIn("test_leak_report_includes_stack", "".join(leaks[0]["stack"]))
+
+            pool.release(pooled)
+            self.assertEqual(pool.find_leaks(threshold=0.01), [])
+        finally:
+            pool.close()
+
+    def test_adaptive_grows_on_wait_and_shrinks_when_idle(self):
+        """adapt() grows the pool while waits are high and shrinks it back."""
+        POOL_CONFIG.update({"adaptive_target_wait_ms": 5.0, "adaptive_max_connections": 6})
+        pool = ConnectionPool(
+            self.db_path, min_connections=1, max_connections=2, max_overflow=1, pool_timeout=5
+        )
+        try:
+            held = [pool.acquire() for _ in range(3)]
+            threading.Timer(0.1, pool.release, args=(held.pop(),)).start()
+            held.append(pool.acquire())  # waits ~100ms
+            for pooled in held:
+                pool.release(pooled)
+
+            record = pool.adapt()
+            self.assertEqual((record["from"], record["to"]), (2, 3))
+            self.assertEqual(pool.get_stats()["max_connections"], 3)
+
+            # Fast, low-concurrency traffic shrinks back to the configured size
+            with pool.get_connection():
+                pass
+            self.assertEqual(pool.adapt()["to"], 2)
+            with pool.get_connection():
+                pass
+            self.assertIsNone(pool.adapt())
+        finally:
+            pool.close()
+
+    def test_prometheus_histograms(self):
+        """Pool histograms are exported in Prometheus format."""
+        with get_connection("main"):
+            pass
+        lines = format_pool_prometheus()
+        text = "\n".join(lines)
+        self.assertIn("# TYPE architect_db_pool_acquire_wait_seconds histogram", text)
+        self.assertIn('architect_db_pool_hold_seconds_bucket{pool="main"', text)
+        self.assertIn('le="+Inf"', text)
+
+
 class TestHealthCheckerGlobal(unittest.TestCase):
     """Test global health checker functions."""
 
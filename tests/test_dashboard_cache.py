@@ -0,0 +1,176 @@
+"""
+Tests for the Dashboard Cache Manager
+
+Tests:
+- TTL and version checks for the in-memory backend
+- Shared SQLite backend visible across managers (worker processes)
+- Version bumps from writes to source tables
+- Single-flight recomputation
+"""
+
+import os
+import sqlite3
+
+# Add parent directory to path for imports
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dashboard_cache import (  # noqa: E402
+    DashboardCacheManager,
+    SQLiteCacheBackend,
+    ensure_dashboard_cache_schema,
+)
+
+
+@pytest.fixture
+def db_path():
+    """Create a temporary database with the tables the triggers watch."""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE bugs (id INTEGER PRIMARY KEY, title TEXT, status TEXT DEFAULT 'open');
+        CREATE TABLE task_queue (
+            id INTEGER PRIMARY KEY, task_type TEXT, status TEXT DEFAULT 'pending',
+            assigned_worker TEXT
+        );
+        PRAGMA journal_mode=WAL;
+    """
+    )
+    ensure_dashboard_cache_schema(conn)
+    conn.commit()
+    conn.close()
+    yield path
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+
+def _shared_manager(path):
+    return DashboardCacheManager(backend=SQLiteCacheBackend(path))
+
+
+class TestMemoryBackend:
+    """Test the default per-process cache."""
+
+    def test_set_get_and_invalidate(self):
+        cache = DashboardCacheManager()
+        cache.set_cache("stats", {"projects": 3})
+        assert cache.get_cache("stats")["data"] == {"projects": 3}
+        assert cache.check_etag("stats", cache.get_etag("stats"))
+
+        result = cache.invalidate("stats")
+        assert result["invalidated"] is True
+        assert cache.get_cache("stats") is None
+        assert cache.get_etag("stats") is None
+
+    def test_entry_expires_after_ttl(self, monkeypatch):
+        cache = DashboardCacheManager()
+        cache.set_cache("activity", [1, 2])
+        later = time.time() + 60
+        monkeypatch.setattr(time, "time", lambda: later)
+        assert cache.get_cache("activity") is None
+
+    def test_etag_depends_on_content_and_version(self):
+        cache = DashboardCacheManager()
+        first = cache.set_cache("stats", {"a": 1})["etag"]
+        assert cache.set_cache("stats", {"a": 1})["etag"] == first
+        assert cache.set_cache("stats", {"a": 2})["etag"] != first
+
+
+class TestSharedBackend:
+    """Test the SQLite backend shared between worker processes."""
+
+    def test_entry_and_etag_shared_across_managers(self, db_path):
+        worker_a = _shared_manager(db_path)
+        worker_b = _shared_manager(db_path)
+
+        worker_a.set_cache("stats", {"projects": 3, "bugs": {"open": 1}})
+        entry = worker_b.get_cache("stats")
+        assert entry["data"] == {"projects": 3, "bugs": {"open": 1}}
+        assert worker_b.get_etag("stats") == worker_a.get_etag("stats")
+        assert not worker_b.should_refresh("stats", f'"{worker_a.get_etag("stats")}"')
+
+    def test_invalidate_reaches_other_managers(self, db_path):
+        worker_a = _shared_manager(db_path)
+        worker_b = _shared_manager(db_path)
+        worker_a.set_cache("queue", {"pending": 1})
+
+        worker_b.invalidate("queue")
+        assert worker_a.get_cache("queue") is None
+
+        worker_a.set_cache("bugs", [])
+        worker_b.invalidate_all()
+        assert worker_a.get_cache("bugs") is None
+        assert worker_a.get_status()["version"] == worker_b.get_status()["version"] == 2
+
+    def test_table_writes_bump_versions(self, db_path):
+        cache = _shared_manager(db_path)
+        cache.set_cache("bugs", [])
+        cache.set_cache("queue", {})
+        cache.set_cache("stats", {})
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("INSERT INTO bugs (title) VALUES ('broken')")
+        conn.commit()
+        assert cache.get_cache("bugs") is None
+        assert cache.get_cache("stats") is None
+        assert cache.get_cache("queue") is not None
+
+        cache.set_cache("queue", {})
+        # Only status changes affect the queue component
+        conn.execute("INSERT INTO task_queue (task_type) VALUES ('shell')")
+        conn.commit()
+        cache.set_cache("queue", {})
+        conn.execute("UPDATE task_queue SET assigned_worker = 'w1'")
+        conn.commit()
+        assert cache.get_cache("queue") is not None
+        conn.execute("UPDATE task_queue SET status = 'running'")
+        conn.commit()
+        assert cache.get_cache("queue") is None
+        conn.close()
+
+    def test_write_during_compute_leaves_entry_stale(self, db_path):
+        cache = _shared_manager(db_path)
+
+        def compute():
+            conn = sqlite3.connect(db_path)
+            conn.execute("INSERT INTO bugs (title) VALUES ('racing')")
+            conn.commit()
+            conn.close()
+            return {"bugs": 0}
+
+        cache.get_or_compute("bugs", compute)
+        assert cache.get_cache("bugs") is None
+
+    def test_single_flight_across_managers(self, db_path):
+        managers = [_shared_manager(db_path) for _ in range(2)]
+        calls = []
+        barrier = threading.Barrier(8)
+        results = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"projects": 7}
+
+        def reader(manager):
+            barrier.wait()
+            results.append(manager.get_or_compute("stats", compute)["data"])
+
+        threads = [threading.Thread(target=reader, args=(managers[i % 2],)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert results == [{"projects": 7}] * 8
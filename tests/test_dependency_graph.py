@@ -0,0 +1,324 @@
+"""
+Tests for the In-Memory Task Dependency Graph
+
+Tests:
+- Dependent counts, chain depth and critical path match brute force
+- Incremental refresh from the trigger-fed change log
+- Reload when the change log was pruned past the graph's position
+- Blockers, ancestors, descendants and transitive cycle checks
+- Cycles and deleted tasks
+"""
+
+import random
+import sqlite3
+
+# Add parent directory to path for imports
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.dependency_graph import (  # noqa: E402
+    TaskDependencyGraph,
+    compute_levels,
+    ensure_dependency_graph_schema,
+    find_critical_path,
+)
+
+
+@pytest.fixture
+def conn(tmp_path):
+    """Database with the task queue and dependency schema."""
+    conn = sqlite3.connect(tmp_path / "tasks.db", isolation_level=None)
+    conn.executescript(
+        """
+        CREATE TABLE task_queue (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_type TEXT NOT NULL DEFAULT 'shell',
+            priority INTEGER DEFAULT 0,
+            status TEXT DEFAULT 'pending'
+        );
+        CREATE TABLE task_dependencies (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER NOT NULL,
+            depends_on_id INTEGER NOT NULL,
+            dependency_type TEXT DEFAULT 'blocks',
+            UNIQUE(task_id, depends_on_id)
+        );
+        CREATE INDEX idx_task_deps_task ON task_dependencies(task_id);
+        CREATE INDEX idx_task_deps_depends ON task_dependencies(depends_on_id);
+    """
+    )
+    ensure_dependency_graph_schema(conn)
+    yield conn
+    conn.close()
+
+
+def _tasks(conn, count, status="pending"):
+    conn.executemany("INSERT INTO task_queue (status) VALUES (?)", [(status,)] * count)
+
+
+def _depend(conn, task_id, depends_on_id):
+    conn.execute(
+        "INSERT INTO task_dependencies (task_id, depends_on_id) VALUES (?, ?)",
+        (task_id, depends_on_id),
+    )
+
+
+def _random_dag(conn, nodes=300, edges=900, seed=7):
+    rng = random.Random(seed)
+    pairs = set()
+    while len(pairs) < edges:
+        a, b = sorted(rng.sample(range(1, nodes + 1), 2))
+        pairs.add((b, a))  # later tasks depend on earlier ones
+    with conn:
+        conn.execute("BEGIN")
+        _tasks(conn, nodes)
+        conn.executemany(
+            "INSERT INTO task_dependencies (task_id, depends_on_id) VALUES (?, ?)", sorted(pairs)
+        )
+
+
+def _brute_force(conn):
+    """Dependents, chain depth and pending longest chain straight from SQL."""
+    edges = conn.execute("SELECT depends_on_id, task_id FROM task_dependencies").fetchall()
+    status = dict(conn.execute("SELECT id, status FROM task_queue"))
+    down = {}
+    for src, dst in edges:
+        down.setdefault(src, []).append(dst)
+
+    def dependents(node):
+        seen, queue = set(), deque([node])
+        while queue:
+            for child in down.get(queue.popleft(), ()):
+                if child not in seen:
+                    seen.add(child)
+                    queue.append(child)
+        return seen
+
+    depth, longest = {}, {}
+
+    def chain(node):
+        if node not in depth:
+            depth[node] = max((chain(c) + 1 for c in down.get(node, ())), default=0)
+        return depth[node]
+
+    def pending_chain(node):
+        if node not in longest:
+            longest[node] = 1 + max(
+                (pending_chain(c) for c in down.get(node, ()) if status[c] == "pending"),
+                default=0,
+            )
+        return longest[node]
+
+    metrics = {
+        node: {
+            "direct_dependents": len(down.get(node, ())),
+            "total_dependents": len(dependents(node)),
+            "chain_depth": chain(node),
+        }
+        for node in status
+    }
+    pending = [n for n in status if status[n] == "pending"]
+    path_length = max((pending_chain(n) for n in pending), default=0)
+    return metrics, path_length if path_length > 1 else 0
+
+
+def _assert_matches(graph, conn):
+    expected, path_length = _brute_force(conn)
+    for node, metrics in expected.items():
+        assert graph.node_metrics(node) == metrics, node
+    path = graph.critical_path()
+    assert len(path) == path_length
+    status = dict(conn.execute("SELECT id, status FROM task_queue"))
+    edges = set(conn.execute("SELECT depends_on_id, task_id FROM task_dependencies"))
+    assert all(status[n] == "pending" for n in path)
+    assert all((a, b) in edges for a, b in zip(path, path[1:]))
+
+
+class TestDerivedData:
+    """Test metrics and critical path against brute force."""
+
+    def test_random_dag(self, conn):
+        _random_dag(conn)
+        graph = TaskDependencyGraph()
+        assert graph.refresh(conn) == -1
+        _assert_matches(graph, conn)
+
+    def test_critical_path_is_pending_only(self, conn):
+        _tasks(conn, 5)
+        for task_id in range(2, 6):
+            _depend(conn, task_id, task_id - 1)
+        graph = TaskDependencyGraph()
+        graph.refresh(conn)
+        assert graph.critical_path() == [1, 2, 3, 4, 5]
+
+        conn.execute("UPDATE task_queue SET status = 'completed' WHERE id = 1")
+        conn.execute("UPDATE task_queue SET status = 'running' WHERE id = 4")
+        assert graph.refresh(conn) == 2
+        assert graph.critical_path() == [2, 3]
+        # Status changes do not touch the dependent metrics
+        assert graph.stats["metric_builds"] == 0
+        assert graph.node_metrics(1)["total_dependents"] == 4
+
+    def test_cycles_terminate(self, conn):
+        _tasks(conn, 4)
+        for task_id, depends_on_id in ((2, 1), (3, 2), (1, 3), (4, 3)):
+            _depend(conn, task_id, depends_on_id)
+        graph = TaskDependencyGraph()
+        graph.refresh(conn)
+        assert graph.node_metrics(1)["total_dependents"] == 3
+        assert graph.node_metrics(4) == {
+            "direct_dependents": 0,
+            "total_dependents": 0,
+            "chain_depth": 0,
+        }
+        assert graph.critical_path() == []
+
+
+class TestIncrementalRefresh:
+    """Test applying the change log."""
+
+    def test_changes_match_fresh_load(self, conn):
+        _random_dag(conn, nodes=200, edges=500)
+        graph = TaskDependencyGraph()
+        graph.refresh(conn)
+        _assert_matches(graph, conn)
+
+        rng = random.Random(3)
+        for _ in range(3):
+            conn.execute(
+                "DELETE FROM task_dependencies WHERE id IN "
+                "(SELECT id FROM task_dependencies ORDER BY RANDOM() LIMIT 40)"
+            )
+            for _ in range(40):
+                a, b = sorted(rng.sample(range(1, 201), 2))
+                conn.execute(
+                    "INSERT OR IGNORE INTO task_dependencies (task_id, depends_on_id) "
+                    "VALUES (?, ?)",
+                    (b, a),
+                )
+            conn.execute(
+                "UPDATE task_queue SET status = 'completed' WHERE id IN "
+                "(SELECT id FROM task_queue ORDER BY RANDOM() LIMIT 20)"
+            )
+            assert graph.refresh(conn) > 0
+            _assert_matches(graph, conn)
+        assert graph.stats["reloads"] == 1
+
+        # No changes: nothing applied, nothing rebuilt
+        builds = graph.stats["metric_builds"]
+        assert graph.refresh(conn) == 0
+        graph.node_metrics(1)
+        assert graph.stats["metric_builds"] == builds
+
+    def test_status_of_unrelated_tasks_not_logged(self, conn):
+        _tasks(conn, 3)
+        _depend(conn, 2, 1)
+        conn.execute("UPDATE task_queue SET status = 'running' WHERE id = 3")
+        conn.execute("UPDATE task_queue SET status = 'running' WHERE id = 1")
+        ops = [
+            row[0] for row in conn.execute("SELECT op FROM task_dependency_changes ORDER BY seq")
+        ]
+        assert ops == ["add", "status"]
+
+    def test_deleted_task_drops_edges(self, conn):
+        _tasks(conn, 3)
+        _depend(conn, 2, 1)
+        _depend(conn, 3, 2)
+        graph = TaskDependencyGraph()
+        graph.refresh(conn)
+
+        conn.execute("DELETE FROM task_queue WHERE id = 2")
+        graph.refresh(conn)
+        assert graph.edges() == []
+        assert graph.get_stats()["nodes"] == 0
+        # A fresh load agrees: dangling rows are ignored
+        fresh = TaskDependencyGraph()
+        fresh.refresh(conn)
+        assert fresh.edges() == []
+
+    def test_reload_after_prune(self, conn):
+        _tasks(conn, 3)
+        graph = TaskDependencyGraph()
+        graph.refresh(conn)
+        _depend(conn, 2, 1)
+        _depend(conn, 3, 2)
+        conn.execute("DELETE FROM task_dependency_changes WHERE seq = 1")
+
+        assert graph.refresh(conn) == -1
+        assert graph.stats["reloads"] == 2
+        assert graph.descendants(1) == {2: 1, 3: 2}
+
+    def test_refresh_opens_own_connection(self, conn, tmp_path):
+        _tasks(conn, 2)
+        _depend(conn, 2, 1)
+        graph = TaskDependencyGraph(tmp_path / "tasks.db")
+        graph.refresh()
+        assert graph.blockers(2) == [1]
+
+
+class TestQueries:
+    """Test lookups served from memory."""
+
+    @pytest.fixture
+    def graph(self, conn):
+        # 1 -> 2 -> 4, 1 -> 3 -> 4 -> 5 (arrows point at dependents)
+        _tasks(conn, 5)
+        for task_id, depends_on_id in ((2, 1), (3, 1), (4, 2), (4, 3), (5, 4)):
+            _depend(conn, task_id, depends_on_id)
+        conn.execute("UPDATE task_queue SET status = 'completed' WHERE id = 2")
+        graph = TaskDependencyGraph()
+        graph.refresh(conn)
+        return graph
+
+    def test_blockers(self, graph):
+        assert graph.blockers(4) == [3]
+        assert graph.blockers(1) == []
+
+    def test_ancestors_and_descendants(self, graph):
+        assert graph.ancestors(5) == {4: 1, 2: 2, 3: 2, 1: 3}
+        assert graph.ancestors(5, max_depth=1) == {4: 1}
+        assert graph.descendants(1) == {2: 1, 3: 1, 4: 2, 5: 3}
+
+    def test_transitive_cycle_check(self, graph):
+        assert graph.would_create_cycle(1, 5)
+        assert graph.would_create_cycle(3, 3)
+        assert not graph.would_create_cycle(5, 1)
+
+    def test_edges_filter(self, graph):
+        assert {(e["task_id"], e["depends_on_id"]) for e in graph.edges([5])} == {(5, 4)}
+        assert len(graph.edges()) == 5
+
+
+def test_stateless_helpers_use_linear_queues():
+    chain = [{"id": i} for i in range(20000)]
+    deps = [{"task_id": i, "depends_on_id": i - 1} for i in range(1, 20000)]
+    started = time.perf_counter()
+    levels = compute_levels(chain, deps, [0])
+    path, length, end = find_critical_path({t["id"]: t for t in chain}, deps)
+    assert time.perf_counter() - started < 2.0
+    assert levels[19999] == 19999
+    assert (length, end) == (20000, 19999)
+
+
+@pytest.mark.performance
+def test_graph_endpoint_workload(conn):
+    """2,000 tasks: one refresh plus per-node metrics stays in milliseconds."""
+    _random_dag(conn, nodes=2000, edges=6000)
+    graph = TaskDependencyGraph()
+    graph.refresh(conn)
+
+    conn.execute("UPDATE task_queue SET status = 'completed' WHERE id = 10")
+    started = time.perf_counter()
+    graph.refresh(conn)
+    nodes = [graph.node_metrics(task_id) for task_id in range(1, 2001)]
+    graph.critical_path()
+    elapsed = time.perf_counter() - started
+
+    assert len(nodes) == 2000
+    assert elapsed < 1.0
@@ -0,0 +1,198 @@
+"""
+Tests for Entity Counters
+
+Tests:
+- Triggers keep per-status counts and occurrence sums exact
+- Seeding and self-healing of missing triggers
+- Migration 061 upgrade and downgrade
+- Consistency checker, repair and command exit codes
+"""
+
+import importlib.util
+import random
+import sqlite3
+
+# Add parent directory to path for imports
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.entity_counters import (  # noqa: E402
+    check_counters,
+    count_entities,
+    ensure_counter_schema,
+    main,
+    read_counters,
+    status_count,
+    status_counts,
+    total,
+)
+
+SCHEMA = """
+    CREATE TABLE projects (id INTEGER PRIMARY KEY, name TEXT, status TEXT DEFAULT 'active');
+    CREATE TABLE bugs (id INTEGER PRIMARY KEY, title TEXT, status TEXT DEFAULT 'open');
+    CREATE TABLE errors (
+        id INTEGER PRIMARY KEY, message TEXT, status TEXT DEFAULT 'open',
+        occurrence_count INTEGER DEFAULT 1
+    );
+    CREATE TABLE tmux_sessions (id INTEGER PRIMARY KEY, session_name TEXT);
+"""
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "main.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def conn(db_path):
+    conn = sqlite3.connect(db_path)
+    ensure_counter_schema(conn)
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def _load_migration():
+    path = Path(__file__).parent.parent / "migrations" / "061_entity_counters.py"
+    spec = importlib.util.spec_from_file_location("migration_061", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestTriggers:
+    """Test that writes keep the counters exact."""
+
+    def test_insert_update_delete(self, conn):
+        conn.executemany(
+            "INSERT INTO bugs (title, status) VALUES (?, ?)",
+            [("a", "open"), ("b", "open"), ("c", "resolved"), ("d", None)],
+        )
+        conn.execute("UPDATE bugs SET status = 'resolved' WHERE title = 'a'")
+        conn.execute("UPDATE bugs SET title = 'renamed' WHERE title = 'b'")
+        conn.execute("DELETE FROM bugs WHERE title = 'c'")
+
+        counters = read_counters(conn)
+        assert status_counts(counters, "bugs") == {"open": 1, "resolved": 1, "": 1}
+        assert total(counters, "bugs") == 3
+        assert status_count(counters, "bugs", "closed") == 0
+
+    def test_error_occurrences(self, conn):
+        conn.execute("INSERT INTO errors (message, occurrence_count) VALUES ('timeout', 3)")
+        conn.execute("INSERT INTO errors (message) VALUES ('refused')")
+        conn.execute(
+            "UPDATE errors SET occurrence_count = occurrence_count + 5 WHERE message = 'timeout'"
+        )
+        assert read_counters(conn)["errors"] == {"open": {"count": 2, "occurrences": 9}}
+
+        conn.execute("UPDATE errors SET status = 'resolved' WHERE message = 'timeout'")
+        assert read_counters(conn)["errors"] == {
+            "open": {"count": 1, "occurrences": 1},
+            "resolved": {"count": 1, "occurrences": 8},
+        }
+
+    def test_table_without_status(self, conn):
+        conn.executemany("INSERT INTO tmux_sessions (session_name) VALUES (?)", [("a",), ("b",)])
+        conn.execute("DELETE FROM tmux_sessions WHERE session_name = 'a'")
+        assert total(read_counters(conn), "tmux_sessions") == 1
+
+    def test_random_writes_match_recount(self, conn):
+        rng = random.Random(11)
+        statuses = ["open", "in_progress", "resolved", None]
+        for i in range(500):
+            action = rng.random()
+            if action < 0.5:
+                conn.execute(
+                    "INSERT INTO errors (message, status, occurrence_count) VALUES (?, ?, ?)",
+                    (f"e{i}", rng.choice(statuses), rng.choice([None, 1, 4])),
+                )
+            elif action < 0.8:
+                conn.execute(
+                    "UPDATE errors SET status = ?, occurrence_count = occurrence_count + 1 "
+                    "WHERE id = (SELECT id FROM errors ORDER BY RANDOM() LIMIT 1)",
+                    (rng.choice(statuses),),
+                )
+            else:
+                conn.execute(
+                    "DELETE FROM errors "
+                    "WHERE id = (SELECT id FROM errors ORDER BY RANDOM() LIMIT 1)"
+                )
+        conn.execute("DELETE FROM errors WHERE status = 'open'")
+        assert check_counters(conn) == []
+
+
+class TestSeeding:
+    """Test seeding, self-healing and the migration."""
+
+    def test_existing_rows_seeded(self, db_path):
+        conn = sqlite3.connect(db_path)
+        conn.executemany("INSERT INTO projects (name) VALUES (?)", [("a",), ("b",)])
+        assert ensure_counter_schema(conn) == ["projects", "bugs", "errors", "tmux_sessions"]
+        assert status_count(read_counters(conn), "projects", "active") == 2
+        # Second startup: nothing to do
+        assert ensure_counter_schema(conn) == []
+        conn.close()
+
+    def test_missing_trigger_is_recreated(self, conn):
+        conn.execute("DROP TRIGGER trg_bugs_insert_counters")
+        conn.execute("INSERT INTO bugs (title) VALUES ('unseen')")
+        assert check_counters(conn) != []
+
+        assert ensure_counter_schema(conn) == ["bugs"]
+        assert check_counters(conn) == []
+        conn.execute("INSERT INTO bugs (title) VALUES ('seen')")
+        assert status_count(read_counters(conn), "bugs", "open") == 2
+
+    def test_migration(self, db_path):
+        migration = _load_migration()
+        conn = sqlite3.connect(db_path)
+        conn.executemany("INSERT INTO bugs (title, status) VALUES (?, ?)", [("a", "open")] * 3)
+
+        migration.upgrade(conn)
+        assert status_count(read_counters(conn), "bugs", "open") == 3
+
+        migration.downgrade(conn)
+        triggers = conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'"
+        ).fetchone()[0]
+        assert triggers == 0
+        # Without the table, reads fall back to a full recount
+        assert read_counters(conn) == count_entities(conn)
+        conn.close()
+
+
+class TestChecker:
+    """Test the consistency checker."""
+
+    def test_detects_and_repairs_drift(self, conn):
+        conn.executemany("INSERT INTO bugs (title) VALUES (?)", [("a",), ("b",)])
+        conn.execute("UPDATE entity_counters SET count = 7 WHERE entity = 'bugs'")
+        conn.execute(
+            "INSERT INTO entity_counters (entity, status, count) VALUES ('bugs', 'ghost', 1)"
+        )
+
+        mismatches = check_counters(conn)
+        assert sorted(m["status"] for m in mismatches) == ["ghost", "open"]
+        assert check_counters(conn, repair=True)
+        assert check_counters(conn) == []
+        assert status_counts(read_counters(conn), "bugs") == {"open": 2}
+
+    def test_command(self, conn, db_path, capsys):
+        conn.execute("INSERT INTO projects (name) VALUES ('a')")
+        conn.commit()
+        assert main(["--db", str(db_path)]) == 0
+
+        conn.execute("DELETE FROM entity_counters WHERE entity = 'projects'")
+        conn.commit()
+        assert main(["--db", str(db_path)]) == 1
+        assert "projects[active]: expected 1" in capsys.readouterr().out
+        assert main(["--db", str(db_path), "--repair"]) == 0
+        assert main(["--db", str(db_path)]) == 0
@@ -0,0 +1,346 @@
+"""
+Tests for Error Ingest
+
+Tests:
+- error_hash column, backfill and unique index over active errors
+- Window aggregation into one upsert per distinct error
+- Futures, on_new / on_flush hooks and retry after a locked database
+- Node agent error buffer coalescing and batch uploads
+- Ingest throughput
+"""
+
+import importlib.util
+import json
+import sqlite3
+
+# Add parent directory to path for imports
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.error_ingest import (  # noqa: E402
+    ERROR_HASH_INDEX,
+    ErrorAggregator,
+    ensure_error_hash_schema,
+    error_hash,
+)
+
+SCHEMA = """
+    CREATE TABLE errors (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        project_id INTEGER,
+        node_id TEXT,
+        error_type TEXT NOT NULL,
+        message TEXT,
+        source TEXT,
+        line INTEGER,
+        column_num INTEGER,
+        stack_trace TEXT,
+        url TEXT,
+        user_agent TEXT,
+        http_status INTEGER,
+        context TEXT,
+        status TEXT DEFAULT 'open',
+        occurrence_count INTEGER DEFAULT 1,
+        first_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE task_queue (id INTEGER PRIMARY KEY, task_type TEXT, task_data TEXT);
+"""
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "main.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    ensure_error_hash_schema(conn)
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def make_aggregator(db_path):
+    aggregators = []
+
+    def make(**kwargs):
+        kwargs.setdefault("flush_interval", 0.05)
+        aggregator = ErrorAggregator(db_path, **kwargs)
+        aggregators.append(aggregator)
+        return aggregator
+
+    yield make
+    for aggregator in aggregators:
+        aggregator.close()
+
+
+def _rows(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    rows = [dict(r) for r in conn.execute("SELECT * FROM errors ORDER BY id")]
+    conn.close()
+    return rows
+
+
+class TestSchema:
+    """Test the error_hash column and index."""
+
+    def test_backfill_keeps_newest_duplicate(self, tmp_path):
+        conn = sqlite3.connect(tmp_path / "old.db")
+        conn.executescript(SCHEMA)
+        conn.executemany(
+            "INSERT INTO errors (error_type, message, source, status) VALUES (?, ?, ?, ?)",
+            [
+                ("error", "boom", "a.py", "open"),
+                ("error", "boom", "a.py", "queued"),
+                ("error", "other", "b.py", "resolved"),
+            ],
+        )
+        assert ensure_error_hash_schema(conn) == 1
+        hashes = dict(conn.execute("SELECT id, error_hash FROM errors"))
+        assert hashes == {1: None, 2: error_hash("error", "boom", "a.py"), 3: None}
+        assert ensure_error_hash_schema(conn) == 0
+        conn.close()
+
+    def test_unique_only_among_active(self, db_path):
+        conn = sqlite3.connect(db_path)
+        digest = error_hash("error", "boom", None)
+        insert = (
+            "INSERT INTO errors (error_type, message, status, error_hash)"
+            " VALUES ('error', 'boom', ?, ?)"
+        )
+        conn.execute(insert, ("resolved", digest))
+        conn.execute(insert, ("open", digest))
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute(insert, ("in_progress", digest))
+        index = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name = ?", (ERROR_HASH_INDEX,)
+        ).fetchone()
+        assert index is not None
+        conn.close()
+
+    def test_missing_table_skipped(self, tmp_path):
+        conn = sqlite3.connect(tmp_path / "empty.db")
+        assert ensure_error_hash_schema(conn) == 0
+        conn.close()
+
+
+class TestAggregation:
+    """Test window aggregation and flushing."""
+
+    def test_one_row_per_distinct_error(self, make_aggregator, db_path):
+        aggregator = make_aggregator()
+        for _ in range(100):
+            assert aggregator.add({"error_type": "error", "message": "boom", "source": "a.py"})
+        aggregator.add({"error_type": "error", "message": "other", "occurrences": 5})
+        assert aggregator.flush()
+
+        rows = _rows(db_path)
+        assert [(r["message"], r["occurrence_count"], r["status"]) for r in rows] == [
+            ("boom", 100, "queued"),
+            ("other", 5, "queued"),
+        ]
+        assert aggregator.get_stats()["rows_written"] == 2
+
+    def test_later_windows_merge_into_active_row(self, make_aggregator, db_path):
+        aggregator = make_aggregator()
+        report = {"error_type": "error", "message": "boom", "context": "first"}
+        aggregator.add(report)
+        aggregator.flush()
+        aggregator.add({**report, "context": "second"})
+        aggregator.add(report)
+        aggregator.flush()
+
+        (row,) = _rows(db_path)
+        assert row["occurrence_count"] == 3
+        assert row["context"] == "first"
+
+    def test_resolved_error_gets_fresh_row(self, make_aggregator, db_path):
+        aggregator = make_aggregator()
+        report = {"error_type": "error", "message": "boom"}
+        first = aggregator.submit(report).result(timeout=2)
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE errors SET status = 'resolved' WHERE id = ?", (first["id"],))
+        conn.commit()
+        conn.close()
+
+        second = aggregator.submit(report).result(timeout=2)
+        assert second["id"] != first["id"]
+        assert not second["deduplicated"]
+
+    def test_submit_resolves_with_id(self, make_aggregator):
+        aggregator = make_aggregator(flush_interval=60)
+        first = aggregator.submit({"error_type": "error", "message": "boom"})
+        second = aggregator.submit({"error_type": "error", "message": "boom"})
+        aggregator.flush()
+        assert first.result(timeout=2) == second.result(timeout=2)
+        assert first.result()["deduplicated"] is False
+        again = aggregator.submit({"error_type": "error", "message": "boom"})
+        aggregator.flush()
+        assert again.result(timeout=2) == {"id": first.result()["id"], "deduplicated": True}
+
+    def test_hooks(self, make_aggregator, db_path):
+        created, flushed = [], []
+
+        def on_new(conn, error_id, report, meta):
+            conn.execute(
+                "INSERT INTO task_queue (task_type, task_data) VALUES ('claude_task', ?)",
+                (meta["url"],),
+            )
+            created.append((error_id, report["message"]))
+
+        aggregator = make_aggregator(flush_interval=60, on_new=on_new, on_flush=flushed.append)
+        aggregator.add({"error_type": "error", "message": "boom"}, meta={"url": "http://x"})
+        aggregator.add({"error_type": "error", "message": "boom"})
+        aggregator.flush()
+        aggregator.add({"error_type": "error", "message": "boom"})
+        aggregator.flush()
+
+        assert created == [(1, "boom")]
+        assert flushed[0] == {"errors": 1, "occurrences": 2, "new": 1}
+        assert flushed[-1] == {"errors": 1, "occurrences": 1, "new": 0}
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT task_data FROM task_queue").fetchall() == [("http://x",)]
+        conn.close()
+
+    def test_locked_database_retried(self, make_aggregator, db_path):
+        aggregator = make_aggregator(flush_interval=60)
+        aggregator.start()
+        aggregator._conn = sqlite3.connect(db_path, timeout=0, check_same_thread=False)
+        locker = sqlite3.connect(db_path, timeout=0)
+        locker.execute("BEGIN EXCLUSIVE")
+        aggregator.add({"error_type": "error", "message": "boom"})
+        aggregator.flush()
+        aggregator.add({"error_type": "error", "message": "boom"})
+        aggregator.flush()
+        assert aggregator.get_stats()["errors"] >= 1
+        assert aggregator.pending() == 1
+
+        locker.rollback()
+        locker.close()
+        aggregator.flush()
+        (row,) = _rows(db_path)
+        assert row["occurrence_count"] == 2
+
+    def test_reports_checked_when_added(self, make_aggregator, db_path):
+        aggregator = make_aggregator(flush_interval=60)
+        with pytest.raises(ValueError, match="context"):
+            aggregator.add({"message": "bad", "context": object()})
+        with pytest.raises(ValueError, match="line"):
+            aggregator.submit({"message": "bad", "line": 2**70})
+        aggregator.add({"message": "boom", "context": {"k": 1}, "source": ["a.py", 3]})
+        aggregator.flush()
+
+        (row,) = _rows(db_path)
+        assert json.loads(row["context"]) == {"k": 1}
+        assert row["source"] == '["a.py", 3]'
+        assert aggregator.pending() == 0
+
+    def test_unretryable_write_fails_batch(self, make_aggregator, db_path):
+        def on_new(conn, error_id, report, meta):
+            if report["message"] == "poison":
+                raise RuntimeError("hook failed")
+
+        aggregator = make_aggregator(flush_interval=60, on_new=on_new)
+        future = aggregator.submit({"message": "poison"})
+        aggregator.flush()
+        with pytest.raises(RuntimeError):
+            future.result(timeout=2)
+        assert aggregator.pending() == 0
+        assert _rows(db_path) == []
+
+        # The flush thread keeps going
+        ok = aggregator.submit({"message": "fine"})
+        aggregator.flush()
+        assert ok.result(timeout=2)["deduplicated"] is False
+
+    def test_window_limit_drops_new_errors(self, make_aggregator):
+        aggregator = make_aggregator(flush_interval=60, max_pending=2)
+        assert aggregator.add({"message": "a"})
+        assert aggregator.add({"message": "b"})
+        assert aggregator.add({"message": "a"})
+        assert not aggregator.add({"message": "c"})
+        assert aggregator.submit({"message": "d"}) is None
+        assert aggregator.get_stats()["dropped"] == 2
+
+    @pytest.mark.performance
+    def test_ingest_throughput(self, make_aggregator, db_path):
+        aggregator = make_aggregator()
+        reports = [
+            {"error_type": "error", "message": f"crash {i % 200}", "node_id": f"n{i % 8}"}
+            for i in range(40000)
+        ]
+
+        def ingest(chunk):
+            for report in chunk:
+                aggregator.add(report)
+
+        threads = [threading.Thread(target=ingest, args=(reports[i::4],)) for i in range(4)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert aggregator.flush()
+        elapsed = time.perf_counter() - started
+
+        assert len(reports) / elapsed > 10000
+        rows = _rows(db_path)
+        assert len(rows) == 200
+        assert sum(r["occurrence_count"] for r in rows) == 40000
+
+
+def _load_node_agent():
+    path = Path(__file__).parent.parent / "distributed" / "node_agent.py"
+    spec = importlib.util.spec_from_file_location("node_agent_under_test", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestNodeAgentBuffer:
+    """Test the client-side error buffer."""
+
+    def test_coalesces_and_batches(self):
+        sent = []
+        buffer = _load_node_agent().ErrorReportBuffer(
+            lambda reports: sent.append(reports) or True, flush_interval=60, batch_size=2
+        )
+        for _ in range(3):
+            buffer.add({"error_type": "error", "message": "boom"})
+        buffer.add({"error_type": "error", "message": "other", "context": "x"})
+        buffer.add({"error_type": "error", "message": "third"})
+        assert buffer.flush()
+        buffer.close()
+
+        reports = [r for batch in sent for r in batch]
+        assert max(len(batch) for batch in sent) <= 2
+        assert {r["message"]: r["occurrences"] for r in reports} == {
+            "boom": 3,
+            "other": 1,
+            "third": 1,
+        }
+
+    def test_failed_upload_kept_for_retry(self):
+        results = [False, True]
+        sent = []
+
+        def send(reports):
+            sent.append(reports)
+            return results.pop(0)
+
+        buffer = _load_node_agent().ErrorReportBuffer(send, flush_interval=60, limit=1)
+        buffer.add({"error_type": "error", "message": "boom"})
+        assert not buffer.add({"error_type": "error", "message": "other"})
+        assert not buffer.flush()
+        buffer.add({"error_type": "error", "message": "boom"})
+        assert buffer.pending() == 1
+        assert buffer.flush()
+        buffer.close()
+        assert sent[-1][0]["occurrences"] == 2
+        assert buffer.dropped == 1
@@ -0,0 +1,258 @@
+"""
+Tests for Streaming Exports
+
+Tests:
+- fetchmany() batching and connection lifetime
+- CSV, NDJSON and JSON document chunks
+- Write-only XLSX workbooks
+- Peak RSS of a 1M row export (performance)
+"""
+
+import csv
+import io
+import json
+import os
+import sqlite3
+import subprocess
+
+# Add parent directory to path for imports
+import sys
+import tempfile
+import textwrap
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from export_stream import (  # noqa: E402
+    csv_chunks,
+    drop_columns,
+    iter_batches,
+    iter_dicts,
+    json_document_chunks,
+    ndjson_chunks,
+    write_xlsx,
+)
+
+# Builds a task_queue table with `rows` rows without going through Python
+_POPULATE_SQL = """
+CREATE TABLE task_queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_type TEXT NOT NULL,
+    task_data TEXT,
+    priority INTEGER DEFAULT 0,
+    status TEXT DEFAULT 'pending',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < {rows})
+INSERT INTO task_queue (task_type, task_data, priority, status)
+SELECT 'shell', '{{"command": "echo ' || i || '"}}', i % 5,
+       CASE i % 3 WHEN 0 THEN 'completed' ELSE 'pending' END
+FROM n;
+"""
+
+
+def _create_db(path, rows):
+    conn = sqlite3.connect(path)
+    conn.executescript(_POPULATE_SQL.format(rows=rows))
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def db_path():
+    """Create a temporary database with 25 tasks."""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    _create_db(path, 25)
+    yield path
+    os.unlink(path)
+
+
+class _TrackedConnection(sqlite3.Connection):
+    """Connection that records when it is closed."""
+
+    closed = []
+
+    def close(self):
+        _TrackedConnection.closed.append(self)
+        super().close()
+
+
+class TestBatches:
+    """Test iter_batches() and batch transforms."""
+
+    def test_rows_arrive_in_fetchmany_batches(self, db_path):
+        batches = list(
+            iter_batches(
+                lambda: sqlite3.connect(db_path), "SELECT id FROM task_queue", batch_size=10
+            )
+        )
+        assert [len(rows) for _, rows in batches] == [10, 10, 5]
+        assert batches[0][0] == ["id"]
+
+    def test_empty_result_yields_header_batch(self, db_path):
+        batches = list(
+            iter_batches(
+                lambda: sqlite3.connect(db_path), "SELECT id, status FROM task_queue WHERE 0"
+            )
+        )
+        assert batches == [(["id", "status"], [])]
+
+    def test_connection_closed_when_stream_abandoned(self, db_path):
+        opened = []
+
+        def connect():
+            opened.append(sqlite3.connect(db_path, factory=_TrackedConnection))
+            return opened[-1]
+
+        batches = iter_batches(connect, "SELECT * FROM task_queue", batch_size=5)
+        assert opened == []  # not opened until iterated
+        next(batches)
+        assert opened[0] not in _TrackedConnection.closed
+        batches.close()
+        assert opened[0] in _TrackedConnection.closed
+
+    def test_drop_columns_and_dicts(self, db_path):
+        batches = iter_batches(
+            lambda: sqlite3.connect(db_path), "SELECT id, task_data FROM task_queue WHERE id = 1"
+        )
+        assert list(iter_dicts(drop_columns(batches, ["task_data"]))) == [[{"id": 1}]]
+
+
+class TestFormats:
+    """Test the text serialisers."""
+
+    def _batches(self, db_path, **kwargs):
+        return iter_batches(
+            lambda: sqlite3.connect(db_path),
+            "SELECT id, task_data, status FROM task_queue ORDER BY id",
+            batch_size=7,
+            **kwargs,
+        )
+
+    def test_csv(self, db_path):
+        rows = list(csv.reader(io.StringIO("".join(csv_chunks(self._batches(db_path))))))
+        assert rows[0] == ["id", "task_data", "status"]
+        assert len(rows) == 26
+        assert json.loads(rows[1][1]) == {"command": "echo 1"}
+
+    def test_csv_header_without_rows(self, db_path):
+        batches = iter_batches(
+            lambda: sqlite3.connect(db_path), "SELECT id FROM task_queue WHERE 0"
+        )
+        assert "".join(csv_chunks(batches)).strip() == "id"
+
+    def test_ndjson(self, db_path):
+        lines = "".join(ndjson_chunks(iter_dicts(self._batches(db_path)))).splitlines()
+        assert len(lines) == 25
+        assert json.loads(lines[-1])["id"] == 25
+
+    def test_json_document(self, db_path):
+        head = {"exported_at": "now", "filters": {"status": None}}
+        text = "".join(json_document_chunks(head, "tasks", iter_dicts(self._batches(db_path))))
+        document = json.loads(text)
+        assert document["total_count"] == 25
+        assert document["filters"] == {"status": None}
+        assert [t["id"] for t in document["tasks"]] == list(range(1, 26))
+
+    def test_json_document_without_rows(self):
+        document = json.loads("".join(json_document_chunks({}, "tasks", iter([[]]))))
+        assert document == {"tasks": [], "total_count": 0}
+
+
+class TestXlsx:
+    """Test write-only workbook output."""
+
+    def test_sheets_written_and_empty_sheets_skipped(self, db_path, tmp_path):
+        openpyxl = pytest.importorskip("openpyxl")
+        out = tmp_path / "export.xlsx"
+        sheets = [
+            (
+                "Tasks",
+                iter_batches(lambda: sqlite3.connect(db_path), "SELECT id, status FROM task_queue"),
+            ),
+            (
+                "Bugs",
+                iter_batches(lambda: sqlite3.connect(db_path), "SELECT id FROM task_queue WHERE 0"),
+            ),
+        ]
+        assert write_xlsx(sheets, str(out)) == 25
+
+        wb = openpyxl.load_workbook(out, read_only=True)
+        assert wb.sheetnames == ["Tasks"]
+        rows = list(wb["Tasks"].iter_rows(values_only=True))
+        assert rows[0] == ("Id", "Status")
+        assert len(rows) == 26
+
+    def test_no_data_workbook(self, tmp_path):
+        openpyxl = pytest.importorskip("openpyxl")
+        out = tmp_path / "empty.xlsx"
+        assert write_xlsx([], str(out)) == 0
+        assert openpyxl.load_workbook(out).sheetnames == ["Empty"]
+
+
+# Child process: exports the database and reports how far peak RSS moved
+_BENCHMARK_SCRIPT = textwrap.dedent(
+    """
+    import json, resource, sqlite3, sys
+    sys.path.insert(0, {root!r})
+    from export_stream import (
+        csv_chunks, iter_batches, iter_dicts, json_document_chunks, ndjson_chunks,
+    )
+
+    def peak_mb():
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    def export(fmt, limit):
+        batches = iter_batches(
+            lambda: sqlite3.connect({path!r}), "SELECT * FROM task_queue LIMIT ?", (limit,)
+        )
+        if fmt == "csv":
+            chunks = csv_chunks(batches)
+        elif fmt == "ndjson":
+            chunks = ndjson_chunks(iter_dicts(batches))
+        else:
+            chunks = json_document_chunks({{}}, "tasks", iter_dicts(batches))
+        return sum(len(c) for c in chunks)
+
+    export({fmt!r}, 1000)
+    baseline = peak_mb()
+    size = export({fmt!r}, -1)
+    print(json.dumps({{"growth_mb": peak_mb() - baseline, "bytes": size}}))
+    """
+)
+
+
+@pytest.fixture(scope="module")
+def large_db():
+    """Create a temporary database with TestExportMemory.ROWS tasks."""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    _create_db(path, TestExportMemory.ROWS)
+    yield path
+    os.unlink(path)
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestExportMemory:
+    """Benchmark: exporting 1M tasks stays under a fixed RSS ceiling."""
+
+    ROWS = 1_000_000
+    RSS_GROWTH_CEILING_MB = 32
+
+    @pytest.mark.parametrize("fmt", ["csv", "ndjson", "json"])
+    def test_peak_rss_independent_of_size(self, large_db, fmt):
+        script = _BENCHMARK_SCRIPT.format(
+            root=str(Path(__file__).parent.parent), path=large_db, fmt=fmt
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, timeout=600
+        )
+        assert result.returncode == 0, result.stderr
+        report = json.loads(result.stdout)
+
+        assert report["bytes"] > self.ROWS * 20
+        assert report["growth_mb"] < self.RSS_GROWTH_CEILING_MB
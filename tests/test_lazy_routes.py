@@ -0,0 +1,125 @@
+"""
+Tests for Lazy Route Loading
+
+Tests:
+- Blueprint modules are imported on the first request under their prefix
+- Routing after loading matches eager registration (404/405/redirects)
+- lazy_import() defers module execution until first attribute access
+"""
+
+# Add parent directory to path for imports
+import sys
+import textwrap
+import uuid
+from pathlib import Path
+
+import pytest
+from flask import Flask
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lazy_routes import LazyBlueprintLoader, lazy_import
+
+
+@pytest.fixture
+def module_dir(tmp_path, monkeypatch):
+    """Directory on sys.path for throwaway route modules."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return tmp_path
+
+
+def _write_blueprint_module(module_dir):
+    name = f"lazy_bp_{uuid.uuid4().hex[:8]}"
+    (module_dir / f"{name}.py").write_text(
+        textwrap.dedent(
+            """
+            from flask import Blueprint, jsonify
+
+            widgets_bp = Blueprint("widgets", __name__, url_prefix="/api/widgets")
+
+            @widgets_bp.route("/", methods=["GET"])
+            def list_widgets():
+                return jsonify({"widgets": []})
+
+            @widgets_bp.route("/<int:widget_id>", methods=["GET"])
+            def get_widget(widget_id):
+                return jsonify({"id": widget_id})
+            """
+        )
+    )
+    return name
+
+
+def _make_app():
+    app = Flask(__name__)
+
+    @app.route("/api/other")
+    def other():
+        return "other"
+
+    return app
+
+
+class TestLazyBlueprintLoader:
+    """Test the LazyBlueprintLoader class."""
+
+    def test_imports_module_on_first_request(self, module_dir):
+        module = _write_blueprint_module(module_dir)
+        app = _make_app()
+        loader = LazyBlueprintLoader(app, enabled=True)
+        loader.add("/api/widgets", module, "widgets_bp")
+        client = app.test_client()
+
+        assert client.get("/api/other").data == b"other"
+        assert module not in sys.modules
+
+        response = client.get("/api/widgets/7")
+        assert response.get_json() == {"id": 7}
+        assert module in sys.modules
+        assert loader.get_status()["widgets_bp"]["loaded"] is True
+
+        # Later requests are matched directly by the blueprint's own rules
+        assert app.url_map.bind("localhost").match("/api/widgets/8")[0] == "widgets.get_widget"
+
+    def test_routing_matches_eager_registration(self, module_dir):
+        module = _write_blueprint_module(module_dir)
+        app = _make_app()
+        LazyBlueprintLoader(app, enabled=True).add("/api/widgets", module, "widgets_bp")
+        client = app.test_client()
+
+        # Same answers on the loading request and after the group is loaded
+        for _ in range(2):
+            assert client.get("/api/widgets").status_code == 308
+            assert client.get("/api/widgets/").get_json() == {"widgets": []}
+            assert client.get("/api/widgets/missing/path").status_code == 404
+            assert client.post("/api/widgets/3").status_code == 405
+            assert client.options("/api/widgets/3").status_code == 200
+
+    def test_disabled_registers_eagerly(self, module_dir):
+        module = _write_blueprint_module(module_dir)
+        app = _make_app()
+        LazyBlueprintLoader(app, enabled=False).add("/api/widgets", module, "widgets_bp")
+
+        assert module in sys.modules
+        assert "widgets.get_widget" in app.view_functions
+
+    def test_missing_module_returns_404(self):
+        app = _make_app()
+        loader = LazyBlueprintLoader(app, enabled=True)
+        loader.add("/api/ghost", "no_such_route_module", "ghost_bp")
+
+        assert app.test_client().get("/api/ghost/1").status_code == 404
+        assert loader.get_status()["ghost_bp"]["error"]
+
+
+class TestLazyImport:
+    """Test lazy_import()."""
+
+    def test_module_body_runs_on_first_attribute_access(self, module_dir):
+        name = f"lazy_mod_{uuid.uuid4().hex[:8]}"
+        (module_dir / f"{name}.py").write_text("LOADED = []\nLOADED.append(1)\nVALUE = 42\n")
+
+        module = lazy_import(name)
+        assert "VALUE" not in object.__getattribute__(module, "__dict__")
+        assert module.VALUE == 42
+        assert module.LOADED == [1]
@@ -0,0 +1,396 @@
+"""
+Tests for the Async Unified LLM Client
+
+Tests:
+- Failover without blocking on a slow provider's timeout
+- Hedged requests: fallback started after the threshold, loser cancelled
+- Circuit breaker and rate-limit semantics shared with the sync client
+- Batch completion with bounded concurrency
+- Blocking providers on a thread pool; pooled HTTP connections for Ollama
+"""
+
+import asyncio
+import json
+
+# Add parent directory to path for imports
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.circuit_breaker import CircuitBreaker, CircuitConfig  # noqa: E402
+from services.llm_provider import (  # noqa: E402
+    AsyncUnifiedLLMClient,
+    BaseProvider,
+    LLMResponse,
+    OllamaProvider,
+    ProviderConfig,
+    ProviderType,
+    UnifiedLLMClient,
+    Usage,
+)
+
+MESSAGES = [{"role": "user", "content": "Summarize this page"}]
+
+
+class _FakeProvider(BaseProvider):
+    """Async provider with a configurable delay and failure."""
+
+    def __init__(self, provider_type, delay=0.0, error=None):
+        super().__init__(ProviderConfig(), provider_type)
+        # Private breaker so tests do not share the global registry
+        self.circuit = CircuitBreaker(
+            f"test-{provider_type.value}", CircuitConfig(failure_threshold=2)
+        )
+        self.delay = delay
+        self.error = error
+        self.started = 0
+        self.finished = 0
+
+    async def _acreate_completion_impl(self, messages, **kwargs):
+        self.started += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        self.finished += 1
+        return LLMResponse(
+            id=f"{self.provider_type.value}-1",
+            content=[{"type": "text", "text": self.provider_type.value}],
+            usage=Usage(prompt_tokens=10, completion_tokens=5, total_tokens=15),
+        )
+
+
+class _BlockingProvider(_FakeProvider):
+    """Provider that only has the synchronous implementation."""
+
+    _acreate_completion_impl = BaseProvider._acreate_completion_impl
+
+    def _create_completion_impl(self, messages, **kwargs):
+        time.sleep(self.delay)
+        return LLMResponse(id="blocking", content=[{"type": "text", "text": "ok"}])
+
+
+class _FakeLimiter:
+    def __init__(self, limited=()):
+        self.limited = set(limited)
+        self.successes = []
+        self.limits = []
+
+    def is_rate_limited(self, provider):
+        return provider in self.limited
+
+    def get_cooldown_remaining(self, provider):
+        return 60
+
+
+def _client(*providers, limiter=None, **kwargs):
+    sync = UnifiedLLMClient(failover_enabled=True)
+    sync.providers = {p.provider_type.value: p for p in providers}
+    sync.failover_order = [p.provider_type.value for p in providers]
+    client = AsyncUnifiedLLMClient(client=sync, **kwargs)
+    limiter = limiter or _FakeLimiter()
+    client.limiter = limiter
+    client._rate_limit_hooks = lambda: (
+        limiter,
+        limiter.limits.append,
+        limiter.successes.append,
+    )
+    return client
+
+
+def _text(response):
+    return response.content[0]["text"]
+
+
+class TestFailover:
+    """Test provider ordering and failover."""
+
+    def test_primary_answers(self):
+        claude = _FakeProvider(ProviderType.CLAUDE, delay=0.01)
+        ollama = _FakeProvider(ProviderType.OLLAMA)
+        client = _client(claude, ollama)
+
+        response = asyncio.run(client.messages.create(messages=MESSAGES))
+        assert _text(response) == "claude"
+        assert response.provider == "claude" and response.cost == 0.0
+        assert ollama.started == 0
+        assert client.limiter.successes == ["claude"]
+
+    def test_error_fails_over_immediately(self):
+        claude = _FakeProvider(ProviderType.CLAUDE, error=ConnectionError("refused"))
+        ollama = _FakeProvider(ProviderType.OLLAMA)
+        client = _client(claude, ollama)
+
+        response = asyncio.run(client.create(MESSAGES))
+        assert _text(response) == "ollama"
+        assert claude.failed_requests == 1
+        assert client.failover_count == 1
+
+    def test_rate_limit_error_recorded(self):
+        claude = _FakeProvider(ProviderType.CLAUDE, error=RuntimeError("429 Too Many Requests"))
+        ollama = _FakeProvider(ProviderType.OLLAMA)
+        client = _client(claude, ollama)
+
+        asyncio.run(client.create(MESSAGES))
+        assert client.limiter.limits == ["claude"]
+        assert client.limiter.successes == ["ollama"]
+
+    def test_skips_open_circuits_and_rate_limited(self):
+        claude = _FakeProvider(ProviderType.CLAUDE)
+        claude.circuit.force_open()
+        openai = _FakeProvider(ProviderType.OPENAI)
+        ollama = _FakeProvider(ProviderType.OLLAMA)
+        client = _client(claude, openai, ollama, limiter=_FakeLimiter(limited={"openai"}))
+
+        assert _text(asyncio.run(client.create(MESSAGES))) == "ollama"
+        assert claude.started == openai.started == 0
+
+    def test_all_fail(self):
+        client = _client(
+            _FakeProvider(ProviderType.CLAUDE, error=ValueError("no key")),
+            _FakeProvider(ProviderType.OLLAMA, error=ConnectionError("down")),
+        )
+        with pytest.raises(RuntimeError, match="claude: no key; ollama: down"):
+            asyncio.run(client.create(MESSAGES))
+        assert client.failed_requests == 1
+
+    def test_without_hedging_waits_for_slow_primary(self):
+        claude = _FakeProvider(ProviderType.CLAUDE, delay=0.3)
+        ollama = _FakeProvider(ProviderType.OLLAMA)
+        client = _client(claude, ollama)
+
+        assert _text(asyncio.run(client.create(MESSAGES))) == "claude"
+        assert ollama.started == 0
+
+
+class TestHedging:
+    """Test hedged requests."""
+
+    def test_hedge_wins_and_loser_is_cancelled(self):
+        claude = _FakeProvider(ProviderType.CLAUDE, delay=5.0)
+        ollama = _FakeProvider(ProviderType.OLLAMA, delay=0.05)
+        client = _client(claude, ollama, hedge_after=0.1)
+
+        start = time.perf_counter()
+        response = asyncio.run(client.create(MESSAGES))
+        elapsed = time.perf_counter() - start
+
+        assert _text(response) == "ollama"
+        assert elapsed < 0.5
+        assert claude.cancelled_requests == 1
+        assert claude.failed_requests == 0  # a cancelled loser is not a failure
+        assert claude.circuit.is_closed
+        metrics = client.get_metrics()
+        assert (metrics["hedged_requests"], metrics["hedge_wins"]) == (1, 1)
+
+    def test_fast_primary_never_hedges(self):
+        claude = _FakeProvider(ProviderType.CLAUDE, delay=0.01)
+        ollama = _FakeProvider(ProviderType.OLLAMA)
+        client = _client(claude, ollama, hedge_after=0.2)
+
+        assert _text(asyncio.run(client.create(MESSAGES))) == "claude"
+        assert ollama.started == 0
+        assert client.hedged_requests == 0
+
+    def test_slow_primary_can_still_win(self):
+        claude = _FakeProvider(ProviderType.CLAUDE, delay=0.15)
+        ollama = _FakeProvider(ProviderType.OLLAMA, delay=1.0)
+        client = _client(claude, ollama, hedge_after=0.05)
+
+        assert _text(asyncio.run(client.create(MESSAGES))) == "claude"
+        assert ollama.cancelled_requests == 1
+        assert client.hedge_wins == 0
+
+    def test_per_call_override(self):
+        claude = _FakeProvider(ProviderType.CLAUDE, delay=0.3)
+        ollama = _FakeProvider(ProviderType.OLLAMA)
+        client = _client(claude, ollama)
+
+        assert _text(asyncio.run(client.create(MESSAGES, hedge_after=0.05))) == "ollama"
+        client_hedging = _client(
+            _FakeProvider(ProviderType.CLAUDE, delay=0.2),
+            _FakeProvider(ProviderType.OLLAMA),
+            hedge_after=0.05,
+        )
+        assert _text(asyncio.run(client_hedging.create(MESSAGES, hedge_after=None))) == "claude"
+
+
+class TestConcurrency:
+    """Test batch completion and blocking providers."""
+
+    def test_create_many(self):
+        claude = _FakeProvider(ProviderType.CLAUDE, delay=0.1)
+        client = _client(claude)
+        requests = [
+            {"messages": [{"role": "user", "content": str(i)}], "max_tokens": 10} for i in range(20)
+        ]
+
+        start = time.perf_counter()
+        responses = asyncio.run(client.create_many(requests, max_concurrency=20))
+        assert time.perf_counter() - start < 0.5
+        assert len(responses) == 20
+        assert client.successful_requests == 20
+
+    def test_create_many_bounded_and_exceptions(self):
+        claude = _FakeProvider(ProviderType.CLAUDE, delay=0.05)
+        client = _client(claude)
+        client.failover_enabled = False
+
+        async def run():
+            batch = [{"messages": MESSAGES}] * 4
+            return await client.create_many(batch, max_concurrency=2)
+
+        start = time.perf_counter()
+        asyncio.run(run())
+        assert time.perf_counter() - start >= 0.1
+
+        claude.error = ValueError("bad request")
+        results = asyncio.run(
+            client.create_many([{"messages": MESSAGES}] * 2, return_exceptions=True)
+        )
+        assert all(isinstance(r, ValueError) for r in results)
+
+    def test_blocking_provider_runs_on_thread_pool(self):
+        provider = _BlockingProvider(ProviderType.GEMINI, delay=0.2)
+        client = _client(provider)
+
+        start = time.perf_counter()
+        asyncio.run(client.create_many([{"messages": MESSAGES}] * 5))
+        assert time.perf_counter() - start < 0.6
+        assert provider.successful_requests == 5
+
+
+class TestCache:
+    """Test the shared response cache on the async path."""
+
+    def test_uses_client_cache(self, tmp_path):
+        from services.llm_cache import LLMResponseCache
+
+        claude = _FakeProvider(ProviderType.CLAUDE)
+        client = _client(claude)
+        cache = client.client.cache = LLMResponseCache(
+            db_path=tmp_path / "cache.db", metrics_recorder=lambda **c: True
+        )
+        try:
+
+            async def run():
+                first = await client.create(MESSAGES, model="m")
+                second = await client.create(MESSAGES, model="m")
+                bypass = await client.create(MESSAGES, model="m", cache=False)
+                return first, second, bypass
+
+            first, second, bypass = asyncio.run(run())
+            assert not first.cached and second.cached and not bypass.cached
+            assert _text(second) == "claude"
+            assert claude.started == 2
+            metrics = cache.get_metrics()
+            assert metrics["misses"] == 1 and metrics["memory_hits"] == 1
+
+            # A fresh memory tier still hits on disk
+            cache._memory.clear()
+            assert asyncio.run(client.create(MESSAGES, model="m")).cached
+            assert cache.get_metrics()["disk_hits"] == 1
+        finally:
+            cache.close()
+
+    def test_concurrent_identical_calls_coalesce(self, tmp_path):
+        from services.llm_cache import LLMResponseCache
+
+        claude = _FakeProvider(ProviderType.CLAUDE, delay=0.1)
+        client = _client(claude)
+        cache = client.client.cache = LLMResponseCache(
+            db_path=tmp_path / "cache.db", metrics_recorder=lambda **c: True
+        )
+        try:
+
+            async def run():
+                return await asyncio.gather(
+                    *[client.create(MESSAGES, model="m") for _ in range(5)],
+                    client.create(MESSAGES, model="other"),
+                )
+
+            responses = asyncio.run(run())
+            assert [_text(r) for r in responses] == ["claude"] * 6
+            assert claude.started == 2
+            metrics = cache.get_metrics()
+            assert (metrics["misses"], metrics["coalesced"], metrics["inflight"]) == (2, 4, 0)
+
+            # A failed call is shared too, and not cached
+            claude.error = ValueError("bad request")
+
+            async def failing():
+                return await asyncio.gather(
+                    *[client.create(MESSAGES, model="x") for _ in range(3)],
+                    return_exceptions=True,
+                )
+
+            assert all(isinstance(r, RuntimeError) for r in asyncio.run(failing()))
+            assert claude.started == 3
+        finally:
+            cache.close()
+
+
+class _OllamaServer:
+    """Local /api/chat endpoint recording client connections."""
+
+    def __init__(self):
+        self.connections = set()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                server.connections.add(self.client_address)
+                length = int(self.headers["Content-Length"])
+                request = json.loads(self.rfile.read(length))
+                body = json.dumps(
+                    {"message": {"content": f"echo {request['messages'][-1]['content']}"}}
+                ).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.endpoint = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def test_ollama_pooled_connections():
+    server = _OllamaServer()
+    try:
+        provider = OllamaProvider(
+            ProviderConfig(model="llama3.2", endpoint=server.endpoint, max_concurrency=1)
+        )
+        provider.circuit = CircuitBreaker("test-ollama-http")
+        client = _client(provider)
+
+        async def run():
+            try:
+                return await client.create_many(
+                    [{"messages": [{"role": "user", "content": str(i)}]} for i in range(5)]
+                )
+            finally:
+                await client.aclose()
+
+        responses = asyncio.run(run())
+        assert [_text(r) for r in responses] == [f"echo {i}" for i in range(5)]
+        # Keep-alive: every request reused one connection
+        assert len(server.connections) == 1
+    finally:
+        server.close()
@@ -0,0 +1,307 @@
+"""
+Tests for the LLM Response Cache
+
+Tests:
+- Canonical request fingerprints
+- Memory and SQLite tiers, TTL expiry and size eviction
+- Single-flight coalescing of concurrent identical requests
+- UnifiedLLMClient opt-in and per-call bypass
+- Hit/miss/cost-saved metrics flushing
+"""
+
+import sqlite3
+
+# Add parent directory to path for imports
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services import llm_cache  # noqa: E402
+from services.llm_cache import LLMResponseCache  # noqa: E402
+from services.llm_provider import LLMResponse, UnifiedLLMClient, Usage  # noqa: E402
+from services.prompt_fingerprint import request_fingerprint  # noqa: E402
+
+MESSAGES = [{"role": "user", "content": "Is this prompt asking to proceed? Answer yes or no."}]
+
+
+def _response(text="yes", cost=0.0125):
+    return LLMResponse(
+        id="msg_1",
+        content=[{"type": "text", "text": text}],
+        model="claude-sonnet-4-5",
+        usage=Usage(prompt_tokens=40, completion_tokens=2, total_tokens=42),
+        provider="claude",
+        cost=cost,
+        latency=0.8,
+    )
+
+
+@pytest.fixture
+def recorded():
+    return []
+
+
+@pytest.fixture
+def cache(tmp_path, recorded):
+    inst = LLMResponseCache(
+        db_path=tmp_path / "cache.db",
+        metrics_recorder=lambda **counts: recorded.append(counts) or True,
+    )
+    yield inst
+    inst.close()
+
+
+@pytest.fixture
+def client(cache):
+    """Client whose provider chain is replaced by a counting fake."""
+    inst = UnifiedLLMClient(failover_enabled=False, cache=cache)
+    inst.calls = []
+    inst.delay = 0.0
+    inst.fail = None
+
+    def create_uncached(messages, **kwargs):
+        inst.calls.append(kwargs)
+        time.sleep(inst.delay)
+        if inst.fail:
+            raise inst.fail
+        return _response()
+
+    inst._create_uncached = create_uncached
+    return inst
+
+
+class TestFingerprint:
+    """Test request fingerprints."""
+
+    def test_canonical(self):
+        base = request_fingerprint("m", MESSAGES, temperature=0, max_tokens=10, system="s")
+        reordered = [{"content": MESSAGES[0]["content"], "role": "user"}]
+        again = request_fingerprint("m", reordered, temperature=0.0, max_tokens=10, system="s")
+        assert again == base
+        assert len(base) == 64
+
+    def test_every_input_counts(self):
+        base = request_fingerprint("m", MESSAGES, temperature=0, max_tokens=10, system="s")
+        variants = [
+            request_fingerprint("other", MESSAGES, temperature=0, max_tokens=10, system="s"),
+            request_fingerprint("m", MESSAGES, temperature=0.7, max_tokens=10, system="s"),
+            request_fingerprint("m", MESSAGES, temperature=0, max_tokens=11, system="s"),
+            request_fingerprint("m", MESSAGES, temperature=0, max_tokens=10, system="t"),
+            request_fingerprint(
+                "m",
+                MESSAGES,
+                temperature=0,
+                max_tokens=10,
+                system="s",
+                extra={"stop_sequences": ["\n"]},
+            ),
+            request_fingerprint(
+                "m",
+                [{"role": "user", "content": "Is this  prompt"}],
+                temperature=0,
+                max_tokens=10,
+                system="s",
+            ),
+        ]
+        assert len({base, *variants}) == 7
+
+
+class TestTiers:
+    """Test the memory and SQLite tiers."""
+
+    def test_memory_hit(self, cache):
+        key = cache.make_key(MESSAGES, model="m")
+        assert cache.get(key) is None
+        cache.put(key, _response())
+
+        hit = cache.get(key)
+        assert hit.content == [{"type": "text", "text": "yes"}]
+        assert hit.cached and hit.cost == 0.0
+        assert hit.usage.total_tokens == 42
+        # Callers get independent copies
+        hit.content[0]["text"] = "mutated"
+        assert cache.get(key).content[0]["text"] == "yes"
+
+        metrics = cache.get_metrics()
+        assert metrics["memory_hits"] == 2
+        assert metrics["cost_saved"] == pytest.approx(0.025)
+
+    def test_disk_tier_survives_restart(self, tmp_path, cache):
+        key = cache.make_key(MESSAGES, model="m")
+        cache.put(key, _response())
+        cache.close()
+
+        reopened = LLMResponseCache(
+            db_path=tmp_path / "cache.db", metrics_recorder=lambda **c: True
+        )
+        try:
+            assert reopened.get(key).content[0]["text"] == "yes"
+            assert reopened.get(key) is not None
+            assert reopened.get_metrics()["disk_hits"] == 1
+            assert reopened.get_metrics()["memory_hits"] == 1
+        finally:
+            reopened.close()
+
+    def test_ttl_expiry(self, tmp_path):
+        cache = LLMResponseCache(db_path=tmp_path / "ttl.db", ttl=0.05)
+        key = cache.make_key(MESSAGES)
+        cache.put(key, _response())
+        assert cache.get(key) is not None
+        time.sleep(0.06)
+        assert cache.get(key) is None
+        assert cache.prune() == 1
+        cache.close()
+
+    def test_size_eviction(self, tmp_path):
+        cache = LLMResponseCache(
+            db_path=tmp_path / "lru.db", memory_entries=2, max_entries=3, prune_every=1000
+        )
+        keys = [cache.make_key([{"role": "user", "content": str(i)}]) for i in range(6)]
+        for key in keys:
+            cache.put(key, _response())
+            time.sleep(0.002)
+        cache.get(keys[0])  # disk hit refreshes its recency
+        cache.prune()
+
+        conn = sqlite3.connect(cache.db_path)
+        kept = {row[0] for row in conn.execute("SELECT key FROM llm_response_cache")}
+        conn.close()
+        assert kept == {keys[0], keys[4], keys[5]}
+        assert cache.get_metrics()["memory_entries"] == 2
+
+        # A byte budget of one and a half responses keeps only the newest
+        conn = sqlite3.connect(cache.db_path)
+        size = conn.execute("SELECT MAX(size) FROM llm_response_cache").fetchone()[0]
+        cache.max_bytes = int(size * 1.5)
+        cache.prune()
+        kept = [row[0] for row in conn.execute("SELECT key FROM llm_response_cache")]
+        conn.close()
+        assert kept == [keys[0]]
+        cache.close()
+
+
+class TestCoalescing:
+    """Test single-flight behaviour through UnifiedLLMClient."""
+
+    def test_concurrent_identical_requests_share_one_call(self, client):
+        client.delay = 0.2
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(client.messages.create(messages=MESSAGES, model="m"))
+            )
+            for _ in range(10)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(client.calls) == 1
+        assert len(results) == 10
+        assert sum(not r.cached for r in results) == 1
+        metrics = client.get_metrics()["cache"]
+        assert metrics["misses"] == 1
+        assert metrics["coalesced"] == 9
+
+    def test_failures_are_shared_not_cached(self, client):
+        client.delay = 0.1
+        client.fail = RuntimeError("All providers failed")
+        errors = []
+
+        def call():
+            try:
+                client.messages.create(messages=MESSAGES, model="m")
+            except RuntimeError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(errors) == 4
+        assert len(client.calls) == 1
+
+        client.fail = None
+        client.delay = 0.0
+        assert not client.messages.create(messages=MESSAGES, model="m").cached
+        assert len(client.calls) == 2
+
+
+class TestClientIntegration:
+    """Test opting in and out of the cache."""
+
+    def test_repeat_requests_hit_cache(self, client):
+        first = client.messages.create(messages=MESSAGES, model="m", max_tokens=5)
+        second = client.messages.create(messages=MESSAGES, model="m", max_tokens=5)
+        client.messages.create(messages=MESSAGES, model="m", max_tokens=6)
+
+        assert not first.cached and second.cached
+        assert len(client.calls) == 2
+
+    def test_per_call_bypass(self, client):
+        client.messages.create(messages=MESSAGES, model="m")
+        client.messages.create(messages=MESSAGES, model="m", cache=False)
+        assert len(client.calls) == 2
+        # The bypass flag never reaches providers
+        assert all("cache" not in kwargs for kwargs in client.calls)
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("LLM_CACHE_ENABLED", raising=False)
+        inst = UnifiedLLMClient(failover_enabled=False)
+        assert inst.cache is None
+        assert inst.get_metrics()["cache"] is None
+
+
+class TestMetrics:
+    """Test metric flushing."""
+
+    def test_flush_sends_deltas(self, client, cache, recorded):
+        for _ in range(3):
+            client.messages.create(messages=MESSAGES, model="m")
+        assert cache.flush_metrics()
+        assert recorded == [
+            {
+                "memory_hits": 2,
+                "disk_hits": 0,
+                "misses": 1,
+                "coalesced": 0,
+                "evictions": 0,
+                "tokens_saved": 84,
+                "cost_saved_usd": pytest.approx(0.025),
+            }
+        ]
+
+        # Nothing new: nothing recorded
+        cache.flush_metrics()
+        assert len(recorded) == 1
+
+    def test_periodic_flush(self, client, cache, recorded):
+        cache.metrics_flush_interval = 0
+        client.messages.create(messages=MESSAGES, model="m")
+        assert recorded and recorded[0]["misses"] == 1
+
+    def test_hits_flush_without_a_miss(self, client, cache, recorded):
+        client.messages.create(messages=MESSAGES, model="m")
+        cache.flush_metrics()
+        recorded.clear()
+
+        cache.metrics_flush_interval = 0
+        client.messages.create(messages=MESSAGES, model="m")
+        assert recorded and recorded[0]["memory_hits"] == 1
+        assert recorded[0]["misses"] == 0
+
+    def test_shared_cache_closed_at_exit(self, monkeypatch):
+        registered = []
+        monkeypatch.setattr(llm_cache, "_shared_cache", None)
+        monkeypatch.setattr(llm_cache.atexit, "register", registered.append)
+        shared = llm_cache.get_response_cache()
+        assert registered == [shared.close]
+        assert llm_cache.get_response_cache() is shared
+        assert len(registered) == 1
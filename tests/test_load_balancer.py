@@ -11,10 +11,12 @@ Tests the load balancing functionality including:
 
 import os
 import sqlite3
+import statistics
 
 # Add parent directory to path for imports
 import sys
 import tempfile
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -858,5 +860,193 @@ class TestLoadBalancerStrategies:
         assert len(set(selections)) == 1
 
 
+class TestLoadSnapshot:
+    """Test the aggregated, cached worker load snapshot."""
+
+    @pytest.fixture
+    def fleet_db(self, tmp_path):
+        """Database with 200 workers and a mix of task history."""
+        path = str(tmp_path / "fleet.db")
+        conn = sqlite3.connect(path)
+        conn.executescript(
+            """
+            CREATE TABLE workers (
+                id TEXT PRIMARY KEY,
+                node_id TEXT NOT NULL,
+                worker_type TEXT NOT NULL,
+                status TEXT DEFAULT 'idle',
+                last_heartbeat TIMESTAMP
+            );
+            CREATE TABLE task_queue (
+                id INTEGER PRIMARY KEY,
+                task_type TEXT,
+                status TEXT,
+                assigned_worker TEXT,
+                priority INTEGER DEFAULT 5,
+                started_at TIMESTAMP,
+                completed_at TIMESTAMP
+            );
+        """
+        )
+        init_load_balancer_schema(path)
+
+        now = datetime.now()
+        stale = (now - timedelta(minutes=10)).isoformat()
+        for i in range(200):
+            wid = f"w{i:03d}"
+            status = "draining" if i % 50 == 7 else "idle"
+            heartbeat = stale if i % 40 == 3 else now.isoformat()
+            conn.execute(
+                "INSERT INTO workers VALUES (?, ?, ?, ?, ?)",
+                (wid, f"n{i % 4}", "shell" if i % 2 else "general", status, heartbeat),
+            )
+            for _ in range(i % 6):
+                conn.execute(
+                    "INSERT INTO task_queue (task_type, status, assigned_worker) "
+                    "VALUES ('shell', 'running', ?)",
+                    (wid,),
+                )
+            conn.execute(
+                "INSERT INTO task_queue (task_type, status, assigned_worker) "
+                "VALUES ('shell', 'pending', ?)",
+                (wid,),
+            )
+            outcomes = ["completed"] * (i % 5) + ["failed"] * (3 if i % 30 == 11 else i % 2)
+            for outcome in outcomes:
+                conn.execute(
+                    "INSERT INTO task_queue (task_type, status, assigned_worker, "
+                    "started_at, completed_at) VALUES ('shell', ?, ?, "
+                    "datetime('now', '-2 hours'), datetime('now', '-1 hours'))",
+                    (outcome, wid),
+                )
+            if i % 3 == 0:
+                conn.execute(
+                    "INSERT INTO worker_config (worker_id, key, value) VALUES (?, 'capacity', ?)",
+                    (wid, str(5 + i % 7)),
+                )
+            if i % 4 == 0:
+                conn.execute(
+                    "INSERT INTO worker_config (worker_id, key, value) VALUES (?, 'weight', '1.5')",
+                    (wid,),
+                )
+        conn.commit()
+        conn.close()
+        return path
+
+    def _count_queries(self, lb):
+        """Record every statement run on connections the balancer opens."""
+        statements = []
+        original = lb._get_connection
+
+        def traced():
+            conn = original()
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        lb._get_connection = traced
+        return statements
+
+    def test_snapshot_matches_per_worker_loads(self, fleet_db):
+        """The aggregated snapshot agrees with single-worker lookups."""
+        lb = LoadBalancer(fleet_db)
+        snapshot = {w.worker_id: w for w in lb.get_all_worker_loads(include_unhealthy=True)}
+        assert len(snapshot) == 200
+
+        for wid in ("w000", "w003", "w007", "w011", "w041", "w199"):
+            assert snapshot[wid] == lb.get_worker_load(wid)
+
+        assert snapshot["w005"].current_tasks == 5
+        assert snapshot["w005"].pending_tasks == 1
+        assert snapshot["w003"].is_healthy is False  # stale heartbeat
+        assert snapshot["w011"].is_healthy is False  # 1 of 4 succeeded
+        assert snapshot["w007"].is_draining is True
+        assert snapshot["w006"].capacity == 11
+        assert snapshot["w004"].weight == 1.5
+        assert snapshot["w001"].capacity == 10
+
+    def test_one_query_per_refresh(self, fleet_db):
+        """Selections between refreshes never touch the database."""
+        lb = LoadBalancer(fleet_db)
+        statements = self._count_queries(lb)
+
+        for _ in range(20):
+            lb.select_worker(strategy=LoadBalancingStrategy.LEAST_LOADED)
+        assert len(statements) == 1
+        assert lb.stats["refreshes"] == 1
+
+        lb.invalidate()
+        lb.select_worker(strategy=LoadBalancingStrategy.WEIGHTED)
+        assert len(statements) == 2
+
+    def test_claims_and_completions_update_snapshot(self, fleet_db):
+        """In-memory counters steer selection until the next refresh."""
+        lb = LoadBalancer(fleet_db)
+        first = lb.select_worker(strategy=LoadBalancingStrategy.LEAST_LOADED).worker_id
+
+        for _ in range(3):
+            lb.record_claim(first)
+        load = {w.worker_id: w for w in lb.get_all_worker_loads()}[first]
+        assert load.current_tasks == 3
+        assert load.last_task_assigned is not None
+        assert lb.select_worker(strategy=LoadBalancingStrategy.LEAST_LOADED).worker_id != first
+
+        lb.record_completion(first, success=True)
+        lb.record_completion(first, success=False)
+        assert load.current_tasks == 1
+        assert (load.completed_today, load.failed_today) == (1, 1)
+
+        # Unknown workers are ignored rather than raising
+        lb.record_claim("missing")
+        lb.record_completion("missing")
+
+    def test_writes_invalidate_snapshot(self, fleet_db):
+        """Configuration and drain changes are visible immediately."""
+        lb = LoadBalancer(fleet_db)
+        lb.get_all_worker_loads()
+
+        lb.set_worker_capacity("w001", 42)
+        lb.drain_worker("w002")
+        loads = {w.worker_id: w for w in lb.get_all_worker_loads(include_unhealthy=True)}
+        assert loads["w001"].capacity == 42
+        assert loads["w002"].is_draining is True
+
+    def test_snapshot_expires(self, fleet_db):
+        """Direct database writes show up once the TTL passes."""
+        lb = LoadBalancer(fleet_db, config={"snapshot_ttl": 0.05})
+        lb.get_all_worker_loads()
+        conn = sqlite3.connect(fleet_db)
+        conn.execute("UPDATE workers SET worker_type = 'python' WHERE id = 'w000'")
+        conn.commit()
+        conn.close()
+
+        assert lb.get_all_worker_loads(worker_type="python") == []
+        time.sleep(0.06)
+        assert [w.worker_id for w in lb.get_all_worker_loads(worker_type="python")] == ["w000"]
+
+    def test_shared_instance_per_database(self, fleet_db):
+        """get_load_balancer reuses one instance (and snapshot) per path."""
+        assert get_load_balancer(fleet_db) is get_load_balancer(fleet_db)
+
+    @pytest.mark.performance
+    def test_selection_benchmark(self, fleet_db):
+        """Selection across 200 workers stays under a millisecond."""
+        lb = LoadBalancer(fleet_db, config={"snapshot_ttl": 60})
+        lb.select_worker(strategy=LoadBalancingStrategy.LEAST_LOADED)
+
+        for strategy in (
+            LoadBalancingStrategy.LEAST_LOADED,
+            LoadBalancingStrategy.WEIGHTED,
+            LoadBalancingStrategy.ADAPTIVE,
+        ):
+            timings = []
+            for _ in range(200):
+                start = time.perf_counter()
+                selection = lb.select_worker(strategy=strategy)
+                timings.append(time.perf_counter() - start)
+                lb.record_claim(selection.worker_id)
+                lb.record_completion(selection.worker_id)
+            assert statistics.median(timings) < 0.001, strategy
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
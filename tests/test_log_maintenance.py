@@ -0,0 +1,182 @@
+"""
+Tests for Log Maintenance
+
+Tests:
+- Tail-seek trimming matches keeping the last N lines
+- Trimming and archiving in constant memory
+- Streaming archives without partial files
+- Parallel maintenance passes under a shared byte-rate cap
+- Single-walk log scanning with exclusions
+"""
+
+import gzip
+import io
+import os
+import random
+
+# Add parent directory to path for imports
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from distributed import log_maintenance  # noqa: E402
+from distributed.log_maintenance import (  # noqa: E402
+    ByteRateLimiter,
+    LogMaintenance,
+    MaintenancePolicy,
+    find_tail_offset,
+)
+
+
+def _maintenance(path, **policy):
+    policy.setdefault("max_bytes_per_sec", None)
+    return LogMaintenance(path, MaintenancePolicy(**policy))
+
+
+def _body(path):
+    """File content after the three trim header lines."""
+    lines = path.read_bytes().split(b"\n", 3)
+    assert lines[0].startswith(b"# Log trimmed on")
+    return lines[3]
+
+
+class TestTailOffset:
+    """Test finding where the last N lines start."""
+
+    @pytest.mark.parametrize("trailing_newline", [True, False])
+    def test_matches_readlines(self, monkeypatch, trailing_newline):
+        monkeypatch.setattr(log_maintenance, "BLOCK_SIZE", 7)
+        rng = random.Random(42)
+        lines = [b"x" * rng.randint(0, 20) + b"\n" for _ in range(200)]
+        data = b"".join(lines)
+        if not trailing_newline:
+            data = data[:-1]
+        expected_lines = io.BytesIO(data).readlines()
+
+        for keep in (1, 2, 13, 199, 200, 500):
+            offset = find_tail_offset(io.BytesIO(data), len(data), keep)
+            assert data[offset:] == b"".join(expected_lines[-keep:])
+
+    def test_edge_cases(self):
+        assert find_tail_offset(io.BytesIO(b""), 0, 5) == 0
+        assert find_tail_offset(io.BytesIO(b"\n\n\n"), 3, 1) == 2
+        assert find_tail_offset(io.BytesIO(b"one line"), 8, 1) == 0
+
+
+class TestTrimLog:
+    """Test in-place trimming."""
+
+    def test_keeps_last_lines(self, tmp_path):
+        log = tmp_path / "worker.log"
+        log.write_text("".join(f"line {i}\n" for i in range(1000)))
+        maintenance = _maintenance(tmp_path)
+
+        ok, freed = maintenance.trim_log(log, keep_lines=10)
+        assert ok and freed > 0
+        assert _body(log) == "".join(f"line {i}\n" for i in range(990, 1000)).encode()
+        assert maintenance.stats["trimmed"] == 1
+        assert maintenance.stats["bytes_freed"] == freed
+
+    def test_short_log_untouched(self, tmp_path):
+        log = tmp_path / "short.log"
+        log.write_text("a\nb\n")
+        ok, freed = _maintenance(tmp_path).trim_log(log, keep_lines=10)
+        assert (ok, freed) == (True, 0)
+        assert log.read_text() == "a\nb\n"
+
+    def test_binary_garbage_preserved(self, tmp_path):
+        log = tmp_path / "mixed.log"
+        tail = b"\xff\xfe broken utf-8\n\x00\x01 bytes\n"
+        log.write_bytes(b"old\n" * 100 + tail)
+        _maintenance(tmp_path).trim_log(log, keep_lines=2)
+        assert _body(log) == tail
+
+    def test_constant_memory(self, tmp_path):
+        log = tmp_path / "big.log"
+        line = b"2026-01-01 12:00:00 INFO worker heartbeat ok " + b"x" * 50 + b"\n"
+        with open(log, "wb") as f:
+            for _ in range(40):
+                f.write(line * 5000)  # ~20 MB total
+        maintenance = _maintenance(tmp_path)
+
+        tracemalloc.start()
+        try:
+            ok, _ = maintenance.trim_log(log, keep_lines=5000)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert ok
+        assert peak < 2 * 1024 * 1024
+        assert _body(log) == line * 5000
+
+
+class TestArchive:
+    """Test streaming archives."""
+
+    def test_archive_round_trip(self, tmp_path):
+        log = tmp_path / "old.log"
+        data = os.urandom(1024) * 300
+        log.write_bytes(data)
+
+        ok, _ = _maintenance(tmp_path).archive_log(log)
+        assert ok
+        assert not log.exists()
+        assert gzip.decompress((tmp_path / "old.log.gz").read_bytes()) == data
+        assert list(tmp_path.iterdir()) == [tmp_path / "old.log.gz"]
+
+    def test_failed_archive_leaves_no_partial(self, tmp_path, monkeypatch):
+        log = tmp_path / "old.log"
+        log.write_text("data\n" * 100)
+
+        def fail(*args):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(log_maintenance.os, "replace", fail)
+        maintenance = _maintenance(tmp_path)
+        assert maintenance.archive_log(log) == (False, 0)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["old.log"]
+        assert maintenance.stats["errors"] == ["disk full"]
+
+
+class TestMaintenancePass:
+    """Test scanning and full maintenance runs."""
+
+    def test_scan_single_walk_with_exclusions(self, tmp_path):
+        (tmp_path / "logs").mkdir()
+        (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+        files = ("logs/a.log", "logs/b.err", "logs/c.txt", "notes.md", "node_modules/pkg/x.log")
+        for name in files:
+            (tmp_path / name).write_text("x\n")
+        (tmp_path / "logs" / "old.log.gz").write_bytes(b"")
+
+        names = sorted(info.name for info in _maintenance(tmp_path).scan_logs())
+        assert names == ["a.log", "b.err", "c.txt"]
+
+    def test_parallel_run(self, tmp_path):
+        for i in range(6):
+            (tmp_path / f"w{i}.log").write_text("entry\n" * 50_000)
+        maintenance = _maintenance(tmp_path, max_size_mb=0.1, keep_lines=100, workers=3)
+
+        results = maintenance.run_maintenance()
+        assert results["stats"]["trimmed"] == 6
+        assert results["stats"]["errors"] == []
+        for i in range(6):
+            assert _body(tmp_path / f"w{i}.log") == b"entry\n" * 100
+
+    def test_rate_limiter_caps_throughput(self):
+        limiter = ByteRateLimiter(1_000_000)
+        started = time.monotonic()
+        for _ in range(15):
+            limiter.consume(100_000)  # 1s burst + 0.5s over the cap
+        assert 0.4 < time.monotonic() - started < 1.0
+
+        unlimited = ByteRateLimiter(None)
+        started = time.monotonic()
+        unlimited.consume(10**12)
+        assert time.monotonic() - started < 0.1
@@ -0,0 +1,204 @@
+"""
+Tests for the Request Logging Middleware
+
+Tests:
+- Ring buffer bounds and filtering
+- Top-K slow request heap
+- Per-route latency histograms
+- Batched, size-rotated background file writer
+"""
+
+import json
+
+# Add parent directory to path for imports
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from flask import Flask
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from middleware import request_logger  # noqa: E402
+from middleware.request_logger import (  # noqa: E402
+    RequestLogWriter,
+    clear_request_logs,
+    get_request_logs,
+    get_request_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_logs():
+    clear_request_logs()
+    yield
+    clear_request_logs()
+
+
+def _entry(path="/api/tasks", duration_ms=5.0, status=200, method="GET"):
+    return {
+        "request_id": "abc",
+        "timestamp": "2026-01-01T00:00:00",
+        "method": method,
+        "path": path,
+        "status": status,
+        "duration_ms": duration_ms,
+    }
+
+
+def _record(entry, route=None):
+    request_logger._add_to_buffer(entry)
+    request_logger._update_stats(entry, route)
+
+
+class TestBufferAndStats:
+    """Test the ring buffer, slow heap and histograms."""
+
+    def test_ring_buffer_keeps_newest(self):
+        for i in range(request_logger._log_buffer_size + 50):
+            _record(_entry(path=f"/p/{i}"))
+
+        logs = get_request_logs(limit=1000)
+        assert len(logs) == request_logger._log_buffer_size
+        assert logs[0]["path"] == f"/p/{request_logger._log_buffer_size + 49}"
+        assert get_request_logs(path_contains="/p/549")[0]["path"] == "/p/549"
+
+    def test_slowest_requests_top_k(self):
+        durations = [150 + (i * 37) % 500 for i in range(200)]
+        for d in durations:
+            _record(_entry(duration_ms=float(d)))
+        _record(_entry(duration_ms=50.0))  # under the threshold
+
+        slowest = get_request_stats()["slowest_requests"]
+        assert [s["duration_ms"] for s in slowest] == sorted(durations, reverse=True)[:10]
+        assert len(request_logger._stats["slowest"]) == request_logger.SLOW_TOP_K
+
+    def test_per_route_percentiles(self):
+        for i in range(100):
+            _record(_entry(duration_ms=float(i + 1)), "GET /api/tasks")
+        _record(_entry(path="/api/x", duration_ms=1000.0, status=500), "POST /api/x")
+
+        stats = get_request_stats()
+        route = stats["routes"]["GET /api/tasks"]
+        assert route["count"] == 100
+        assert 40 <= route["p50_ms"] <= 60
+        assert 90 <= route["p99_ms"] <= 100
+        assert stats["routes"]["POST /api/x"]["count"] == 1
+        assert stats["total_errors"] == 1
+        assert stats["latency"]["count"] == 101
+
+    def test_route_cardinality_is_capped(self, monkeypatch):
+        monkeypatch.setattr(request_logger, "MAX_ROUTES", 3)
+        for i in range(10):
+            _record(_entry(), f"GET /r{i}")
+        routes = get_request_stats()["routes"]
+        assert len(routes) == 4
+        assert routes[request_logger.OTHER_ROUTE]["count"] == 7
+
+
+class TestRequestLogWriter:
+    """Test the background file writer."""
+
+    def test_batches_json_lines(self, tmp_path):
+        writer = RequestLogWriter(tmp_path / "requests.log", flush_interval=60)
+        try:
+            threads = [
+                threading.Thread(
+                    target=lambda n=n: [writer.write(_entry(path=f"/{n}/{i}")) for i in range(100)]
+                )
+                for n in range(4)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert writer.flush()
+
+            lines = (tmp_path / "requests.log").read_text().splitlines()
+            assert len(lines) == 400
+            assert json.loads(lines[0])["status"] == 200
+            assert writer.get_stats()["batches"] <= 2
+        finally:
+            writer.close()
+
+    def test_rotates_by_size(self, tmp_path):
+        path = tmp_path / "requests.log"
+        writer = RequestLogWriter(path, max_bytes=2000, backups=2, flush_interval=60)
+        try:
+            for _ in range(5):
+                for i in range(20):
+                    writer.write(_entry(path=f"/{i}"))
+                assert writer.flush()
+        finally:
+            writer.close()
+
+        assert writer.stats["rotations"] >= 2
+        assert (tmp_path / "requests.log.1").exists()
+        assert (tmp_path / "requests.log.2").exists()
+        assert not (tmp_path / "requests.log.3").exists()
+
+    def test_write_error_closes_file(self, tmp_path):
+        writer = RequestLogWriter(tmp_path / "requests.log", flush_interval=60)
+        try:
+            writer.write(_entry())
+            assert writer.flush()
+            opened = writer._file
+
+            class FullDisk:
+                def write(self, data):
+                    raise OSError("No space left on device")
+
+                def close(self):
+                    opened.close()
+
+            writer._file = FullDisk()
+            writer.write(_entry())
+            assert writer.flush()
+            assert opened.closed
+            assert writer.stats["errors"] == 1
+
+            writer.write(_entry())
+            assert writer.flush()
+        finally:
+            writer.close()
+        assert len((tmp_path / "requests.log").read_text().splitlines()) == 2
+
+    def test_close_flushes(self, tmp_path):
+        writer = RequestLogWriter(tmp_path / "requests.log", flush_interval=60)
+        writer.write(_entry())
+        writer.close()
+        assert len((tmp_path / "requests.log").read_text().splitlines()) == 1
+
+
+class TestMiddleware:
+    """Test init_request_logging() on a Flask app."""
+
+    def test_requests_logged_by_route(self, tmp_path, monkeypatch):
+        writer = RequestLogWriter(tmp_path / "requests.log", flush_interval=60)
+        monkeypatch.setattr(request_logger, "_writer", writer)
+        app = Flask(__name__)
+        app.secret_key = "test"
+
+        @app.route("/api/items/<int:item_id>")
+        def item(item_id):
+            return {"id": item_id}
+
+        request_logger.init_request_logging(app)
+        client = app.test_client()
+        for i in range(5):
+            assert client.get(f"/api/items/{i}").headers["X-Request-ID"]
+        client.get("/missing")
+
+        with client.session_transaction() as session:
+            session["user"] = "admin"
+        stats = client.get("/api/debug/requests/stats").get_json()
+        assert stats["routes"]["GET /api/items/<int:item_id>"]["count"] == 5
+        assert stats["routes"]["GET <unmatched>"]["count"] == 1
+
+        try:
+            assert writer.flush()
+            # 5 items, the 404 and the stats request itself
+            assert len((tmp_path / "requests.log").read_text().splitlines()) == 7
+        finally:
+            writer.close()
@@ -0,0 +1,185 @@
+"""
+Tests for the Cron Scheduler
+
+Tests:
+- Field-wise next_run() against a minute-by-minute reference
+- Sparse and unsatisfiable expressions
+- Heap-driven SchedulerDaemon wakeups
+"""
+
+import os
+import random
+import sqlite3
+
+# Add parent directory to path for imports
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.scheduler import CronError, CronExpression, SchedulerDaemon, SchedulerService
+
+MIGRATION = Path(__file__).parent.parent / "migrations" / "011_scheduled_tasks.sql"
+
+
+def _reference_next_run(cron, from_dt, limit=3 * 525600):
+    """Minute-stepping search used to cross-check next_run()."""
+    dt = from_dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    for _ in range(limit):
+        if cron.matches(dt):
+            return dt
+        dt += timedelta(minutes=1)
+    return None
+
+
+class TestCronNextRun:
+    """Test CronExpression.next_run()."""
+
+    @pytest.mark.parametrize(
+        "expression",
+        [
+            "*/15 * * * *",
+            "0 2 * * *",
+            "59 23 31 12 *",
+            "5,10 */3 1-7 * 1",
+            "30 4 31 * *",
+            "*/7 3-5 * 2,4 2-3",
+            "0 0 13 * 5",
+            "@weekly",
+        ],
+    )
+    def test_matches_minute_stepping(self, expression):
+        cron = CronExpression(expression)
+        rng = random.Random(expression)
+        for _ in range(20):
+            from_dt = datetime(2024, 1, 1) + timedelta(
+                minutes=rng.randint(0, 2 * 525600), seconds=rng.randint(0, 59)
+            )
+            assert cron.next_run(from_dt) == _reference_next_run(cron, from_dt)
+
+    def test_leap_day_beyond_one_year(self):
+        cron = CronExpression("0 0 29 2 *")
+        assert cron.next_run(datetime(2025, 3, 1)) == datetime(2028, 2, 29)
+        assert cron.next_runs(2, datetime(2096, 3, 1)) == [
+            datetime(2104, 2, 29),
+            datetime(2108, 2, 29),
+        ]
+
+    def test_next_run_is_strictly_after_start(self):
+        cron = CronExpression("30 10 * * *")
+        assert cron.next_run(datetime(2026, 5, 1, 10, 30, 0)) == datetime(2026, 5, 2, 10, 30)
+        assert cron.next_run(datetime(2026, 5, 1, 10, 29, 59)) == datetime(2026, 5, 1, 10, 30)
+
+    def test_unsatisfiable_expression_raises(self):
+        with pytest.raises(CronError):
+            CronExpression("0 0 30 2 *").next_run()
+
+    def test_max_iterations_bounds_search_window(self):
+        cron = CronExpression("0 0 1 1 *")
+        with pytest.raises(CronError):
+            cron.next_run(datetime(2026, 6, 1), max_iterations=60)
+        assert cron.next_run(datetime(2026, 6, 1), max_iterations=525600) == datetime(2027, 1, 1)
+
+
+@pytest.fixture
+def db_path():
+    """Create a temporary database with the scheduler schema."""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    conn.executescript(MIGRATION.read_text())
+    conn.execute(
+        """
+        CREATE TABLE task_queue (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_type TEXT NOT NULL,
+            task_data TEXT,
+            priority INTEGER DEFAULT 0,
+            status TEXT DEFAULT 'pending'
+        )
+    """
+    )
+    conn.commit()
+    conn.close()
+    yield path
+    os.unlink(path)
+
+
+class TestSchedulerDaemon:
+    """Test the heap-driven daemon loop."""
+
+    def test_sleeps_until_next_fire_time(self, db_path):
+        service = SchedulerService(db_path)
+        service.create_scheduled_task("hourly", "0 * * * *", "shell")
+        daemon = SchedulerDaemon(db_path, poll_interval=3600, service=service)
+        daemon._load_schedule()
+
+        next_run = datetime.fromisoformat(
+            service.get_scheduled_task_by_name("hourly")["next_run_at"]
+        )
+        expected = (next_run - datetime.now()).total_seconds()
+        assert abs(daemon._seconds_until_next() - expected) < 2
+
+    def test_runs_due_task_and_reschedules(self, db_path):
+        service = SchedulerService(db_path)
+        task = service.create_scheduled_task("every_minute", "* * * * *", "shell")
+        with service._get_connection() as conn:
+            conn.execute(
+                "UPDATE scheduled_tasks SET next_run_at = ? WHERE id = ?",
+                ((datetime.now() - timedelta(minutes=1)).isoformat(), task["id"]),
+            )
+            conn.commit()
+
+        daemon = SchedulerDaemon(db_path, poll_interval=3600, service=service)
+        daemon._load_schedule()
+        assert daemon._seconds_until_next() == 0
+        daemon._process_due_tasks()
+
+        with service._get_connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM task_queue").fetchone()[0] == 1
+        assert daemon._fire_times[task["id"]] > datetime.now()
+        assert daemon._seconds_until_next() > 0
+
+    def test_due_tasks_kept_when_lookup_fails(self, db_path, monkeypatch):
+        service = SchedulerService(db_path)
+        task = service.create_scheduled_task("every_minute", "* * * * *", "shell")
+        with service._get_connection() as conn:
+            conn.execute(
+                "UPDATE scheduled_tasks SET next_run_at = ? WHERE id = ?",
+                ((datetime.now() - timedelta(minutes=1)).isoformat(), task["id"]),
+            )
+            conn.commit()
+
+        daemon = SchedulerDaemon(db_path, poll_interval=3600, service=service)
+        daemon._load_schedule()
+        lookup = service.get_scheduled_task
+
+        def fail(task_id):
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(service, "get_scheduled_task", fail)
+        with pytest.raises(sqlite3.OperationalError):
+            daemon._process_due_tasks()
+        assert task["id"] in daemon._fire_times
+        assert 0 < daemon._seconds_until_next() <= daemon.RETRY_DELAY
+
+        monkeypatch.setattr(service, "get_scheduled_task", lookup)
+        daemon._fire_times[task["id"]] = datetime.now() - timedelta(seconds=1)
+        daemon._heap = [(daemon._fire_times[task["id"]], task["id"])]
+        daemon._process_due_tasks()
+        with service._get_connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM task_queue").fetchone()[0] == 1
+
+    def test_service_changes_wake_daemon(self, db_path):
+        service = SchedulerService(db_path)
+        daemon = SchedulerDaemon(db_path, poll_interval=3600, service=service)
+        daemon._load_schedule()
+        assert not daemon._wake.is_set()
+
+        service.create_scheduled_task("daily", "0 2 * * *", "shell")
+        assert daemon._wake.is_set()
+        assert daemon._seconds_until_next() == 0
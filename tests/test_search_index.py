@@ -0,0 +1,272 @@
+"""
+Tests for the Full-Text Search Index
+
+Tests:
+- Trigger sync on insert, update and delete
+- BM25 ranking and snippet highlighting
+- Backfill of existing rows (schema setup and migration)
+- Query building for punctuation and FTS5 syntax
+- Index-backed query plans
+"""
+
+import importlib.util
+import json
+import os
+import sqlite3
+
+# Add parent directory to path for imports
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services import search_index  # noqa: E402
+from services.search_index import (  # noqa: E402
+    build_match_query,
+    ensure_search_schema,
+    fts_filter,
+    search,
+    search_source,
+)
+
+pytestmark = pytest.mark.skipif(
+    not search_index.fts5_available(sqlite3.connect(":memory:")),
+    reason="SQLite built without FTS5",
+)
+
+_SCHEMA = """
+CREATE TABLE activity_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER,
+    action TEXT NOT NULL,
+    entity_type TEXT,
+    entity_id INTEGER,
+    details TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE task_queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_type TEXT NOT NULL,
+    task_data TEXT,
+    priority INTEGER DEFAULT 0,
+    status TEXT DEFAULT 'pending',
+    assigned_worker TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE errors (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    error_type TEXT NOT NULL,
+    message TEXT,
+    source TEXT,
+    status TEXT DEFAULT 'open',
+    occurrence_count INTEGER DEFAULT 1,
+    last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE task_comments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    author TEXT,
+    comment_type TEXT DEFAULT 'note',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+
+@pytest.fixture
+def conn():
+    """Create a temporary database with the indexed tables."""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    connection = sqlite3.connect(path)
+    connection.executescript(_SCHEMA)
+    yield connection
+    connection.close()
+    os.unlink(path)
+
+
+def _add_task(conn, title, description=None, task_type="shell"):
+    data = {"title": title}
+    if description:
+        data["description"] = description
+    return conn.execute(
+        "INSERT INTO task_queue (task_type, task_data) VALUES (?, ?)",
+        (task_type, json.dumps(data)),
+    ).lastrowid
+
+
+def _add_error(conn, message, error_type="TypeError", source="app.js"):
+    return conn.execute(
+        "INSERT INTO errors (error_type, message, source) VALUES (?, ?, ?)",
+        (error_type, message, source),
+    ).lastrowid
+
+
+def _ids(results):
+    return [r["id"] for r in results]
+
+
+class TestTriggerSync:
+    """Test that the indexes follow their source tables."""
+
+    def test_insert_update_delete(self, conn):
+        ensure_search_schema(conn)
+        task_id = _add_task(conn, "Deploy staging", "Roll out the payments service")
+        assert _ids(search_source(conn, "tasks", "payments")) == [task_id]
+
+        conn.execute(
+            "UPDATE task_queue SET task_data = ? WHERE id = ?",
+            (json.dumps({"title": "Deploy staging", "description": "Restart billing"}), task_id),
+        )
+        assert search_source(conn, "tasks", "payments") == []
+        assert _ids(search_source(conn, "tasks", "billing")) == [task_id]
+
+        conn.execute("DELETE FROM task_queue WHERE id = ?", (task_id,))
+        assert search_source(conn, "tasks", "deploy") == []
+        conn.execute("INSERT INTO task_fts(task_fts) VALUES ('integrity-check')")
+
+    def test_unindexed_updates_leave_index_alone(self, conn):
+        ensure_search_schema(conn)
+        error_id = _add_error(conn, "Cannot read property of undefined")
+        conn.execute(
+            "UPDATE errors SET occurrence_count = occurrence_count + 1, status = 'resolved'"
+        )
+        conn.execute("UPDATE errors SET message = 'Connection reset' WHERE id = ?", (error_id,))
+
+        assert search_source(conn, "errors", "undefined") == []
+        assert _ids(search_source(conn, "errors", "reset")) == [error_id]
+        conn.execute("INSERT INTO error_fts(error_fts) VALUES ('integrity-check')")
+
+    def test_tasks_without_json_are_indexed_by_type(self, conn):
+        ensure_search_schema(conn)
+        conn.execute("INSERT INTO task_queue (task_type, task_data) VALUES ('backup', 'not json')")
+        conn.execute("DELETE FROM task_queue WHERE task_type = 'backup'")
+        conn.execute("INSERT INTO task_queue (task_type, task_data) VALUES ('backup', NULL)")
+        assert len(search_source(conn, "tasks", "backup")) == 1
+        conn.execute("INSERT INTO task_fts(task_fts) VALUES ('integrity-check')")
+
+
+class TestRanking:
+    """Test BM25 ordering, snippets and filters."""
+
+    def test_title_matches_rank_first(self, conn):
+        ensure_search_schema(conn)
+        body = _add_task(conn, "Nightly job", "Clean up the deploy cache")
+        title = _add_task(conn, "Deploy web servers")
+        for i in range(10):
+            _add_task(conn, f"Unrelated work {i}")
+
+        results = search_source(conn, "tasks", "deploy")
+        assert _ids(results) == [title, body]
+        assert results[0]["score"] > results[1]["score"]
+
+    def test_snippet_highlights_terms(self, conn):
+        ensure_search_schema(conn)
+        conn.execute(
+            "INSERT INTO task_comments (task_id, content) VALUES (1, ?)",
+            ("The worker timed out while uploading the release artifacts",),
+        )
+        result = search(conn, "upload", sources=["comments"])["comments"][0]
+        assert "<mark>uploading</mark>" in result["snippet"]
+        assert result["task_id"] == 1
+
+    def test_snippet_escapes_row_text(self, conn):
+        ensure_search_schema(conn)
+        conn.execute(
+            "INSERT INTO task_comments (task_id, content) VALUES (1, ?)",
+            ('<img src=x onerror="alert(1)"> upload & <b>retry</b>',),
+        )
+        snippet = search(conn, "upload", sources=["comments"])["comments"][0]["snippet"]
+        assert "<img" not in snippet and "<b>" not in snippet
+        assert "&lt;img src=x onerror=&quot;alert(1)&quot;&gt;" in snippet
+        assert "<mark>upload</mark> &amp; &lt;b&gt;retry&lt;/b&gt;" in snippet
+
+    def test_terms_are_anded_and_filtered(self, conn):
+        ensure_search_schema(conn)
+        both = _add_error(conn, "Database timeout on deploy")
+        _add_error(conn, "Database locked")
+        archived = _add_error(conn, "Deploy timeout on database")
+        conn.execute("UPDATE errors SET status = 'archived' WHERE id = ?", (archived,))
+
+        assert set(_ids(search_source(conn, "errors", "database timeout"))) == {both, archived}
+        assert _ids(
+            search_source(
+                conn, "errors", "database timeout", where="s.status != ?", params=["archived"]
+            )
+        ) == [both]
+
+
+class TestBackfill:
+    """Test that existing rows are indexed."""
+
+    def test_schema_setup_backfills_and_repairs(self, conn):
+        conn.execute(
+            """INSERT INTO activity_log (action, entity_type, details)
+            VALUES ('create', 'project', 'Apollo')"""
+        )
+        assert "activity" in ensure_search_schema(conn)
+        assert len(search_source(conn, "activity", "apollo")) == 1
+        assert ensure_search_schema(conn) == []
+
+        # Rows written while a trigger was missing are picked up again
+        conn.execute("DROP TRIGGER trg_activity_fts_insert")
+        conn.execute(
+            """INSERT INTO activity_log (action, entity_type, details)
+            VALUES ('create', 'project', 'Apollo 2')"""
+        )
+        assert ensure_search_schema(conn) == ["activity"]
+        assert len(search_source(conn, "activity", "apollo")) == 2
+
+    def test_migration_backfills(self, conn):
+        _add_task(conn, "Rotate certificates")
+        _add_error(conn, "Certificate expired")
+        conn.execute(
+            "INSERT INTO task_comments (task_id, content) VALUES (1, 'certificate renewed')"
+        )
+        conn.commit()
+
+        path = Path(__file__).parent.parent / "migrations" / "059_fts_search.py"
+        spec = importlib.util.spec_from_file_location("migration_059", str(path))
+        migration = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(migration)
+        migration.upgrade(conn)
+
+        results = search(conn, "certif")
+        assert {name: len(rows) for name, rows in results.items()} == {
+            "activity": 0,
+            "tasks": 1,
+            "errors": 1,
+            "comments": 1,
+        }
+
+
+class TestQueries:
+    """Test query building and plans."""
+
+    @pytest.mark.parametrize(
+        "text",
+        ['"unbalanced', "NOT AND OR", "a:b (c*", "col:value", "^start", "-flag", "x NEAR(y)"],
+    )
+    def test_fts_syntax_is_quoted(self, conn, text):
+        ensure_search_schema(conn)
+        _add_error(conn, "col value flag start")
+        search_source(conn, "errors", text)
+
+    def test_build_match_query(self):
+        assert build_match_query('say "hi" now') == '"say"* """hi"""* "now"*'
+        assert build_match_query("  -- ** ") is None
+
+    def test_filter_uses_index(self, conn):
+        ensure_search_schema(conn)
+        plan = " ".join(
+            row[3]
+            for row in conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM errors e WHERE {fts_filter('errors', 'e.id')}",
+                ["timeout"],
+            )
+        )
+        assert "SCAN error_fts VIRTUAL TABLE INDEX" in plan
+        assert "SEARCH e USING INTEGER PRIMARY KEY" in plan
@@ -0,0 +1,446 @@
+"""
+Tests for incremental Google Sheets sync
+
+Runs against a local fake of the gspread spreadsheet/worksheet API that
+counts calls.
+
+Tests:
+- Row-level diff ranges and A1 helpers
+- Snapshot baselines, single batch_update per commit, format changes
+- Watermark skips and user edits forcing a rewrite
+- full_sync cycles: one sheet read and only changed cells written
+"""
+
+import sqlite3
+
+# Add parent directory to path for imports
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from workers import sheets_sync  # noqa: E402
+from workers.sheets_diff import (  # noqa: E402
+    SheetSnapshot,
+    SheetWriter,
+    column_letter,
+    diff_ranges,
+    grid_range,
+)
+
+
+class FakeWorksheet:
+    """In-memory worksheet with the gspread methods sheets_sync uses."""
+
+    def __init__(self, spreadsheet, title, sheet_id, rows=200, cols=15):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.id = sheet_id
+        self.row_count = rows
+        self.col_count = cols
+        self.cells = {}  # (row, col) 0-based -> text
+        self.formats = {}  # (row, col) -> format dict
+
+    def _call(self, name):
+        self.spreadsheet.calls[name] += 1
+
+    def values(self):
+        if not self.cells:
+            return []
+        height = max(r for r, _ in self.cells) + 1
+        grid = []
+        for r in range(height):
+            cols = [c for (row, c) in self.cells if row == r]
+            width = max(cols) + 1 if cols else 0
+            grid.append([self.cells.get((r, c), "") for c in range(width)])
+        return grid
+
+    def get_all_values(self):
+        self._call("get_all_values")
+        return self.values()
+
+    def acell(self, label):
+        self._call("acell")
+        return type("Cell", (), {"value": self.cells.get((0, 0))})()
+
+    def clear(self):
+        self._call("clear")
+        self.cells = {}
+
+    def update(self, values=None, range_name=None, *args):
+        self._call("update")
+        if isinstance(values, str):  # Positional (range, values) form
+            range_name, values = values, range_name
+        start = grid_range(range_name.split(":")[0], self.id)
+        for r, row in enumerate(values):
+            for c, value in enumerate(row):
+                self._set(start["startRowIndex"] + r, start["startColumnIndex"] + c, value)
+
+    def update_acell(self, label, value):
+        self._call("update_acell")
+        start = grid_range(label, self.id)
+        self._set(start["startRowIndex"], start["startColumnIndex"], value)
+
+    def format(self, range_name, fmt):
+        self._call("format")
+
+    def _set(self, row, col, value):
+        text = "" if value is None else str(value)
+        if text:
+            self.cells[(row, col)] = text
+        else:
+            self.cells.pop((row, col), None)
+
+
+class FakeSpreadsheet:
+    """In-memory spreadsheet applying batch_update requests."""
+
+    title = "Fake"
+
+    def __init__(self):
+        self.calls = Counter()
+        self.sheets = {}
+        self.requests = []  # Every request from every batch_update
+
+    def add(self, title, values=None):
+        ws = FakeWorksheet(self, title, len(self.sheets) + 1)
+        for r, row in enumerate(values or []):
+            for c, value in enumerate(row):
+                ws._set(r, c, value)
+        self.sheets[title] = ws
+        return ws
+
+    def worksheets(self):
+        self.calls["worksheets"] += 1
+        return list(self.sheets.values())
+
+    def worksheet(self, title):
+        self.calls["worksheet"] += 1
+        if title not in self.sheets:
+            raise KeyError(title)
+        return self.sheets[title]
+
+    def add_worksheet(self, title, rows=200, cols=15):
+        self.calls["add_worksheet"] += 1
+        ws = self.add(title)
+        ws.row_count, ws.col_count = rows, cols
+        return ws
+
+    def values_batch_get(self, ranges):
+        self.calls["values_batch_get"] += 1
+        result = []
+        for name in ranges:
+            title = name[1:-1].replace("''", "'")
+            values = self.sheets[title].values()
+            result.append({"range": name, **({"values": values} if values else {})})
+        return {"valueRanges": result}
+
+    def batch_update(self, body):
+        self.calls["batch_update"] += 1
+        by_id = {ws.id: ws for ws in self.sheets.values()}
+        for request in body["requests"]:
+            self.requests.append(request)
+            if "updateCells" in request:
+                spec = request["updateCells"]
+                ws = by_id[spec["start"]["sheetId"]]
+                for r, row in enumerate(spec["rows"]):
+                    for c, cell in enumerate(row["values"]):
+                        value = next(iter(cell.get("userEnteredValue", {}).values()), "")
+                        row_index = spec["start"]["rowIndex"] + r
+                        col_index = spec["start"]["columnIndex"] + c
+                        assert row_index < ws.row_count and col_index < ws.col_count
+                        ws._set(row_index, col_index, value)
+            elif "repeatCell" in request:
+                spec = request["repeatCell"]
+                grid = spec["range"]
+                ws = by_id[grid["sheetId"]]
+                for r in range(grid["startRowIndex"], grid["endRowIndex"]):
+                    for c in range(grid["startColumnIndex"], grid["endColumnIndex"]):
+                        ws.formats[(r, c)] = spec["cell"]["userEnteredFormat"]
+            elif "updateSheetProperties" in request:
+                props = request["updateSheetProperties"]["properties"]
+                ws = by_id[props["sheetId"]]
+                ws.row_count = props["gridProperties"].get("rowCount", ws.row_count)
+                ws.col_count = props["gridProperties"].get("columnCount", ws.col_count)
+        return {}
+
+    def cells_written(self, title=None):
+        sheet_ids = {ws.id for ws in self.sheets.values() if title in (None, ws.title)}
+        return sum(
+            len(row["values"])
+            for r in self.requests
+            if "updateCells" in r and r["updateCells"]["start"]["sheetId"] in sheet_ids
+            for row in r["updateCells"]["rows"]
+        )
+
+
+@pytest.fixture
+def spreadsheet():
+    return FakeSpreadsheet()
+
+
+def _writer(spreadsheet, tmp_path):
+    return SheetWriter(spreadsheet, SheetSnapshot.load(tmp_path / "snapshot.json", "sheet-1"))
+
+
+class TestDiff:
+    """Test diff ranges and A1 helpers."""
+
+    def test_changed_cells_only(self):
+        old = [["ID", "Title"], ["1", "a"], ["2", "b"]]
+        assert diff_ranges(old, [["ID", "Title"], [1, "a"], [2, "B"]]) == [(3, 2, [["B"]])]
+
+    def test_adjacent_rows_merge_and_removed_rows_clear(self):
+        old = [["h"], ["1", "x", "y"], ["2", "x", "y"], ["3"]]
+        new = [["h"], [1, "X", "Y"], [2, "X", "Y"]]
+        assert diff_ranges(old, new) == [(2, 2, [["X", "Y"], ["X", "Y"]]), (4, 1, [[""]])]
+
+    def test_a1_helpers(self):
+        assert [column_letter(n) for n in (1, 26, 27, 52)] == ["A", "Z", "AA", "AZ"]
+        assert grid_range("B2:C5", 7) == {
+            "sheetId": 7,
+            "startRowIndex": 1,
+            "endRowIndex": 5,
+            "startColumnIndex": 1,
+            "endColumnIndex": 3,
+        }
+
+
+class TestSheetWriter:
+    """Test snapshots, batching and skips."""
+
+    def test_snapshot_keyed_by_spreadsheet(self, spreadsheet, tmp_path):
+        writer = _writer(spreadsheet, tmp_path)
+        writer.stage("Errors", [["ID"], [1]])
+        writer.commit()
+
+        other = SheetSnapshot.load(tmp_path / "snapshot.json", "sheet-2")
+        assert other.sheets == {}
+        other.sheets["Errors"] = {"values": [["ID"], ["9"]]}
+        other.save()
+
+        # Each spreadsheet diffs against its own baseline
+        first = SheetSnapshot.load(tmp_path / "snapshot.json", "sheet-1")
+        assert first.sheets["Errors"]["values"] == [["ID"], ["1"]]
+        spreadsheet.calls.clear()
+        writer = _writer(spreadsheet, tmp_path)
+        writer.stage("Errors", [["ID"], [1]])
+        writer.commit()
+        assert spreadsheet.calls["batch_update"] == 0
+
+    def test_first_commit_reads_baseline_then_one_batch(self, spreadsheet, tmp_path):
+        spreadsheet.add("Errors", [["stale", "x"], ["old"], ["old"]])
+        writer = _writer(spreadsheet, tmp_path)
+        writer.stage(
+            "Errors", [["ID", "Message"], [1, "boom"]], {"A1:B1": {"textFormat": {"bold": True}}}
+        )
+        writer.stage("Tasks", [["ID"], [5]])
+        writer.commit()
+
+        assert spreadsheet.sheets["Errors"].values() == [["ID", "Message"], ["1", "boom"]]
+        assert spreadsheet.sheets["Tasks"].values() == [["ID"], ["5"]]
+        assert spreadsheet.calls["values_batch_get"] == 1
+        assert spreadsheet.calls["batch_update"] == 1
+        assert spreadsheet.sheets["Errors"].formats[(0, 1)] == {"textFormat": {"bold": True}}
+
+    def test_unchanged_commit_sends_nothing(self, spreadsheet, tmp_path):
+        rows = [["ID", "Message"], [1, "boom"]]
+        formats = {"A1:B1": {"textFormat": {"bold": True}}}
+        writer = _writer(spreadsheet, tmp_path)
+        writer.stage("Errors", rows, formats)
+        writer.commit()
+
+        # A new process picks the snapshot up from disk
+        spreadsheet.calls.clear()
+        writer = _writer(spreadsheet, tmp_path)
+        writer.stage("Errors", rows, formats)
+        stats = writer.commit()
+        assert spreadsheet.calls["batch_update"] == spreadsheet.calls["values_batch_get"] == 0
+        assert stats["unchanged"] == 1
+
+    def test_new_worksheet_not_read(self, spreadsheet, tmp_path):
+        writer = _writer(spreadsheet, tmp_path)
+        writer.stage("Tasks", [["ID"], [5]])
+        writer.commit()
+        assert spreadsheet.calls["add_worksheet"] == 1
+        assert spreadsheet.calls["values_batch_get"] == 0
+
+    def test_one_changed_cell(self, spreadsheet, tmp_path):
+        writer = _writer(spreadsheet, tmp_path)
+        rows = [["ID", "Status"]] + [[i, "open"] for i in range(100)]
+        writer.stage("Bugs", rows)
+        writer.commit()
+        before = spreadsheet.cells_written()
+
+        rows[50][1] = "resolved"
+        writer.stage("Bugs", rows)
+        writer.commit()
+        assert spreadsheet.cells_written() - before == 1
+        assert spreadsheet.sheets["Bugs"].values()[50] == ["49", "resolved"]
+
+    def test_grid_grows_and_formats_move(self, spreadsheet, tmp_path):
+        spreadsheet.add("Bugs")
+        writer = _writer(spreadsheet, tmp_path)
+        writer.stage("Bugs", [["h"]], {"A1": {"textFormat": {"bold": True}}})
+        writer.commit()
+        writer.stage(
+            "Bugs", [["h"]] + [[i] for i in range(250)], {"A2": {"textFormat": {"bold": True}}}
+        )
+        writer.commit()
+
+        ws = spreadsheet.sheets["Bugs"]
+        assert ws.row_count == 251
+        assert ws.formats[(0, 0)] == {}
+        assert ws.formats[(1, 0)] == {"textFormat": {"bold": True}}
+
+    def test_watermark_and_user_edits(self, spreadsheet, tmp_path):
+        writer = _writer(spreadsheet, tmp_path)
+        writer.stage("Bugs", [["ID"], [1]], watermark=[["bugs", 1, "t1", 3]])
+        writer.commit()
+
+        writer = _writer(spreadsheet, tmp_path)
+        assert writer.is_current("Bugs", [["bugs", 1, "t1", 3]])
+        assert not writer.is_current("Bugs", [["bugs", 1, "t2", 4]])
+        assert not writer.is_current("Bugs", None)
+
+        # A user edit seen on read means the sheet no longer matches the snapshot
+        spreadsheet.sheets["Bugs"].update_acell("A2", "edited")
+        writer.read(["Bugs", "Missing"])
+        assert not writer.is_current("Bugs", [["bugs", 1, "t1", 3]])
+        writer.stage("Bugs", [["ID"], [1]], watermark=[["bugs", 1, "t1", 3]])
+        writer.commit()
+        assert spreadsheet.sheets["Bugs"].values() == [["ID"], ["1"]]
+
+
+SCHEMA = """
+    CREATE TABLE projects (
+        id INTEGER PRIMARY KEY, name TEXT, description TEXT, status TEXT DEFAULT 'active',
+        source_path TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE milestones (
+        id INTEGER PRIMARY KEY, name TEXT, project_id INTEGER, status TEXT, target_date TEXT,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE features (
+        id INTEGER PRIMARY KEY, name TEXT, description TEXT, status TEXT, priority INTEGER,
+        assigned_to TEXT, tmux_session TEXT, project_id INTEGER, milestone_id INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE bugs (
+        id INTEGER PRIMARY KEY, project_id INTEGER, title TEXT, description TEXT,
+        severity TEXT, status TEXT, assigned_to TEXT, tmux_session TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE task_queue (
+        id INTEGER PRIMARY KEY, task_type TEXT, task_data TEXT, priority INTEGER,
+        status TEXT DEFAULT 'pending', assigned_worker TEXT, error_message TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, started_at TIMESTAMP, completed_at TIMESTAMP
+    );
+    CREATE TABLE errors (
+        id INTEGER PRIMARY KEY, error_type TEXT, message TEXT, source TEXT, status TEXT,
+        occurrence_count INTEGER DEFAULT 1, first_seen TEXT, last_seen TEXT
+    );
+    CREATE TABLE tmux_sessions (id INTEGER PRIMARY KEY, session_name TEXT, attached INTEGER);
+"""
+
+
+@pytest.fixture
+def sync_env(tmp_path, monkeypatch):
+    """sheets_sync pointed at a temp database, snapshot and fake spreadsheet."""
+    db_path = tmp_path / "architect.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    conn.execute("INSERT INTO projects (id, name) VALUES (1, 'Core')")
+    conn.executemany(
+        "INSERT INTO bugs (project_id, title, severity, status) VALUES (1, ?, 'high', 'open')",
+        [(f"Bug {i}",) for i in range(30)],
+    )
+    conn.execute(
+        "INSERT INTO task_queue (task_type, task_data, priority)"
+        " VALUES ('dev', '{\"title\": \"t\"}', 5)"
+    )
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(sheets_sync, "DB_PATH", db_path)
+    monkeypatch.setattr(sheets_sync, "SNAPSHOT_FILE", tmp_path / "snapshot.json")
+    monkeypatch.setattr(sheets_sync, "LOG_FILE", tmp_path / "sync.log")
+    monkeypatch.setattr(sheets_sync, "get_tmux_sessions", lambda: [])
+    monkeypatch.setattr(sheets_sync, "get_worker_progress", lambda: [])
+    monkeypatch.setattr(sheets_sync, "get_environment_data", lambda: None)
+    monkeypatch.setattr(sheets_sync, "sync_architecture_setup_to_sheet", lambda s, w=None: None)
+    monkeypatch.setattr(sheets_sync, "sync_architecture_to_google_doc", lambda c: None)
+
+    spreadsheet = FakeSpreadsheet()
+    client = type("Client", (), {"open_by_key": lambda self, key: spreadsheet})()
+    return db_path, spreadsheet, client
+
+
+class TestFullSync:
+    """Test complete sync cycles against the fake spreadsheet."""
+
+    def test_second_cycle_writes_only_changes(self, sync_env):
+        db_path, spreadsheet, client = sync_env
+        assert sheets_sync.full_sync(client)
+        bugs = spreadsheet.sheets["Bugs"].values()
+        assert bugs[1][1] == "Bug 0" and bugs[-1][0] == "NEW"
+        assert spreadsheet.calls["batch_update"] == 1
+
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "UPDATE bugs SET status = 'resolved', updated_at = '2099-01-01 00:00:00'"
+            " WHERE title = 'Bug 7'"
+        )
+        conn.commit()
+        conn.close()
+
+        spreadsheet.calls.clear()
+        before = spreadsheet.cells_written("Bugs")
+        assert sheets_sync.full_sync(client)
+
+        # One read of the editable sheets, one write; no per-sheet clears or rewrites
+        assert spreadsheet.calls["values_batch_get"] == 1
+        assert spreadsheet.calls["batch_update"] == 1
+        assert spreadsheet.calls["clear"] == spreadsheet.calls["update"] == 0
+        assert spreadsheet.calls["get_all_values"] == spreadsheet.calls["acell"] == 0
+        assert spreadsheet.cells_written("Bugs") - before == 1
+        assert ["resolved"] == [
+            row[3] for row in spreadsheet.sheets["Bugs"].values() if row[1:2] == ["Bug 7"]
+        ]
+
+    def test_unchanged_sources_skip_queries(self, sync_env, monkeypatch):
+        _, spreadsheet, client = sync_env
+        sheets_sync.full_sync(client)
+
+        queried = []
+        for name in ("get_bugs", "get_tasks", "get_errors", "get_features_hierarchy"):
+            monkeypatch.setattr(sheets_sync, name, lambda name=name: queried.append(name))
+        sheets_sync.full_sync(client)
+        assert queried == []
+
+    def test_sheet_edits_applied_and_template_row_restored(self, sync_env):
+        db_path, spreadsheet, client = sync_env
+        sheets_sync.full_sync(client)
+
+        bugs_ws = spreadsheet.sheets["Bugs"]
+        new_row = len(bugs_ws.values())
+        bugs_ws.update_acell(f"B{new_row}", "Reported from sheet")
+        sheets_sync.full_sync(client)
+
+        conn = sqlite3.connect(db_path)
+        assert (
+            conn.execute(
+                "SELECT COUNT(*) FROM bugs WHERE title = 'Reported from sheet'"
+            ).fetchone()[0]
+            == 1
+        )
+        conn.close()
+        rows = bugs_ws.values()
+        assert rows[-1][:2] == ["NEW", "(Enter title here)"]
+        assert sum(1 for row in rows if row[1:2] == ["Reported from sheet"]) == 1
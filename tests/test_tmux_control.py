@@ -0,0 +1,230 @@
+"""
+Tests for the tmux Control Mode Client
+
+Tests:
+- Commands, errors and quoting over one control-mode connection
+- Change-driven session scans (unchanged panes are not re-captured)
+- Control session cleanup and no-server behaviour
+- Git branch cache invalidated by .git/HEAD changes
+"""
+
+import shutil
+import subprocess
+
+# Add parent directory to path for imports
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from workers.assigner_worker import SessionDetector, SessionStatus  # noqa: E402
+from workers.tmux_control import (  # noqa: E402
+    CONTROL_SESSION,
+    GitBranchCache,
+    TmuxControlClient,
+    TmuxControlError,
+)
+
+requires_tmux = pytest.mark.skipif(shutil.which("tmux") is None, reason="tmux not installed")
+
+
+class _TmuxServer:
+    """tmux server on a private socket."""
+
+    def __init__(self, socket_path):
+        self.socket_path = str(socket_path)
+
+    def run(self, *args):
+        return subprocess.run(
+            ["tmux", "-S", self.socket_path, *args], capture_output=True, text=True, timeout=10
+        )
+
+    def new_session(self, name, command="cat"):
+        result = self.run("new-session", "-d", "-s", name, "-x", "80", "-y", "24", command)
+        assert result.returncode == 0, result.stderr
+
+    def sessions(self):
+        return set(self.run("list-sessions", "-F", "#{session_name}").stdout.split())
+
+
+@pytest.fixture
+def tmux_server(tmp_path):
+    server = _TmuxServer(tmp_path / "tmux.sock")
+    server.new_session("agent1")
+    server.new_session("agent2")
+    yield server
+    server.run("kill-server")
+
+
+@pytest.fixture
+def client(tmux_server):
+    control = TmuxControlClient(socket_path=tmux_server.socket_path)
+    assert control.start()
+    yield control
+    control.close()
+
+
+@requires_tmux
+class TestControlClient:
+    """Test the control-mode connection."""
+
+    def test_commands_and_errors(self, client, tmux_server):
+        assert sorted(client.list_sessions()) == ["agent1", "agent2"]
+        assert CONTROL_SESSION in tmux_server.sessions()
+
+        with pytest.raises(TmuxControlError, match="can't find"):
+            client.capture_pane("missing")
+        # The connection stays usable after an error
+        assert client.display("agent1", "#{session_name}") == "agent1"
+
+    def test_quoting(self, client, tmux_server):
+        tmux_server.new_session("it's")
+        assert client.display("it's", "#{session_name} #{window_index}") == "it's 0"
+
+    def test_active_panes_in_one_command(self, client):
+        before = client.stats["commands"]
+        panes = {p.session: p for p in client.list_active_panes()}
+        assert set(panes) == {"agent1", "agent2"}
+        assert panes["agent1"].pane_id.startswith("%")
+        assert panes["agent1"].activity > 0
+        assert client.stats["commands"] == before + 1
+
+    def test_close_removes_control_session(self, client, tmux_server):
+        client.close()
+        assert not client.alive
+        assert tmux_server.sessions() == {"agent1", "agent2"}
+        with pytest.raises(TmuxControlError):
+            client.list_sessions()
+
+    def test_layout_change_callback(self, client, tmux_server):
+        changed = threading.Event()
+        client.on_layout_change = changed.set
+        tmux_server.new_session("agent3")
+        assert changed.wait(2)
+        assert client.layout_version > 0
+
+    def test_no_server(self, tmp_path):
+        control = TmuxControlClient(socket_path=str(tmp_path / "none.sock"))
+        assert control.start(timeout=2) is False
+        assert not (tmp_path / "none.sock").exists()
+
+
+@requires_tmux
+class TestControlModeScan:
+    """Test SessionDetector scans over the control connection."""
+
+    def test_only_changed_panes_are_captured(self, client, tmux_server):
+        detector = SessionDetector(control_client=client)
+        time.sleep(1.1)  # let session startup output fall into an earlier second
+
+        first = {s.name: s for s in detector.scan_all_sessions()}
+        assert set(first) == {"agent1", "agent2"}
+        assert detector.scan_stats["captures"] == 2
+
+        detector.scan_all_sessions()
+        assert detector.scan_stats["captures"] == 2
+        assert detector.scan_stats["cached"] == 2
+
+        tmux_server.run("send-keys", "-t", "agent2", "Processing files", "Enter")
+        time.sleep(0.3)
+        second = {s.name: s for s in detector.scan_all_sessions()}
+        assert detector.scan_stats["captures"] == 3
+        assert second["agent2"].status == SessionStatus.BUSY
+
+    def test_sessions_come_and_go(self, client, tmux_server):
+        detector = SessionDetector(control_client=client)
+        detector.scan_all_sessions()
+        tmux_server.run("kill-session", "-t", "agent1")
+        tmux_server.new_session("agent3")
+
+        assert {s.name for s in detector.scan_all_sessions()} == {"agent2", "agent3"}
+        assert set(detector._pane_cache) == {"agent2", "agent3"}
+
+    def test_reconnects_after_connection_loss(self, client, tmux_server):
+        detector = SessionDetector(control_client=client)
+        client.close()
+        assert len(detector.scan_all_sessions()) == 2
+        assert client.alive
+        assert client.stats["connects"] == 2
+
+
+class TestGitBranchCache:
+    """Test branch lookups from .git/HEAD."""
+
+    def _repo(self, path, head="ref: refs/heads/main\n"):
+        (path / ".git").mkdir(parents=True)
+        (path / ".git" / "HEAD").write_text(head)
+        return path
+
+    def test_reads_branch_and_caches(self, tmp_path):
+        repo = self._repo(tmp_path / "repo")
+        (repo / "src" / "pkg").mkdir(parents=True)
+        cache = GitBranchCache()
+
+        assert cache.get_branch(str(repo / "src" / "pkg")) == "main"
+        assert cache.get_branch(str(repo / "src" / "pkg")) == "main"
+        assert cache.get_branch(str(repo)) == "main"
+        assert cache.stats["reads"] == 1
+
+    def test_head_change_invalidates(self, tmp_path):
+        repo = self._repo(tmp_path / "repo")
+        cache = GitBranchCache()
+        assert cache.get_branch(str(repo)) == "main"
+
+        # git writes HEAD.lock and renames it over HEAD
+        (repo / ".git" / "HEAD.lock").write_text("ref: refs/heads/feature/x\n")
+        (repo / ".git" / "HEAD.lock").replace(repo / ".git" / "HEAD")
+        assert cache.get_branch(str(repo)) == "feature/x"
+
+        (repo / ".git" / "HEAD").write_text("3f2a9c0d1e\n")
+        assert cache.get_branch(str(repo)) == "HEAD"
+
+    def test_worktree_and_non_repo(self, tmp_path):
+        main = self._repo(tmp_path / "main")
+        gitdir = main / ".git" / "worktrees" / "wt"
+        gitdir.mkdir(parents=True)
+        (gitdir / "HEAD").write_text("ref: refs/heads/hotfix\n")
+        worktree = tmp_path / "wt"
+        worktree.mkdir()
+        (worktree / ".git").write_text(f"gitdir: {gitdir}\n")
+        (tmp_path / "plain").mkdir()
+        cache = GitBranchCache()
+
+        assert cache.get_branch(str(worktree)) == "hotfix"
+        assert cache.get_branch(str(tmp_path / "plain")) is None
+        assert cache.get_branch(None) is None
+
+    def test_matches_git(self, tmp_path):
+        if shutil.which("git") is None:
+            pytest.skip("git not installed")
+        repo = tmp_path / "repo"
+        subprocess.run(["git", "init", "-q", "-b", "trunk", str(repo)], check=True)
+        subprocess.run(
+            [
+                "git",
+                "-C",
+                str(repo),
+                "-c",
+                "user.name=t",
+                "-c",
+                "user.email=t@t",
+                "commit",
+                "-q",
+                "--allow-empty",
+                "-m",
+                "init",
+            ],
+            check=True,
+        )
+        subprocess.run(["git", "-C", str(repo), "checkout", "-q", "-b", "topic"], check=True)
+        expected = subprocess.run(
+            ["git", "-C", str(repo), "rev-parse", "--abbrev-ref", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        assert GitBranchCache().get_branch(str(repo)) == expected == "topic"
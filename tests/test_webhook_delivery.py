@@ -0,0 +1,306 @@
+"""
+Tests for the Webhook Delivery Engine
+
+Tests:
+- Subscription cache matching and invalidation
+- Outbox deliveries with batched delivery logs
+- Retries scheduled with backoff (no blocking sleeps)
+- Per-endpoint concurrency limits
+- Bulk events without a thread per event
+"""
+
+import os
+import sqlite3
+
+# Add parent directory to path for imports
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import webhooks  # noqa: E402
+from webhooks import (  # noqa: E402
+    DELIVERY_CONFIG,
+    WebhookDispatcher,
+    create_webhook,
+    update_webhook,
+)
+
+MIGRATION = Path(__file__).parent.parent / "migrations" / "017_task_webhooks.sql"
+
+
+@pytest.fixture
+def db_path():
+    """Create a temporary database with the webhook tables."""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(MIGRATION.read_text())
+    webhooks.ensure_webhook_schema(conn)
+    conn.commit()
+    conn.close()
+    yield path
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+
+class _Endpoint:
+    """Local HTTP server recording webhook requests."""
+
+    def __init__(self, fail_first=0, delay=0.0):
+        self.fail_first = fail_first
+        self.delay = delay
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                with endpoint.lock:
+                    endpoint.active += 1
+                    endpoint.max_active = max(endpoint.max_active, endpoint.active)
+                    endpoint.requests.append((self.path, body, self.client_address[1]))
+                    status = 500 if len(endpoint.requests) <= endpoint.fail_first else 200
+                time.sleep(endpoint.delay)
+                with endpoint.lock:
+                    endpoint.active -= 1
+                self.send_response(status)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def endpoint():
+    server = _Endpoint()
+    yield server
+    server.close()
+
+
+def _add_webhook(db_path, name, url, **kwargs):
+    conn = sqlite3.connect(db_path)
+    webhook_id = create_webhook(conn, name, url, **kwargs)
+    conn.commit()
+    conn.close()
+    webhooks.invalidate_subscriptions()
+    return webhook_id
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def _count(db_path, table, where="1=1"):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def dispatcher(db_path, monkeypatch):
+    """Dispatcher registered as the db's default, closed after the test."""
+    instance = WebhookDispatcher(db_path, max_workers=4, endpoint_concurrency=2)
+    monkeypatch.setitem(webhooks._dispatchers, str(db_path), instance)
+    yield instance
+    instance.close()
+
+
+class TestSubscriptionCache:
+    """Test in-memory webhook matching."""
+
+    def test_matches_events_and_task_types(self, db_path, endpoint):
+        every = _add_webhook(db_path, "all", endpoint.url)
+        shell_done = _add_webhook(
+            db_path, "shell", endpoint.url, events=["task.completed"], task_types=["shell"]
+        )
+        cache = webhooks.SubscriptionCache(db_path)
+
+        assert {s.id for s in cache.match("task.completed", "shell")} == {every, shell_done}
+        assert {s.id for s in cache.match("task.completed", "python")} == {every}
+        assert {s.id for s in cache.match("task.failed", "shell")} == {every}
+        assert {s.id for s in cache.match("task.custom", "shell")} == set()
+
+    def test_reloads_after_changes(self, db_path, endpoint):
+        webhook_id = _add_webhook(db_path, "hook", endpoint.url)
+        cache = webhooks.SubscriptionCache(db_path, ttl=3600)
+        assert cache.get(webhook_id) is not None
+
+        conn = sqlite3.connect(db_path)
+        update_webhook(conn, webhook_id, enabled=False)
+        # A reload before the commit must not pin the old row
+        assert cache.get(webhook_id) is not None
+        conn.commit()
+        conn.close()
+        webhooks.invalidate_subscriptions()
+        assert cache.get(webhook_id) is None
+
+
+class TestWebhookDispatcher:
+    """Test outbox delivery."""
+
+    def test_delivers_and_logs(self, db_path, endpoint, dispatcher):
+        webhook_id = _add_webhook(db_path, "hook", endpoint.url, secret="s3cret")
+        queued = webhooks.trigger_task_event(
+            db_path, 7, "task.completed", "shell", new_status="completed", result="done"
+        )
+
+        assert queued == 1
+        assert _wait_for(lambda: _count(db_path, "webhook_deliveries") == 1)
+        assert _count(db_path, "webhook_outbox") == 0
+        delivery = webhooks.get_deliveries(sqlite3.connect(db_path), webhook_id=webhook_id)[0]
+        assert delivery["success"] == 1
+        assert delivery["task_id"] == 7
+        assert delivery["payload"]["task"]["result"] == "done"
+
+    def test_failed_attempts_are_rescheduled(self, db_path, dispatcher, monkeypatch):
+        monkeypatch.setitem(DELIVERY_CONFIG, "retry_base_delay", 0.05)
+        server = _Endpoint(fail_first=2)
+        try:
+            _add_webhook(db_path, "flaky", server.url, retry_count=3)
+            webhooks.trigger_task_event(db_path, 1, "task.failed", "shell")
+
+            assert _wait_for(lambda: _count(db_path, "webhook_deliveries", "success = 1") == 1)
+            assert _count(db_path, "webhook_deliveries", "success = 0") == 2
+            assert _count(db_path, "webhook_outbox") == 0
+            assert dispatcher.get_stats()["retried"] == 2
+        finally:
+            server.close()
+
+    def test_gives_up_after_max_attempts(self, db_path, dispatcher, monkeypatch):
+        monkeypatch.setitem(DELIVERY_CONFIG, "retry_base_delay", 0.01)
+        server = _Endpoint(fail_first=100)
+        try:
+            _add_webhook(db_path, "down", server.url, retry_count=2)
+            webhooks.trigger_task_event(db_path, 1, "task.failed", "shell")
+
+            assert _wait_for(lambda: _count(db_path, "webhook_deliveries") == 2)
+            assert _wait_for(lambda: _count(db_path, "webhook_outbox") == 0)
+            time.sleep(0.1)
+            assert len(server.requests) == 2
+        finally:
+            server.close()
+
+    def test_endpoint_concurrency_limit(self, db_path, dispatcher):
+        server = _Endpoint(delay=0.05)
+        try:
+            _add_webhook(db_path, "slow", server.url)
+            for task_id in range(20):
+                webhooks.trigger_task_event(db_path, task_id, "task.created", "shell")
+
+            assert _wait_for(lambda: _count(db_path, "webhook_deliveries") == 20)
+            assert server.max_active <= dispatcher.endpoint_concurrency
+            # Deliveries are logged in batches, not one commit per attempt
+            assert dispatcher.get_stats()["log_batches"] < 20
+        finally:
+            server.close()
+
+    def test_bulk_events_use_bounded_threads(self, db_path, endpoint, dispatcher):
+        _add_webhook(db_path, "hook", endpoint.url)
+        baseline = threading.active_count()
+        for task_id in range(2000):
+            webhooks.trigger_task_event(db_path, task_id, "task.completed", "shell")
+        assert threading.active_count() <= baseline + dispatcher.max_workers + 1
+
+        assert _wait_for(lambda: _count(db_path, "webhook_deliveries") == 2000, timeout=60)
+        if webhooks.requests is not None:
+            # Keep-alive: far fewer client connections than requests
+            assert len({port for _, _, port in endpoint.requests}) <= dispatcher.max_workers
+
+    def test_results_kept_when_logging_fails(self, db_path, endpoint, dispatcher, monkeypatch):
+        _add_webhook(db_path, "hook", endpoint.url)
+        log_sql = webhooks._DELIVERY_LOG_SQL
+        monkeypatch.setattr(webhooks, "_DELIVERY_LOG_SQL", "INSERT INTO missing_table VALUES (?)")
+        webhooks.trigger_task_event(db_path, 1, "task.completed", "shell")
+
+        assert _wait_for(lambda: len(endpoint.requests) == 1)
+        time.sleep(0.1)
+        # The failed batch was rolled back and the endpoint slot released
+        assert _count(db_path, "webhook_deliveries") == 0
+        assert dispatcher.get_stats()["inflight"] == 0
+        conn = sqlite3.connect(db_path, timeout=1)
+        conn.execute("BEGIN IMMEDIATE")
+        conn.rollback()
+        conn.close()
+
+        monkeypatch.setattr(webhooks, "_DELIVERY_LOG_SQL", log_sql)
+        assert _wait_for(lambda: _count(db_path, "webhook_deliveries") == 1)
+        assert _count(db_path, "webhook_outbox") == 0
+        assert len(endpoint.requests) == 1
+
+    def test_unexpected_error_keeps_dispatching(self, db_path, endpoint, dispatcher, monkeypatch):
+        _add_webhook(db_path, "hook", endpoint.url)
+        dispatch_due = dispatcher._dispatch_due
+        calls = []
+
+        def flaky(conn):
+            calls.append(1)
+            if len(calls) == 1:
+                raise KeyError("bad row")
+            return dispatch_due(conn)
+
+        monkeypatch.setattr(dispatcher, "_dispatch_due", flaky)
+        webhooks.trigger_task_event(db_path, 1, "task.completed", "shell")
+        assert _wait_for(lambda: _count(db_path, "webhook_deliveries") == 1)
+        assert dispatcher._thread.is_alive()
+
+    def test_enqueue_restarts_dead_thread(self, db_path, endpoint, dispatcher):
+        _add_webhook(db_path, "hook", endpoint.url)
+        dispatcher._thread = threading.Thread(target=lambda: None)
+        dispatcher._thread.start()
+        dispatcher._thread.join()
+
+        webhooks.trigger_task_event(db_path, 1, "task.completed", "shell")
+        assert _wait_for(lambda: _count(db_path, "webhook_deliveries") == 1)
+
+    def test_outbox_survives_restart(self, db_path, endpoint):
+        webhook_id = _add_webhook(db_path, "hook", endpoint.url)
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            """INSERT INTO webhook_outbox
+                (webhook_id, event, task_id, payload, next_attempt_at, lease_until)
+            VALUES (?, 'task.completed', 3, '{"event": "task.completed"}', ?, ?)""",
+            (webhook_id, time.time(), time.time() - 1),  # lease of a crashed process
+        )
+        conn.commit()
+        conn.close()
+
+        dispatcher = WebhookDispatcher(db_path)
+        try:
+            subscriptions = dispatcher.subscriptions.match("task.created", "shell")
+            dispatcher.enqueue(subscriptions, "task.created", 4, {"event": "task.created"})
+            assert _wait_for(lambda: _count(db_path, "webhook_deliveries") == 2)
+        finally:
+            dispatcher.close()
+        assert _count(db_path, "webhook_outbox") == 0
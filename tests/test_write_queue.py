@@ -0,0 +1,226 @@
+"""
+Tests for the Write Queue and Read-Only Pool
+
+Tests:
+- Group commits through the single writer thread
+- Per-write savepoints (one failure does not roll back the batch)
+- Read-only (mode=ro) connections
+- Database class routing in write-queue mode
+- Write benchmark (performance)
+"""
+
+import os
+import sqlite3
+
+# Add parent directory to path for imports
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import db  # noqa: E402
+from db import (  # noqa: E402
+    WRITE_QUEUE_CONFIG,
+    ConnectionPool,
+    Database,
+    WriteQueue,
+    get_read_connection,
+    get_write_queue,
+)
+
+
+@pytest.fixture
+def db_path():
+    """Create a temporary database with a single table."""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+    conn.commit()
+    conn.close()
+    yield Path(path)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+
+@pytest.fixture
+def write_queue(db_path):
+    wq = WriteQueue(db_path, name="test")
+    yield wq
+    wq.close()
+
+
+def _names(path):
+    conn = sqlite3.connect(path)
+    try:
+        return {row[0] for row in conn.execute("SELECT name FROM items")}
+    finally:
+        conn.close()
+
+
+class TestWriteQueue:
+    """Test the single-writer group commit queue."""
+
+    def test_execute_returns_lastrowid(self, write_queue, db_path):
+        assert write_queue.execute("INSERT INTO items (name) VALUES (?)", ("a",)) == 1
+        assert write_queue.executemany("INSERT INTO items (name) VALUES (?)", [("b",), ("c",)]) == 2
+        assert _names(db_path) == {"a", "b", "c"}
+
+    def test_failed_write_only_rolls_back_itself(self, write_queue, db_path):
+        write_queue.execute("INSERT INTO items (name) VALUES ('dup')")
+
+        def partial(conn):
+            conn.execute("INSERT INTO items (name) VALUES ('partial')")
+            conn.execute("INSERT INTO items (name) VALUES ('dup')")
+
+        futures = [
+            write_queue.submit(lambda conn: conn.execute("INSERT INTO items (name) VALUES ('x')")),
+            write_queue.submit(partial),
+            write_queue.submit(lambda conn: conn.execute("INSERT INTO items (name) VALUES ('y')")),
+        ]
+        with pytest.raises(sqlite3.IntegrityError):
+            futures[1].result(5)
+        futures[0].result(5)
+        futures[2].result(5)
+        assert _names(db_path) == {"dup", "x", "y"}
+        assert write_queue.get_stats()["errors"] == 1
+
+    def test_commit_and_rollback_inside_function(self, write_queue, db_path):
+        def writes(conn):
+            conn.execute("INSERT INTO items (name) VALUES ('kept')")
+            conn.commit()  # the writer commits the whole batch later
+            conn.execute("INSERT INTO items (name) VALUES ('undone')")
+            conn.rollback()
+            return "ok"
+
+        assert write_queue.run(writes) == "ok"
+        assert _names(db_path) == {"kept"}
+
+        def nested(conn):
+            conn.execute("INSERT INTO items (name) VALUES ('outer')")
+            return write_queue.run(
+                lambda inner: inner.execute("INSERT INTO items (name) VALUES ('inner')").lastrowid
+            )
+
+        assert write_queue.run(nested) == 3
+        assert _names(db_path) == {"kept", "outer", "inner"}
+
+    def test_concurrent_writes_are_group_committed(self, write_queue, db_path):
+        barrier = threading.Barrier(16)
+
+        def writer(n):
+            barrier.wait()
+            for i in range(25):
+                write_queue.execute("INSERT INTO items (name) VALUES (?)", (f"{n}-{i}",))
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stats = write_queue.get_stats()
+        assert len(_names(db_path)) == 400
+        assert stats["writes"] == 400
+        assert stats["batches"] < 400
+        assert stats["latency"]["count"] == 400
+
+    @pytest.mark.parametrize(
+        "breaks_batch",
+        [
+            lambda conn: conn.execute("ROLLBACK"),
+            lambda conn: conn.executescript("INSERT INTO items (name) VALUES ('script');"),
+        ],
+    )
+    def test_write_ending_the_transaction_keeps_writer_alive(
+        self, write_queue, db_path, breaks_batch
+    ):
+        with pytest.raises(sqlite3.OperationalError):
+            write_queue.run(breaks_batch)
+
+        assert write_queue.execute("INSERT INTO items (name) VALUES ('after')")
+        assert "after" in _names(db_path)
+        assert write_queue._thread.is_alive()
+
+    def test_dead_writer_thread_is_restarted(self, write_queue, db_path):
+        write_queue._queue.put(None)  # stop the writer behind the queue's back
+        write_queue._thread.join(5)
+
+        assert write_queue.execute("INSERT INTO items (name) VALUES ('restarted')")
+        assert "restarted" in _names(db_path)
+
+    def test_close_flushes_pending_writes(self, db_path):
+        wq = WriteQueue(db_path, name="flush")
+        futures = [
+            wq.submit(
+                lambda conn, i=i: conn.execute("INSERT INTO items (name) VALUES (?)", (str(i),))
+            )
+            for i in range(50)
+        ]
+        wq.close()
+        assert all(f.done() for f in futures)
+        assert len(_names(db_path)) == 50
+        with pytest.raises(RuntimeError):
+            wq.submit(lambda conn: None)
+
+
+class TestReadOnly:
+    """Test read-only connections."""
+
+    def test_read_only_pool_rejects_writes(self, db_path):
+        pool = ConnectionPool(db_path, min_connections=1, max_connections=2, read_only=True)
+        try:
+            with pool.get_connection() as conn:
+                assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+            with pytest.raises(sqlite3.OperationalError, match="readonly"):
+                with pool.get_connection() as conn:
+                    conn.execute("INSERT INTO items (name) VALUES ('nope')")
+            assert pool.get_stats()["read_only"] is True
+        finally:
+            pool.close()
+
+    def test_reader_sees_committed_writes(self, db_path, write_queue, monkeypatch):
+        monkeypatch.setitem(db.DB_PATHS, "queue_test", db_path)
+        try:
+            write_queue.execute("INSERT INTO items (name) VALUES ('seen')")
+            with get_read_connection("queue_test") as conn:
+                assert conn.execute("SELECT name FROM items").fetchone()["name"] == "seen"
+        finally:
+            pool = db._pools.pop("queue_test:ro", None)
+            if pool:
+                pool.close()
+
+
+class TestDatabaseRouting:
+    """Test Database methods in write-queue mode."""
+
+    def test_database_uses_write_queue(self, db_path, monkeypatch):
+        monkeypatch.setitem(WRITE_QUEUE_CONFIG, "enabled", True)
+        database = Database(str(db_path))
+        try:
+            assert database.execute("INSERT INTO items (name) VALUES (?)", ("routed",)) == 1
+            assert get_write_queue(str(db_path)).get_stats()["writes"] == 1
+            assert database.query_one("SELECT name FROM items")["name"] == "routed"
+        finally:
+            db._write_queues.pop(str(db_path)).close()
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestWriteBenchmark:
+    """Benchmark: concurrent writers with and without the write queue."""
+
+    def test_compare_write_modes(self):
+        from write_benchmark import compare_write_modes
+
+        report = compare_write_modes(threads=16, writes_per_thread=50)
+        for mode in ("before", "after"):
+            assert report[mode]["writes"] == 800
+            assert report[mode]["errors"] == 0
+        assert report["after"]["queue"]["avg_batch"] > 1
@@ -211,6 +211,132 @@ class TestRateLimitService(TestDatabase):
         assert summary["total_violations"] >= 1
 
 
+class TestInMemoryLimiter(TestDatabase):
+    """Tests for the in-memory GCRA tier of RateLimitService."""
+
+    def test_disable_config_takes_effect_immediately(self, test_db):
+        """Test that config changes invalidate the cached limits."""
+        service = RateLimitService(lambda: test_db)
+        service.create_config(
+            rule_name="test",
+            scope="ip",
+            limit_type="requests_per_minute",
+            limit_value=1
+        )
+
+        assert service.check_limit("ip", "10.0.0.1", "default")[0]
+        assert not service.check_limit("ip", "10.0.0.1", "default")[0]
+
+        service.disable_config("test")
+        assert service.check_limit("ip", "10.0.0.1", "default")[0]
+
+    def test_limits_are_per_client(self, test_db):
+        """Test that one client's usage does not affect another."""
+        service = RateLimitService(lambda: test_db)
+        service.create_config(
+            rule_name="test",
+            scope="ip",
+            limit_type="requests_per_minute",
+            limit_value=1
+        )
+
+        assert service.check_limit("ip", "10.0.0.1", "default")[0]
+        assert not service.check_limit("ip", "10.0.0.1", "default")[0]
+        assert service.check_limit("ip", "10.0.0.2", "default")[0]
+
+    def test_gcra_refills_after_interval(self):
+        """Test that capacity returns one request per emission interval."""
+        tat = None
+        now = 1000.0
+        for _ in range(3):
+            tat = RateLimitService._gcra_next(tat, now, 3, 60)
+            assert tat is not None
+        assert RateLimitService._gcra_next(tat, now, 3, 60) is None
+        # One request becomes available every 20 seconds
+        assert RateLimitService._gcra_next(tat, now + 19, 3, 60) is None
+        assert RateLimitService._gcra_next(tat, now + 20, 3, 60) is not None
+
+    def test_expired_state_is_evicted(self, test_db, monkeypatch):
+        """Test that idle clients' GCRA state and cached limits are dropped."""
+        import services.rate_limiting as rate_limiting
+
+        service = RateLimitService(lambda: test_db)
+        service.MAX_LIMITS_CACHE = 50
+        service.create_config(
+            rule_name="test",
+            scope="ip",
+            limit_type="requests_per_minute",
+            limit_value=10
+        )
+        clients = [f"10.0.0.{i}" for i in range(100)]
+        for client in clients:
+            assert service.check_limit("ip", client, "default")[0]
+        assert sum(len(state) for state, _ in service._shards) == 100
+        assert len(service._limits_cache) <= 50
+
+        # Six seconds restore one of ten requests per minute: state has expired
+        now = rate_limiting.time.monotonic() + service.SWEEP_INTERVAL + 6
+        monkeypatch.setattr(rate_limiting.time, "monotonic", lambda: now)
+        assert service.check_limit("ip", clients[0], "default")[0]
+        assert sum(len(state) for state, _ in service._shards) < 100
+        assert service.evict_expired() > 0
+        assert sum(len(state) for state, _ in service._shards) == 1
+
+    def test_flush_buckets_batches_counts(self, test_db):
+        """Test that allowed requests are written to rate_limit_buckets on flush."""
+        service = RateLimitService(lambda: test_db)
+        service.create_config(
+            rule_name="test",
+            scope="ip",
+            limit_type="requests_per_minute",
+            limit_value=100
+        )
+
+        for _ in range(5):
+            service.check_limit("ip", "10.0.0.1", "default")
+        assert test_db.execute("SELECT COUNT(*) FROM rate_limit_buckets").fetchone()[0] == 0
+
+        assert service.flush_buckets() == 1
+        for _ in range(3):
+            service.check_limit("ip", "10.0.0.1", "default")
+        service.flush_buckets()
+
+        rows = test_db.execute(
+            "SELECT SUM(request_count), COUNT(*) FROM rate_limit_buckets"
+        ).fetchone()
+        assert rows[0] == 8
+        assert rows[1] <= 2  # Same minute bucket unless the minute rolled over
+
+    @pytest.mark.performance
+    def test_check_limit_microbenchmark(self, test_db):
+        """Benchmark per-check cost of the in-memory tier (target: < 20us)."""
+        import time
+
+        service = RateLimitService(lambda: test_db)
+        service.create_config(
+            rule_name="global",
+            scope="ip",
+            limit_type="requests_per_minute",
+            limit_value=10_000_000
+        )
+        service.create_config(
+            rule_name="hourly",
+            scope="ip",
+            limit_type="requests_per_hour",
+            limit_value=10_000_000
+        )
+        clients = [f"10.0.{i // 256}.{i % 256}" for i in range(1000)]
+        service.check_limit("ip", clients[0], "default")  # Warm config cache
+
+        iterations = 50_000
+        start = time.perf_counter()
+        for i in range(iterations):
+            service.check_limit("ip", clients[i % 1000], "default")
+        per_check_us = (time.perf_counter() - start) / iterations * 1_000_000
+
+        assert per_check_us < 20, f"check_limit took {per_check_us:.2f}us per check"
+
+
 class TestResourceMonitor(TestDatabase):
     """Tests for ResourceMonitor."""
 
@@ -3,21 +3,55 @@ Webhook Management Module for Task Events
 
 Provides functions for managing webhooks that receive notifications
 when task events occur (created, started, completed, failed, etc.).
+
+Deliveries go through a WebhookDispatcher rather than a thread per event:
+- Persistent outbox table (webhook_outbox); events survive restarts
+- Bounded worker pool with keep-alive HTTP sessions (requests, if installed)
+- Per-endpoint concurrency limit
+- Retries scheduled with exponential backoff instead of blocking sleeps
+- Delivery log rows written in batches
+- Subscriptions cached in memory, pre-indexed by event
+
+Usage:
+    import webhooks
+
+    webhooks.trigger_task_event(db_path, task_id, "task.completed", "shell")
+    webhooks.get_dispatcher(db_path).get_stats()
 """
 
+import atexit
 import hashlib
 import hmac
 import json
 import logging
+import os
 import sqlite3
 import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:  # deliveries fall back to urllib (no keep-alive)
+    requests = None
+
 logger = logging.getLogger(__name__)
 
+# Delivery engine settings
+DELIVERY_CONFIG = {
+    "max_workers": int(os.environ.get("WEBHOOK_MAX_WORKERS", "8")),
+    "endpoint_concurrency": int(os.environ.get("WEBHOOK_ENDPOINT_CONCURRENCY", "2")),
+    "retry_base_delay": 1.0,  # seconds; doubles per failed attempt
+    "subscription_ttl": 30.0,  # seconds before the subscription cache reloads
+    "lease_padding": 30.0,  # extra seconds an in-flight row stays leased
+}
+
 # Available task events that can trigger webhooks
 TASK_EVENTS = {
     "task.created": "Triggered when a new task is created",
@@ -122,6 +156,9 @@ def create_webhook(
 
     Returns:
         ID of created webhook
+
+    Call invalidate_subscriptions() after committing so dispatchers see
+    the new webhook.
     """
     if events is None:
         events = list(TASK_EVENTS.keys())
@@ -160,6 +197,8 @@ def update_webhook(conn, webhook_id: int, **kwargs) -> bool:
 
     Returns:
         True if updated, False if not found
+
+    Call invalidate_subscriptions() after committing.
     """
     updates = []
     params = []
@@ -205,7 +244,7 @@ def update_webhook(conn, webhook_id: int, **kwargs) -> bool:
 
 
 def delete_webhook(conn, webhook_id: int) -> bool:
-    """Delete a webhook."""
+    """Delete a webhook. Call invalidate_subscriptions() once committed."""
     result = conn.execute("DELETE FROM task_webhooks WHERE id = ?", (webhook_id,))
     return result.rowcount > 0
 
@@ -216,7 +255,12 @@ def sign_payload(payload: str, secret: str) -> str:
 
 
 def deliver_webhook(
-    url: str, payload: Dict, secret: str = None, timeout: int = 10, headers: Dict = None
+    url: str,
+    payload: Dict,
+    secret: str = None,
+    timeout: int = 10,
+    headers: Dict = None,
+    session=None,
 ) -> Dict:
     """Deliver a webhook payload to a URL.
 
@@ -226,6 +270,7 @@ def deliver_webhook(
         secret: Secret for signing (optional)
         timeout: Request timeout in seconds
         headers: Additional headers
+        session: requests.Session to reuse keep-alive connections (optional)
 
     Returns:
         Dict with delivery result
@@ -245,6 +290,9 @@ def deliver_webhook(
     if headers:
         request_headers.update(headers)
 
+    if session is not None:
+        return _deliver_with_session(session, url, payload_json, request_headers, timeout)
+
     req = Request(url, data=payload_json.encode("utf-8"), headers=request_headers, method="POST")
 
     start_time = datetime.now()
@@ -284,27 +332,57 @@ def deliver_webhook(
         }
 
 
+def _deliver_with_session(session, url: str, body: str, headers: Dict, timeout: int) -> Dict:
+    """deliver_webhook() over a pooled requests.Session."""
+    start = time.perf_counter()
+    try:
+        response = session.post(url, data=body.encode("utf-8"), headers=headers, timeout=timeout)
+    except requests.RequestException as e:
+        return {
+            "success": False,
+            "status_code": None,
+            "duration_seconds": time.perf_counter() - start,
+            "error": str(e),
+        }
+    result = {
+        "success": response.status_code < 400,
+        "status_code": response.status_code,
+        "duration_seconds": time.perf_counter() - start,
+        "response_body": response.text[:1000],
+    }
+    if not result["success"]:
+        result["error"] = f"HTTP Error {response.status_code}: {response.reason}"
+    return result
+
+
+_DELIVERY_LOG_SQL = """
+    INSERT INTO webhook_deliveries
+    (webhook_id, event, task_id, payload, status_code, success, duration_seconds,
+     response_body, error)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _delivery_row(webhook_id, event, task_id, payload_json: str, result: Dict) -> tuple:
+    return (
+        webhook_id,
+        event,
+        task_id,
+        payload_json,
+        result.get("status_code"),
+        1 if result.get("success") else 0,
+        result.get("duration_seconds"),
+        result.get("response_body"),
+        result.get("error"),
+    )
+
+
 def log_delivery(
     conn, webhook_id: int, event: str, payload: Dict, result: Dict, task_id: int = None
 ):
     """Log a webhook delivery attempt."""
     conn.execute(
-        """
-        INSERT INTO webhook_deliveries
-        (webhook_id, event, task_id, payload, status_code, success, duration_seconds, response_body, error)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """,
-        (
-            webhook_id,
-            event,
-            task_id,
-            json.dumps(payload),
-            result.get("status_code"),
-            1 if result.get("success") else 0,
-            result.get("duration_seconds"),
-            result.get("response_body"),
-            result.get("error"),
-        ),
+        _DELIVERY_LOG_SQL, _delivery_row(webhook_id, event, task_id, json.dumps(payload), result)
     )
 
 
@@ -369,6 +447,42 @@ def get_deliveries(
     return deliveries
 
 
+def build_task_payload(
+    event: str,
+    task_id: int,
+    task_type: str,
+    task_data: Dict = None,
+    old_status: str = None,
+    new_status: str = None,
+    worker_id: str = None,
+    result: str = None,
+    error: str = None,
+) -> Dict:
+    """Build the JSON body sent to webhooks for a task event."""
+    payload = {
+        "event": event,
+        "timestamp": datetime.now().isoformat(),
+        "task": {
+            "id": task_id,
+            "type": task_type,
+            "status": new_status,
+            "previous_status": old_status,
+        },
+    }
+
+    if worker_id:
+        payload["task"]["worker_id"] = worker_id
+    if result:
+        payload["task"]["result"] = result[:2000] if isinstance(result, str) else str(result)[:2000]
+    if error:
+        payload["task"]["error"] = error[:2000] if isinstance(error, str) else str(error)[:2000]
+    if task_data:
+        # Include safe task data fields
+        safe_fields = ["priority", "description", "max_retries", "timeout_seconds"]
+        payload["task"]["data"] = {k: v for k, v in task_data.items() if k in safe_fields}
+    return payload
+
+
 def trigger_task_event(
     db_path: str,
     task_id: int,
@@ -380,10 +494,12 @@ def trigger_task_event(
     worker_id: str = None,
     result: str = None,
     error: str = None,
-):
+) -> int:
     """Trigger webhooks for a task event.
 
-    This runs in a background thread to avoid blocking.
+    Matching is done against the in-memory subscription cache and the
+    deliveries are handed to the database's WebhookDispatcher, so the caller
+    never waits on the network.
 
     Args:
         db_path: Database path
@@ -396,94 +512,23 @@ def trigger_task_event(
         worker_id: Worker ID if applicable
         result: Task result for completed tasks
         error: Error message for failed tasks
-    """
-
-    def _trigger():
-        try:
-            import sqlite3
-
-            conn = sqlite3.connect(db_path)
-            conn.row_factory = sqlite3.Row
-
-            # Get all enabled webhooks
-            webhooks = conn.execute(
-                """
-                SELECT id, name, url, secret, events, task_types, retry_count, timeout_seconds
-                FROM task_webhooks WHERE enabled = 1
-            """
-            ).fetchall()
-
-            for webhook in webhooks:
-                # Check if webhook subscribes to this event
-                events = json.loads(webhook["events"]) if webhook["events"] else []
-                if events and event not in events:
-                    continue
-
-                # Check if webhook filters by task type
-                task_types = json.loads(webhook["task_types"]) if webhook["task_types"] else []
-                if task_types and task_type not in task_types:
-                    continue
-
-                # Build payload
-                payload = {
-                    "event": event,
-                    "timestamp": datetime.now().isoformat(),
-                    "task": {
-                        "id": task_id,
-                        "type": task_type,
-                        "status": new_status,
-                        "previous_status": old_status,
-                    },
-                }
-
-                if worker_id:
-                    payload["task"]["worker_id"] = worker_id
-                if result:
-                    payload["task"]["result"] = (
-                        result[:2000] if isinstance(result, str) else str(result)[:2000]
-                    )
-                if error:
-                    payload["task"]["error"] = (
-                        error[:2000] if isinstance(error, str) else str(error)[:2000]
-                    )
-                if task_data:
-                    # Include safe task data fields
-                    safe_fields = ["priority", "description", "max_retries", "timeout_seconds"]
-                    payload["task"]["data"] = {
-                        k: v for k, v in task_data.items() if k in safe_fields
-                    }
-
-                # Deliver with retries
-                retry_count = webhook["retry_count"] or 3
-                timeout = webhook["timeout_seconds"] or 10
-
-                for attempt in range(retry_count):
-                    delivery_result = deliver_webhook(
-                        url=webhook["url"],
-                        payload=payload,
-                        secret=webhook["secret"],
-                        timeout=timeout,
-                    )
-
-                    # Log delivery
-                    log_delivery(conn, webhook["id"], event, payload, delivery_result, task_id)
-                    conn.commit()
-
-                    if delivery_result["success"]:
-                        break
-
-                    # Wait before retry (exponential backoff)
-                    if attempt < retry_count - 1:
-                        import time
-
-                        time.sleep(2**attempt)
-
-            conn.close()
-        except Exception as e:
-            logger.error(f"Failed to trigger webhooks for task {task_id}: {e}")
 
-    thread = threading.Thread(target=_trigger, daemon=True)
-    thread.start()
+    Returns:
+        Number of webhooks the event was queued for
+    """
+    dispatcher = get_dispatcher(db_path)
+    try:
+        subscriptions = dispatcher.subscriptions.match(event, task_type)
+    except sqlite3.Error as e:
+        logger.error(f"Failed to load webhooks for task {task_id}: {e}")
+        return 0
+    if not subscriptions:
+        return 0
+
+    payload = build_task_payload(
+        event, task_id, task_type, task_data, old_status, new_status, worker_id, result, error
+    )
+    return dispatcher.enqueue(subscriptions, event, task_id, payload)
 
 
 def test_webhook(conn, webhook_id: int) -> Dict:
@@ -521,3 +566,437 @@ def test_webhook(conn, webhook_id: int) -> Dict:
     log_delivery(conn, webhook_id, "test", payload, result, None)
 
     return result
+
+
+# ============================================================================
+# Delivery engine
+# ============================================================================
+
+_OUTBOX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS webhook_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    webhook_id INTEGER NOT NULL,
+    event TEXT NOT NULL,
+    task_id INTEGER,
+    payload TEXT NOT NULL,
+    attempts INTEGER DEFAULT 0,
+    max_attempts INTEGER DEFAULT 3,
+    next_attempt_at REAL NOT NULL,
+    lease_until REAL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_webhook_outbox_due ON webhook_outbox(next_attempt_at);
+"""
+
+
+def ensure_webhook_schema(conn):
+    """Create the webhook_outbox delivery queue table."""
+    conn.executescript(_OUTBOX_SCHEMA)
+
+
+# Bumped by invalidate_subscriptions() after webhook changes are committed
+_subscriptions_version = 0
+
+
+def invalidate_subscriptions():
+    """Make every SubscriptionCache reload on its next lookup.
+
+    Call after the webhook change is committed: a reload that runs before
+    the commit would cache the old rows until the TTL expires.
+    """
+    global _subscriptions_version
+    _subscriptions_version += 1
+
+
+class Subscription:
+    """An enabled webhook with its filters parsed once."""
+
+    __slots__ = ("id", "url", "secret", "events", "task_types", "max_attempts", "timeout")
+
+    def __init__(self, row):
+        self.id = row["id"]
+        self.url = row["url"]
+        self.secret = row["secret"]
+        self.events = frozenset(json.loads(row["events"]) if row["events"] else ())
+        self.task_types = frozenset(json.loads(row["task_types"]) if row["task_types"] else ())
+        self.max_attempts = max(1, row["retry_count"] or 3)
+        self.timeout = row["timeout_seconds"] or 10
+
+
+class SubscriptionCache:
+    """
+    In-memory view of enabled webhooks, indexed by event.
+
+    Reloads after invalidate_subscriptions() or, for changes made by other
+    processes, once `ttl` seconds have passed.
+    """
+
+    def __init__(self, db_path: str, ttl: float = None):
+        self.db_path = db_path
+        self.ttl = DELIVERY_CONFIG["subscription_ttl"] if ttl is None else ttl
+        self._lock = threading.Lock()
+        self._by_id: Dict[int, Subscription] = {}
+        self._by_event: Dict[str, List[Subscription]] = {}
+        self._all_events: List[Subscription] = []
+        self._version = None
+        self._expires = 0.0
+
+    def _refresh(self):
+        if self._version == _subscriptions_version and time.monotonic() < self._expires:
+            return
+        with self._lock:
+            version = _subscriptions_version
+            if self._version == version and time.monotonic() < self._expires:
+                return
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            try:
+                rows = conn.execute(
+                    """
+                    SELECT id, url, secret, events, task_types, retry_count, timeout_seconds
+                    FROM task_webhooks WHERE enabled = 1
+                """
+                ).fetchall()
+            finally:
+                conn.close()
+
+            subscriptions = [Subscription(row) for row in rows]
+            all_events = [sub for sub in subscriptions if not sub.events]
+            by_event: Dict[str, List[Subscription]] = {}
+            for sub in subscriptions:
+                for event in sub.events:
+                    by_event.setdefault(event, list(all_events)).append(sub)
+            self._by_id = {sub.id: sub for sub in subscriptions}
+            self._by_event = by_event
+            self._all_events = all_events
+            self._version = version
+            self._expires = time.monotonic() + self.ttl
+
+    def match(self, event: str, task_type: str = None) -> List[Subscription]:
+        """Enabled webhooks subscribed to an event for a task type."""
+        self._refresh()
+        candidates = self._by_event.get(event, self._all_events)
+        return [sub for sub in candidates if not sub.task_types or task_type in sub.task_types]
+
+    def get(self, webhook_id: int) -> Optional[Subscription]:
+        """An enabled webhook by id (None if deleted or disabled)."""
+        self._refresh()
+        return self._by_id.get(webhook_id)
+
+
+def _rollback(conn):
+    """Roll back an open transaction, ignoring errors (the caller re-raises)."""
+    try:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+    except sqlite3.Error:
+        pass
+
+
+class WebhookDispatcher:
+    """
+    Delivers queued webhook events from the outbox with a bounded worker pool.
+
+    A single dispatcher thread owns the database side: it persists newly
+    enqueued events, leases due outbox rows (at most `endpoint_concurrency`
+    in flight per webhook), hands them to the worker pool and records the
+    results in batches. Failed attempts are rescheduled with exponential
+    backoff; the row is removed after success or the final attempt.
+    """
+
+    def __init__(self, db_path: str, max_workers: int = None, endpoint_concurrency: int = None):
+        self.db_path = str(db_path)
+        self.max_workers = max_workers or DELIVERY_CONFIG["max_workers"]
+        self.endpoint_concurrency = endpoint_concurrency or DELIVERY_CONFIG["endpoint_concurrency"]
+        self.subscriptions = SubscriptionCache(self.db_path)
+
+        self._incoming = deque()
+        self._results = deque()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._inflight: Dict[int, int] = {}
+        self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="webhook")
+        self._sessions = threading.local()
+        self._thread = None
+        self._closed = False
+        self.stats = {
+            "enqueued": 0,
+            "attempts": 0,
+            "delivered": 0,
+            "failed": 0,
+            "retried": 0,
+            "dropped": 0,
+            "log_batches": 0,
+        }
+
+    def enqueue(
+        self, subscriptions: List[Subscription], event: str, task_id: int, payload: Dict
+    ) -> int:
+        """Queue one delivery per subscription; returns the number queued."""
+        if self._closed:
+            raise RuntimeError("Webhook dispatcher is closed")
+        payload_json = json.dumps(payload)
+        for sub in subscriptions:
+            self._incoming.append((sub.id, event, task_id, payload_json, sub.max_attempts))
+        with self._lock:
+            self.stats["enqueued"] += len(subscriptions)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="webhook-dispatcher", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+        return len(subscriptions)
+
+    def _session(self):
+        """Per-worker requests.Session; keeps connections to each host alive."""
+        if requests is None:
+            return None
+        session = getattr(self._sessions, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=self.endpoint_concurrency)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._sessions.session = session
+        return session
+
+    def _run(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        # Same durability as db.py connections; the outbox commits often
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            ensure_webhook_schema(conn)
+            wait = 0.0
+            while True:
+                self._wake.wait(wait)
+                self._wake.clear()
+                try:
+                    self._persist_incoming(conn)
+                    self._record_results(conn)
+                    if self._closed:
+                        break
+                    wait = self._dispatch_due(conn)
+                except sqlite3.Error as e:
+                    _rollback(conn)
+                    logger.error(f"Webhook dispatcher database error: {e}")
+                    wait = 1.0
+                except Exception:
+                    # Anything else loses at most the batch in hand; keep dispatching
+                    _rollback(conn)
+                    logger.exception("Webhook dispatcher error")
+                    wait = 1.0
+            # Let in-flight deliveries finish and log them
+            self._executor.shutdown(wait=True)
+            self._record_results(conn)
+        finally:
+            conn.close()
+
+    def _persist_incoming(self, conn):
+        rows = []
+        while self._incoming:
+            rows.append(self._incoming.popleft())
+        if not rows:
+            return
+        now = time.time()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                """
+                INSERT INTO webhook_outbox
+                    (webhook_id, event, task_id, payload, max_attempts, next_attempt_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """,
+                [row + (now,) for row in rows],
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            _rollback(conn)
+            # Keep the events (in order) for the next pass
+            self._incoming.extendleft(reversed(rows))
+            raise
+
+    def _dispatch_due(self, conn) -> float:
+        """Lease and submit due rows; returns seconds until the next due row."""
+        now = time.time()
+        with self._lock:
+            inflight = dict(self._inflight)
+        capacity = self.max_workers - sum(inflight.values())
+        if capacity > 0:
+            # Skip endpoints already at their limit so one backlog cannot starve the rest
+            saturated = [i for i, n in inflight.items() if n >= self.endpoint_concurrency]
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                f"""
+                SELECT id, webhook_id, event, task_id, payload, attempts, max_attempts
+                FROM webhook_outbox
+                WHERE next_attempt_at <= ? AND (lease_until IS NULL OR lease_until < ?)
+                    AND webhook_id NOT IN ({','.join('?' * len(saturated))})
+                ORDER BY next_attempt_at, id LIMIT ?
+            """,
+                [now, now] + saturated + [capacity * self.endpoint_concurrency * 4],
+            ).fetchall()
+            chosen, dropped = [], []
+            for row in rows:
+                sub = self.subscriptions.get(row["webhook_id"])
+                if sub is None:
+                    dropped.append(row["id"])
+                    continue
+                if inflight.get(sub.id, 0) >= self.endpoint_concurrency:
+                    continue
+                inflight[sub.id] = inflight.get(sub.id, 0) + 1
+                chosen.append((dict(row), sub))
+                if len(chosen) >= capacity:
+                    break
+            for row, sub in chosen:
+                conn.execute(
+                    "UPDATE webhook_outbox SET lease_until = ? WHERE id = ?",
+                    (now + sub.timeout + DELIVERY_CONFIG["lease_padding"], row["id"]),
+                )
+            if dropped:
+                # Webhook deleted or disabled since the event was queued
+                conn.executemany("DELETE FROM webhook_outbox WHERE id = ?", [(i,) for i in dropped])
+            conn.execute("COMMIT")
+
+            with self._lock:
+                self.stats["dropped"] += len(dropped)
+                for row, sub in chosen:
+                    self._inflight[sub.id] = self._inflight.get(sub.id, 0) + 1
+            for row, sub in chosen:
+                self._executor.submit(self._attempt, row, sub)
+
+        next_due = conn.execute(
+            """SELECT MIN(next_attempt_at) FROM webhook_outbox
+            WHERE lease_until IS NULL OR lease_until < ?""",
+            (now,),
+        ).fetchone()[0]
+        # Rows already due are waiting on a free worker or endpoint slot;
+        # finishing deliveries wake the loop, the cap covers other processes
+        if next_due is None or next_due <= now:
+            return 5.0
+        return min(max(next_due - time.time(), 0.01), 5.0)
+
+    def _attempt(self, row: Dict, sub: Subscription):
+        try:
+            result = deliver_webhook(
+                url=sub.url,
+                payload=json.loads(row["payload"]),
+                secret=sub.secret,
+                timeout=sub.timeout,
+                session=self._session(),
+            )
+        except Exception as e:
+            result = {"success": False, "status_code": None, "duration_seconds": 0, "error": str(e)}
+        finally:
+            # The endpoint slot frees up when the request ends, whether or not
+            # the result is recorded on the first try
+            with self._lock:
+                self._inflight[sub.id] -= 1
+                if not self._inflight[sub.id]:
+                    del self._inflight[sub.id]
+        self._results.append((row, sub, result))
+        self._wake.set()
+
+    def _record_results(self, conn):
+        results = []
+        while self._results:
+            results.append(self._results.popleft())
+        if not results:
+            return
+        now = time.time()
+        done, retry = [], []
+        for row, sub, result in results:
+            attempts = row["attempts"] + 1
+            if result["success"] or attempts >= row["max_attempts"]:
+                done.append((row["id"],))
+            else:
+                delay = DELIVERY_CONFIG["retry_base_delay"] * 2 ** (attempts - 1)
+                retry.append((attempts, now + delay, row["id"]))
+
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                _DELIVERY_LOG_SQL,
+                [
+                    _delivery_row(sub.id, row["event"], row["task_id"], row["payload"], result)
+                    for row, sub, result in results
+                ],
+            )
+            conn.executemany("DELETE FROM webhook_outbox WHERE id = ?", done)
+            conn.executemany(
+                """UPDATE webhook_outbox SET attempts = ?, next_attempt_at = ?, lease_until = NULL
+                WHERE id = ?""",
+                retry,
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            _rollback(conn)
+            # Record them on the next pass; the rows stay leased until then
+            self._results.extendleft(reversed(results))
+            raise
+
+        with self._lock:
+            for row, sub, result in results:
+                self.stats["delivered" if result["success"] else "failed"] += 1
+            self.stats["attempts"] += len(results)
+            self.stats["retried"] += len(retry)
+            self.stats["log_batches"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters, in-flight deliveries and outbox depth."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["inflight"] = sum(self._inflight.values())
+        stats["incoming"] = len(self._incoming)
+        stats["max_workers"] = self.max_workers
+        stats["endpoint_concurrency"] = self.endpoint_concurrency
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=5)
+            try:
+                stats["outbox"] = conn.execute("SELECT COUNT(*) FROM webhook_outbox").fetchone()[0]
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            stats["outbox"] = None
+        return stats
+
+    def close(self, timeout: float = 10.0):
+        """Persist queued events, finish in-flight deliveries and stop.
+
+        Rows not yet delivered stay in the outbox for the next dispatcher.
+        """
+        self._closed = True
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+        else:
+            self._executor.shutdown(wait=False)
+
+
+_dispatchers: Dict[str, WebhookDispatcher] = {}
+_dispatchers_lock = threading.Lock()
+
+
+def get_dispatcher(db_path: str) -> WebhookDispatcher:
+    """Get (or create) the dispatcher for a database."""
+    key = str(db_path)
+    dispatcher = _dispatchers.get(key)
+    if dispatcher is None:
+        with _dispatchers_lock:
+            dispatcher = _dispatchers.get(key)
+            if dispatcher is None:
+                dispatcher = _dispatchers[key] = WebhookDispatcher(key)
+    return dispatcher
+
+
+def close_all_dispatchers():
+    """Close every dispatcher (registered with atexit)."""
+    with _dispatchers_lock:
+        dispatchers = list(_dispatchers.values())
+        _dispatchers.clear()
+    for dispatcher in dispatchers:
+        dispatcher.close()
+
+
+atexit.register(close_all_dispatchers)
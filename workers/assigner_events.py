@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Assigner Wake-up Channel
+
+Lets prompt producers wake the assigner worker the moment a prompt is
+queued instead of waiting for its next poll.
+
+Features:
+- The worker binds a Unix datagram socket next to its PID file and blocks
+  on it with a timeout set to its next scheduled duty
+- notify_assigner() sends one small datagram; it never blocks and never
+  raises, so producers can call it after every commit whether or not a
+  worker is running
+- Datagrams carry a reason ("prompt", "tmux", "stop"); wait() drains all
+  queued datagrams and returns the set of reasons, so a burst of inserts
+  costs the worker one wake-up
+- Deliberately free of heavy imports so app.py, the MCP server and CLIs can
+  import it cheaply
+
+Usage:
+    from workers.assigner_events import notify_assigner
+
+    # Producer, after committing an INSERT INTO prompts
+    notify_assigner()
+
+    # Worker
+    from workers.assigner_events import AssignerWakeup
+
+    wakeup = AssignerWakeup()
+    wakeup.open()
+    reasons = wakeup.wait(timeout=10)  # {"prompt"} or set() on timeout
+    wakeup.close()
+"""
+
+import logging
+import os
+import select
+import socket
+from pathlib import Path
+from typing import Optional, Set, Union
+
+logger = logging.getLogger("AssignerEvents")
+
+# Socket the running worker listens on
+WAKE_SOCKET = Path(os.environ.get("ASSIGNER_WAKE_SOCKET", "/tmp/architect_assigner_worker.sock"))
+
+# Longest reason accepted; anything beyond is truncated
+_MAX_REASON = 64
+
+
+def notify_assigner(reason: str = "prompt", path: Optional[Union[str, Path]] = None) -> bool:
+    """Wake the assigner worker. Returns False if no worker is listening."""
+    if not hasattr(socket, "AF_UNIX"):
+        return False
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    except OSError:
+        return False
+    try:
+        sock.setblocking(False)
+        sock.sendto(reason.encode("utf-8")[:_MAX_REASON], str(path or WAKE_SOCKET))
+        return True
+    except OSError:
+        # No worker, stale socket file, or a full queue (the worker is
+        # already due to wake up): all fine to ignore
+        return False
+    finally:
+        sock.close()
+
+
+class AssignerWakeup:
+    """Receiving end of the wake-up socket, owned by the worker."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self.path = Path(path or WAKE_SOCKET)
+        self._sock: Optional[socket.socket] = None
+        self.stats = {"wakeups": 0, "messages": 0}
+
+    def open(self) -> bool:
+        """Bind the socket; False (and timed waits only) if unsupported."""
+        if self._sock is not None:
+            return True
+        if not hasattr(socket, "AF_UNIX"):
+            return False
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove stale wake-up socket {self.path}: {e}")
+            return False
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            sock.bind(str(self.path))
+        except OSError as e:
+            logger.warning(f"Could not bind wake-up socket {self.path}: {e}")
+            sock.close()
+            return False
+        sock.setblocking(False)
+        self._sock = sock
+        return True
+
+    def notify(self, reason: str) -> bool:
+        """Wake this worker from inside its own process (signal handlers, threads)."""
+        return notify_assigner(reason, self.path)
+
+    def wait(self, timeout: float) -> Set[str]:
+        """Block until woken or timeout; returns the reasons received."""
+        if self._sock is None:
+            select.select([], [], [], max(timeout, 0))
+            return set()
+        try:
+            readable, _, _ = select.select([self._sock], [], [], max(timeout, 0))
+        except InterruptedError:
+            readable = [self._sock]
+        if not readable:
+            return set()
+
+        reasons = set()
+        while True:
+            try:
+                data = self._sock.recv(_MAX_REASON)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                break
+            self.stats["messages"] += 1
+            reasons.add(data.decode("utf-8", errors="replace") or "prompt")
+        if reasons:
+            self.stats["wakeups"] += 1
+        return reasons
+
+    def close(self):
+        """Close and remove the socket."""
+        sock, self._sock = self._sock, None
+        if sock is None:
+            return
+        sock.close()
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
@@ -8,6 +8,9 @@ A background worker that:
     - Assigns prompts to available sessions via tmux send-keys
 - Tracks assignments and collects responses
 - Handles timeouts, retries, and session targeting
+- Sleeps until woken: producers call notify_assigner() after queueing a
+  prompt, tmux layout changes arrive over the control-mode connection,
+  and state is persisted only when it changes
 
 Usage:
     python3 assigner_worker.py                # Run worker in foreground
@@ -65,6 +68,9 @@ ASSIGNER_DIR = DATA_DIR / "assigner"
 # Add parent directory to Python path for services import
 sys.path.insert(0, str(BASE_DIR))
 
+from workers.assigner_events import AssignerWakeup, notify_assigner  # noqa: E402
+from workers.tmux_control import GitBranchCache, TmuxControlClient, TmuxControlError  # noqa: E402
+
 # Worker configuration
 PID_FILE = Path("/tmp/architect_assigner_worker.pid")
 STATE_FILE = Path("/tmp/architect_assigner_worker_state.json")
@@ -79,6 +85,9 @@ ASSIGNER_DB = ASSIGNER_DIR / "assigner.db"
 # Configuration file
 CONFIG_FILE = BASE_DIR / "config" / "session_assigner.yaml"
 
+# Scan sessions over one persistent `tmux -C` connection (0 = fork per call)
+TMUX_CONTROL_MODE = os.environ.get("ASSIGNER_TMUX_CONTROL_MODE", "1") != "0"
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -448,6 +457,7 @@ class AssignerDatabase:
 
     def __init__(self, db_path: Path = ASSIGNER_DB):
         self.db_path = db_path
+        self.git_branches = GitBranchCache()
         self._init_db()
 
     def _get_conn(self) -> sqlite3.Connection:
@@ -611,7 +621,9 @@ class AssignerDatabase:
                     timeout_minutes,
                 ),
             )
-            return cursor.lastrowid
+            prompt_id = cursor.lastrowid
+        notify_assigner()
+        return prompt_id
 
     def get_pending_prompts(self, limit: int = 10) -> List[Dict]:
         """Get pending prompts ordered by priority."""
@@ -1042,7 +1054,8 @@ class AssignerDatabase:
             """,
                 (retry_count, prompt_id),
             )
-            return True
+        notify_assigner()
+        return True
 
     def retry_all_failed(self) -> int:
         """Retry all failed prompts that haven't exceeded max retries."""
@@ -1060,7 +1073,9 @@ class AssignerDatabase:
                   AND retry_count < max_retries
             """
             )
-            return result.rowcount
+        if result.rowcount:
+            notify_assigner()
+        return result.rowcount
 
     def get_timed_out_assignments(self) -> List[Dict]:
         """Get assignments that have exceeded their timeout."""
@@ -1156,8 +1171,8 @@ class AssignerDatabase:
             """,
                 (prompt_id,),
             )
-
-            return True
+        notify_assigner()
+        return True
 
     def update_session_state(self, session_name: str, working_dir: Optional[str] = None) -> None:
         """
@@ -1186,20 +1201,8 @@ class AssignerDatabase:
                 if result.returncode == 0:
                     working_dir = result.stdout.strip()
 
-            # Try to detect git branch if in a git repo
-            git_branch = None
-            if working_dir:
-                try:
-                    result = subprocess.run(
-                        ["git", "-C", working_dir, "rev-parse", "--abbrev-ref", "HEAD"],
-                        capture_output=True,
-                        text=True,
-                        timeout=2,
-                    )
-                    if result.returncode == 0:
-                        git_branch = result.stdout.strip()
-                except Exception:
-                    pass  # Not in a git repo
+            # Git branch from .git/HEAD, cached until HEAD changes
+            git_branch = self.git_branches.get_branch(working_dir)
 
             # Update database with context information
             with self._get_conn() as conn:
@@ -1223,7 +1226,17 @@ class AssignerDatabase:
 
 
 class SessionDetector:
-    """Detects and monitors tmux sessions."""
+    """Detects and monitors tmux sessions.
+
+    When control mode is enabled, tmux commands go over one persistent
+    TmuxControlClient connection instead of a fork each, and
+    scan_all_sessions() only re-captures and re-classifies panes whose
+    window showed activity since their last capture. If tmux is not running
+    or the connection fails, it falls back to subprocess calls and retries
+    the connection every CONTROL_RETRY_INTERVAL seconds.
+    """
+
+    CONTROL_RETRY_INTERVAL = 30
 
     # Patterns that indicate Claude is idle and waiting for input
     IDLE_PATTERNS = [
@@ -1309,7 +1322,11 @@ class SessionDetector:
         ],
     }
 
-    def __init__(self):
+    def __init__(
+        self,
+        use_control_mode: bool = TMUX_CONTROL_MODE,
+        control_client: Optional[TmuxControlClient] = None,
+    ):
         self.idle_regex = re.compile("|".join(self.IDLE_PATTERNS), re.IGNORECASE)
         self.busy_regex = re.compile("|".join(self.BUSY_PATTERNS), re.IGNORECASE)
         self.provider_regex = {
@@ -1317,6 +1334,31 @@ class SessionDetector:
             for provider, patterns in self.PROVIDER_SESSION_PATTERNS.items()
         }
 
+        self.control = control_client or (TmuxControlClient() if use_control_mode else None)
+        self._control_retry_at = 0.0
+        # session -> (pane_id, second of last capture, status, provider)
+        self._pane_cache: Dict[str, tuple] = {}
+        self.scan_stats = {"scans": 0, "captures": 0, "cached": 0}
+
+    def _control_client(self) -> Optional[TmuxControlClient]:
+        """The live control connection, (re)connecting at most every retry interval."""
+        if self.control is None:
+            return None
+        if self.control.alive:
+            return self.control
+        if time.time() < self._control_retry_at:
+            return None
+        if self.control.start():
+            self._pane_cache.clear()
+            return self.control
+        self._control_retry_at = time.time() + self.CONTROL_RETRY_INTERVAL
+        return None
+
+    def close(self):
+        """Close the control connection."""
+        if self.control is not None:
+            self.control.close()
+
     def detect_provider(self, session: str, output: str) -> str:
         """Detect provider based on session name and output."""
         # Check session name first for explicit matches (more specific)
@@ -1342,6 +1384,12 @@ class SessionDetector:
 
     def list_sessions(self) -> List[str]:
         """List all tmux sessions."""
+        client = self._control_client()
+        if client:
+            try:
+                return client.list_sessions()
+            except TmuxControlError as e:
+                logger.debug(f"Control-mode list-sessions failed: {e}")
         try:
             result = subprocess.run(
                 ["tmux", "list-sessions", "-F", "#{session_name}"],
@@ -1357,6 +1405,13 @@ class SessionDetector:
 
     def capture_pane(self, session: str, lines: int = 50) -> Optional[str]:
         """Capture the last N lines from a session's pane."""
+        client = self._control_client()
+        if client:
+            try:
+                return client.capture_pane(session, lines)
+            except TmuxControlError as e:
+                logger.debug(f"Failed to capture pane for {session}: {e}")
+                return None
         try:
             result = subprocess.run(
                 ["tmux", "capture-pane", "-t", session, "-p", "-S", f"-{lines}"],
@@ -1372,6 +1427,13 @@ class SessionDetector:
 
     def get_working_dir(self, session: str) -> Optional[str]:
         """Get the working directory of a session."""
+        client = self._control_client()
+        if client:
+            try:
+                return client.display(session, "#{pane_current_path}") or None
+            except TmuxControlError as e:
+                logger.debug(f"Failed to get working dir for {session}: {e}")
+                return None
         try:
             result = subprocess.run(
                 [
@@ -1398,7 +1460,15 @@ class SessionDetector:
 
         Returns: (status, provider, last_output)
         """
-        output = self.capture_pane(session)
+        return self.classify_output(session, self.capture_pane(session))
+
+    def classify_output(
+        self, session: str, output: Optional[str]
+    ) -> tuple[str, str, Optional[str]]:
+        """Apply the IDLE/BUSY patterns to captured pane output.
+
+        Returns: (status, provider, last_output)
+        """
         if not output:
             return SessionStatus.UNKNOWN, "unknown", None
 
@@ -1429,27 +1499,76 @@ class SessionDetector:
 
     def scan_all_sessions(self) -> List[SessionInfo]:
         """Scan all sessions and return their info."""
+        client = self._control_client()
+        if client:
+            try:
+                return self._scan_with_control(client)
+            except TmuxControlError as e:
+                logger.warning(f"Control-mode scan failed, using subprocess scan: {e}")
+
         sessions = []
         for name in self.list_sessions():
             status, provider, last_output = self.detect_session_status(name)
             working_dir = self.get_working_dir(name)
-            sessions.append(
-                SessionInfo(
-                    name=name,
-                    status=status,
-                    last_activity=datetime.now().isoformat(),
-                    current_task_id=None,
-                    working_dir=working_dir,
-                    is_claude=(provider == "claude"),
-                    provider=provider,
+            sessions.append(self._session_info(name, status, provider, working_dir))
+        return sessions
+
+    def _scan_with_control(self, client: TmuxControlClient) -> List[SessionInfo]:
+        """Scan over the control connection, re-capturing only changed panes.
+
+        One list-panes call returns every session's active pane with its
+        window_activity (epoch seconds of the last output). A pane is
+        re-captured when its id changed or its window was active in or after
+        the second of its last capture; otherwise the cached status is used.
+        """
+        self.scan_stats["scans"] += 1
+        sessions = []
+        seen = set()
+        for pane in client.list_active_panes():
+            seen.add(pane.session)
+            cached = self._pane_cache.get(pane.session)
+            if cached and cached[0] == pane.pane_id and pane.activity < cached[1]:
+                status, provider = cached[2], cached[3]
+                self.scan_stats["cached"] += 1
+            else:
+                captured_second = int(time.time())
+                status, provider, _ = self.classify_output(
+                    pane.session, client.capture_pane(pane.pane_id)
                 )
-            )
+                self._pane_cache[pane.session] = (pane.pane_id, captured_second, status, provider)
+                self.scan_stats["captures"] += 1
+            sessions.append(self._session_info(pane.session, status, provider, pane.current_path))
+
+        for name in set(self._pane_cache) - seen:
+            del self._pane_cache[name]
         return sessions
 
+    @staticmethod
+    def _session_info(
+        name: str, status: str, provider: str, working_dir: Optional[str]
+    ) -> SessionInfo:
+        return SessionInfo(
+            name=name,
+            status=status,
+            last_activity=datetime.now().isoformat(),
+            current_task_id=None,
+            working_dir=working_dir,
+            is_claude=(provider == "claude"),
+            provider=provider,
+        )
+
 
 class AssignerWorker:
     """
     Main assigner worker that coordinates prompts and sessions.
+
+    The worker sleeps on an AssignerWakeup socket instead of polling. It is
+    woken by producers (notify_assigner() after a prompt insert), by tmux
+    layout notifications from the control-mode connection (sessions added
+    or removed), and by its own schedule: session scans, timeout checks,
+    assignment checks (only while prompts are assigned) and a cheap
+    `PRAGMA data_version` check that catches prompts queued by writers
+    that do not notify. State is written only when it changed.
     """
 
     def __init__(
@@ -1457,61 +1576,141 @@ class AssignerWorker:
         poll_interval: int = 3,
         session_scan_interval: int = 10,
         timeout_check_interval: int = 60,
+        db_check_interval: float = 2.0,
+        wake_socket: Optional[Path] = None,
     ):
+        # poll_interval is how often active assignments are checked
         self.poll_interval = poll_interval
         self.session_scan_interval = session_scan_interval
         self.timeout_check_interval = timeout_check_interval
+        self.db_check_interval = db_check_interval
         self.running = False
         self.worker_id = f"assigner-{os.getpid()}"
 
         self.db = AssignerDatabase()
         self.detector = SessionDetector()
+        self.wakeup = AssignerWakeup(wake_socket)
 
         self._last_session_scan = 0
         self._last_timeout_check = 0
+        self._last_assignment_check = 0
+        self._last_db_check = 0
+        self._has_active_assignments = True
+        self._watch_conn: Optional[sqlite3.Connection] = None
+        self._data_version: Optional[int] = None
+        self._saved_state: Optional[tuple] = None
         self._lock = threading.Lock()
+        self.loop_stats = {
+            "wakeups": 0,
+            "timeouts": 0,
+            "db_changes": 0,
+            "dispatched": 0,
+            "state_writes": 0,
+        }
 
     def start(self):
         """Start the worker."""
         self.running = True
         logger.info(f"Starting AssignerWorker {self.worker_id}")
 
-        # Setup signal handlers
-        signal.signal(signal.SIGTERM, self._handle_signal)
-        signal.signal(signal.SIGINT, self._handle_signal)
+        # Setup signal handlers (only possible from the main thread)
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self._handle_signal)
+            signal.signal(signal.SIGINT, self._handle_signal)
+
+        if not self.wakeup.open():
+            logger.warning(
+                f"Wake-up socket unavailable; new prompts are picked up "
+                f"every {self.db_check_interval}s"
+            )
+        control = getattr(self.detector, "control", None)
+        if control is not None:
+            control.on_layout_change = lambda: self.wakeup.notify("tmux")
 
         self._save_state()
 
         try:
+            reasons = {"prompt"}
             while self.running:
-                # Scan sessions periodically
-                if time.time() - self._last_session_scan > self.session_scan_interval:
-                    self._scan_sessions()
-                    self._last_session_scan = time.time()
-
-                # Check for timed out assignments periodically
-                if time.time() - self._last_timeout_check > self.timeout_check_interval:
-                    self._check_timeouts()
-                    self._last_timeout_check = time.time()
-
-                # Process pending prompts
-                self._process_prompts()
-
-                # Check active assignments
-                self._check_assignments()
-
-                self._save_state()
-                time.sleep(self.poll_interval)
+                self._run_once(reasons)
+                if not self.running:
+                    break
+                reasons = self.wakeup.wait(self._next_wait())
+                self.loop_stats["wakeups" if reasons else "timeouts"] += 1
 
         except Exception as e:
             logger.error(f"Worker error: {e}")
         finally:
             self._save_state()
+            self.detector.close()
+            self.wakeup.close()
+            if self._watch_conn is not None:
+                self._watch_conn.close()
+                self._watch_conn = None
             logger.info("AssignerWorker stopped")
 
+    def _run_once(self, reasons: set):
+        """Run the duties that are due or that the wake-up reasons ask for."""
+        now = time.time()
+        process = "prompt" in reasons
+
+        # Sessions came or went (tmux notification) or the periodic scan is due
+        if "tmux" in reasons or now - self._last_session_scan >= self.session_scan_interval:
+            self._scan_sessions()
+            self._last_session_scan = time.time()
+            process = True
+
+        if now - self._last_timeout_check >= self.timeout_check_interval:
+            self._check_timeouts()
+            self._last_timeout_check = time.time()
+            process = True
+
+        if self._has_active_assignments and (
+            now - self._last_assignment_check >= self.poll_interval
+        ):
+            self._check_assignments()
+            self._last_assignment_check = time.time()
+            process = True
+
+        if now - self._last_db_check >= self.db_check_interval:
+            self._last_db_check = now
+            if self._db_changed():
+                self.loop_stats["db_changes"] += 1
+                process = True
+
+        if process:
+            self._process_prompts()
+
+        self._save_state()
+
+    def _next_wait(self) -> float:
+        """Seconds until the next scheduled duty."""
+        due = [
+            self._last_session_scan + self.session_scan_interval,
+            self._last_timeout_check + self.timeout_check_interval,
+            self._last_db_check + self.db_check_interval,
+        ]
+        if self._has_active_assignments:
+            due.append(self._last_assignment_check + self.poll_interval)
+        return max(0.0, min(due) - time.time())
+
+    def _db_changed(self) -> bool:
+        """True if another connection committed to the queue since the last check."""
+        try:
+            if self._watch_conn is None:
+                self._watch_conn = sqlite3.connect(str(self.db.db_path), timeout=30)
+            version = self._watch_conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error as e:
+            logger.debug(f"data_version check failed: {e}")
+            return True
+        changed = version != self._data_version
+        self._data_version = version
+        return changed
+
     def stop(self):
         """Stop the worker."""
         self.running = False
+        self.wakeup.notify("stop")
         logger.info("Stopping AssignerWorker")
 
     def _handle_signal(self, signum, frame):
@@ -1582,11 +1781,17 @@ class AssignerWorker:
 
         logger.debug(f"Scanned {len(sessions)} sessions")
 
-    def _process_prompts(self):
-        """Process pending prompts and assign to available sessions."""
-        pending = self.db.get_pending_prompts(limit=5)
+    def _process_prompts(self) -> int:
+        """Process pending prompts and assign to available sessions.
+
+        Returns the number of prompts assigned.
+        """
+        limit = 5
+        pending = self.db.get_pending_prompts(limit=limit)
         if not pending:
-            return
+            return 0
+
+        assigned = 0
 
         for prompt in pending:
             target = prompt.get("target_session")
@@ -1596,7 +1801,8 @@ class AssignerWorker:
                 available = self.db.get_available_sessions()
                 available_names = {s["name"] for s in available}
                 if target in available_names:
-                    self._assign_prompt(prompt, target)
+                    if self._assign_prompt(prompt, target):
+                        assigned += 1
                     continue
                 else:
                     # Target session not available, try to match by provider
@@ -1614,7 +1820,8 @@ class AssignerWorker:
                                 f"Prompt {prompt['id']}: matched provider '{target}' "
                                 f"→ session '{session['name']}'"
                             )
-                            self._assign_prompt(prompt, session["name"])
+                            if self._assign_prompt(prompt, session["name"]):
+                                assigned += 1
                             continue
                     # Still no match, fall through to general selection
                     logger.debug(
@@ -1630,7 +1837,13 @@ class AssignerWorker:
                 logger.debug(f"Prompt {prompt['id']} waiting, no available sessions{provider_msg}")
                 continue
 
-            self._assign_prompt(prompt, session["name"])
+            if self._assign_prompt(prompt, session["name"]):
+                assigned += 1
+
+        # A full batch that made progress may have more prompts behind it
+        if assigned and len(pending) == limit:
+            self.wakeup.notify("prompt")
+        return assigned
 
     def _select_session_for_prompt(self, prompt: Dict) -> Optional[Dict]:
         """Select the best available session for a prompt (Phase 3 Context Management).
@@ -1727,8 +1940,11 @@ class AssignerWorker:
         if timed_out > 0:
             logger.warning(f"Timed out {timed_out} stuck assignments")
 
-    def _assign_prompt(self, prompt: Dict, session_name: str):
-        """Assign a prompt to a session with throttle checking."""
+    def _assign_prompt(self, prompt: Dict, session_name: str) -> bool:
+        """Assign a prompt to a session with throttle checking.
+
+        Returns True if the prompt was sent to the session.
+        """
         prompt_id = prompt["id"]
         content = prompt["content"]
         priority_num = prompt.get("priority", 0)
@@ -1766,7 +1982,7 @@ class AssignerWorker:
                     "throttled",
                     f"Throttled: {throttle_level.value}",
                 )
-                return
+                return False
 
         except Exception as e:
             logger.warning(f"Throttle check failed, proceeding anyway: {e}")
@@ -1798,7 +2014,7 @@ class AssignerWorker:
                     "failed",
                     f"Session '{session_name}' not found",
                 )
-                return
+                return False
 
         logger.info(
             f"Assigning prompt {prompt_id} to session {session_name} (priority: {priority})"
@@ -1828,11 +2044,14 @@ class AssignerWorker:
             self.db.log_assignment(prompt_id, session_name, "assigned", "Sent prompt to session")
 
             logger.info(f"Assigned prompt {prompt_id} to {session_name}")
+            self.loop_stats["dispatched"] += 1
+            return True
 
         except Exception as e:
             logger.error(f"Failed to assign prompt {prompt_id}: {e}")
             self.db.update_prompt_status(prompt_id, PromptStatus.FAILED, error=str(e))
             self.db.log_assignment(prompt_id, session_name, "failed", str(e))
+            return False
 
     def _prepare_session_context(self, session_name: str, metadata: Optional[Dict] = None) -> bool:
         """Prepare session context before sending a task (Phase 1 Context Management)."""
@@ -2007,8 +2226,15 @@ class AssignerWorker:
                     logger.info(f"Prompt {prompt_id} completed in session {session_name}")
 
     def _save_state(self):
-        """Save worker state to file."""
+        """Save worker state to file if it changed since the last write.
+
+        The timestamp records when the state last changed.
+        """
         stats = self.db.get_stats()
+        self._has_active_assignments = stats["active_assignments"] > 0
+        snapshot = (self.running, stats)
+        if snapshot == self._saved_state:
+            return
         state = {
             "worker_id": self.worker_id,
             "running": self.running,
@@ -2016,6 +2242,8 @@ class AssignerWorker:
             "stats": stats,
         }
         STATE_FILE.write_text(json.dumps(state, indent=2))
+        self._saved_state = snapshot
+        self.loop_stats["state_writes"] += 1
 
 
 # ============================================================================
@@ -2383,7 +2611,12 @@ def main():
     parser.add_argument("--daemon", action="store_true", help="Run as daemon")
     parser.add_argument("--stop", action="store_true", help="Stop daemon")
     parser.add_argument("--status", action="store_true", help="Show status")
-    parser.add_argument("--poll-interval", type=int, default=3, help="Poll interval in seconds")
+    parser.add_argument(
+        "--poll-interval",
+        type=int,
+        default=3,
+        help="Seconds between checks of active assignments",
+    )
 
     # Prompt operations
     parser.add_argument("--send", metavar="PROMPT", help="Send a prompt to the queue")
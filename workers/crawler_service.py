@@ -130,13 +130,14 @@ class LLMClient:
         if self.failover_enabled:
             # Use unified client with failover
             try:
-                from services.llm_provider import UnifiedLLMClient
+                from services.llm_provider import AsyncUnifiedLLMClient
 
-                self.unified_client = UnifiedLLMClient()
-                logger.info("LLM failover enabled: using UnifiedLLMClient")
+                self.unified_client = AsyncUnifiedLLMClient()
+                logger.info("LLM failover enabled: using AsyncUnifiedLLMClient")
             except Exception as e:
                 logger.warning(
-                    f"Failed to initialize UnifiedLLMClient, falling back to direct provider: {e}"
+                    "Failed to initialize AsyncUnifiedLLMClient, "
+                    f"falling back to direct provider: {e}"
                 )
                 self.unified_client = None
                 self.failover_enabled = False
@@ -204,19 +205,15 @@ class LLMClient:
                     f"{delegation_result.agent.value} ({delegation_result.model})"
                 )
 
-            # Call unified client (synchronous, but wrapped in async)
+            # Call unified client without tying up a thread per request
             # Includes automatic throttling
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.unified_client.messages.create(
-                    model=model,
-                    max_tokens=self.config.llm.claude_max_tokens,
-                    messages=messages,
-                    temperature=self.config.llm.temperature,
-                    session_id=self.session_id,
-                    priority=priority,
-                ),
+            response = await self.unified_client.messages.create(
+                model=model,
+                max_tokens=self.config.llm.claude_max_tokens,
+                messages=messages,
+                temperature=self.config.llm.temperature,
+                session_id=self.session_id,
+                priority=priority,
             )
 
             # Extract text from response
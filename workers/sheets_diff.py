@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Google Sheets Diff Writer
+
+Incremental writes for sheets_sync.py. Instead of clearing and rewriting
+every worksheet each cycle, the writer keeps a local snapshot of what it
+last wrote to each sheet, diffs the new grid against it and sends only the
+changed cells.
+
+Features:
+- Snapshot of last written values, formats and source watermark per sheet,
+  persisted as JSON between runs and keyed by spreadsheet ID
+- Row-level diffs: each changed row becomes one cell range spanning its
+  first to last changed column; identical spans on adjacent rows merge
+- One spreadsheets.batchUpdate per commit carrying grid resizes, changed
+  cells (updateCells) and changed formats (repeatCell) for every sheet
+- Sheets whose source watermark is unchanged are skipped without
+  rebuilding their rows
+- Baselines come from values_batch_get: values read for the
+  sheet-to-database direction are reused (so user edits are overwritten
+  where the database disagrees), and sheets missing from the snapshot are
+  read in one call at commit
+
+Usage:
+    from workers.sheets_diff import SheetSnapshot, SheetWriter
+
+    writer = SheetWriter(spreadsheet, SheetSnapshot.load(path, spreadsheet.id))
+    current = writer.read(["Bugs", "Tasks"])   # one API call, becomes baseline
+    if not writer.is_current("Errors", watermark):
+        writer.stage("Errors", rows, formats={"A1:H1": {...}}, watermark=watermark)
+    writer.commit()                             # one batch_update
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Cell values as get_all_values() returns them, for comparison
+Grid = List[List[str]]
+
+_A1_CELL = re.compile(r"^([A-Z]+)(\d+)$")
+
+
+def column_letter(col: int) -> str:
+    """1-based column number to its A1 letters."""
+    letters = ""
+    while col:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _column_number(letters: str) -> int:
+    number = 0
+    for char in letters:
+        number = number * 26 + ord(char) - 64
+    return number
+
+
+def grid_range(a1: str, sheet_id: int) -> Dict[str, int]:
+    """A1 range ("A1" or "A1:H1") to a Sheets API GridRange."""
+    cells = []
+    for part in a1.split(":"):
+        match = _A1_CELL.match(part)
+        if not match:
+            raise ValueError(f"Unsupported A1 range: {a1}")
+        cells.append((int(match.group(2)), _column_number(match.group(1))))
+    (row, col), (end_row, end_col) = cells[0], cells[-1]
+    return {
+        "sheetId": sheet_id,
+        "startRowIndex": row - 1,
+        "endRowIndex": end_row,
+        "startColumnIndex": col - 1,
+        "endColumnIndex": end_col,
+    }
+
+
+def cell_text(value: Any) -> str:
+    """How a written value reads back from get_all_values()."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    return str(value)
+
+
+def normalize_grid(values: Iterable[Iterable[Any]]) -> Grid:
+    """Values as text, with trailing empty cells and rows trimmed."""
+    grid = []
+    for row in values:
+        cells = [cell_text(v) for v in row]
+        while cells and cells[-1] == "":
+            cells.pop()
+        grid.append(cells)
+    while grid and not grid[-1]:
+        grid.pop()
+    return grid
+
+
+def diff_ranges(old: Grid, new: List[List[Any]]) -> List[Tuple[int, int, List[List[Any]]]]:
+    """Changed cell rectangles between a written grid and a new one.
+
+    Args:
+        old: Normalized grid currently on the sheet
+        new: Values to be written (raw, not normalized)
+
+    Returns:
+        (row, col, values) tuples, 1-based top-left corner. Cells present
+        in old but not in new are returned as "" so they get cleared.
+    """
+    ranges: List[Tuple[int, int, List[List[Any]]]] = []
+    span: Optional[Tuple[int, int, int]] = None  # (first row, first col, last col) of ranges[-1]
+    for r in range(max(len(old), len(new))):
+        old_row = old[r] if r < len(old) else []
+        new_row = list(new[r]) if r < len(new) else []
+        width = max(len(old_row), len(new_row))
+        changed = [
+            c
+            for c in range(width)
+            if (old_row[c] if c < len(old_row) else "")
+            != (cell_text(new_row[c]) if c < len(new_row) else "")
+        ]
+        if not changed:
+            span = None
+            continue
+        first, last = changed[0], changed[-1]
+        cells = [new_row[c] if c < len(new_row) else "" for c in range(first, last + 1)]
+        if span and span[1:] == (first, last) and span[0] + len(ranges[-1][2]) == r:
+            ranges[-1][2].append(cells)
+        else:
+            ranges.append((r + 1, first + 1, [cells]))
+            span = (r, first, last)
+    return ranges
+
+
+def _cell_data(value: Any) -> Dict[str, Any]:
+    """Value as an updateCells CellData (RAW input, like ws.update())."""
+    if value is None or value == "":
+        return {}
+    if isinstance(value, bool):
+        return {"userEnteredValue": {"boolValue": value}}
+    if isinstance(value, (int, float)):
+        return {"userEnteredValue": {"numberValue": value}}
+    return {"userEnteredValue": {"stringValue": str(value)}}
+
+
+class SheetSnapshot:
+    """Last written state per sheet of one spreadsheet, persisted as JSON.
+
+    The file maps spreadsheet ID to that spreadsheet's sheets, so processes
+    syncing different spreadsheets can share it. Each sheet entry holds
+    "values" (normalized grid), "formats" ({A1 range: format}) and
+    "watermark" (opaque, JSON-serializable source version).
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        sheets: Optional[Dict[str, Dict]] = None,
+        spreadsheet_id: str = "",
+    ):
+        self.path = Path(path) if path else None
+        self.spreadsheet_id = spreadsheet_id
+        self.sheets: Dict[str, Dict[str, Any]] = sheets or {}
+
+    @staticmethod
+    def _read(path: Path) -> Dict[str, Dict]:
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @classmethod
+    def load(cls, path: Path, spreadsheet_id: str) -> "SheetSnapshot":
+        """Read one spreadsheet's entry; a missing or unreadable file gives an empty one."""
+        sheets = cls._read(path).get(spreadsheet_id)
+        return cls(path, sheets if isinstance(sheets, dict) else {}, spreadsheet_id)
+
+    def save(self):
+        """Write this spreadsheet's entry atomically (no-op without a path)."""
+        if not self.path:
+            return
+        data = self._read(self.path)
+        data[self.spreadsheet_id] = self.sheets
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+
+class SheetWriter:
+    """
+    Stages new grids for worksheets and writes only what changed.
+
+    stage() is cheap; nothing is sent until commit(), which issues at most
+    one values_batch_get (for sheets with no known baseline) and one
+    batch_update for the whole spreadsheet.
+    """
+
+    def __init__(self, spreadsheet, snapshot: SheetSnapshot):
+        self.spreadsheet = spreadsheet
+        self.snapshot = snapshot
+        self._worksheets: Optional[Dict[str, Any]] = None
+        self._staged: Dict[str, Dict[str, Any]] = {}
+        self._observed: Dict[str, Grid] = {}
+        self.stats = {
+            "staged": 0,
+            "skipped": 0,
+            "unchanged": 0,
+            "ranges": 0,
+            "cells": 0,
+            "formats": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Worksheets and reads
+    # ------------------------------------------------------------------
+
+    def worksheet(self, title: str, rows: int = 200, cols: int = 15):
+        """Existing worksheet by title (one metadata call per writer) or a new one."""
+        if self._worksheets is None:
+            self._worksheets = {ws.title: ws for ws in self.spreadsheet.worksheets()}
+        ws = self._worksheets.get(title)
+        if ws is None:
+            ws = self._worksheets[title] = self.spreadsheet.add_worksheet(
+                title, rows=rows, cols=cols
+            )
+            self.observe(title, [])  # Nothing to read back from a new sheet
+        return ws
+
+    def has_worksheet(self, title: str) -> bool:
+        if self._worksheets is None:
+            self._worksheets = {ws.title: ws for ws in self.spreadsheet.worksheets()}
+        return title in self._worksheets
+
+    def read(self, titles: Iterable[str]) -> Dict[str, Grid]:
+        """Current values of existing sheets in one API call.
+
+        The values become each sheet's diff baseline for this writer.
+        """
+        titles = [t for t in titles if self.has_worksheet(t)]
+        if not titles:
+            return {}
+        quoted = ["'{}'".format(t.replace("'", "''")) for t in titles]
+        response = self.spreadsheet.values_batch_get(quoted)
+        values = {
+            title: [list(row) for row in value_range.get("values", [])]
+            for title, value_range in zip(titles, response.get("valueRanges", []))
+        }
+        for title, rows in values.items():
+            self.observe(title, rows)
+        return values
+
+    def observe(self, title: str, values: Iterable[Iterable[Any]]):
+        """Record values read from a sheet as its diff baseline."""
+        self._observed[title] = normalize_grid(values)
+
+    def written(self, title: str) -> Grid:
+        """Values this sync last wrote to a sheet, per the snapshot."""
+        return self.snapshot.sheets.get(title, {}).get("values", [])
+
+    def _baseline(self, title: str) -> Optional[Grid]:
+        if title in self._observed:
+            return self._observed[title]
+        return self.snapshot.sheets.get(title, {}).get("values")
+
+    # ------------------------------------------------------------------
+    # Staging
+    # ------------------------------------------------------------------
+
+    def is_current(self, title: str, watermark: Any) -> bool:
+        """True if the sheet was last written from this source watermark
+        and has not been edited since (as far as this writer has read)."""
+        entry = self.snapshot.sheets.get(title)
+        current = (
+            watermark is not None
+            and entry is not None
+            and "values" in entry
+            and entry.get("watermark") == watermark
+            and self._observed.get(title, entry["values"]) == entry["values"]
+        )
+        if current:
+            self.stats["skipped"] += 1
+        return current
+
+    def stage(
+        self,
+        title: str,
+        values: List[List[Any]],
+        formats: Optional[Dict[str, Dict[str, Any]]] = None,
+        watermark: Any = None,
+        rows: int = 200,
+        cols: int = 15,
+    ):
+        """Queue the full desired contents of a sheet, starting at A1."""
+        self._staged[title] = {
+            "values": [list(row) for row in values],
+            "formats": formats or {},
+            "watermark": watermark,
+            "ws": self.worksheet(title, rows, cols),
+        }
+        self.stats["staged"] += 1
+
+    # ------------------------------------------------------------------
+    # Commit
+    # ------------------------------------------------------------------
+
+    def commit(self) -> Dict[str, int]:
+        """Send every staged change in one batch_update and save the snapshot."""
+        if not self._staged:
+            return dict(self.stats)
+
+        unknown = [t for t in self._staged if self._baseline(t) is None]
+        if unknown:
+            self.read(unknown)
+
+        requests: List[Dict[str, Any]] = []
+        for title, staged in self._staged.items():
+            requests.extend(self._requests(title, staged))
+            self._observed.pop(title, None)
+
+        if requests:
+            self.spreadsheet.batch_update({"requests": requests})
+
+        for title, staged in self._staged.items():
+            self.snapshot.sheets[title] = {
+                "values": normalize_grid(staged["values"]),
+                "formats": staged["formats"],
+                "watermark": staged["watermark"],
+            }
+        self._staged = {}
+        self.snapshot.save()
+        return dict(self.stats)
+
+    def _requests(self, title: str, staged: Dict[str, Any]) -> List[Dict[str, Any]]:
+        ws, values = staged["ws"], staged["values"]
+        entry = self.snapshot.sheets.get(title, {})
+        sheet_id = ws.id
+        requests = []
+
+        # Grow the grid first so every range below fits
+        need_rows = len(values)
+        need_cols = max((len(row) for row in values), default=0)
+        grid = {}
+        if need_rows > ws.row_count:
+            grid["rowCount"] = need_rows
+        if need_cols > ws.col_count:
+            grid["columnCount"] = need_cols
+        if grid:
+            requests.append(
+                {
+                    "updateSheetProperties": {
+                        "properties": {"sheetId": sheet_id, "gridProperties": grid},
+                        "fields": ",".join(f"gridProperties.{k}" for k in grid),
+                    }
+                }
+            )
+
+        ranges = diff_ranges(self._baseline(title) or [], values)
+        for row, col, block in ranges:
+            requests.append(
+                {
+                    "updateCells": {
+                        "start": {"sheetId": sheet_id, "rowIndex": row - 1, "columnIndex": col - 1},
+                        "rows": [{"values": [_cell_data(v) for v in cells]} for cells in block],
+                        "fields": "userEnteredValue",
+                    }
+                }
+            )
+            self.stats["cells"] += sum(len(cells) for cells in block)
+        self.stats["ranges"] += len(ranges)
+
+        old_formats = entry.get("formats", {})
+        new_formats = staged["formats"]
+        # Formats that no longer apply are reset before new ones are applied
+        for a1 in old_formats:
+            if a1 not in new_formats:
+                requests.append(
+                    {
+                        "repeatCell": {
+                            "range": grid_range(a1, sheet_id),
+                            "cell": {"userEnteredFormat": {}},
+                            "fields": "userEnteredFormat",
+                        }
+                    }
+                )
+                self.stats["formats"] += 1
+        for a1, fmt in new_formats.items():
+            if old_formats.get(a1) == fmt:
+                continue
+            requests.append(
+                {
+                    "repeatCell": {
+                        "range": grid_range(a1, sheet_id),
+                        "cell": {"userEnteredFormat": fmt},
+                        "fields": "userEnteredFormat({})".format(",".join(fmt)),
+                    }
+                }
+            )
+            self.stats["formats"] += 1
+
+        if not requests:
+            self.stats["unchanged"] += 1
+        return requests
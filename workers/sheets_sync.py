@@ -8,6 +8,11 @@ Full bidirectional sync between Architect Dashboard and Google Sheets:
 - Progress: Worker sessions update Sheet with status
 - Documentation: Project docs synced to Sheet
 
+Each cycle reads the editable sheets in one request while local state is
+collected, applies user edits to the database, then writes only changed
+cells in one batch update (see sheets_diff.py). Database-backed sheets are
+skipped entirely while their source tables are unchanged.
+
 Usage:
     python3 sheets_sync.py              # One-time sync
     python3 sheets_sync.py --daemon     # Continuous sync every 2 minutes
@@ -21,11 +26,15 @@ import sqlite3
 import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from dashboard_cache import VERSIONED_TABLES  # noqa: E402
+from workers.sheets_diff import SheetSnapshot, SheetWriter, normalize_grid  # noqa: E402
+
 # Configuration
 SPREADSHEET_ID = "12i2uO6-41uZdHl_a9BbhBHhR1qbNlAqOgH-CWQBz7rA"
 ARCHITECTURE_DOC_ID = None  # Will be auto-created/discovered
@@ -34,8 +43,24 @@ CREDENTIALS_PATH = Path.home() / ".config" / "gspread" / "service_account.json"
 DB_PATH = Path(__file__).parent.parent / "data" / "prod" / "architect.db"
 LOG_FILE = Path("/tmp/sheets_sync.log")
 PID_FILE = Path("/tmp/sheets_sync.pid")
+SNAPSHOT_FILE = Path("/tmp/sheets_sync_snapshot.json")  # Last written state, per spreadsheet ID
 ARCHITECTURE_DOC_TITLE = "Architect Dashboard - Architecture Guide"
 
+# Sheets read at the start of each cycle (one request): user edits flow to
+# the database and the values serve as diff baselines
+READ_SHEETS = ["Bugs", "Tasks", "DevTasks", "Testing", "Decisions", "Usage", "SOP"]
+
+# Source tables of database-backed sheets, for change watermarks
+SHEET_SOURCES = {
+    "Bugs": ("bugs", "projects"),
+    "Features": ("features", "milestones", "projects"),
+    "Tasks": ("task_queue",),
+    "Errors": ("errors",),
+}
+
+HEADER_FORMAT = {"textFormat": {"bold": True}}
+TITLE_FORMAT = {"textFormat": {"bold": True, "fontSize": 14}}
+
 
 def log(msg):
     ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -80,6 +105,79 @@ def get_or_create_worksheet(spreadsheet, title, rows=200, cols=15):
         return spreadsheet.add_worksheet(title, rows=rows, cols=cols)
 
 
+def get_worksheet(spreadsheet, writer, title, rows=200, cols=15):
+    """Worksheet via the cycle's writer (no extra lookup) when there is one."""
+    if writer is not None:
+        return writer.worksheet(title, rows, cols)
+    return get_or_create_worksheet(spreadsheet, title, rows, cols)
+
+
+def first_cell(ws, current):
+    """A1 of a sheet, from values read this cycle when available."""
+    if current is not None:
+        return current[0][0] if current and current[0] else None
+    return ws.acell("A1").value
+
+
+def edited_rows(rows, written=None):
+    """Data rows of a sheet, less the ones still exactly as this sync wrote them.
+
+    Unedited rows are stale copies of the database and must not overwrite it.
+    """
+    unchanged = {tuple(row) for row in written or []}
+    return [row for row in rows[1:] if tuple(normalize_grid([row, ["-"]])[0]) not in unchanged]
+
+
+def stage_sheet(spreadsheet, writer, title, values, formats=None, watermark=None, **kwargs):
+    """Stage a sheet's contents on the cycle's writer, or write them now without one."""
+    own = writer is None
+    if own:
+        writer = SheetWriter(spreadsheet, SheetSnapshot.load(SNAPSHOT_FILE, SPREADSHEET_ID))
+    writer.stage(title, values, formats, watermark, **kwargs)
+    if own:
+        writer.commit()
+
+
+def sheet_is_current(writer, title, watermark):
+    return writer is not None and writer.is_current(title, watermark)
+
+
+def get_watermark(title):
+    """Change watermark for a database-backed sheet.
+
+    Per source table: row count, newest updated_at (or last_seen) and the
+    dashboard cache version that triggers bump on every write, so edits
+    that do not touch updated_at are still seen. None if unavailable.
+    """
+    try:
+        conn = get_db()
+        try:
+            try:
+                versions = {
+                    row[0]: row[1]
+                    for row in conn.execute(
+                        "SELECT component, version FROM dashboard_cache_versions"
+                    )
+                }
+            except sqlite3.OperationalError:
+                versions = {}
+            watermark = []
+            for table in SHEET_SOURCES[title]:
+                columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                stamp = next((c for c in ("updated_at", "last_seen") if c in columns), None)
+                count, newest = conn.execute(
+                    f"SELECT COUNT(*), {f'MAX({stamp})' if stamp else 'NULL'} FROM {table}"
+                ).fetchone()
+                component = VERSIONED_TABLES.get(table, ((None,),))[0][0]
+                watermark.append([table, count, newest, versions.get(component)])
+            return watermark
+        finally:
+            conn.close()
+    except Exception as e:
+        log(f"Error getting watermark for {title}: {e}")
+        return None
+
+
 # =============================================================================
 # DATA COLLECTION
 # =============================================================================
@@ -347,42 +445,38 @@ def get_worker_progress():
 # =============================================================================
 
 
-def sync_sessions_to_sheet(spreadsheet):
+def sync_sessions_to_sheet(spreadsheet, writer=None, sessions=None):
     """Sync tmux sessions to Sessions sheet."""
-    ws = get_or_create_worksheet(spreadsheet, "Sessions")
-    sessions = get_tmux_sessions()
+    if sessions is None:
+        sessions = get_tmux_sessions()
 
-    ws.clear()
     headers = ["Session", "Status", "Windows", "Created", "Last Activity", "Last Sync"]
-    ws.update(values=[headers], range_name="A1")
-    ws.format(
-        "A1:F1",
-        {"textFormat": {"bold": True}, "backgroundColor": {"red": 0.9, "green": 0.9, "blue": 0.9}},
-    )
-
-    if sessions:
-        rows = [
-            [
-                s["name"],
-                "Attached" if s["attached"] == "Yes" else "Detached",
-                s["windows"],
-                s["created"],
-                s["last_output"][:50],
-                datetime.now().strftime("%H:%M:%S"),
-            ]
-            for s in sessions
+    rows = [headers] + [
+        [
+            s["name"],
+            "Attached" if s["attached"] == "Yes" else "Detached",
+            s["windows"],
+            s["created"],
+            s["last_output"][:50],
+            datetime.now().strftime("%H:%M:%S"),
         ]
-        ws.update(values=rows, range_name="A2")
+        for s in sessions
+    ]
+    formats = {
+        "A1:F1": {**HEADER_FORMAT, "backgroundColor": {"red": 0.9, "green": 0.9, "blue": 0.9}},
+    }
+    stage_sheet(spreadsheet, writer, "Sessions", rows, formats)
 
     log(f"Synced {len(sessions)} sessions")
 
 
-def sync_bugs_to_sheet(spreadsheet):
+def sync_bugs_to_sheet(spreadsheet, writer=None):
     """Sync bugs to Bugs sheet (two-way sync enabled)."""
-    ws = get_or_create_worksheet(spreadsheet, "Bugs")
+    watermark = get_watermark("Bugs")
+    if sheet_is_current(writer, "Bugs", watermark):
+        return
     bugs = get_bugs()
 
-    ws.clear()
     headers = [
         "ID",
         "Title",
@@ -394,54 +488,43 @@ def sync_bugs_to_sheet(spreadsheet):
         "Description",
         "Created",
     ]
-    ws.update(values=[headers], range_name="A1")
-    ws.format(
-        "A1:I1",
-        {"textFormat": {"bold": True}, "backgroundColor": {"red": 1, "green": 0.8, "blue": 0.8}},
-    )
-
-    if bugs:
-        rows = [
-            [
-                b["id"],
-                b["title"] or "",
-                b["severity"] or "medium",
-                b["status"] or "open",
-                b["project_name"] or "",
-                b["assigned_to"] or "",
-                b["tmux_session"] or "",
-                (b["description"] or "")[:100],
-                b["created_at"] or "",
-            ]
-            for b in bugs
+    rows = [headers] + [
+        [
+            b["id"],
+            b["title"] or "",
+            b["severity"] or "medium",
+            b["status"] or "open",
+            b["project_name"] or "",
+            b["assigned_to"] or "",
+            b["tmux_session"] or "",
+            (b["description"] or "")[:100],
+            b["created_at"] or "",
         ]
-        ws.update(values=rows, range_name="A2")
+        for b in bugs
+    ]
 
-    # Add "NEW BUG" row template at the end
+    # Add "NEW BUG" row template at the end, after a blank row
     next_row = len(bugs) + 3
-    ws.update(
-        values=[["NEW", "(Enter title here)", "medium", "open", "", "", "", "(description)", ""]],
-        range_name=f"A{next_row}",
-    )
-    ws.format(f"A{next_row}:I{next_row}", {"backgroundColor": {"red": 1, "green": 1, "blue": 0.8}})
+    rows.append([])
+    rows.append(["NEW", "(Enter title here)", "medium", "open", "", "", "", "(description)", ""])
+    formats = {
+        "A1:I1": {**HEADER_FORMAT, "backgroundColor": {"red": 1, "green": 0.8, "blue": 0.8}},
+        f"A{next_row}:I{next_row}": {"backgroundColor": {"red": 1, "green": 1, "blue": 0.8}},
+    }
+    stage_sheet(spreadsheet, writer, "Bugs", rows, formats, watermark)
 
     log(f"Synced {len(bugs)} bugs")
 
 
-def sync_features_to_sheet(spreadsheet):
+def sync_features_to_sheet(spreadsheet, writer=None):
     """Sync features to Features sheet with project/milestone hierarchy."""
-    ws = get_or_create_worksheet(spreadsheet, "Features")
+    watermark = get_watermark("Features")
+    if sheet_is_current(writer, "Features", watermark):
+        return
     hierarchy = get_features_hierarchy()
 
-    ws.clear()
     headers = ["Level", "ID", "Name", "Status", "Priority", "Assigned To", "Session", "Description"]
-    ws.update(values=[headers], range_name="A1")
-    ws.format(
-        "A1:H1",
-        {"textFormat": {"bold": True}, "backgroundColor": {"red": 0.8, "green": 0.9, "blue": 0.8}},
-    )
-
-    rows = []
+    rows = [headers]
     project_rows = []  # Track rows to format as project headers
     milestone_rows = []  # Track rows to format as milestone headers
 
@@ -571,44 +654,32 @@ def sync_features_to_sheet(spreadsheet):
             )
             row_num += 1
 
-    if rows:
-        ws.update(values=rows, range_name="A2")
-
-        # Format project rows with bold and background color
-        for r in project_rows:
-            try:
-                ws.format(
-                    f"A{r}:H{r}",
-                    {
-                        "textFormat": {"bold": True},
-                        "backgroundColor": {"red": 0.9, "green": 0.95, "blue": 1},
-                    },
-                )
-            except:
-                pass
-
-        # Format milestone rows
-        for r in milestone_rows:
-            try:
-                ws.format(
-                    f"A{r}:H{r}",
-                    {
-                        "textFormat": {"bold": True},
-                        "backgroundColor": {"red": 0.95, "green": 1, "blue": 0.95},
-                    },
-                )
-            except:
-                pass
+    formats = {
+        "A1:H1": {**HEADER_FORMAT, "backgroundColor": {"red": 0.8, "green": 0.9, "blue": 0.8}},
+    }
+    # Project and milestone header rows: bold with a background color
+    for r in project_rows:
+        formats[f"A{r}:H{r}"] = {
+            **HEADER_FORMAT,
+            "backgroundColor": {"red": 0.9, "green": 0.95, "blue": 1},
+        }
+    for r in milestone_rows:
+        formats[f"A{r}:H{r}"] = {
+            **HEADER_FORMAT,
+            "backgroundColor": {"red": 0.95, "green": 1, "blue": 0.95},
+        }
+    stage_sheet(spreadsheet, writer, "Features", rows, formats, watermark)
 
     log(f"Synced {len(features)} features in hierarchy")
 
 
-def sync_tasks_to_sheet(spreadsheet):
+def sync_tasks_to_sheet(spreadsheet, writer=None):
     """Sync task queue to Tasks sheet."""
-    ws = get_or_create_worksheet(spreadsheet, "Tasks")
+    watermark = get_watermark("Tasks")
+    if sheet_is_current(writer, "Tasks", watermark):
+        return
     tasks = get_tasks()
 
-    ws.clear()
     headers = [
         "ID",
         "Type",
@@ -620,81 +691,69 @@ def sync_tasks_to_sheet(spreadsheet):
         "Created",
         "Started",
     ]
-    ws.update(values=[headers], range_name="A1")
-    ws.format(
-        "A1:I1",
-        {"textFormat": {"bold": True}, "backgroundColor": {"red": 0.8, "green": 0.8, "blue": 1}},
-    )
-
-    if tasks:
-        rows = [
-            [
-                t["id"],
-                t["task_type"],
-                t["title"],
-                t["priority"] or 0,
-                t["status"],
-                t["assigned_worker"] or "",
-                t["description"],
-                t["created_at"] or "",
-                t["started_at"] or "",
-            ]
-            for t in tasks
+    rows = [headers] + [
+        [
+            t["id"],
+            t["task_type"],
+            t["title"],
+            t["priority"] or 0,
+            t["status"],
+            t["assigned_worker"] or "",
+            t["description"],
+            t["created_at"] or "",
+            t["started_at"] or "",
         ]
-        ws.update(values=rows, range_name="A2")
+        for t in tasks
+    ]
+    formats = {
+        "A1:I1": {**HEADER_FORMAT, "backgroundColor": {"red": 0.8, "green": 0.8, "blue": 1}},
+    }
+    stage_sheet(spreadsheet, writer, "Tasks", rows, formats, watermark)
 
     log(f"Synced {len(tasks)} tasks")
 
 
-def sync_errors_to_sheet(spreadsheet):
+def sync_errors_to_sheet(spreadsheet, writer=None):
     """Sync errors to Errors sheet."""
-    ws = get_or_create_worksheet(spreadsheet, "Errors")
+    watermark = get_watermark("Errors")
+    if sheet_is_current(writer, "Errors", watermark):
+        return
     errors = get_errors()
 
-    ws.clear()
     headers = ["ID", "Type", "Message", "Source", "Count", "First Seen", "Last Seen", "Status"]
-    ws.update(values=[headers], range_name="A1")
-    ws.format(
-        "A1:H1",
-        {"textFormat": {"bold": True}, "backgroundColor": {"red": 1, "green": 0.7, "blue": 0.7}},
-    )
-
-    if errors:
-        rows = [
-            [
-                e["id"],
-                e["error_type"] or "",
-                (e["message"] or "")[:80],
-                e["source"] or "",
-                e["occurrence_count"] or 1,
-                e["first_seen"] or "",
-                e["last_seen"] or "",
-                e["status"] or "open",
-            ]
-            for e in errors
+    rows = [headers] + [
+        [
+            e["id"],
+            e["error_type"] or "",
+            (e["message"] or "")[:80],
+            e["source"] or "",
+            e["occurrence_count"] or 1,
+            e["first_seen"] or "",
+            e["last_seen"] or "",
+            e["status"] or "open",
         ]
-        ws.update(values=rows, range_name="A2")
+        for e in errors
+    ]
+    formats = {
+        "A1:H1": {**HEADER_FORMAT, "backgroundColor": {"red": 1, "green": 0.7, "blue": 0.7}},
+    }
+    stage_sheet(spreadsheet, writer, "Errors", rows, formats, watermark)
 
     log(f"Synced {len(errors)} errors")
 
 
-def sync_progress_to_sheet(spreadsheet):
+def sync_progress_to_sheet(spreadsheet, writer=None, progress=None, sessions=None):
     """Sync worker progress to Progress sheet."""
-    ws = get_or_create_worksheet(spreadsheet, "Progress")
-    progress = get_worker_progress()
-    sessions = get_tmux_sessions()
+    if progress is None:
+        progress = get_worker_progress()
+    if sessions is None:
+        sessions = get_tmux_sessions()
 
-    ws.clear()
     headers = ["Session", "Confirmations", "Last Activity", "Current Status", "Last Output"]
-    ws.update(values=[headers], range_name="A1")
-    ws.format(
-        "A1:E1",
-        {"textFormat": {"bold": True}, "backgroundColor": {"red": 0.8, "green": 1, "blue": 0.8}},
-    )
 
     # Merge progress with session data
     session_map = {s["name"]: s for s in sessions}
-    rows = []
+    rows = [headers]
     for p in progress:
         session = session_map.get(p["session_name"], {})
         rows.append(
@@ -706,18 +765,22 @@ def sync_progress_to_sheet(spreadsheet):
                 session.get("last_output", "")[:60],
             ]
         )
+    formats = {
+        "A1:E1": {**HEADER_FORMAT, "backgroundColor": {"red": 0.8, "green": 1, "blue": 0.8}},
+    }
+    stage_sheet(spreadsheet, writer, "Progress", rows, formats)
 
-    if rows:
-        ws.update(values=rows, range_name="A2")
+    log(f"Synced {len(rows) - 1} progress entries")
 
-    log(f"Synced {len(rows)} progress entries")
 
+def sync_summary_to_sheet(spreadsheet, writer=None, current=None, env_data=None):
+    """Sync dashboard summary to Summary sheet.
 
-def sync_summary_to_sheet(spreadsheet):
-    """Sync dashboard summary to Summary sheet."""
-    ws = get_or_create_worksheet(spreadsheet, "Summary")
-
-    ws.clear()
+    current: sheet values read this cycle ({title: rows}), reused for the
+    DevTasks and Testing counts instead of reading those sheets again.
+    """
+    if current is None:
+        current = {}
 
     rows = [
         ["ARCHITECT DASHBOARD SUMMARY"],
@@ -756,7 +819,8 @@ def sync_summary_to_sheet(spreadsheet):
         # ===== ENVIRONMENTS =====
         rows.append(["ENVIRONMENTS", "Branch", "Changes"])
 
-        env_data = get_environment_data()
+        if env_data is None:
+            env_data = get_environment_data()
         if env_data and "environments" in env_data:
             envs = env_data["environments"]
             if "architect" in envs:
@@ -809,8 +873,9 @@ def sync_summary_to_sheet(spreadsheet):
         # ===== DEV TASKS (from sheet) =====
         rows.append(["DEV TASKS", "Count", ""])
         try:
-            dev_ws = spreadsheet.worksheet("DevTasks")
-            dev_rows = dev_ws.get_all_values()
+            dev_rows = current.get("DevTasks")
+            if dev_rows is None:
+                dev_rows = spreadsheet.worksheet("DevTasks").get_all_values()
             dev_statuses = {}
             for row in dev_rows[1:]:
                 if len(row) > 4:
@@ -825,8 +890,9 @@ def sync_summary_to_sheet(spreadsheet):
         # ===== TESTING =====
         rows.append(["TESTING", "Count", ""])
         try:
-            test_ws = spreadsheet.worksheet("Testing")
-            test_rows = test_ws.get_all_values()
+            test_rows = current.get("Testing")
+            if test_rows is None:
+                test_rows = spreadsheet.worksheet("Testing").get_all_values()
             test_statuses = {}
             for row in test_rows[1:]:
                 if len(row) > 4:
@@ -858,26 +924,16 @@ def sync_summary_to_sheet(spreadsheet):
         rows.append([f"Error: {e}", "", ""])
         log(f"Error syncing summary: {e}")
 
-    # Write all data at once
-    ws.update(values=rows, range_name="A1")
-
-    # Format header
-    ws.format("A1", {"textFormat": {"bold": True, "fontSize": 14}})
-
-    # Format section headers
+    # Header and section header formats
+    formats = {"A1": TITLE_FORMAT}
     section_rows = [4, 10, 14, 24, 30, 36, 42, 48, 54]
     for r in section_rows:
         if r <= len(rows):
-            try:
-                ws.format(
-                    f"A{r}",
-                    {
-                        "textFormat": {"bold": True},
-                        "backgroundColor": {"red": 0.9, "green": 0.9, "blue": 0.95},
-                    },
-                )
-            except:
-                pass
+            formats[f"A{r}"] = {
+                **HEADER_FORMAT,
+                "backgroundColor": {"red": 0.9, "green": 0.9, "blue": 0.95},
+            }
+    stage_sheet(spreadsheet, writer, "Summary", rows, formats)
 
     log("Synced summary")
 
@@ -887,11 +943,14 @@ def sync_summary_to_sheet(spreadsheet):
 # =============================================================================
 
 
-def sync_bugs_from_sheet(spreadsheet):
-    """Read bugs from sheet and sync new/updated ones to database."""
+def sync_bugs_from_sheet(spreadsheet, rows=None, written=None):
+    """Read bugs from sheet and sync new/updated ones to database.
+
+    written: the rows last written to the sheet; only rows edited since are applied.
+    """
     try:
-        ws = spreadsheet.worksheet("Bugs")
-        rows = ws.get_all_values()
+        if rows is None:
+            rows = spreadsheet.worksheet("Bugs").get_all_values()
 
         if len(rows) < 2:
             return
@@ -903,7 +962,7 @@ def sync_bugs_from_sheet(spreadsheet):
         new_bugs = 0
         updated_bugs = 0
 
-        for row in rows[1:]:
+        for row in edited_rows(rows, written):
             if len(row) < 4:
                 continue
 
@@ -953,11 +1012,14 @@ def sync_bugs_from_sheet(spreadsheet):
         log(f"Error syncing bugs from sheet: {e}")
 
 
-def sync_tasks_from_sheet(spreadsheet):
-    """Read task priority changes from sheet."""
+def sync_tasks_from_sheet(spreadsheet, rows=None, written=None):
+    """Read task priority changes from sheet.
+
+    written: the rows last written to the sheet; only rows edited since are applied.
+    """
     try:
-        ws = spreadsheet.worksheet("Tasks")
-        rows = ws.get_all_values()
+        if rows is None:
+            rows = spreadsheet.worksheet("Tasks").get_all_values()
 
         if len(rows) < 2:
             return
@@ -966,7 +1028,7 @@ def sync_tasks_from_sheet(spreadsheet):
         cursor = conn.cursor()
         updated = 0
 
-        for row in rows[1:]:
+        for row in edited_rows(rows, written):
             if len(row) < 4:
                 continue
 
@@ -999,14 +1061,17 @@ def sync_tasks_from_sheet(spreadsheet):
 # =============================================================================
 
 
-def sync_dev_tasks_to_sheet(spreadsheet):
-    """Sync development tasks to DevTasks sheet for tmux sessions to pull."""
-    ws = get_or_create_worksheet(spreadsheet, "DevTasks")
+def sync_dev_tasks_to_sheet(spreadsheet, writer=None, current=None):
+    """Sync development tasks to DevTasks sheet for tmux sessions to pull.
+
+    current: the sheet's values read this cycle, if any.
+    """
+    ws = get_worksheet(spreadsheet, writer, "DevTasks")
 
     # Check if sheet needs initialization
     try:
-        first_cell = ws.acell("A1").value
-        if first_cell != "ID":
+        if first_cell(ws, current) != "ID":
+            current = None  # Rewritten below; read it back
             ws.clear()
             headers = [
                 "ID",
@@ -1069,7 +1134,7 @@ def sync_dev_tasks_to_sheet(spreadsheet):
         conn.close()
 
         if tasks:
-            rows = ws.get_all_values()
+            rows = current if current is not None else ws.get_all_values()
             existing_ids = {row[0] for row in rows[1:] if row and row[0].isdigit()}
 
             # Only add tasks not already in sheet
@@ -1102,11 +1167,13 @@ def sync_dev_tasks_to_sheet(spreadsheet):
         log(f"Error syncing dev tasks: {e}")
 
 
-def sync_dev_tasks_from_sheet(spreadsheet):
+def sync_dev_tasks_from_sheet(spreadsheet, rows=None):
     """Read new dev tasks from sheet and add to database."""
     try:
-        ws = spreadsheet.worksheet("DevTasks")
-        rows = ws.get_all_values()
+        ws = None
+        if rows is None:
+            ws = spreadsheet.worksheet("DevTasks")
+            rows = ws.get_all_values()
 
         if len(rows) < 2:
             return
@@ -1152,7 +1219,10 @@ def sync_dev_tasks_from_sheet(spreadsheet):
 
                     new_id = cursor.lastrowid
                     # Update sheet with new ID
+                    if ws is None:
+                        ws = spreadsheet.worksheet("DevTasks")
                     ws.update_acell(f"A{i}", str(new_id))
+                    row[0] = str(new_id)  # Keep values read this cycle in step
                     new_tasks += 1
                 except Exception as e:
                     log(f"Error adding task: {e}")
@@ -1188,13 +1258,12 @@ def sync_dev_tasks_from_sheet(spreadsheet):
 # =============================================================================
 
 
-def sync_testing_to_sheet(spreadsheet):
+def sync_testing_to_sheet(spreadsheet, writer=None, current=None):
     """Sync testing sheet for test management."""
-    ws = get_or_create_worksheet(spreadsheet, "Testing")
+    ws = get_worksheet(spreadsheet, writer, "Testing")
 
     try:
-        first_cell = ws.acell("A1").value
-        if first_cell != "ID":
+        if first_cell(ws, current) != "ID":
             ws.clear()
             headers = [
                 "ID",
@@ -1275,11 +1344,11 @@ def sync_testing_to_sheet(spreadsheet):
     log("Synced testing sheet")
 
 
-def sync_testing_from_sheet(spreadsheet):
+def sync_testing_from_sheet(spreadsheet, rows=None):
     """Read test results from sheet and log them."""
     try:
-        ws = spreadsheet.worksheet("Testing")
-        rows = ws.get_all_values()
+        if rows is None:
+            rows = spreadsheet.worksheet("Testing").get_all_values()
 
         if len(rows) < 2:
             return
@@ -1308,13 +1377,12 @@ def sync_testing_from_sheet(spreadsheet):
 # =============================================================================
 
 
-def sync_decisions_to_sheet(spreadsheet):
+def sync_decisions_to_sheet(spreadsheet, writer=None, current=None):
     """Sync decisions sheet for decision tracking."""
-    ws = get_or_create_worksheet(spreadsheet, "Decisions")
+    ws = get_worksheet(spreadsheet, writer, "Decisions")
 
     try:
-        first_cell = ws.acell("A1").value
-        if first_cell != "ID":
+        if first_cell(ws, current) != "ID":
             ws.clear()
             headers = [
                 "ID",
@@ -1385,14 +1453,10 @@ def get_environment_data():
     return None
 
 
-def sync_environments_to_sheet(spreadsheet):
+def sync_environments_to_sheet(spreadsheet, writer=None, env_data=None):
     """Sync environments and services to Environments sheet."""
-    ws = get_or_create_worksheet(spreadsheet, "Environments")
-
-    ws.clear()
-
     # Get environment data from API
-    data = get_environment_data()
+    data = get_environment_data() if env_data is None else env_data
 
     rows = [
         ["ENVIRONMENTS & SERVICES"],
@@ -1534,16 +1598,12 @@ def sync_environments_to_sheet(spreadsheet):
     except Exception as e:
         rows.append([f"Error getting sessions: {e}"])
 
-    # Write all data
-    ws.update(values=rows, range_name="A1")
-
-    # Format headers
-    ws.format("A1", {"textFormat": {"bold": True, "fontSize": 14}})
-    ws.format("A5", {"textFormat": {"bold": True}})
-    ws.format(
-        "A8:D8",
-        {"textFormat": {"bold": True}, "backgroundColor": {"red": 0.8, "green": 0.9, "blue": 1}},
-    )
+    formats = {
+        "A1": TITLE_FORMAT,
+        "A5": HEADER_FORMAT,
+        "A8:D8": {**HEADER_FORMAT, "backgroundColor": {"red": 0.8, "green": 0.9, "blue": 1}},
+    }
+    stage_sheet(spreadsheet, writer, "Environments", rows, formats)
 
     log("Synced environments sheet")
 
@@ -1690,13 +1750,13 @@ def get_session_tasks(session_name):
 # =============================================================================
 
 
-def sync_usage_to_sheet(spreadsheet):
+def sync_usage_to_sheet(spreadsheet, writer=None, current=None):
     """Sync Usage guide to Usage sheet - quick reference for daily use."""
-    ws = get_or_create_worksheet(spreadsheet, "Usage")
+    ws = get_worksheet(spreadsheet, writer, "Usage")
 
     try:
-        first_cell = ws.acell("A1").value
-        if first_cell and "USAGE GUIDE" in first_cell:
+        a1 = first_cell(ws, current)
+        if a1 and "USAGE GUIDE" in a1:
             return  # Already exists
     except:
         pass
@@ -1818,14 +1878,14 @@ def sync_usage_to_sheet(spreadsheet):
     log("Synced usage guide")
 
 
-def sync_sop_to_sheet(spreadsheet, force: bool = False):
+def sync_sop_to_sheet(spreadsheet, force: bool = False, writer=None, current=None):
     """Sync Standard Operating Procedures to SOP sheet."""
-    ws = get_or_create_worksheet(spreadsheet, "SOP")
+    ws = get_worksheet(spreadsheet, writer, "SOP")
 
     # Only update if sheet is empty or has template marker
     try:
-        first_cell = ws.acell("A1").value
-        if not force and first_cell and "STANDARD OPERATING PROCEDURES" in first_cell:
+        a1 = first_cell(ws, current)
+        if not force and a1 and "STANDARD OPERATING PROCEDURES" in a1:
             return  # SOP already exists, don't overwrite
     except:
         pass
@@ -2060,11 +2120,9 @@ def sync_sop_to_sheet(spreadsheet, force: bool = False):
 # =============================================================================
 
 
-def sync_architecture_setup_to_sheet(spreadsheet):
+def sync_architecture_setup_to_sheet(spreadsheet, writer=None):
     """Sync architecture setup and configuration data to sheet."""
     try:
-        ws = get_or_create_worksheet(spreadsheet, "Architecture Setup", rows=100, cols=10)
-
         # Header
         headers = [
             "Component",
@@ -2078,7 +2136,6 @@ def sync_architecture_setup_to_sheet(spreadsheet):
             "Notes",
             "Last Updated",
         ]
-        ws.update("A1:J1", [headers])
 
         # Collect system component data
         components = []
@@ -2269,8 +2326,14 @@ def sync_architecture_setup_to_sheet(spreadsheet):
         )
 
         # Write to sheet
-        if components:
-            ws.update(f"A2:J{len(components)+1}", components)
+        stage_sheet(
+            spreadsheet,
+            writer,
+            "Architecture Setup",
+            [headers] + components,
+            rows=100,
+            cols=10,
+        )
 
         log(f"Synced architecture setup ({len(components)} components)")
 
@@ -2414,33 +2477,49 @@ def full_sync(client):
     try:
         spreadsheet = client.open_by_key(SPREADSHEET_ID)
         log(f"Connected to: {spreadsheet.title}")
+        writer = SheetWriter(spreadsheet, SheetSnapshot.load(SNAPSHOT_FILE, SPREADSHEET_ID))
+
+        # Read both directions at once: sheet values (user edits) in one
+        # request, and the local state that does not depend on them
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            sheet_read = pool.submit(writer.read, READ_SHEETS)
+            sessions = pool.submit(get_tmux_sessions)
+            progress = pool.submit(get_worker_progress)
+            env_data = pool.submit(get_environment_data)
+            current = sheet_read.result()
+            sessions, progress, env_data = sessions.result(), progress.result(), env_data.result()
+
+        # First, apply changes from sheet (user edits)
+        sync_bugs_from_sheet(spreadsheet, current.get("Bugs"), writer.written("Bugs"))
+        sync_tasks_from_sheet(spreadsheet, current.get("Tasks"), writer.written("Tasks"))
+        sync_dev_tasks_from_sheet(spreadsheet, current.get("DevTasks"))
+        sync_testing_from_sheet(spreadsheet, current.get("Testing"))
+
+        # Then, stage current state; only changed cells are sent, in one batch update
+        sync_sessions_to_sheet(spreadsheet, writer, sessions)
+        sync_bugs_to_sheet(spreadsheet, writer)
+        sync_features_to_sheet(spreadsheet, writer)
+        sync_tasks_to_sheet(spreadsheet, writer)
+        sync_errors_to_sheet(spreadsheet, writer)
+        sync_progress_to_sheet(spreadsheet, writer, progress, sessions)
+        sync_environments_to_sheet(spreadsheet, writer, env_data)
+        sync_summary_to_sheet(spreadsheet, writer, current, env_data)
+        sync_architecture_setup_to_sheet(spreadsheet, writer)
+        stats = writer.commit()
+        log(
+            f"Wrote {stats['cells']} cells in {stats['ranges']} ranges "
+            f"({stats['skipped']} sheets unchanged at source, {stats['unchanged']} unchanged)"
+        )
+
+        # Development, Testing, and Decisions sheets (templates; user-owned rows)
+        sync_dev_tasks_to_sheet(spreadsheet, writer, current.get("DevTasks"))
+        sync_testing_to_sheet(spreadsheet, writer, current.get("Testing"))
+        sync_decisions_to_sheet(spreadsheet, writer, current.get("Decisions"))
+
+        sync_usage_to_sheet(spreadsheet, writer, current.get("Usage"))
+        sync_sop_to_sheet(spreadsheet, writer=writer, current=current.get("SOP"))
 
-        # First, read changes from sheet (user edits)
-        sync_bugs_from_sheet(spreadsheet)
-        sync_tasks_from_sheet(spreadsheet)
-        sync_dev_tasks_from_sheet(spreadsheet)
-        sync_testing_from_sheet(spreadsheet)
-
-        # Then, sync current state to sheet
-        sync_sessions_to_sheet(spreadsheet)
-        sync_bugs_to_sheet(spreadsheet)
-        sync_features_to_sheet(spreadsheet)
-        sync_tasks_to_sheet(spreadsheet)
-        sync_errors_to_sheet(spreadsheet)
-        sync_progress_to_sheet(spreadsheet)
-
-        # Development, Testing, and Decisions sheets
-        sync_dev_tasks_to_sheet(spreadsheet)
-        sync_testing_to_sheet(spreadsheet)
-        sync_decisions_to_sheet(spreadsheet)
-        sync_environments_to_sheet(spreadsheet)
-
-        sync_summary_to_sheet(spreadsheet)
-        sync_usage_to_sheet(spreadsheet)
-        sync_sop_to_sheet(spreadsheet)
-
-        # Architecture and documentation sync
-        sync_architecture_setup_to_sheet(spreadsheet)
+        # Architecture documentation sync
         sync_architecture_to_google_doc(client)
 
         log("Full sync complete!")
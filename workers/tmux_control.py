@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+tmux Control Mode Client
+
+Keeps one long-lived `tmux -C` connection to the tmux server so session
+scans run commands in-process instead of forking a tmux client per call.
+
+Features:
+- Single control-mode connection (`tmux -N -C new-session -A`) on a hidden
+  session that tmux destroys when the client goes away; never starts a
+  tmux server of its own
+- Commands are pipelined over stdin and matched to their %begin/%end
+  replies in order; %error replies raise TmuxControlError
+- Notifications (%sessions-changed, %window-add, %output, ...) are counted
+  so callers can tell when the session layout changed; an optional
+  on_layout_change callback is invoked from the reader thread so callers
+  can react to sessions coming and going without polling
+- list_active_panes() returns every session's active pane with its
+  window_activity timestamp in one round trip, which is what callers use
+  to skip panes that produced no output since they were last captured
+- GitBranchCache: current branch per directory read from .git/HEAD and
+  re-read only when HEAD's mtime/inode changes (no git subprocesses)
+
+Usage:
+    from workers.tmux_control import GitBranchCache, TmuxControlClient
+
+    client = TmuxControlClient()
+    if client.start():
+        for pane in client.list_active_panes():
+            print(pane.session, pane.pane_id, pane.activity, pane.current_path)
+        print(client.capture_pane("dev", lines=50))
+        client.close()
+
+    branches = GitBranchCache()
+    branches.get_branch("/path/to/repo/subdir")  # "main"
+"""
+
+import logging
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("TmuxControl")
+
+# Hidden session the control client attaches to
+CONTROL_SESSION = "_assigner_control"
+
+# Notifications that mean sessions, windows or panes came or went
+_LAYOUT_NOTIFICATIONS = {
+    "%sessions-changed",
+    "%session-renamed",
+    "%session-window-changed",
+    "%window-add",
+    "%window-close",
+    "%window-pane-changed",
+    "%unlinked-window-add",
+    "%unlinked-window-close",
+    "%layout-change",
+}
+
+_PANE_FORMAT = "\t".join(
+    [
+        "#{session_name}",
+        "#{window_active}",
+        "#{pane_active}",
+        "#{pane_id}",
+        "#{window_activity}",
+        "#{pane_current_path}",
+    ]
+)
+
+
+class TmuxControlError(Exception):
+    """A control-mode command failed or the connection is unusable."""
+
+
+@dataclass
+class PaneState:
+    session: str
+    pane_id: str
+    activity: int  # window_activity: epoch seconds of the window's last output
+    current_path: Optional[str]
+
+
+def quote(arg: str) -> str:
+    """Quote one argument for the tmux command parser."""
+    if "\n" in arg:
+        raise ValueError("tmux control-mode arguments cannot contain newlines")
+    return "'" + arg.replace("'", "'\\''") + "'"
+
+
+class TmuxControlClient:
+    """One persistent tmux control-mode connection."""
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        session_name: str = CONTROL_SESSION,
+        command_timeout: float = 5.0,
+    ):
+        self.socket_path = socket_path
+        self.session_name = session_name
+        self.command_timeout = command_timeout
+
+        self._proc: Optional[subprocess.Popen] = None
+        self._reader: Optional[threading.Thread] = None
+        self._write_lock = threading.Lock()
+        self._pending: deque = deque()
+        self._ready = threading.Event()
+
+        # Bumped on every layout notification
+        self.layout_version = 0
+        # Called (from the reader thread) after each layout notification
+        self.on_layout_change: Optional[Callable[[], None]] = None
+        self.stats = {"commands": 0, "errors": 0, "notifications": 0, "connects": 0}
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None and self._ready.is_set()
+
+    def _tmux(self) -> List[str]:
+        return ["tmux", "-S", self.socket_path] if self.socket_path else ["tmux"]
+
+    def start(self, timeout: float = 5.0) -> bool:
+        """Connect to the running tmux server; False if there is none."""
+        self.close()
+        self._ready.clear()
+        try:
+            self._proc = subprocess.Popen(
+                self._tmux() + ["-N", "-C", "new-session", "-A", "-s", self.session_name],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            logger.debug(f"tmux control mode unavailable: {e}")
+            self._proc = None
+            return False
+
+        self._reader = threading.Thread(
+            target=self._read_loop, args=(self._proc,), name="tmux-control", daemon=True
+        )
+        self._reader.start()
+        # Without a server `tmux -N` exits at once instead of replying
+        deadline = time.time() + timeout
+        while not self._ready.wait(0.05):
+            if self._proc.poll() is not None or time.time() > deadline:
+                self.close()
+                return False
+
+        try:
+            self.command("set-option", "-t", self.session_name, "destroy-unattached", "on")
+        except TmuxControlError as e:
+            logger.debug(f"Could not mark control session for cleanup: {e}")
+        self.stats["connects"] += 1
+        logger.info("Connected to tmux in control mode")
+        return True
+
+    def close(self):
+        """Detach; the hidden session is destroyed with the last client."""
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        if self._reader:
+            self._reader.join(timeout=2)
+        self._fail_pending(TmuxControlError("tmux control connection closed"))
+
+    def _fail_pending(self, error: Exception):
+        with self._write_lock:
+            while self._pending:
+                future = self._pending.popleft()
+                if not future.done():
+                    future.set_exception(error)
+
+    def _read_loop(self, proc: subprocess.Popen):
+        """Parse control-mode output into command replies and notifications."""
+        block: Optional[Tuple[str, str]] = None  # (cmd number, flags) of the open %begin
+        lines: List[str] = []
+        for raw in proc.stdout:
+            line = raw.decode("utf-8", errors="replace").rstrip("\n")
+            if block is not None:
+                parts = line.split(" ")
+                if (
+                    parts[0] in ("%end", "%error")
+                    and len(parts) == 4
+                    and (parts[2], parts[3]) == block
+                ):
+                    self._finish(block[1], lines, error=parts[0] == "%error")
+                    block, lines = None, []
+                else:
+                    lines.append(line)
+                continue
+            if line.startswith("%begin "):
+                parts = line.split(" ")
+                block = (parts[2], parts[3]) if len(parts) == 4 else ("", "")
+                continue
+            self._notify(line)
+        self._ready.clear()
+        self._fail_pending(TmuxControlError("tmux control connection lost"))
+
+    def _finish(self, flags: str, lines: List[str], error: bool):
+        # Flag 1 marks replies to commands this client sent; the reply to the
+        # attach command itself (flag 0) signals that the connection is ready
+        if flags != "1":
+            self._ready.set()
+            return
+        with self._write_lock:
+            future = self._pending.popleft() if self._pending else None
+        if future is None:
+            return
+        if error:
+            self.stats["errors"] += 1
+            future.set_exception(TmuxControlError("\n".join(lines) or "tmux command failed"))
+        else:
+            future.set_result(lines)
+
+    def _notify(self, line: str):
+        name = line.split(" ", 1)[0]
+        self.stats["notifications"] += 1
+        if name in _LAYOUT_NOTIFICATIONS:
+            self.layout_version += 1
+            callback = self.on_layout_change
+            if callback is not None:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.debug(f"Layout change callback failed: {e}")
+
+    def command(self, *args: str) -> List[str]:
+        """Run one tmux command; returns its output lines."""
+        proc = self._proc
+        if proc is None or proc.poll() is not None:
+            raise TmuxControlError("tmux control connection is not running")
+        future: Future = Future()
+        line = (" ".join(quote(a) for a in args) + "\n").encode("utf-8")
+        with self._write_lock:
+            self._pending.append(future)
+            try:
+                proc.stdin.write(line)
+                proc.stdin.flush()
+            except (OSError, ValueError) as e:
+                self._pending.remove(future)
+                raise TmuxControlError(f"tmux control write failed: {e}")
+        self.stats["commands"] += 1
+        try:
+            return future.result(self.command_timeout)
+        except FutureTimeout:
+            # Replies are matched by position, so a lost reply desyncs the stream
+            self.close()
+            raise TmuxControlError(f"tmux command timed out: {args[0]}")
+
+    def list_sessions(self) -> List[str]:
+        """Session names, excluding the control session."""
+        return [
+            name
+            for name in self.command("list-sessions", "-F", "#{session_name}")
+            if name and name != self.session_name
+        ]
+
+    def list_active_panes(self) -> List[PaneState]:
+        """The active pane of each session's current window, in one command."""
+        panes = []
+        for line in self.command("list-panes", "-a", "-F", _PANE_FORMAT):
+            parts = line.split("\t", 5)
+            if len(parts) != 6 or parts[0] == self.session_name:
+                continue
+            session, window_active, pane_active, pane_id, activity, path = parts
+            if window_active != "1" or pane_active != "1":
+                continue
+            panes.append(
+                PaneState(
+                    session=session,
+                    pane_id=pane_id,
+                    activity=int(activity or 0),
+                    current_path=path or None,
+                )
+            )
+        return panes
+
+    def capture_pane(self, target: str, lines: int = 50) -> str:
+        """Last N lines of a pane (same text as `capture-pane -p`)."""
+        output = self.command("capture-pane", "-p", "-t", target, "-S", f"-{lines}")
+        return "\n".join(output) + "\n" if output else ""
+
+    def display(self, target: str, fmt: str) -> str:
+        """Expand a format for a target (`display-message -p`)."""
+        output = self.command("display-message", "-p", "-t", target, fmt)
+        return output[0] if output else ""
+
+
+class GitBranchCache:
+    """Current git branch per directory, re-read only when HEAD changes."""
+
+    # Directories outside any repository are re-checked after this long
+    NEGATIVE_TTL = 60.0
+
+    def __init__(self):
+        self._heads: Dict[str, Tuple[Optional[Path], float]] = {}
+        self._branches: Dict[Path, Tuple[Tuple[int, int, int], Optional[str]]] = {}
+        self.stats = {"lookups": 0, "reads": 0}
+
+    @staticmethod
+    def find_head(directory: str) -> Optional[Path]:
+        """HEAD file of the repository containing a directory (worktrees too)."""
+        path = Path(directory)
+        for candidate in (path, *path.parents):
+            git = candidate / ".git"
+            if git.is_dir():
+                return git / "HEAD"
+            if git.is_file():
+                try:
+                    content = git.read_text().strip()
+                except OSError:
+                    return None
+                if content.startswith("gitdir:"):
+                    gitdir = Path(content[len("gitdir:") :].strip())
+                    if not gitdir.is_absolute():
+                        gitdir = candidate / gitdir
+                    return gitdir / "HEAD"
+                return None
+        return None
+
+    @staticmethod
+    def parse_head(content: str) -> Optional[str]:
+        """Branch name as `git rev-parse --abbrev-ref HEAD` prints it."""
+        content = content.strip()
+        if content.startswith("ref:"):
+            ref = content[len("ref:") :].strip()
+            for prefix in ("refs/heads/", "refs/"):
+                if ref.startswith(prefix):
+                    return ref[len(prefix) :]
+            return ref
+        return "HEAD" if content else None
+
+    def get_branch(self, directory: Optional[str]) -> Optional[str]:
+        """Current branch of the repository containing directory, or None."""
+        if not directory:
+            return None
+        self.stats["lookups"] += 1
+
+        head, checked_at = self._heads.get(directory, (None, 0.0))
+        if head is None and time.time() - checked_at < self.NEGATIVE_TTL:
+            return None
+
+        for _ in range(2):
+            if head is None:
+                head = self.find_head(directory)
+                self._heads[directory] = (head, time.time())
+                if head is None:
+                    return None
+            try:
+                st = os.stat(head)
+            except OSError:
+                # Repository moved or removed: look it up again once
+                head = None
+                continue
+
+            key = (st.st_mtime_ns, st.st_ino, st.st_size)
+            cached = self._branches.get(head)
+            if cached and cached[0] == key:
+                return cached[1]
+            try:
+                branch = self.parse_head(head.read_text())
+            except OSError:
+                return None
+            self.stats["reads"] += 1
+            self._branches[head] = (key, branch)
+            return branch
+        return None
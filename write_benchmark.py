@@ -0,0 +1,196 @@
+"""
+Write Benchmark Module
+
+Measures SQLite write throughput and tail latency for concurrent writers,
+with and without the db.py write queue. Without it every thread opens its
+own connection and commits each write, competing for the database lock
+through busy_timeout; with it all writes go through one writer thread that
+group-commits them.
+
+Usage:
+    python write_benchmark.py --threads 32 --writes 200
+    python write_benchmark.py --json
+
+    from write_benchmark import compare_write_modes
+    report = compare_write_modes(threads=16, writes_per_thread=100)
+"""
+
+import argparse
+import json
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import db
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bench_writes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    worker INTEGER NOT NULL,
+    payload TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+_INSERT = "INSERT INTO bench_writes (worker, payload) VALUES (?, ?)"
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_write_benchmark(
+    db_path: Path, threads: int = 16, writes_per_thread: int = 100, use_queue: bool = False
+) -> Dict:
+    """
+    Run concurrent single-row inserts against a database.
+
+    Args:
+        db_path: Database file (created if missing)
+        threads: Concurrent writer threads
+        writes_per_thread: Inserts per thread
+        use_queue: Route writes through a db.WriteQueue
+
+    Returns:
+        {"mode", "writes", "errors", "elapsed_s", "writes_per_s", "p50_ms",
+         "p95_ms", "p99_ms", "max_ms"} plus "queue" stats in queue mode
+    """
+    db_path = Path(db_path)
+    conn = db._create_connection(db_path)
+    conn.execute(_SCHEMA)
+    conn.commit()
+    conn.close()
+
+    write_queue = db.WriteQueue(db_path, name="benchmark") if use_queue else None
+    latencies: List[float] = []
+    errors: List[str] = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads + 1)
+
+    def writer(worker: int):
+        own_conn = None if write_queue else db._create_connection(db_path)
+        local = []
+        barrier.wait()
+        for i in range(writes_per_thread):
+            start = time.perf_counter()
+            try:
+                if write_queue:
+                    write_queue.execute(_INSERT, (worker, f"payload-{i}"))
+                else:
+                    own_conn.execute(_INSERT, (worker, f"payload-{i}"))
+                    own_conn.commit()
+            except sqlite3.Error as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            local.append(time.perf_counter() - start)
+        if own_conn:
+            own_conn.close()
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=writer, args=(n,)) for n in range(threads)]
+    for t in workers:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "mode": "write_queue" if use_queue else "direct",
+        "threads": threads,
+        "writes": len(latencies),
+        "errors": len(errors),
+        "elapsed_s": round(elapsed, 3),
+        "writes_per_s": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+    }
+    latencies.sort()
+    for label, q in (("p50_ms", 0.50), ("p95_ms", 0.95), ("p99_ms", 0.99), ("max_ms", 1.0)):
+        result[label] = round(_percentile(latencies, q) * 1000, 3)
+    if latencies:
+        result["mean_ms"] = round(statistics.mean(latencies) * 1000, 3)
+    if write_queue:
+        stats = write_queue.get_stats()
+        result["queue"] = {k: stats[k] for k in ("batches", "avg_batch", "largest_batch")}
+        write_queue.close()
+    return result
+
+
+def compare_write_modes(threads: int = 16, writes_per_thread: int = 100) -> Dict:
+    """Benchmark direct writes (before) and the write queue (after) on fresh databases."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for use_queue in (False, True):
+            path = Path(tmp) / f"bench_{'queue' if use_queue else 'direct'}.db"
+            results["after" if use_queue else "before"] = run_write_benchmark(
+                path, threads, writes_per_thread, use_queue
+            )
+    before, after = results["before"], results["after"]
+    results["throughput_ratio"] = (
+        round(after["writes_per_s"] / before["writes_per_s"], 2) if before["writes_per_s"] else None
+    )
+    results["p99_ratio"] = (
+        round(after["p99_ms"] / before["p99_ms"], 2) if before["p99_ms"] else None
+    )
+    return results
+
+
+def format_report(report: Dict) -> str:
+    """Render a compare_write_modes() report as text."""
+    before, after = report["before"], report["after"]
+    rows = [
+        ("writes/s", "writes_per_s"),
+        ("p50 (ms)", "p50_ms"),
+        ("p95 (ms)", "p95_ms"),
+        ("p99 (ms)", "p99_ms"),
+        ("max (ms)", "max_ms"),
+        ("errors", "errors"),
+    ]
+    total = before["writes"] + before["errors"]
+    lines = [
+        f"SQLite write benchmark: {before['threads']} threads, {total} writes",
+        "",
+        f"{'':<14}{'direct':>12}{'queue':>12}",
+    ]
+    for label, key in rows:
+        lines.append(f"{label:<14}{before[key]:>12}{after[key]:>12}")
+    queue = after.get("queue", {})
+    lines.append("")
+    lines.append(
+        f"Group commits: {queue.get('batches', 0)} "
+        f"(avg {queue.get('avg_batch', 0)} writes, largest {queue.get('largest_batch', 0)})"
+    )
+    lines.append(f"Throughput x{report['throughput_ratio']}, p99 x{report['p99_ratio']}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark SQLite writes with and without the write queue"
+    )
+    parser.add_argument("--threads", type=int, default=16, help="Concurrent writers")
+    parser.add_argument("--writes", type=int, default=100, help="Writes per thread")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON")
+    args = parser.parse_args(argv)
+
+    report = compare_write_modes(args.threads, args.writes)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())